@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the per-call overhead of :func:`privex.helpers.asyncx.awaitable` on cache reads.
+
+Compares the legacy blacklist check (``caller_name`` / ``calling_function`` / ``calling_module`` from
+:mod:`privex.helpers.black_magic`, each building a full :func:`inspect.stack`) against the current
+:func:`sys._getframe` + per-code-object memo check, then times cache reads from sync code (the global
+:attr:`privex.helpers.cache.cached` wrapper backed by an :class:`.AsyncMemoryCache`) and from async code (an ``@awaitable``
+wrapper around :meth:`.AsyncMemoryCache.get`), with the blacklists empty (fast path) and non-empty.
+
+Usage::
+
+    python3 benchmarks/bench_awaitable.py [iterations]
+
+"""
+import asyncio
+import sys
+import timeit
+from os.path import abspath, dirname
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+from privex.helpers import asyncx
+from privex.helpers.asyncx import awaitable
+from privex.helpers.cache import AsyncMemoryCache, adapter_set, cached
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+
+acache = AsyncMemoryCache()
+
+
+@awaitable
+def cache_get(key):
+    return acache.get(key)
+
+
+def legacy_blacklisted(skip=3) -> bool:
+    from privex.helpers.black_magic import calling_module, calling_function, caller_name
+    if caller_name(skip=skip) in asyncx.AWAITABLE_BLACKLIST:
+        return True
+    if calling_function(skip=skip) in asyncx.AWAITABLE_BLACKLIST_FUNCS:
+        return True
+    _mod = calling_module(skip=skip)
+    if _mod in asyncx.AWAITABLE_BLACKLIST_MODS:
+        return True
+    return any(_mod.startswith(_m + '.') for _m in asyncx.AWAITABLE_BLACKLIST_MODS)
+
+
+def legacy_probe():
+    return legacy_blacklisted(skip=2)
+
+
+def probe():
+    return asyncx._awaitable_blacklisted(skip=2)
+
+
+def bench(name: str, stmt, number: int = N):
+    t = min(timeit.repeat(stmt, number=number, repeat=3))
+    print(f'  {name:<46} {t / number * 1e6:8.2f} us/op')
+    return t
+
+
+async def _async_gets(number: int):
+    for _ in range(number):
+        await cache_get('key')
+
+
+def bench_async(name: str, number: int = N):
+    loop = asyncio.new_event_loop()
+    try:
+        t = min(timeit.repeat(lambda: loop.run_until_complete(_async_gets(number)), number=1, repeat=3))
+    finally:
+        loop.close()
+    print(f'  {name:<46} {t / number * 1e6:8.2f} us/op')
+    return t
+
+
+def main():
+    adapter_set(acache)
+    cached['key'] = 'hello world'
+    asyncx.AWAITABLE_BLACKLIST_MODS.append('some.other.module')
+
+    print(f'Per-call cost ({N} iterations, best of 3)\n')
+    print('Blacklist check (non-empty blacklist):')
+    a = bench('legacy inspect.stack() x3', legacy_probe, number=max(N // 20, 1))
+    a = a / max(N // 20, 1) * N
+    b = bench('sys._getframe + code object memo', probe)
+    print(f'  -> {a / b:.1f}x faster\n')
+
+    print('AsyncMemoryCache.get via @awaitable with a non-empty blacklist:')
+    bench('cached.get from sync code', lambda: cached.get('key'))
+    bench_async('await cache_get from async code')
+
+    asyncx.AWAITABLE_BLACKLIST_MODS.clear()
+    print('\nAsyncMemoryCache.get via @awaitable with empty blacklists (fast path):')
+    bench('cached.get from sync code', lambda: cached.get('key'))
+    bench_async('await cache_get from async code')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Benchmark measuring the overhead of cache instrumentation (:mod:`privex.helpers.cache.metrics`) on :class:`.MemoryCache`.
+
+Compares a plain adapter (metrics disabled - the default) against an instrumented adapter, with and without a metrics hook.
+
+Usage::
+
+    python3 benchmarks/bench_cache_metrics.py [iterations]
+
+"""
+import sys
+import timeit
+from os.path import abspath, dirname
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+from privex.helpers.cache import MemoryCache
+from privex.helpers.cache.metrics import instrument, add_metrics_hook, remove_metrics_hook
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+
+def bench(name: str, stmt, number: int = N):
+    t = min(timeit.repeat(stmt, number=number, repeat=3)) / number
+    print(f'  {name:<30} {t * 1e6:10.2f} us/call')
+    return t
+
+
+def run(c: MemoryCache):
+    c.set('bench:key', 'hello world')
+    bench('get (hit)', lambda: c.get('bench:key'))
+    bench('get (miss)', lambda: c.get('bench:missing'))
+    bench('set', lambda: c.set('bench:key', 'hello world'))
+
+
+def main():
+    print(f'MemoryCache get / set ({N} iterations, best of 3)')
+    print('\nmetrics disabled:')
+    run(MemoryCache(max_entries=1000))
+    print('\ninstrumented:')
+    c = MemoryCache(max_entries=1000)
+    instrument(c)
+    run(c)
+    print('\ninstrumented + no-op hook:')
+    hook = lambda metric, value, tags: None
+    add_metrics_hook(hook)
+    run(c)
+    remove_metrics_hook(hook)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark suite for the per-call overhead of the caching decorators on cache hits, using :class:`.MemoryCache`
+(and :class:`.AsyncMemoryCache` for :func:`.r_cache_async`).
+
+Each decorated function is called once to populate the cache, then timed for repeated cache hits. A plain
+``cached.get`` of the same key is timed as a baseline, so the figures show the overhead added by each decorator:
+
+  * :func:`.r_cache` with a static key, a ``format_args`` key, a callable key, and ``key_builder=True``
+  * :func:`.r_cache_async` with a static key
+  * :func:`.z_cache` on an instance method, a classmethod, with a custom ``cache_key``, and with structured keys
+
+Usage::
+
+    python3 benchmarks/bench_decorators.py [iterations]
+
+"""
+import asyncio
+import sys
+import timeit
+from os.path import abspath, dirname
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+from privex.helpers.cache import AsyncMemoryCache, MemoryCache, adapter_set, async_adapter_set, cached
+from privex.helpers.cache.extras import CacheManagerMixin, z_cache
+from privex.helpers.decorators import r_cache, r_cache_async
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+
+@r_cache('bench_static')
+def static_key(x=1):
+    return x
+
+
+@r_cache('bench_fmt:{}:{}', format_args=[0, 1, 'x', 'y'])
+def format_key(x=1, y=2):
+    return x + y
+
+
+@r_cache(lambda x: f'bench_callable:{x}')
+def callable_key(x):
+    return x
+
+
+@r_cache('bench_builder', key_builder=True)
+def builder_key(x, y=2):
+    return x + y
+
+
+@r_cache_async('bench_async')
+async def async_key(x=1):
+    return x
+
+
+class Example(CacheManagerMixin):
+    cache_prefix = 'bench_zc'
+
+    @z_cache()
+    def method(self, x, y=2):
+        return x + y
+
+    @classmethod
+    @z_cache()
+    def clsmethod(cls, x, y=2):
+        return x + y
+
+    @z_cache(cache_key=lambda self, x: f'custom:{x}')
+    def custom(self, x):
+        return x
+
+    @z_cache(key_builder=True)
+    def structured(self, x, y=2):
+        return x + y
+
+
+def bench(name: str, stmt, number: int = N, base: float = None):
+    t = min(timeit.repeat(stmt, number=number, repeat=3)) / number
+    extra = '' if base is None else f'   (+{(t - base) * 1e6:6.2f} us over cached.get)'
+    print(f'  {name:<40} {t * 1e6:8.2f} us/call{extra}')
+    return t
+
+
+def bench_async(name: str, number: int = N, base: float = None):
+    async def _calls():
+        for _ in range(number):
+            await async_key(1)
+
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(async_key(1))
+        t = min(timeit.repeat(lambda: loop.run_until_complete(_calls()), number=1, repeat=3)) / number
+    finally:
+        loop.close()
+    extra = '' if base is None else f'   (+{(t - base) * 1e6:6.2f} us over cached.get)'
+    print(f'  {name:<40} {t * 1e6:8.2f} us/call{extra}')
+    return t
+
+
+def main():
+    adapter_set(MemoryCache())
+    async_adapter_set(AsyncMemoryCache())
+    ex = Example()
+    # Populate the cache for every benchmarked call
+    static_key(1), format_key(1, 2), callable_key(1), builder_key(1)
+    ex.method(1), Example.clsmethod(1), ex.custom(1), ex.structured(1)
+
+    print(f'Decorator overhead on cache hits ({N} iterations, best of 3)\n')
+    base = bench('cached.get (baseline)', lambda: cached.get('bench_static'))
+    print('\nr_cache:')
+    bench('static key', lambda: static_key(1), base=base)
+    bench('format_args key', lambda: format_key(1, 2), base=base)
+    bench('callable key', lambda: callable_key(1), base=base)
+    bench('key_builder=True', lambda: builder_key(1), base=base)
+    print('\nr_cache_async:')
+    bench_async('static key', base=base)
+    print('\nz_cache:')
+    bench('instance method', lambda: ex.method(1), base=base)
+    bench('classmethod', lambda: Example.clsmethod(1), base=base)
+    bench('custom cache_key', lambda: ex.custom(1), base=base)
+    bench('key_builder=True', lambda: ex.structured(1), base=base)
+
+
+if __name__ == '__main__':
+    main()
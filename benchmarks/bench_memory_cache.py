@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the per-hit cost of :class:`privex.helpers.cache.MemoryCache`
+
+**Adapter calls** - ``MemoryCache.get`` (hit / miss) and ``MemoryCache.set`` are timed against the code in this
+working tree. If a git ref (commit / tag / branch) is passed, the same timings are also taken for the real
+``privex.helpers`` code at that ref (extracted with ``git archive`` into a temporary folder, and ran in a separate
+interpreter), so the two can be compared.
+
+**Entry representation (synthetic)** - compares a re-implementation of the legacy entry representation (a
+``dict(value=..., timeout=datetime)`` per key, with ``datetime.utcnow()`` and a ``str(...) != 'never'`` comparison on
+every hit) against the current :class:`.CacheEntry` (``__slots__`` object with a :func:`time.monotonic` float deadline).
+The legacy side is a hand written copy of the old logic rather than the old code itself, so these figures only isolate
+the cost of the entry representation - use the adapter call figures with a git ref to compare against real code.
+
+Usage::
+
+    python3 benchmarks/bench_memory_cache.py [iterations] [git_ref]
+    # e.g. compare against the previous release
+    python3 benchmarks/bench_memory_cache.py 1000000 3.2.1
+
+"""
+import json
+import subprocess
+import sys
+import tarfile
+import tempfile
+import timeit
+from datetime import datetime, timedelta
+from io import BytesIO
+from os.path import abspath, dirname
+from time import monotonic
+
+ROOT = dirname(dirname(abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from privex.helpers.cache.memstore import CacheEntry, _deadline
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+REF = sys.argv[2] if len(sys.argv) > 2 else None
+
+ADAPTER_BENCH = """
+import json, sys, timeit
+sys.path.insert(0, sys.argv[1])
+from privex.helpers.cache import MemoryCache
+n = int(sys.argv[2])
+mc = MemoryCache()
+mc.set('key', 'hello world', timeout=300)
+res = {}
+for name, stmt, number in [
+    ('MemoryCache.get (hit)', lambda: mc.get('key'), n),
+    ('MemoryCache.get (miss)', lambda: mc.get('nonexistent'), n),
+    ('MemoryCache.set', lambda: mc.set('key', 'hello world', timeout=300), max(n // 10, 1)),
+]:
+    res[name] = min(timeit.repeat(stmt, number=number, repeat=3)) / number
+print(json.dumps(res))
+"""
+"""Ran in a separate interpreter for each tree, so the working tree and the git ref can't share any imported modules"""
+
+
+def legacy_hit(c: dict, key: str):
+    if key in c:
+        vc = c[key]
+        if str(vc['timeout']) != 'never' and vc['timeout'] < datetime.utcnow():
+            return None
+        return vc['value']
+    return None
+
+
+def entry_hit(c: dict, key: str):
+    vc = c.get(key)
+    if vc is None or vc.deadline < monotonic():
+        return None
+    return vc.value
+
+
+def legacy_set(c: dict, key: str):
+    c[key] = dict(value='hello world', timeout=datetime.utcnow() + timedelta(seconds=300))
+
+
+def entry_set(c: dict, key: str):
+    c[key] = CacheEntry('hello world', _deadline(300))
+
+
+def bench(name: str, stmt, number: int = N):
+    t = min(timeit.repeat(stmt, number=number, repeat=3))
+    print(f'  {name:<42} {t / number * 1e9:8.1f} ns/op')
+    return t
+
+
+def adapter_times(path: str) -> dict:
+    """Time the ``MemoryCache`` adapter calls using the ``privex.helpers`` package found in ``path``"""
+    res = subprocess.run([sys.executable, '-c', ADAPTER_BENCH, path, str(N)], stdout=subprocess.PIPE, check=True)
+    return json.loads(res.stdout.decode())
+
+
+def extract_ref(ref: str, dest: str):
+    """Extract the ``privex`` package at the git ``ref`` into the folder ``dest``"""
+    data = subprocess.run(['git', 'archive', ref, 'privex'], cwd=ROOT, stdout=subprocess.PIPE, check=True).stdout
+    with tarfile.open(fileobj=BytesIO(data)) as tf:
+        tf.extractall(dest)
+
+
+def main():
+    print(f'Per-operation cost ({N} iterations, best of 3)\n')
+    print('Full adapter call:')
+    current = adapter_times(ROOT)
+    if REF is None:
+        for name, t in current.items():
+            print(f'  {name:<42} {t * 1e9:8.1f} ns/op')
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            extract_ref(REF, tmp)
+            old = adapter_times(tmp)
+        print(f'  {"":<30} {REF[:12]:>12} {"working tree":>14}')
+        for name, t in current.items():
+            print(f'  {name:<30} {old[name] * 1e9:9.1f} ns {t * 1e9:11.1f} ns   -> speedup {old[name] / t:.2f}x')
+    print()
+
+    legacy, new = {}, {}
+    legacy_set(legacy, 'key')
+    entry_set(new, 'key')
+
+    print('Entry expiry check + value lookup (cache hit) - synthetic:')
+    a = bench('legacy dict + datetime.utcnow()', lambda: legacy_hit(legacy, 'key'))
+    b = bench('__slots__ CacheEntry + monotonic()', lambda: entry_hit(new, 'key'))
+    print(f'  -> {a / b:.2f}x faster\n')
+
+    print('Entry creation (cache set) - synthetic:')
+    a = bench('legacy dict + datetime + timedelta', lambda: legacy_set(legacy, 'key'))
+    b = bench('__slots__ CacheEntry + monotonic()', lambda: entry_set(new, 'key'))
+    print(f'  -> {a / b:.2f}x faster')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Benchmark comparing :class:`.SqliteCache` in it's default mode against fast mode (WAL, ``synchronous=NORMAL``,
+direct prepared statements and background purging - see :attr:`privex.helpers.settings.SQLITE_CACHE_FAST`).
+
+Each mode uses a fresh database file in a temporary folder, and times ``set`` (overwriting an existing key) and ``get``.
+
+Usage::
+
+    python3 benchmarks/bench_sqlite_cache.py [iterations]
+
+"""
+import sys
+import tempfile
+import timeit
+from os.path import abspath, dirname, join
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+from privex.helpers.cache import SqliteCache
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+
+
+def bench(name: str, stmt, number: int = N):
+    t = min(timeit.repeat(stmt, number=number, repeat=3)) / number
+    print(f'  {name:<30} {t * 1e6:10.2f} us/call')
+    return t
+
+
+def main():
+    print(f'SqliteCache get / set ({N} iterations, best of 3)')
+    with tempfile.TemporaryDirectory() as tmp:
+        for fast in (False, True):
+            c = SqliteCache(join(tmp, f'bench-{int(fast)}.sqlite3'), fast_mode=fast)
+            c.set('bench_key', 'hello world', timeout=300)
+            print(f'\nfast_mode={fast}:')
+            bench('set (overwrite)', lambda: c.set('bench_key', 'hello world', timeout=300))
+            bench('get', lambda: c.get('bench_key'))
+            c.close()
+
+
+if __name__ == '__main__':
+    main()
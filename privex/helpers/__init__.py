@@ -11,6 +11,19 @@ X11 / MIT License
   * :py:mod:`.net` - Network related functions/classes such as ASN name lookup, and IP version bool checks
   * :py:mod:`.exceptions` - Exception classes used either by our helpers, or generic exceptions for use in projects
 
+**Lazy loading**:
+
+Only :py:mod:`.common` and :py:mod:`.exceptions` are imported when ``privex.helpers`` is imported. Every other name
+which is available from the package root (e.g. ``r_cache``, ``resolve_ips``, ``EncryptHelper``, ``geolocate_ip``) is
+listed in :py:attr:`._LAZY_ATTRS`, and its submodule is only imported the first time the name is accessed
+(:pep:`562` module ``__getattr__``), so importing the package doesn't pull in ``cryptography``, ``geoip2``,
+``setuptools``, ``redis`` etc. unless they're actually used::
+
+    >>> from privex.helpers import empty            # Imported eagerly with privex.helpers.common
+    >>> from privex.helpers import r_cache          # Imports privex.helpers.decorators on first access
+
+``from privex.helpers import *`` still exports every name, but it has to import every submodule to do so.
+
 
 **Copyright**::
 
@@ -49,11 +62,11 @@ X11 / MIT License
 
 """
 
+import importlib
+import importlib.util
 import logging
 import warnings
 
-from privex.helpers.common import *
-
 log = logging.getLogger(__name__)
 
 
@@ -92,131 +105,182 @@ class _Dummy:
         except AttributeError as ex:
             raise KeyError(str(ex))
 
-try:
-    from privex.helpers.collections import *
-except ImportError as e:
-    log.warning(
-        'privex.helpers __init__ failed to import "%s", not loading %s module. reason: %s %s',
-        'privex.helpers.collections', 'collections', type(e), str(e)
-    )
-
-try:
-    from privex.helpers.decorators import *
-except ImportError as e:
-    log.warning(
-        'privex.helpers __init__ failed to import "%s", not loading %s module. reason: %s %s',
-        'privex.helpers.decorators', 'decorators', type(e), str(e)
-    )
-try:
-    from privex.helpers.net import *
-except ImportError as e:
-    log.warning(
-        'privex.helpers __init__ failed to import "%s", not loading %s module. reason: %s %s',
-        'privex.helpers.net', 'net', type(e), str(e)
-    )
 
-from privex.helpers.exceptions import *
+_LAZY_ATTRS = {
+    'collections': (
+        'AUTO', 'COPY_CLASS_BLACKLIST', 'DEFAULT_ALLOWED_DUPE', 'DictDataClass', 'DictDataclass', 'Dictable', 'MockDictObj',
+        'Mocker', 'convert_dictable_namedtuple', 'copy_class', 'copy_class_simple', 'copy_func', 'dataclasses_mock',
+        'dictable_namedtuple', 'generate_class', 'generate_class_kw', 'is_namedtuple', 'make_dict_tuple',
+        'subclass_dictable_namedtuple',
+    ),
+    'decorators': (
+        'CacheEnvelope', 'DEF_FAIL_MSG', 'DEF_RETRY_MSG', 'FO', 'FormatOpt', 'KeyBuilder', 'NO_RESULT',
+        'async_adapter_get', 'async_retry', 'async_single_flight', 'async_sync', 'await_if_needed', 'decode_result',
+        'encode_exception', 'encode_result', 'exception_types', 'flight_opts', 'mock_decorator', 'r_cache',
+        'r_cache_async', 'refresh_in_background', 'refresh_in_background_async', 'result_ttl', 'retry_on_err',
+        'single_flight',
+    ),
+    'net': (
+        'AnySocket', 'AsyncSocketWrapper', 'OpAnySocket', 'DNSCache', 'IPV4_ALIASES', 'IPV6_ALIASES', 'SocketContextManager', 'SocketWrapper',
+        'StopLoopOnMatch', 'check_host', 'check_host_async', 'check_host_http', 'check_host_http_async', 'check_v4',
+        'asn_to_name', 'asn_to_name_async', 'asn_to_name_many', 'asn_to_name_many_async',
+        'check_v4_async', 'check_v6', 'check_v6_async', 'get_asn_cache', 'get_async_resolver', 'get_dns_cache', 'get_rdns',
+        'get_rdns_async', 'get_rdns_multi', 'get_rdns_multi_async', 'get_resolver', 'happy_eyeballs_connect',
+        'happy_eyeballs_connect_async', 'ip4_to_rdns', 'ip6_to_rdns',
+        'ip_is_v4', 'ip_is_v6', 'ip_to_rdns', 'ip_ver_to_int', 'ip_ver_to_sock', 'is_ip', 'ping',
+        'load_asn_table', 'resolve_ip', 'resolve_ip_async', 'resolve_ips', 'resolve_ips_async', 'resolve_ips_multi',
+        'resolve_ips_multi_async', 'send_data', 'send_data_async', 'set_resolver', 'sock_validate_ip', 'sock_ver',
+        'test_hosts',
+        'test_hosts_async', 'upload_termbin', 'upload_termbin_async', 'upload_termbin_file',
+        'upload_termbin_file_async',
+    ),
+    'cache': ('CacheAdapter', 'CacheWrapper', 'MemoryCache', 'cached'),
+    'plugin': (
+        'AsyncConnectionPool', 'ConnectionPool', 'HAS_ASYNC_MEMCACHED', 'HAS_ASYNC_REDIS', 'HAS_CRYPTO',
+        'HAS_DNSPYTHON', 'HAS_GEOIP', 'HAS_MEMCACHED', 'HAS_PRIVEX_DB', 'HAS_REDIS', 'HAS_SETUPPY_BUMP',
+        'HAS_SETUPPY_COMMANDS', 'HAS_SETUPPY_COMMON', 'clean_threadstore', 'close_geoip', 'close_memcached',
+        'close_memcached_async', 'close_pool', 'close_pool_async', 'close_redis', 'close_redis_async',
+        'configure_memcached', 'configure_memcached_async', 'configure_redis', 'configure_redis_async', 'connect_geoip',
+        'connect_memcached', 'connect_memcached_async', 'connect_redis', 'connect_redis_async', 'get_async_pool',
+        'get_geodbs', 'get_geoip', 'get_geoip_db', 'get_memcached', 'get_memcached_async', 'get_memcached_async_pool',
+        'get_memcached_pool', 'get_pool', 'get_redis', 'get_redis_async', 'get_redis_async_pool', 'get_redis_pool',
+        'prune_threadstore', 'reset_geoip', 'reset_memcached', 'reset_memcached_async', 'reset_redis',
+        'reset_redis_async',
+    ),
+    'cache.RedisCache': ('RedisCache',),
+    'cache.MemcachedCache': ('MemcachedCache',),
+    'cache.SqliteCache': ('SqliteCache',),
+    'cache.TieredCache': ('TieredCache',),
+    'cache.ShardedCache': ('ShardedCache',),
+    'cache.asyncx': (
+        'AsyncCacheAdapter', 'AsyncMemoryCache', 'AsyncShardedCache', 'AsyncSqliteCache', 'AsyncTieredCache',
+        'HAS_ASYNC_MEMORY', 'HAS_ASYNC_SHARDED', 'HAS_ASYNC_SQLITE', 'HAS_ASYNC_TIERED',
+    ),
+    'cache.extras': (
+        'ANY_LCK', 'CACHE_MGR', 'CacheManagerMixin', 'CacheSettings', 'NO_LOCK', 'fake_lock_manager', 'z_cache',
+    ),
+    'asyncx': (
+        'AWAITABLE_BLACKLIST', 'AWAITABLE_BLACKLIST_FUNCS', 'AWAITABLE_BLACKLIST_MODS', 'AWAITABLE_CHECK_BLACKLIST',
+        'AwaitableMixin', 'LoopRunner', 'LoopThread', 'aobject', 'awaitable', 'awaitable_class', 'call_sys_async',
+        'coro_thread_func', 'get_async_type', 'get_loop_runner', 'is_async_context', 'loop_run', 'run_coro_thread',
+        'run_coro_thread_async', 'run_coro_thread_base', 'run_sync',
+    ),
+    'crypto': ('EncryptHelper', 'Format', 'KeyManager', 'auto_b64decode', 'is_base64'),
+    'setuppy.common': ('extras_require', 'reqs'),
+    'setuppy.commands': ('BumpCommand', 'ExtrasCommand'),
+    'setuppy.bump': ('bump_version', 'get_current_ver'),
+    'extras': (
+        'AsyncGit', 'AttribDictable', 'Git', 'HAS_ATTRS', '_repo', 'get_current_branch', 'get_current_commit',
+        'get_current_tag',
+    ),
+    'converters': (
+        'CLEAN_OBJ_FALLBACK', 'CLEAN_OBJ_VALIDATORS', 'DAY', 'DECADE', 'DICT_TYPES', 'FLOAT_TYPES', 'HOUR',
+        'INTEGER_TYPES', 'LIST_TYPES', 'MINUTE', 'MONTH', 'NUMBER_TYPES', 'YEAR', 'clean_dict', 'clean_list',
+        'clean_obj', 'convert_bool_int', 'convert_datetime', 'convert_epoch_datetime', 'convert_int_bool',
+        'convert_unixtime_datetime', 'parse_date', 'parse_datetime', 'parse_epoch', 'parse_unixtime',
+    ),
+    'geoip': (
+        'GeoIPCache', 'GeoIPResult', 'cleanup_geoip', 'geoip_manager', 'geolocate_bulk', 'geolocate_bulk_async',
+        'geolocate_ip', 'geolocate_ips', 'get_geoip_cache', 'GeoIPPrefixCache', 'get_prefix_cache',
+    ),
+    'thread': (
+        'BetterEvent', 'InvertibleEvent', 'SafeLoopThread', 'StopperThread', 'event_multi_wait', 'event_multi_wait_all',
+        'event_multi_wait_any', 'lock_acquire_timeout',
+    ),
+}
+"""
+Maps each lazily loaded submodule (relative to ``privex.helpers``) to the names which are made available from the package
+root once it's imported. The order matches the order the submodules used to be imported eagerly, so when
+:func:`._load_all` imports everything, names which exist in multiple submodules resolve to the same object as before.
+"""
 
-try:
-    from privex.helpers.cache import CacheNotFound, CacheAdapter, CacheWrapper, MemoryCache, cached
-except ImportError as e:
-    log.warning(
-        'privex.helpers __init__ failed to import "%s", not loading %s module. reason: %s %s',
-        'privex.helpers.cache', 'cache', type(e), str(e)
-    )
-    # noinspection PyTypeChecker
-    CacheNotFound, CacheAdapter, CacheWrapper, MemoryCache, cached = _Dummy(), _Dummy(), _Dummy(), _Dummy(), _Dummy()
-
-
-try:
-    from privex.helpers import plugin
-    from privex.helpers.plugin import *
-except ImportError as e:
-    log.warning(
-        'privex.helpers __init__ failed to import "%s", not loading %s module. reason: %s %s',
-        'privex.helpers.plugin', 'plugin', type(e), str(e)
-    )
-    # noinspection PyTypeChecker
-    plugin = _Dummy()
-
-try:
-    from privex.helpers.cache.RedisCache import RedisCache
-    plugin.HAS_REDIS = True
-except ImportError:
-    log.debug('privex.helpers __init__ failed to import "RedisCache", not loading RedisCache')
-
-try:
-    from privex.helpers.cache.MemcachedCache import MemcachedCache
-    
-    plugin.HAS_MEMCACHED = True
-except ImportError:
-    log.debug('privex.helpers __init__ failed to import "MemcachedCache", not loading MemcachedCache')
-
-try:
-    from privex.helpers.cache.SqliteCache import SqliteCache
-except ImportError:
-    log.debug('privex.helpers __init__ failed to import "SqliteCache", not loading SqliteCache')
-
-try:
-    from privex.helpers.cache.asyncx import *
-except ImportError:
-    log.debug('privex.helpers __init__ failed to import "cache.asyncx.*", not loading async cache adapters')
-
-try:
-    from privex.helpers.cache.extras import *
-except ImportError:
-    log.exception("[%s] Failed to import %s from %s (unknown error!)", __name__, '*', f'privex.helpers.cache.extras')
-
-try:
-    from privex.helpers.asyncx import *
-except ImportError:
-    log.debug('privex.helpers __init__ failed to import "asyncx", not loading async helpers')
-
-try:
-    from privex.helpers.crypto import Format, KeyManager, EncryptHelper, auto_b64decode, is_base64
-    plugin.HAS_CRYPTO = True
-except ImportError:
-    log.debug('privex.helpers __init__ failed to import "crypto", not loading cryptography helpers')
-
-try:
-    from privex.helpers.setuppy.common import extras_require, reqs
-    plugin.HAS_SETUPPY_COMMON = True
-except ImportError:
-    log.debug('privex.helpers __init__ failed to import "setuppy.common", not loading packaging helpers')
-
-try:
-    from privex.helpers.setuppy.commands import BumpCommand, ExtrasCommand
-    plugin.HAS_SETUPPY_COMMANDS = True
-except ImportError:
-    log.debug('privex.helpers __init__ failed to import "setuppy.commands", not loading packaging helpers')
-
-try:
-    from privex.helpers.setuppy.bump import bump_version, get_current_ver
-    plugin.HAS_SETUPPY_BUMP = True
-except ImportError:
-    log.debug('privex.helpers __init__ failed to import "setuppy.bump", not loading packaging helpers')
-
-try:
-    from privex.helpers.extras import *
-except ImportError:
-    log.debug('privex.helpers __init__ failed to import "extras", cannot load any extras.* modules...')
-
-try:
-    from privex.helpers.converters import *
-except ImportError:
-    log.debug('privex.helpers __init__ failed to import "converter", cannot load any converter.* modules...')
-
-try:
-    from privex.helpers.geoip import *
-    
-    plugin.HAS_GEOIP = True
-except ImportError:
-    log.debug('privex.helpers __init__ failed to import "geoip", not loading GeoIP2 helpers')
+_STAR_MODULES = (
+    'collections', 'decorators', 'net', 'plugin', 'cache.asyncx', 'cache.extras', 'asyncx', 'extras', 'converters',
+    'geoip', 'thread',
+)
+"""Submodules which were previously ``import *``'d - :func:`._load_all` exports all of their public names, not just :attr:`._LAZY_ATTRS`"""
+
+_DUMMY_ON_FAIL = ('cache', 'plugin')
+"""If these submodules fail to import, their names are replaced with :class:`._Dummy` instances instead of being missing"""
+
+_PLUGIN_FLAGS = {
+    'crypto': 'HAS_CRYPTO', 'setuppy.common': 'HAS_SETUPPY_COMMON', 'setuppy.commands': 'HAS_SETUPPY_COMMANDS',
+    'setuppy.bump': 'HAS_SETUPPY_BUMP', 'geoip': 'HAS_GEOIP',
+}
+"""The ``HAS_X`` attribute on :py:mod:`.plugin` to set to ``True`` once the submodule has been successfully imported"""
+
+_ATTR_MODULES = {attr: mod for mod, attrs in _LAZY_ATTRS.items() for attr in attrs}
+"""Reverse index of :attr:`._LAZY_ATTRS` - maps each lazy name to the submodule it's imported from"""
+
+
+def _import_lazy(mod: str):
+    """
+    Import the submodule ``mod`` (relative to ``privex.helpers``), copy its :attr:`._LAZY_ATTRS` names into the package
+    globals, and return the module. Returns ``None`` if the submodule (or one of its dependencies) couldn't be imported.
+    """
+    try:
+        m = importlib.import_module(f'{__name__}.{mod}')
+    except ImportError as e:
+        log.debug('privex.helpers failed to import "%s.%s", not loading %s module. reason: %s %s', __name__, mod, mod, type(e), str(e))
+        if mod in _DUMMY_ON_FAIL:
+            # noinspection PyTypeChecker
+            globals().update({attr: _Dummy() for attr in _LAZY_ATTRS[mod]})
+            if mod == 'plugin': globals()['plugin'] = _Dummy()
+        return None
+    g = globals()
+    for attr in _LAZY_ATTRS[mod]:
+        if hasattr(m, attr): g[attr] = getattr(m, attr)
+    if mod in _PLUGIN_FLAGS:
+        from privex.helpers import plugin as _plugin
+        setattr(_plugin, _PLUGIN_FLAGS[mod], True)
+    return m
+
+
+def _load_all() -> list:
+    """
+    Import every lazily loaded submodule (in their original order), export all of their names into the package globals,
+    and return the resulting list of public names - which is used as ``__all__`` for ``from privex.helpers import *``
+    """
+    g = globals()
+    for mod in _LAZY_ATTRS.keys():
+        m = _import_lazy(mod)
+        if m is None or mod not in _STAR_MODULES:
+            continue
+        names = getattr(m, '__all__', None)
+        names = [n for n in dir(m) if not n.startswith('_')] if names is None else names
+        g.update({n: getattr(m, n) for n in names if hasattr(m, n) and n not in _EAGER_ATTRS})
+    return [n for n in g.keys() if not n.startswith('_') or n in _ATTR_MODULES]
+
+
+def __getattr__(name: str):
+    if name == '__all__':
+        return _load_all()
+    if name.startswith('__'):
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    g = globals()
+    if name in _ATTR_MODULES:
+        _import_lazy(_ATTR_MODULES[name])
+        if name in g: return g[name]
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}' (failed to import {__name__}.{_ATTR_MODULES[name]})")
+    # Submodules which haven't been imported yet, e.g. ``privex.helpers.net``
+    if not name.startswith('_') and importlib.util.find_spec(f'{__name__}.{name}') is not None:
+        try:
+            return importlib.import_module(f'{__name__}.{name}')
+        except ImportError as e:
+            raise AttributeError(f"module '{__name__}' has no attribute '{name}' (failed to import submodule: {e!s})")
+    # Unknown names must fail fast - importing every submodule here would make ``hasattr(helpers, 'x')`` extremely slow
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+
+def __dir__():
+    return sorted(set(_load_all()) | set(globals().keys()))
 
-try:
-    from privex.helpers.thread import *
-except ImportError:
-    log.debug('privex.helpers __init__ failed to import "thread", not loading python threading helpers')
+
+from privex.helpers.common import *
+from privex.helpers.exceptions import *
+
+_EAGER_ATTRS = frozenset(n for n in globals().keys() if not n.startswith('_'))
+"""Names imported eagerly from :py:mod:`.common` / :py:mod:`.exceptions`, which lazily loaded modules never override"""
 
 
 def _setup_logging(level=logging.WARNING):
@@ -242,7 +306,3 @@ name = 'helpers'
 from privex.helpers import version as _version_mod
 
 VERSION = _version_mod.VERSION
-
-
-
-
@@ -25,24 +25,33 @@ To avoid issues with the ``async`` keyword, this file is named ``asyncx`` instea
 
 """
 import asyncio
+import atexit
+import concurrent.futures
 import inspect
+import os
 import queue
+import sys
 import threading
 import warnings
+import weakref
 from asyncio.subprocess import PIPE, STDOUT
-from typing import Tuple, Callable, Any, Union, Coroutine, List, Type, Awaitable, Optional
+from types import CodeType, FrameType
+from typing import Dict, Tuple, Callable, Any, Union, Coroutine, List, Type, Awaitable, Optional
 
+from privex.helpers import settings
 from privex.helpers.common import byteify, shell_quote
-from privex.helpers.types import T, STRBYTES, NO_RESULT
+from privex.helpers.types import T, STRBYTES
 import logging
 
 log = logging.getLogger(__name__)
 
 
 __all__ = [
-    'awaitable', 'AWAITABLE_BLACKLIST_MODS', 'AWAITABLE_BLACKLIST', 'AWAITABLE_BLACKLIST_FUNCS', 'run_sync', 'aobject',
+    'awaitable', 'AWAITABLE_BLACKLIST_MODS', 'AWAITABLE_BLACKLIST', 'AWAITABLE_BLACKLIST_FUNCS', 'AWAITABLE_CHECK_BLACKLIST',
+    'run_sync', 'aobject',
     'call_sys_async', 'async_sync', 'awaitable_class', 'AwaitableMixin', 'loop_run', 'is_async_context', 'await_if_needed',
-    'get_async_type', 'run_coro_thread', 'run_coro_thread_async', 'run_coro_thread_base', 'coro_thread_func'
+    'get_async_type', 'run_coro_thread', 'run_coro_thread_async', 'run_coro_thread_base', 'coro_thread_func',
+    'LoopThread', 'LoopRunner', 'get_loop_runner',
 ]
 
 
@@ -69,6 +78,13 @@ def _is_coro(obj: Any) -> bool:
     return False
 
 
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
 _coro_thread_queue = queue.Queue()
 
 
@@ -131,6 +147,179 @@ def run_coro_thread_base(func: callable, *args, _daemon_thread=False, **kwargs)
     return t_co
 
 
+class LoopThread:
+    """
+    A long-lived daemon thread which owns a single AsyncIO event loop, running forever until :meth:`.stop` is called.
+    
+    Coroutines are handed to the loop with :meth:`.submit` (via :func:`asyncio.run_coroutine_threadsafe`), which returns
+    a :class:`concurrent.futures.Future` - so no thread or event loop is created per coroutine.
+    
+    You generally shouldn't need to use this class directly - see :class:`.LoopRunner` / :func:`.get_loop_runner`
+    """
+    def __init__(self, name: str = 'pvx-loop-runner'):
+        self.name = name
+        self.pending = 0
+        """Number of submitted coroutines which haven't finished yet (maintained by :class:`.LoopRunner`)"""
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self.thread.start()
+    
+    def _run(self):
+        loop = self.loop
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+        finally:
+            try:
+                tasks = asyncio.all_tasks(loop)
+                for t in tasks:
+                    t.cancel()
+                if tasks:
+                    loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+                loop.run_until_complete(loop.shutdown_asyncgens())
+            finally:
+                loop.close()
+    
+    @property
+    def is_alive(self) -> bool:
+        return self.thread.is_alive()
+    
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        """Schedule the coroutine ``coro`` on this thread's event loop, returning a :class:`concurrent.futures.Future`"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+    
+    def stop(self, timeout: Optional[float] = 5.0):
+        """Stop the event loop (cancelling any unfinished coroutines) and wait up to ``timeout`` seconds for the thread to exit"""
+        if self.is_alive:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join(timeout)
+    
+    def __repr__(self):
+        return f"<LoopThread name='{self.name}' alive={self.is_alive} pending={self.pending}>"
+
+
+class LoopRunner:
+    """
+    A small pool of :class:`.LoopThread` 's - long-lived threads which each own one event loop, used to run coroutines
+    from synchronous code (or on another thread from async code) without creating a new thread or event loop per call.
+    
+    Coroutines are sent to an idle loop thread (preferring the first one, so sequential callers always share the same loop).
+    If every loop thread is busy, a new one is started - up to ``max_threads`` - so coroutines which block their event loop
+    (e.g. calling blocking synchronous code) can still run in parallel, just like the old thread-per-call behaviour.
+    Once ``max_threads`` is reached, coroutines are queued on the least busy loop.
+    
+    Use the shared instance from :func:`.get_loop_runner`::
+    
+        >>> async def example(x): return x * 2
+        >>> get_loop_runner().run(example(5))
+        10
+        >>> fut = get_loop_runner().submit(example(10))    # concurrent.futures.Future
+        >>> fut.result()
+        20
+    
+    """
+    def __init__(self, max_threads: Optional[int] = None, name: str = 'pvx-loop-runner'):
+        """
+        :param int max_threads: Maximum number of loop threads (default: :attr:`.settings.ASYNC_LOOP_RUNNER_THREADS`)
+        :param str name: Name prefix for the loop threads
+        """
+        self.max_threads = settings.ASYNC_LOOP_RUNNER_THREADS if max_threads is None else max(int(max_threads), 1)
+        self.name = name
+        self.threads: List[LoopThread] = []
+        self._lock = threading.Lock()
+    
+    def current_thread(self) -> Optional[LoopThread]:
+        """Returns the :class:`.LoopThread` we're currently running inside of, or ``None`` if not called from a loop thread"""
+        cur = threading.current_thread()
+        for lt in self.threads:
+            if lt.thread is cur:
+                return lt
+        return None
+    
+    def _pick(self, exclude: Optional[LoopThread] = None) -> LoopThread:
+        self.threads = [lt for lt in self.threads if lt.is_alive]
+        candidates = [lt for lt in self.threads if lt is not exclude]
+        for lt in candidates:
+            if lt.pending == 0:
+                return lt
+        # Always start a new thread if the only other option would be the calling loop thread itself, to avoid deadlocks
+        if len(self.threads) < self.max_threads or not candidates:
+            lt = LoopThread(name=f'{self.name}-{len(self.threads)}')
+            self.threads.append(lt)
+            return lt
+        return min(candidates, key=lambda c: c.pending)
+    
+    def _done(self, lt: LoopThread, fut: concurrent.futures.Future):
+        with self._lock:
+            lt.pending -= 1
+    
+    def submit(self, coro: Coroutine, _exclude: Optional[LoopThread] = None) -> concurrent.futures.Future:
+        """
+        Schedule the coroutine ``coro`` on one of the loop threads, returning a :class:`concurrent.futures.Future`
+        for it's result. From async code, use :func:`asyncio.wrap_future` to ``await`` the returned future.
+        """
+        with self._lock:
+            lt = self._pick(_exclude)
+            lt.pending += 1
+        try:
+            fut = lt.submit(coro)
+        except BaseException:
+            with self._lock:
+                lt.pending -= 1
+            raise
+        fut.add_done_callback(lambda f: self._done(lt, f))
+        return fut
+    
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """
+        Run the coroutine ``coro`` on one of the loop threads, block until it's complete, and return it's result
+        (or raise the exception it raised).
+        
+        Safe to call from within a loop thread - the coroutine will be sent to a different loop thread.
+        """
+        return self.submit(coro, _exclude=self.current_thread()).result(timeout)
+    
+    def stop(self, timeout: Optional[float] = 5.0):
+        """Stop all loop threads. They'll be started again on demand by :meth:`.submit`"""
+        with self._lock:
+            threads, self.threads = self.threads, []
+        for lt in threads:
+            lt.stop(timeout)
+    
+    def __repr__(self):
+        return f"<LoopRunner name='{self.name}' threads={len(self.threads)} max_threads={self.max_threads}>"
+
+
+_loop_runner: Optional[LoopRunner] = None
+_loop_runner_lock = threading.Lock()
+
+
+def get_loop_runner() -> LoopRunner:
+    """Returns the shared :class:`.LoopRunner` instance, creating it on first use"""
+    global _loop_runner
+    if _loop_runner is None:
+        with _loop_runner_lock:
+            if _loop_runner is None:
+                _loop_runner = LoopRunner()
+    return _loop_runner
+
+
+def _stop_loop_runner():
+    if _loop_runner is not None:
+        _loop_runner.stop(timeout=1.0)
+
+
+def _reset_loop_runner():
+    # Threads don't survive a fork, so a forked child must start it's own loop threads
+    global _loop_runner, _loop_runner_lock
+    _loop_runner, _loop_runner_lock = None, threading.Lock()
+
+
+atexit.register(_stop_loop_runner)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_loop_runner)
+
+
 def run_coro_thread(func: callable, *args, **kwargs) -> Any:
     """
     Run a Python AsyncIO coroutine function within a new event loop using a thread, and return the result / raise any exceptions
@@ -138,8 +327,7 @@ def run_coro_thread(func: callable, *args, **kwargs) -> Any:
     
     
     .. Caution:: If you're wanting to run a coroutine within a thread from an AsyncIO function/method, then you should
-                 use :func:`.run_coro_thread_async` instead, which uses :func:`asyncio.sleep` while waiting for a result/exception
-                 to be transmitted via a queue.
+                 use :func:`.run_coro_thread_async` instead, which awaits the result/exception without blocking the event loop.
              
                  This allows you to run and wait for multiple coroutine threads simultaneously, as there's no synchronous blocking
                  wait - unlike this function.
@@ -164,32 +352,23 @@ def run_coro_thread(func: callable, *args, **kwargs) -> Any:
             if lorem > 100: raise AttributeError("lorem is greater than 100!")
         AttributeError: lorem is greater than 100!
     
-    Creates a new :class:`threading.Thread` with the target :func:`.coro_thread_func` (via :func:`.run_coro_thread_base`), passing
-    the coroutine ``func`` along with the passed positional ``args`` and keyword ``kwargs``, which creates a new event loop, and
-    then runs ``func`` within that thread event loop.
-    
-    Uses the private :class:`queue.Queue` threading queue :attr:`._coro_thread_queue` to safely relay back to the calling thread -
-    either the result from the coroutine, or an exception if one was raised while trying to run the coroutine.
+    The coroutine is ran on one of the long-lived event loop threads managed by :func:`.get_loop_runner` (see :class:`.LoopRunner`),
+    with the result or exception relayed back through a :class:`concurrent.futures.Future` - so no thread or event loop is
+    created per call. If you need a dedicated thread per coroutine, use :func:`.run_coro_thread_base` directly.
     
     :param callable func: A reference to the ``async def`` coroutine function that you want to run
     :param args:          Positional arguments to pass-through to the coroutine function
     :param kwargs:        Keyword arguments to pass-through to the coroutine function
     :return Any coro_res: The result returned from the coroutine ``func``
     """
-    t_co = run_coro_thread_base(func, *args, **kwargs, _output_queue=_coro_thread_queue)
-    t_co.join()
-    
-    res = _coro_thread_queue.get(block=True, timeout=10)
-    if isinstance(res, (Exception, BaseException)):
-        raise res
-    return res
+    return get_loop_runner().run(await_if_needed(func, *args, **kwargs))
 
 
 async def run_coro_thread_async(func: callable, *args, _queue_timeout=30.0, _queue_sleep=0.05, **kwargs) -> Any:
     """
-    AsyncIO version of :func:`.run_coro_thread` which uses :func:`asyncio.sleep` while waiting on a result from the queue,
-    allowing you to run multiple AsyncIO coroutines which call blocking synchronous code - simultaneously,
-    e.g. by using :func:`asyncio.gather`
+    AsyncIO version of :func:`.run_coro_thread` which awaits the result from the loop thread's future (delivered by a
+    done callback - no polling), allowing you to run multiple AsyncIO coroutines which call blocking synchronous code -
+    simultaneously, e.g. by using :func:`asyncio.gather`
     
     Below is an example of running an example coroutine ``hello`` which runs the synchronous blocking ``time.sleep``.
     Using :func:`.run_coro_thread_async` plus :func:`asyncio.gather` - we can run ``hello`` 4 times simultaneously,
@@ -212,29 +391,16 @@ async def run_coro_thread_async(func: callable, *args, _queue_timeout=30.0, _que
     :param kwargs:        Keyword arguments to pass-through to the coroutine function
     :param float|int _queue_timeout: (default: ``30``) Maximum amount of seconds to wait for a result or exception
                                      from ``func`` before giving up.
-    :param _queue_sleep: (default: ``0.05``) Amount of time to AsyncIO sleep between each check of the result queue
+    :param _queue_sleep: No longer used - the result is delivered by a future callback instead of polling a queue.
+                         Kept for backwards compatibility.
     :return Any coro_res: The result returned from the coroutine ``func``
     """
-    _queue_timeout, _queue_sleep = float(_queue_timeout), float(_queue_sleep)
-    thread_waited = 0.0
-    q = queue.Queue()
-    t_co = run_coro_thread_base(func, *args, **kwargs, _output_queue=q)
-    
-    res = NO_RESULT
-    while res == NO_RESULT:
-        if thread_waited >= _queue_timeout:
-            raise TimeoutError(f"No thread result after waiting {thread_waited} seconds...")
-        try:
-            _res = q.get_nowait()
-            if isinstance(_res, (Exception, BaseException)):
-                raise _res
-            res = _res
-        except queue.Empty:
-            thread_waited += _queue_sleep
-            await asyncio.sleep(_queue_sleep)
-    t_co.join(5)
-    
-    return res
+    _queue_timeout = float(_queue_timeout)
+    fut = get_loop_runner().submit(await_if_needed(func, *args, **kwargs))
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(fut), _queue_timeout)
+    except asyncio.TimeoutError:
+        raise TimeoutError(f"No thread result after waiting {_queue_timeout} seconds...")
 
 
 def run_sync(func, *args, **kwargs):
@@ -259,11 +425,7 @@ def run_sync(func, *args, **kwargs):
     :param args:          Positional arguments to pass to ``func``
     :param kwargs:        Keyword arguments to pass to ``func``
     """
-    coro = asyncio.coroutine(func)
-    future = coro(*args, **kwargs)
-    loop = asyncio.get_event_loop()
-    return loop.run_until_complete(future)
-    # return asyncio.run(future)
+    return loop_run(func, *args, **kwargs)
 
 
 def loop_run(coro: Union[Coroutine, Type[Coroutine], Callable], *args, _loop=None, **kwargs) -> Any:
@@ -305,6 +467,7 @@ def loop_run(coro: Union[Coroutine, Type[Coroutine], Callable], *args, _loop=Non
     :param coro:     A co-routine, or reference to an async function to be ran synchronously
     :param args:     Any positional arguments to pass to ``coro`` (if it's a function reference and not a coroutine)
     :param _loop:    (kwarg only!) If passed, will run ``coro`` in this event loop, instead of :func:`asyncio.get_event_loop`
+                     (or the shared :class:`.LoopRunner` when an event loop is already running in this thread)
     :param kwargs:   Any keyword arguments to pass to ``coro`` (if it's a function reference and not a coroutine)
     
     :type _loop: asyncio.base_events.BaseEventLoop
@@ -324,9 +487,14 @@ def loop_run(coro: Union[Coroutine, Type[Coroutine], Callable], *args, _loop=Non
         log.debug("'coro' object isn't callable. Returning original 'coro' object: %s", coro)
         return coro
     
-    loop = _loop
-    if loop is None: loop = asyncio.get_event_loop()
     if asyncio.iscoroutinefunction(coro): coro = coro(*args, **kwargs)
+    loop = _loop
+    if loop is None:
+        # An event loop is already running in this thread (e.g. a sync function called from async code), so it can't be
+        # re-entered - run the coroutine on a loop thread from the shared LoopRunner instead.
+        if _running_loop() is not None:
+            return get_loop_runner().run(coro)
+        loop = asyncio.get_event_loop()
     
     return loop.run_until_complete(coro)
 
@@ -527,27 +695,58 @@ def is_async_context() -> bool:
         return False
 
 
+AWAITABLE_CHECK_BLACKLIST: bool = True
+"""
+Set this to ``False`` to skip the caller blacklist checks (:attr:`.AWAITABLE_BLACKLIST` etc.) entirely, removing the
+stack frame lookup from every :func:`.awaitable` call. The checks are also skipped automatically while all three
+blacklists are empty.
+"""
+
+_CODE_NAMES: "weakref.WeakKeyDictionary[CodeType, Tuple[str, str]]" = weakref.WeakKeyDictionary()
+"""
+Memo of ``code object -> (module name, function name)`` used by :func:`._awaitable_blacklisted`. Weakly keyed, so entries
+are dropped along with their code object (e.g. dynamically created functions), instead of growing forever.
+"""
+
+
+def _frame_names(frame: FrameType) -> Tuple[str, str]:
+    """
+    Returns the ``(module_name, function_name)`` for a stack frame, memoized per code object - so repeat calls from
+    the same function only cost a dict lookup. Frames executed outside of a module (e.g. the REPL) report ``__main__``.
+    """
+    code = frame.f_code
+    names = _CODE_NAMES.get(code)
+    if names is None:
+        names = _CODE_NAMES[code] = (frame.f_globals.get('__name__') or '__main__', code.co_name)
+    return names
+
+
 def _awaitable_blacklisted(skip=3) -> bool:
     """
     Returns ``True`` if the caller of the function calling ``_awaitable_blacklisted`` is present in the awaitable
     blacklists such as :attr:`.AWAITABLE_BLACKLIST` - otherwise ``False`` if they're not blacklisted.
+    
+    Uses :func:`sys._getframe` to jump straight to the caller frame, with the caller's module / function name memoized
+    per code object, instead of building a full :func:`inspect.stack` (which reads source files) on every call.
 
     :param int skip: Scan the caller function this far up the stack
                      (2 = callee of _awaitable_blacklisted, 3 = callee of callee #2, 4 = callee of #3, 5 = callee of #4 etc.)
 
     :return bool is_blacklisted: ``True`` if the calling method/module/function is blacklisted, otherwise ``False``.
     """
+    if not AWAITABLE_CHECK_BLACKLIST or not (AWAITABLE_BLACKLIST or AWAITABLE_BLACKLIST_FUNCS or AWAITABLE_BLACKLIST_MODS):
+        return False
     try:
-        from privex.helpers.black_magic import calling_module, calling_function, caller_name
+        try:
+            # skip is relative to the old inspect.stack() based helpers, whose own frame was frame 0
+            frame = sys._getframe(skip - 1)
+        except ValueError:
+            return False
+        _mod, _func = _frame_names(frame)
         
-        # Exact module + function/method path match
-        if caller_name(skip=skip) in AWAITABLE_BLACKLIST:
-            return True
         # Plain function name match
-        if calling_function(skip=skip) in AWAITABLE_BLACKLIST_FUNCS:
+        if _func in AWAITABLE_BLACKLIST_FUNCS:
             return True
-        
-        _mod = calling_module(skip=skip)
         # Exact module path match
         if _mod in AWAITABLE_BLACKLIST_MODS:
             return True
@@ -555,9 +754,21 @@ def _awaitable_blacklisted(skip=3) -> bool:
         for _m in AWAITABLE_BLACKLIST_MODS:
             if _mod.startswith(_m + '.'):
                 return True
-    
+        
+        # Exact module + function/method path match
+        if AWAITABLE_BLACKLIST:
+            name = [_mod]
+            _self = frame.f_locals.get('self')
+            if _self is not None:
+                name.append(_self.__class__.__name__)
+            if _func != '<module>':
+                name.append(_func)
+            if '.'.join(name) in AWAITABLE_BLACKLIST:
+                return True
     except Exception:
         log.exception("Failed to check blacklist for awaitable function. Falling back to standard async sniffing.")
+    finally:
+        frame = None
     
     return False
 
@@ -716,6 +927,9 @@ def awaitable(func: Callable) -> Callable:
         >>> # Whenever the specific class method 'other.module.SomeClass.some_sync' calls an awaitable, it will always run synchronously.
         >>> asyncx.AWAITABLE_BLACKLIST += ['other.module.SomeClass.some_sync']
     
+    The blacklists are only checked when a coroutine would be returned in an async context, and are skipped entirely while
+    they're all empty. Set ``asyncx.AWAITABLE_CHECK_BLACKLIST = False`` to always skip them.
+    
     
     Original source: https://github.com/encode/httpx/issues/572#issuecomment-562179966
     
@@ -729,12 +943,12 @@ def awaitable(func: Callable) -> Callable:
         if not _is_coro(coroutine):
             return coroutine
 
-        # Always run the coroutine in an event loop if the caller function is blacklisted in the AWAITABLE_BLACKLIST* lists
-        if _awaitable_blacklisted():
+        # We're in async context, return the coroutine for await usage - unless the caller function is blacklisted
+        # in the AWAITABLE_BLACKLIST* lists, in which case we always run the coroutine in an event loop.
+        if is_async_context():
+            if not _awaitable_blacklisted():
+                return coroutine
             return asyncio.get_event_loop().run_until_complete(coroutine)
-            
-        if is_async_context():           # We're in async context, return the coroutine for await usage
-            return coroutine
         loop = asyncio.get_event_loop()  # Not in async context, run coroutine in event loop.
         return loop.run_until_complete(coroutine)
     
@@ -1,13 +1,17 @@
 import asyncio
 from abc import ABC, abstractmethod
-from typing import Any, Optional, Union, Coroutine, Awaitable
+from typing import Any, Dict, Iterable, Mapping, Optional, Union, Coroutine, Awaitable
 
 from privex.helpers.asyncx import await_if_needed
 from privex.helpers.common import empty_if
 
 from privex.helpers.exceptions import CacheNotFound
+from privex.helpers import settings
 from privex.helpers.settings import DEFAULT_CACHE_TIMEOUT
-from privex.helpers.types import VAL_FUNC_CORO
+from privex.helpers.cache.metrics import instrument
+from privex.helpers.types import VAL_FUNC_CORO, NO_RESULT
+from privex.helpers.cache.singleflight import single_flight as _single_flight, async_single_flight as _async_single_flight, \
+    flight_opts
 
 
 class CacheAdapter(ABC):
@@ -47,6 +51,8 @@ class CacheAdapter(ABC):
     def __init__(self, *args, enter_reconnect: Optional[bool] = None, exit_close: Optional[bool] = None, **kwargs):
         self.ins_enter_reconnect = empty_if(enter_reconnect, self.adapter_enter_reconnect)
         self.ins_exit_close = empty_if(exit_close, self.adapter_exit_close)
+        if settings.CACHE_METRICS:
+            instrument(self)
     
     @abstractmethod
     def get(self, key: str, default: Any = None, fail: bool = False) -> Any:
@@ -121,7 +127,96 @@ class CacheAdapter(ABC):
         """
         raise NotImplemented(f'{self.__class__.__name__} must implement .extend_timeout()')
 
-    def get_or_set(self, key: str, value: Union[Any, callable], timeout: int = DEFAULT_CACHE_TIMEOUT) -> Any:
+    def add(self, key: str, value: Any, timeout: Optional[int] = DEFAULT_CACHE_TIMEOUT) -> bool:
+        """
+        Set the cache key ``key`` to ``value`` **only if it doesn't already exist** (or has expired).
+        
+        This is used as the distributed lock primitive for single-flight stampede protection (see
+        :mod:`privex.helpers.cache.singleflight`). Adapters should override this with an atomic operation supported by
+        their backend (e.g. Redis ``SET NX``, memcached ``add``). The default implementation is a non-atomic
+        :meth:`.get` followed by :meth:`.set`.
+        
+        :param str key: The cache key (as a string) to set the value for, e.g. ``example:test``
+        :param Any value: The value to store in the cache key ``key``
+        :param int timeout: The amount of seconds to keep the data in cache. Pass ``None`` to disable expiration.
+        :return bool added: ``True`` if the key was set, ``False`` if it already existed
+        """
+        key = str(key)
+        if self.get(key, default=NO_RESULT) is not NO_RESULT:
+            return False
+        self.set(key, value, timeout=timeout)
+        return True
+
+    def remove_if(self, key: str, value: Any) -> bool:
+        """
+        Remove the cache key ``key`` **only if it's current value equals** ``value`` (compare-and-delete).
+        
+        This is used to release the distributed lock used by single-flight stampede protection, so that a lock which expired
+        and was then acquired by another process isn't removed by the previous owner. Adapters should override this with an
+        atomic operation supported by their backend (e.g. a Lua script for Redis, ``DELETE ... WHERE value = ?`` for SQLite).
+        The default implementation is a non-atomic :meth:`.get` followed by :meth:`.remove`.
+        
+        :param str key: The cache key (as a string) to remove, e.g. ``example:test``
+        :param Any value: The value ``key`` must contain for it to be removed
+        :return bool removed: ``True`` if the key was removed, ``False`` if it didn't exist or contained a different value
+        """
+        key = str(key)
+        if self.get(key, default=NO_RESULT) != value:
+            return False
+        return self.remove(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Retrieve multiple cache keys at once. Keys which don't exist / are expired are left out of the returned dict.
+        
+        The default implementation simply calls :meth:`.get` for each key - adapters for networked / on-disk
+        backends override this to fetch all keys in a single round trip / query.
+        
+        **Example**::
+        
+            >>> c = CacheAdapter()
+            >>> c.set_many({'hello': 'world', 'lorem': 'ipsum'})
+            >>> c.get_many(['hello', 'lorem', 'nonexistent'])
+            {'hello': 'world', 'lorem': 'ipsum'}
+        
+        :param Iterable[str] keys: An iterable (e.g. list / tuple / set) of cache keys to retrieve
+        :return Dict[str,Any] values: A dictionary mapping each found key to it's value
+        """
+        res = {}
+        for k in keys:
+            k = str(k)
+            v = self.get(k, default=NO_RESULT)
+            if v is not NO_RESULT:
+                res[k] = v
+        return res
+
+    def set_many(self, mapping: Mapping[str, Any], timeout: Optional[int] = DEFAULT_CACHE_TIMEOUT):
+        """
+        Set multiple cache keys at once, from the dictionary ``mapping`` (``{key: value}``), each expiring after
+        ``timeout`` seconds.
+        
+        The default implementation simply calls :meth:`.set` for each key - adapters for networked / on-disk
+        backends override this to store all keys in a single round trip / transaction.
+        
+        :param Mapping[str,Any] mapping: A dictionary mapping cache keys to the values to store
+        :param int timeout: The amount of seconds to keep the data in cache. Pass ``None`` to disable expiration.
+        """
+        for k, v in mapping.items():
+            self.set(str(k), v, timeout=timeout)
+
+    def remove_many(self, keys: Iterable[str]) -> int:
+        """
+        Remove multiple cache keys at once. Unlike :meth:`.remove`, this returns the number of keys which actually
+        existed and were removed.
+        
+        :param Iterable[str] keys: An iterable (e.g. list / tuple / set) of cache keys to remove
+        :return int removed: The number of keys which were removed
+        """
+        return len([k for k in keys if self.remove(k)])
+
+    def get_or_set(self, key: str, value: Union[Any, callable], timeout: int = DEFAULT_CACHE_TIMEOUT,
+                   single_flight: Optional[bool] = None, lock_timeout: Optional[float] = None,
+                   distributed_lock: Optional[bool] = None) -> Any:
         """
         Attempt to return the value of ``key`` in the cache. If ``key`` doesn't exist or is expired, then it will be
         set to ``value``, and ``value`` will be returned.
@@ -148,20 +243,43 @@ class CacheAdapter(ABC):
             >>> c.get('example')
             'hello example world'
 
+        **Stampede protection**
+        
+        Pass ``single_flight=True`` (or enable :attr:`.settings.CACHE_SINGLE_FLIGHT`) to ensure that when ``key`` is missing,
+        only one thread calls ``value`` at a time, while other threads requesting ``key`` wait for it's result.
+        With ``distributed_lock=True``, a lock key is also held in the cache backend (see :meth:`.add`) so that only one
+        process sharing the cache computes the value. See :mod:`privex.helpers.cache.singleflight`
+        
         :param str key: The cache key (as a string) to get/set the value for, e.g. ``example:test``
         :param Any value: The value to store in the cache key ``key``. Can be a standard type, or a callable function.
         :param int timeout: The amount of seconds to keep the data in cache. Pass ``None`` to disable expiration.
+        :param bool single_flight: Only compute ``value`` once at a time per key (default: :attr:`.CACHE_SINGLE_FLIGHT`)
+        :param float lock_timeout: Max seconds to wait for another caller's computation (default: :attr:`.CACHE_LOCK_TIMEOUT`)
+        :param bool distributed_lock: Hold a lock in the cache backend while computing (default: :attr:`.CACHE_DISTRIBUTED_LOCK`)
         :return Any value: The value of the cache key ``key``, or ``value`` if it wasn't found.
         """
-        key, timeout = str(key), int(timeout)
+        key, timeout = str(key), None if timeout is None else int(timeout)
         try:
-            k = self.get(key, fail=True)
+            return self.get(key, fail=True)
         except CacheNotFound:
+            pass
+        
+        def _compute():
             k = value(key) if callable(value) else value
             self.set(key=key, value=k, timeout=timeout)
-        return k
+            return k
+        
+        single_flight, lock_timeout, distributed_lock = flight_opts(single_flight, lock_timeout, distributed_lock)
+        if not single_flight:
+            return _compute()
+        return _single_flight(
+            key, lambda: self.get(key, default=NO_RESULT), _compute, adapter=self,
+            lock_timeout=lock_timeout, distributed=distributed_lock
+        )
 
-    async def get_or_set_async(self, key: str, value: VAL_FUNC_CORO, timeout: int = DEFAULT_CACHE_TIMEOUT) -> Any:
+    async def get_or_set_async(self, key: str, value: VAL_FUNC_CORO, timeout: int = DEFAULT_CACHE_TIMEOUT,
+                               single_flight: Optional[bool] = None, lock_timeout: Optional[float] = None,
+                               distributed_lock: Optional[bool] = None) -> Any:
         """
         Async coroutine compatible version of :meth:`.get_or_set`.
         
@@ -186,12 +304,18 @@ class CacheAdapter(ABC):
         :param Any value: The value to store in the cache key ``key``. Can be a standard type, a coroutine / awaitable,
                           or a plain callable function.
         :param int timeout: The amount of seconds to keep the data in cache. Pass ``None`` to disable expiration.
+        :param bool single_flight: Only compute ``value`` once at a time per key, per event loop (see :meth:`.get_or_set`)
+        :param float lock_timeout: Max seconds to wait for another caller's computation (default: :attr:`.CACHE_LOCK_TIMEOUT`)
+        :param bool distributed_lock: Hold a lock in the cache backend while computing (default: :attr:`.CACHE_DISTRIBUTED_LOCK`)
         :return Any value: The value of the cache key ``key``, or ``value`` if it wasn't found.
         """
-        key, timeout = str(key), int(timeout)
+        key, timeout = str(key), None if timeout is None else int(timeout)
         try:
-            k = self.get(key, fail=True)
+            return self.get(key, fail=True)
         except CacheNotFound:
+            pass
+        
+        async def _compute():
             k = value
             if asyncio.iscoroutinefunction(value):
                 k = await value(key)
@@ -200,7 +324,15 @@ class CacheAdapter(ABC):
             elif callable(value):
                 k = value(key)
             self.set(key=key, value=k, timeout=timeout)
-        return k
+            return k
+        
+        single_flight, lock_timeout, distributed_lock = flight_opts(single_flight, lock_timeout, distributed_lock)
+        if not single_flight:
+            return await _compute()
+        return await _async_single_flight(
+            key, lambda: self.get(key, default=NO_RESULT), _compute, adapter=self,
+            lock_timeout=lock_timeout, distributed=distributed_lock
+        )
 
     def close(self, *args, **kwargs) -> Any:
         """
@@ -1,18 +1,20 @@
-import pickle
-from typing import Any, Union, Optional
-from privex.helpers.common import empty, stringify
+from typing import Any, Dict, Iterable, Mapping, Union, Optional
+from privex.helpers.common import stringify
 from privex.helpers.exceptions import CacheNotFound
+from privex.helpers import settings
 from privex.helpers.settings import DEFAULT_CACHE_TIMEOUT
-from privex.helpers.plugin import close_memcached, get_memcached
+from privex.helpers.plugin import close_memcached, get_memcached, get_memcached_pool, ConnectionPool
 import pylibmc
 import logging
 
 from privex.helpers.cache.CacheAdapter import CacheAdapter
+from privex.helpers.cache.pooling import PooledClientMixin
+from privex.helpers.cache.serializers import SerializerMixin
 
 log = logging.getLogger(__name__)
 
 
-class MemcachedCache(CacheAdapter):
+class MemcachedCache(SerializerMixin, PooledClientMixin, CacheAdapter):
     """
     A Memcached backed implementation of :class:`.CacheAdapter`. Uses the global Memcached instance from
     :py:mod:`privex.helpers.plugin` by default, however custom Memcached instances can be passed in via
@@ -78,9 +80,17 @@ class MemcachedCache(CacheAdapter):
     adapter_enter_reconnect: bool = True
     adapter_exit_close: bool = True
 
+    pooled: bool
+    """
+    If ``True``, this adapter borrows a Memcached client from the shared connection pool (:func:`.get_memcached_pool`) for each
+    operation, or for the whole of a ``with`` block, and then returns it to the pool (see :mod:`privex.helpers.cache.pooling`).
+    Defaults to :attr:`.settings.CACHE_POOL_ENABLED` - always ``False`` when ``mcache_instance`` is passed.
+    """
+
     _mcache: Optional[pylibmc.Client]
     
-    def __init__(self, use_pickle: bool = None, mcache_instance: pylibmc.Client = None, *args, **kwargs):
+    def __init__(self, use_pickle: bool = None, mcache_instance: pylibmc.Client = None, *args, serializer=None, pooled: bool = None,
+                 **kwargs):
         """
         MemcachedCache by default uses the global Memcached instance from :py:mod:`privex.helpers.plugin`.
 
@@ -92,10 +102,17 @@ class MemcachedCache(CacheAdapter):
 
         :param bool use_pickle: (Default: ``True``) Use the built-in ``pickle`` to serialise values before
                                 storing in Memcached, and un-serialise when loading from Memcached
+        
+        :param str|CacheSerializer serializer: (Default: :attr:`.settings.CACHE_SERIALIZER`) The serializer used when
+                                               ``use_pickle`` is ``True`` - a name such as ``'msgpack'`` / ``'orjson'``,
+                                               or a :class:`.CacheSerializer` (see :mod:`privex.helpers.cache.serializers`)
 
         :param pylibmc.Client mcache_instance: If this isn't ``None`` / ``False``, then this Memcached instance will be
                                                  used instead of the global one from :py:func:`.get_memcached`
         
+        :param bool pooled: (Default: :attr:`.settings.CACHE_POOL_ENABLED`) Borrow the Memcached client from the shared
+                            connection pool (:func:`.get_memcached_pool`) instead of cloning the global instance
+        
         :keyword bool enter_reconnect: Pass ``enter_reconnect=False`` to disable calling :meth:`.reconnect` when entering this cache
                                        adapter as a context manager (:meth:`.__aenter__`)
         :keyword bool exit_close: Pass ``exit_close=False`` to disable calling :meth:`.close` when exiting this cache
@@ -103,7 +120,8 @@ class MemcachedCache(CacheAdapter):
         """
         super().__init__(*args, **kwargs)
         self._mcache = None if not mcache_instance else mcache_instance
-        self.use_pickle = self.pickle_default if use_pickle is None else use_pickle
+        self._init_pool(False if mcache_instance else (settings.CACHE_POOL_ENABLED if pooled is None else pooled))
+        self._init_serializer(use_pickle, serializer)
     
     @property
     def mcache(self) -> pylibmc.Client:
@@ -111,42 +129,80 @@ class MemcachedCache(CacheAdapter):
     
     def get(self, key: Union[bytes, str], default: Any = None, fail: bool = False) -> Any:
         key = str(stringify(key))
-        res = self.mcache.get(key)
-        if empty(res):
+        with self._client() as mc:
+            res = mc.get(key)
+        if res is None:
             if fail: raise CacheNotFound(f'Cache key "{key}" was not found.')
             return default
-        return pickle.loads(res) if self.use_pickle else res
+        return self._loads(res)
     
     def set(self, key: Union[bytes, str], value: Any, timeout: Optional[int] = DEFAULT_CACHE_TIMEOUT):
-        v = pickle.dumps(value) if self.use_pickle else value
-        return self.mcache.set(str(stringify(key)), v, timeout)
+        v = self._dumps(value)
+        with self._client() as mc:
+            return mc.set(str(stringify(key)), v, timeout)
     
     def remove(self, *key: Union[bytes, str]) -> bool:
         removed = 0
-        for k in key:
-            k = str(stringify(k))
-            try:
-                self.get(k, fail=True)
-                self.mcache.delete(k)
-                removed += 1
-            except CacheNotFound:
-                pass
-        
+        with self._client() as mc:
+            for k in key:
+                # pylibmc's delete returns True only if the key existed, so there's no need to GET each key first.
+                if mc.delete(str(stringify(k))):
+                    removed += 1
         return removed == len(key)
     
+    def add(self, key: Union[bytes, str], value: Any, timeout: Optional[int] = DEFAULT_CACHE_TIMEOUT) -> bool:
+        v = self._dumps(value)
+        with self._client() as mc:
+            return bool(mc.add(str(stringify(key)), v, time=0 if timeout is None else int(timeout)))
+
+    def get_many(self, keys: Iterable[Union[bytes, str]]) -> Dict[str, Any]:
+        keys = [str(stringify(k)) for k in keys]
+        if len(keys) == 0:
+            return {}
+        with self._client() as mc:
+            res = mc.get_multi(keys)
+        return {k: self._loads(v) for k, v in res.items()}
+
+    def set_many(self, mapping: Mapping[Union[bytes, str], Any], timeout: Optional[int] = DEFAULT_CACHE_TIMEOUT):
+        data = {str(stringify(k)): self._dumps(v) for k, v in mapping.items()}
+        if len(data) == 0:
+            return []
+        # set_multi returns the list of keys which failed to be stored
+        with self._client() as mc:
+            return mc.set_multi(data, time=0 if timeout is None else int(timeout))
+
+    def remove_many(self, keys: Iterable[Union[bytes, str]]) -> int:
+        keys = [str(stringify(k)) for k in keys]
+        if len(keys) == 0:
+            return 0
+        # pylibmc's delete_multi only reports overall success, so we use a single get_multi to find the keys which exist
+        with self._client() as mc:
+            found = list(mc.get_multi(keys).keys())
+            if len(found) > 0:
+                mc.delete_multi(found)
+        return len(found)
+
     def update_timeout(self, key: str, timeout: int = DEFAULT_CACHE_TIMEOUT) -> Any:
         key, timeout = str(key), int(timeout)
         v = self.get(key=key, fail=True)
         self.set(key=key, value=v, timeout=timeout)
         return v
 
+    def _get_pool(self) -> ConnectionPool:
+        return get_memcached_pool()
+
     def connect(self, *args, new_connection=True, **kwargs) -> pylibmc.Client:
+        if self.pooled:
+            return self._pooled_connect()
         # To be safe, we use .clone() to obtain a new memcached instance for every instance of this cache class.
         if not self._mcache:
             self._mcache = get_memcached(*args, new_connection=new_connection, **kwargs).clone()
         return self._mcache
 
     def close(self):
+        if self.pooled:
+            self._give_back(release_all=True)
+            return True
         if self._mcache is not None:
             log.debug("Closing Memcached instance %s._mcache", self.__class__.__name__)
             self._mcache.disconnect_all()
@@ -1,10 +1,12 @@
 import logging
-from datetime import datetime, timedelta
-from typing import Any, Optional, Union
+from typing import Any, Optional
 
+from privex.helpers import settings
 from privex.helpers.exceptions import CacheNotFound
 from privex.helpers.settings import DEFAULT_CACHE_TIMEOUT
 from privex.helpers.cache.CacheAdapter import CacheAdapter
+from privex.helpers.cache.memstore import MemoryStore
+from privex.helpers.collections import DictObject
 
 log = logging.getLogger(__name__)
 
@@ -12,11 +14,17 @@ log = logging.getLogger(__name__)
 class MemoryCache(CacheAdapter):
     """
     A very basic cache adapter which implements :class:`.CacheAdapter` - stores the cache in memory using
-    the static attribute :py:attr:`.__CACHE`
+    a :class:`.MemoryStore`.
+    
+    By default, all instances share a single store (see :meth:`.shared_store`), which is bounded by the settings
+    :attr:`.MEMORY_CACHE_MAX_ENTRIES` / :attr:`.MEMORY_CACHE_MAX_BYTES` / :attr:`.MEMORY_CACHE_EVICTION`
+    (unbounded by default). Passing ``max_entries``, ``max_bytes`` or ``eviction`` to the constructor gives that instance
+    its own private store instead.
     
     As the cache is simply stored in memory, any python object can be cached without needing any form of serialization.
     
-    Fully supports cache expiration.
+    Fully supports cache expiration (including ``timeout=None`` for keys which never expire) - expired keys are reclaimed via an expiry index each time a key is set, rather
+    than only when the expired key is requested.
     
     **Basic Usage**::
         
@@ -29,55 +37,84 @@ class MemoryCache(CacheAdapter):
         >>> c.get('test:example', 'NOT FOUND')
         'NOT FOUND'
     
-    """
-    __CACHE = {}
+    **Bounded cache with its own store**::
+    
+        >>> c = MemoryCache(max_entries=10000, eviction='tinylfu')
+        >>> c.stats()
+        {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'rejections': 0, 'entries': 0, ...}
     
+    """
+    _shared_store: Optional[MemoryStore] = None
+
+    def __init__(self, *args, max_entries: Optional[int] = None, max_bytes: Optional[int] = None,
+                 eviction: Optional[str] = None, store: Optional[MemoryStore] = None, **kwargs):
+        """
+        :param int max_entries: Give this instance a private store, limited to this many keys
+        :param int max_bytes: Give this instance a private store, limited to approx. this many bytes of keys + values
+        :param str eviction: Eviction policy for a private store (``lru`` / ``lfu`` / ``tinylfu``)
+        :param MemoryStore store: Use this specific :class:`.MemoryStore` instance instead of the shared store
+        """
+        super().__init__(*args, **kwargs)
+        if store is None and any(x is not None for x in [max_entries, max_bytes, eviction]):
+            store = MemoryStore(
+                max_entries=max_entries, max_bytes=max_bytes, eviction=eviction or settings.MEMORY_CACHE_EVICTION
+            )
+        self._store = store
+
+    @staticmethod
+    def shared_store() -> MemoryStore:
+        """
+        Return the :class:`.MemoryStore` shared by all :class:`.MemoryCache` instances which weren't given their
+        own store, creating it from the ``MEMORY_CACHE_*`` settings on first use.
+        """
+        if MemoryCache._shared_store is None:
+            MemoryCache._shared_store = MemoryStore(
+                max_entries=settings.MEMORY_CACHE_MAX_ENTRIES, max_bytes=settings.MEMORY_CACHE_MAX_BYTES,
+                eviction=settings.MEMORY_CACHE_EVICTION
+            )
+        return MemoryCache._shared_store
+
+    @property
+    def store(self) -> MemoryStore:
+        return self.shared_store() if self._store is None else self._store
+
+    def stats(self) -> DictObject:
+        """Return the hit / miss / eviction / expiry counters for this instance's store - see :meth:`.MemoryStore.stats`"""
+        return self.store.stats()
+
     def get(self, key: str, default: Any = None, fail: bool = False) -> Any:
         key = str(key)
-        c = self.__CACHE
-        if key in c:
-            log.debug('Cache key "%s" found in __CACHE. Checking expiry...', key)
-            vc = c[key]
-            if str(vc['timeout']) != 'never' and vc['timeout'] < datetime.utcnow():
-                log.debug('Cache key "%s" has expired. Removing from cache.')
-                del c[key]
-                if fail:
-                    raise CacheNotFound(f'Cache key "{key}" was expired.')
-                return default
+        vc = self.store.get_entry(key)
+        if vc is not None:
             log.debug('Cache key "%s" is valid and not expired. Returning value "%s"', key, vc)
-            return vc['value']
+            return vc.value
         if fail:
-            raise CacheNotFound(f'Cache key "{key}" was not found.')
-        log.debug('Cache key "%s" was not found in __CACHE. Returning default value.', key)
+            raise CacheNotFound(f'Cache key "{key}" was not found or has expired.')
+        log.debug('Cache key "%s" was not found in the store (or expired). Returning default value.', key)
         return default
 
     def set(self, key: str, value: Any, timeout: Optional[int] = DEFAULT_CACHE_TIMEOUT):
-        key, timeout = str(key), int(timeout)
-        c = self.__CACHE
+        key, timeout = str(key), None if timeout is None else int(timeout)
         log.debug('Setting cache key "%s" to value "%s" with timeout %s', key, value, timeout)
-        c[key] = dict(value=value, timeout=datetime.utcnow() + timedelta(seconds=timeout))
-        return c[key]
+        return self.store.set(key, value, timeout)
+
+    def add(self, key: str, value: Any, timeout: Optional[int] = DEFAULT_CACHE_TIMEOUT) -> bool:
+        key, timeout = str(key), None if timeout is None else int(timeout)
+        return self.store.add(key, value, timeout)
+
+    def remove_if(self, key: str, value: Any) -> bool:
+        return self.store.delete_if(str(key), value)
 
-    def get_or_set(self, key: str, value: Union[Any, callable], timeout: int = DEFAULT_CACHE_TIMEOUT) -> Any:
-        key, timeout = str(key), int(timeout)
-        try:
-            k = self.get(key, fail=True)
-        except CacheNotFound:
-            k = value(key) if callable(value) else value
-            self.set(key=key, value=k, timeout=timeout)
-        return k
-    
     def remove(self, *key: str) -> bool:
         removed = 0
         for k in key:
-            k = str(k)
-            if k in self.__CACHE:
-                del self.__CACHE[k]
+            if self.store.delete(str(k)):
                 removed += 1
         return removed == len(key)
 
     def update_timeout(self, key: str, timeout: int = DEFAULT_CACHE_TIMEOUT) -> Any:
-        key, timeout = str(key), int(timeout)
-        v = self.get(key=key, fail=True)
-        self.__CACHE[key]['timeout'] = datetime.utcnow() + timedelta(seconds=timeout)
-        return v
+        key, timeout = str(key), None if timeout is None else int(timeout)
+        vc = self.store.touch(key, timeout)
+        if vc is None:
+            raise CacheNotFound(f'Cache key "{key}" was not found or has expired.')
+        return vc.value
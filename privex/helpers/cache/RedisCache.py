@@ -1,9 +1,9 @@
-import pickle
-from typing import Any, Union, Optional
-from privex.helpers.common import empty
+from typing import Any, Dict, Iterable, Mapping, Union, Optional
 
-from privex.helpers import plugin
+from privex.helpers import plugin, settings
 from privex.helpers.cache.CacheAdapter import CacheAdapter
+from privex.helpers.cache.pooling import PooledClientMixin
+from privex.helpers.cache.serializers import SerializerMixin
 from privex.helpers.exceptions import CacheNotFound
 from privex.helpers.settings import DEFAULT_CACHE_TIMEOUT
 import logging
@@ -12,11 +12,11 @@ log = logging.getLogger(__name__)
 
 
 if plugin.HAS_REDIS:
-    from privex.helpers.plugin import get_redis, close_redis
+    from privex.helpers.plugin import get_redis, close_redis, get_redis_pool, ConnectionPool
     from redis import Redis
     import redis
     
-    class RedisCache(CacheAdapter):
+    class RedisCache(SerializerMixin, PooledClientMixin, CacheAdapter):
         """
         A Redis backed implementation of :class:`.CacheAdapter`. Uses the global Redis instance from
         :py:mod:`privex.helpers.plugin` by default, however custom Redis instances can be passed in via
@@ -79,9 +79,17 @@ if plugin.HAS_REDIS:
         as ``dict`` and ``Decimal`` before insertion, and un-serialise after retrieval).
         """
         
+        pooled: bool
+        """
+        If ``True``, this adapter borrows a Redis client from the shared connection pool (:func:`.get_redis_pool`) for each
+        operation, or for the whole of a ``with`` block, and then returns it to the pool (see :mod:`privex.helpers.cache.pooling`).
+        Defaults to :attr:`.settings.CACHE_POOL_ENABLED` - always ``False`` when ``redis_instance`` is passed.
+        """
+        
         _redis: Optional[Redis]
         
-        def __init__(self, use_pickle: bool = None, redis_instance: Redis = None, *args, **kwargs):
+        def __init__(self, use_pickle: bool = None, redis_instance: Redis = None, *args, serializer=None, pooled: bool = None,
+                     **kwargs):
             """
             RedisCache by default uses the global Redis instance from :py:mod:`privex.helpers.plugin`.
             
@@ -94,13 +102,24 @@ if plugin.HAS_REDIS:
             :param bool use_pickle: (Default: ``True``) Use the built-in ``pickle`` to serialise values before
                                     storing in Redis, and un-serialise when loading from Redis
             
+            :param str|CacheSerializer serializer: (Default: :attr:`.settings.CACHE_SERIALIZER`) The serializer used when
+                                                   ``use_pickle`` is ``True`` - a name such as ``'msgpack'`` / ``'orjson'``,
+                                                   or a :class:`.CacheSerializer` (see :mod:`privex.helpers.cache.serializers`)
+            
             :param redis.Redis redis_instance: If this isn't ``None`` / ``False``, then this Redis instance will be
                                                used instead of the global one from :py:func:`.get_redis`
             
+            :param bool pooled: (Default: :attr:`.settings.CACHE_POOL_ENABLED`) Borrow the Redis client from the shared
+                                connection pool (:func:`.get_redis_pool`) instead of using the per-thread global instance
+            
             """
             super().__init__(*args, **kwargs)
-            self._redis = get_redis() if not redis_instance else redis_instance
-            self.use_pickle = self.pickle_default if use_pickle is None else use_pickle
+            self._init_pool(False if redis_instance else (settings.CACHE_POOL_ENABLED if pooled is None else pooled))
+            if redis_instance:
+                self._redis = redis_instance
+            else:
+                self._redis = None if self.pooled else get_redis()
+            self._init_serializer(use_pickle, serializer)
         
         @property
         def redis(self) -> Redis:
@@ -108,28 +127,67 @@ if plugin.HAS_REDIS:
         
         def get(self, key: str, default: Any = None, fail: bool = False) -> Any:
             key = str(key)
-            res = self.redis.get(key)
-            if empty(res):
+            with self._client() as r:
+                res = r.get(key)
+            if res is None:
                 if fail: raise CacheNotFound(f'Cache key "{key}" was not found.')
                 return default
-            return pickle.loads(res) if self.use_pickle else res
+            return self._loads(res)
 
         def set(self, key: str, value: Any, timeout: Optional[int] = DEFAULT_CACHE_TIMEOUT):
-            v = pickle.dumps(value) if self.use_pickle else value
-            return self.redis.set(str(key), v, ex=timeout)
+            v = self._dumps(value)
+            with self._client() as r:
+                return r.set(str(key), v, ex=timeout)
 
         def remove(self, *key: str) -> bool:
-            removed = 0
-            for k in key:
-                k = str(k)
-                try:
-                    self.get(k, fail=True)
-                    self.redis.delete(k)
-                    removed += 1
-                except CacheNotFound:
-                    pass
-
-            return removed == len(key)
+            if len(key) == 0:
+                return True
+            # DEL returns the number of keys which existed and were deleted, so there's no need to GET each key first.
+            with self._client() as r:
+                return r.delete(*[str(k) for k in key]) == len(key)
+
+        def add(self, key: str, value: Any, timeout: Optional[int] = DEFAULT_CACHE_TIMEOUT) -> bool:
+            v = self._dumps(value)
+            # SET NX only sets the key if it doesn't exist - returning None instead of True if it already existed
+            with self._client() as r:
+                return bool(r.set(str(key), v, nx=True, px=int(timeout * 1000) if timeout else None))
+
+        REMOVE_IF_SCRIPT = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) else return 0 end"
+        """Lua script used by :meth:`.remove_if` - Redis runs scripts atomically, so nothing can change the key between GET and DEL"""
+
+        def remove_if(self, key: str, value: Any) -> bool:
+            with self._client() as r:
+                return bool(r.eval(self.REMOVE_IF_SCRIPT, 1, str(key), self._dumps(value)))
+
+        def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+            keys = [str(k) for k in keys]
+            if len(keys) == 0:
+                return {}
+            res = {}
+            with self._client() as r:
+                values = r.mget(keys)
+            for k, v in zip(keys, values):
+                if v is None:
+                    continue
+                res[k] = self._loads(v)
+            return res
+
+        def set_many(self, mapping: Mapping[str, Any], timeout: Optional[int] = DEFAULT_CACHE_TIMEOUT):
+            if len(mapping) == 0:
+                return []
+            # A non-transactional pipeline sends every SET in a single round trip
+            with self._client() as r:
+                pipe = r.pipeline(transaction=False)
+                for k, v in mapping.items():
+                    pipe.set(str(k), self._dumps(v), ex=timeout)
+                return pipe.execute()
+
+        def remove_many(self, keys: Iterable[str]) -> int:
+            keys = [str(k) for k in keys]
+            if len(keys) == 0:
+                return 0
+            with self._client() as r:
+                return r.delete(*keys)
 
         def update_timeout(self, key: str, timeout: int = DEFAULT_CACHE_TIMEOUT) -> Any:
             key, timeout = str(key), int(timeout)
@@ -137,12 +195,20 @@ if plugin.HAS_REDIS:
             self.set(key=key, value=v, timeout=timeout)
             return v
 
+        def _get_pool(self) -> ConnectionPool:
+            return get_redis_pool()
+
         def connect(self, *args, **kwargs) -> Redis:
+            if self.pooled:
+                return self._pooled_connect()
             if not self._redis:
                 self._redis = get_redis()
             return self._redis
 
         def close(self):
+            if self.pooled:
+                self._give_back(release_all=True)
+                return True
             if self._redis is not None:
                 log.debug("Closing Synchronous Redis instance %s._redis", self.__class__.__name__)
                 self._redis.close()
@@ -0,0 +1,333 @@
+import bisect
+import hashlib
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Generator, Iterable, List, Mapping, Optional, Union
+from urllib.parse import urlparse
+
+from privex.helpers import settings
+from privex.helpers.exceptions import CacheNotFound
+from privex.helpers.settings import DEFAULT_CACHE_TIMEOUT
+from privex.helpers.cache.CacheAdapter import CacheAdapter
+from privex.helpers.types import NO_RESULT
+
+log = logging.getLogger(__name__)
+
+
+class HashRing:
+    """
+    A consistent hash ring, mapping keys to node names. Each node is placed on the ring ``vnodes`` times (virtual nodes),
+    and a key belongs to the first node found clockwise from the key's position. Adding / removing a node only moves
+    the keys between it and it's neighbours, instead of re-distributing every key.
+
+        >>> ring = HashRing(['redis-a', 'redis-b', 'redis-c'])
+        >>> ring.get_node('hello')
+        'redis-a'
+        >>> list(ring.iter_nodes('hello'))     # Every node, in the order they'd be tried for failover
+        ['redis-a', 'redis-c', 'redis-b']
+
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), vnodes: Optional[int] = None):
+        self.vnodes = int(settings.SHARDED_CACHE_VNODES if vnodes is None else vnodes)
+        self.nodes: List[str] = []
+        self._points: List[int] = []
+        self._owners: List[str] = []
+        for n in nodes:
+            self.add_node(n)
+
+    @staticmethod
+    def hash(value: str) -> int:
+        return int.from_bytes(hashlib.blake2b(value.encode('utf-8', 'surrogatepass'), digest_size=8).digest(), 'big')
+
+    def _rebuild(self):
+        ring = sorted((self.hash(f"{n}#{i}"), n) for n in self.nodes for i in range(self.vnodes))
+        self._points, self._owners = [p for p, _ in ring], [n for _, n in ring]
+
+    def add_node(self, name: str):
+        if name not in self.nodes:
+            self.nodes.append(name)
+            self._rebuild()
+
+    def remove_node(self, name: str):
+        if name in self.nodes:
+            self.nodes.remove(name)
+            self._rebuild()
+
+    def get_node(self, key: str) -> str:
+        """Return the name of the node which owns ``key``"""
+        if not self._points:
+            raise KeyError("HashRing has no nodes.")
+        i = bisect.bisect(self._points, self.hash(key))
+        return self._owners[i % len(self._owners)]
+
+    def iter_nodes(self, key: str) -> Generator[str, None, None]:
+        """Yield each distinct node clockwise from ``key``, starting with the node which owns it"""
+        if not self._points:
+            return
+        seen, total, start = set(), len(self._owners), bisect.bisect(self._points, self.hash(key))
+        for i in range(total):
+            n = self._owners[(start + i) % total]
+            if n not in seen:
+                seen.add(n)
+                yield n
+                if len(seen) == len(self.nodes):
+                    return
+
+
+def _url_name(url: str) -> str:
+    # Used as the node's name on the ring (and in log messages), so we leave out any credentials
+    u = urlparse(url)
+    netloc = u.hostname or ''
+    if u.port: netloc += f':{u.port}'
+    return f"{u.scheme}://{netloc}{u.path}"
+
+
+def node_from_url(url: str, cat: str = 'sync') -> Any:
+    """
+    Create a cache adapter connected to the server ``url``, for use as a :class:`.ShardedCache` node.
+
+    Supports ``redis://``, ``rediss://`` and ``unix://`` URLs (anything accepted by :meth:`redis.Redis.from_url`), and
+    ``memcached://host:port`` URLs.
+
+    :param str url: The URL of the cache server
+    :param str cat: ``'sync'`` to create a synchronous adapter, or ``'asyncio'`` for an AsyncIO adapter
+    """
+    u = urlparse(url)
+    scheme, is_async = u.scheme.lower(), cat in ['async', 'asyncio']
+    if scheme in ['redis', 'rediss', 'unix']:
+        if is_async:
+            from redis import asyncio as aioredis
+            from privex.helpers.cache.asyncx.AsyncRedisCache import AsyncRedisCache
+            return AsyncRedisCache(redis_instance=aioredis.Redis.from_url(url))
+        import redis
+        from privex.helpers.cache.RedisCache import RedisCache
+        return RedisCache(redis_instance=redis.Redis.from_url(url))
+    if scheme in ['memcached', 'memcache']:
+        host, port = u.hostname or 'localhost', u.port or 11211
+        if is_async:
+            import aiomcache
+            from privex.helpers.cache.asyncx.AsyncMemcachedCache import AsyncMemcachedCache
+            return AsyncMemcachedCache(mcache_instance=aiomcache.Client(host, port))
+        import pylibmc
+        from privex.helpers.cache.MemcachedCache import MemcachedCache
+        return MemcachedCache(mcache_instance=pylibmc.Client([f"{host}:{port}"]))
+    raise ValueError(f"Unsupported cache node URL '{_url_name(url)}' - scheme must be redis / rediss / unix / memcached")
+
+
+class ShardedBase:
+    """
+    Shared node handling for :class:`.ShardedCache` and :class:`.AsyncShardedCache` - resolving nodes, the hash ring,
+    grouping keys by node, and tracking failed nodes for failover.
+    """
+    nodes: Dict[str, Any]
+    ring: HashRing
+    failover: bool
+    retry_after: float
+
+    def _init_ring(self, nodes, cat: str, vnodes: Optional[int] = None, failover: Optional[bool] = None,
+                   retry_after: Optional[float] = None):
+        self.nodes = self._resolve_nodes(nodes, cat, self.__class__.__name__)
+        self.ring = HashRing(self.nodes.keys(), vnodes=vnodes)
+        self.failover = settings.SHARDED_CACHE_FAILOVER if failover is None else failover
+        self.retry_after = float(settings.SHARDED_CACHE_RETRY if retry_after is None else retry_after)
+        self._down: Dict[str, float] = {}
+
+    @staticmethod
+    def _resolve_nodes(nodes, cat: str, cls_name: str) -> Dict[str, Any]:
+        # Imported here, as privex.helpers.cache imports this module
+        from privex.helpers.cache import import_adapter
+        nodes = settings.SHARDED_CACHE_NODES if nodes is None else nodes
+        if isinstance(nodes, str):
+            nodes = [n.strip() for n in nodes.split(',') if n.strip() != '']
+        items = list(nodes.items()) if isinstance(nodes, Mapping) else [(None, n) for n in nodes]
+        res = {}
+        for i, (name, n) in enumerate(items):
+            if isinstance(n, str) and '://' in n:
+                name, n = _url_name(n) if name is None else name, node_from_url(n, cat)
+            elif isinstance(n, str):
+                if n.lower() in ['sharded', 'shard'] or n in ['ShardedCache', 'AsyncShardedCache']:
+                    raise AttributeError(f"{cls_name} can't use another sharded cache as one of it's nodes.")
+                n = import_adapter(n, cat)()
+            res[f"node{i}" if name is None else str(name)] = n
+        if len(res) == 0:
+            raise AttributeError(f"{cls_name} requires at least one node - pass 'nodes', or set PRIVEX_SHARDED_CACHE_NODES")
+        return res
+
+    def _is_down(self, name: str) -> bool:
+        until = self._down.get(name)
+        if until is None:
+            return False
+        if until <= time.time():
+            self._down.pop(name, None)
+            return False
+        return True
+
+    def _mark_down(self, name: str, err: Exception):
+        log.warning("Sharded cache node '%s' failed (%s: %s) - skipping it for %s seconds.",
+                    name, type(err).__name__, str(err), self.retry_after)
+        self._down[name] = time.time() + self.retry_after
+
+    def _candidates(self, key: str) -> List[str]:
+        if not self.failover:
+            return [self.ring.get_node(key)]
+        nodes = list(self.ring.iter_nodes(key))
+        up = [n for n in nodes if not self._is_down(n)]
+        # If every node is marked as down, try them all anyway rather than failing without trying
+        return up if len(up) > 0 else nodes
+
+    def node_for(self, key: str) -> str:
+        """Return the name of the node which ``key`` is currently routed to"""
+        return self._candidates(str(key))[0]
+
+    def adapter_for(self, key: str) -> Any:
+        """Return the cache adapter which ``key`` is currently routed to"""
+        return self.nodes[self.node_for(key)]
+
+    def _group(self, keys: Iterable[str]) -> Dict[str, List[str]]:
+        groups = {}
+        for k in keys:
+            groups.setdefault(self.node_for(k), []).append(k)
+        return groups
+
+    def _handle_error(self, name: str, err: Exception):
+        """Re-raise ``err`` unless failover is enabled (or it's a :class:`.CacheNotFound`), otherwise mark ``name`` as down"""
+        if not self.failover or isinstance(err, CacheNotFound):
+            raise err
+        self._mark_down(name, err)
+
+
+class ShardedCache(ShardedBase, CacheAdapter):
+    """
+    A cache adapter which distributes keys over multiple cache adapters ("nodes") - such as several :class:`.RedisCache`
+    or :class:`.MemcachedCache` servers - using a consistent hash ring (:class:`.HashRing`) with virtual nodes.
+
+    * Each key is stored on exactly one node, so capacity and throughput scale with the number of nodes.
+    * Bulk operations (:meth:`.get_many` / :meth:`.set_many` / :meth:`.remove_many`) group keys by node, and query each
+      node in parallel using a thread pool.
+    * With ``failover=True`` (default: :attr:`.SHARDED_CACHE_FAILOVER`), when a node raises an error, the operation is
+      retried on the next node on the ring, and the failed node is skipped for ``retry_after`` seconds. Keys set while
+      a node is skipped live on it's neighbour, so once the node returns, reads of those keys may be served (possibly
+      stale) values from the original node until they expire.
+
+    Can be selected as the global cache adapter with ``PRIVEX_CACHE_ADAPTER=sharded``, in which case the nodes are read
+    from :attr:`.SHARDED_CACHE_NODES` (``PRIVEX_SHARDED_CACHE_NODES``).
+
+    **Basic Usage**::
+
+        >>> from privex.helpers.cache import ShardedCache
+        >>> c = ShardedCache(['redis://10.0.0.1:6379/0', 'redis://10.0.0.2:6379/0'], failover=True)
+        >>> c.set('hello', 'world')
+        >>> c.get('hello')
+        'world'
+        >>> c.node_for('hello')               # The node 'hello' is stored on
+        'redis://10.0.0.1:6379/0'
+
+    Nodes can also be adapter instances, optionally with names (the ring position of a node is based on it's name, so
+    names should be the same in every process sharing the nodes)::
+
+        >>> c = ShardedCache({'a': RedisCache(redis_instance=Redis('10.0.0.1')), 'b': RedisCache(redis_instance=Redis('10.0.0.2'))})
+
+    """
+
+    def __init__(self, nodes: Union[Iterable[Union[CacheAdapter, str]], Mapping[str, CacheAdapter], str] = None, *args,
+                 vnodes: Optional[int] = None, failover: Optional[bool] = None, retry_after: Optional[float] = None,
+                 parallel: bool = True, **kwargs):
+        """
+        :param nodes: A list of cache adapter instances, server URLs (see :func:`.node_from_url`), or adapter names - or a
+                      dict mapping node names to adapters. (default: :attr:`.SHARDED_CACHE_NODES`)
+        :param int vnodes: Virtual nodes per node on the hash ring (default: :attr:`.SHARDED_CACHE_VNODES`)
+        :param bool failover: Retry on the next node when a node fails (default: :attr:`.SHARDED_CACHE_FAILOVER`)
+        :param float retry_after: Seconds to skip a failed node for (default: :attr:`.SHARDED_CACHE_RETRY`)
+        :param bool parallel: (Default: ``True``) Query nodes in parallel threads for bulk operations. Disable this if
+                              your node adapters aren't safe to use from multiple threads.
+        """
+        super().__init__(*args, **kwargs)
+        self._init_ring(nodes, 'sync', vnodes=vnodes, failover=failover, retry_after=retry_after)
+        self.parallel = parallel
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def _call(self, key: str, method: str, *args, **kwargs) -> Any:
+        for name in self._candidates(key):
+            try:
+                return getattr(self.nodes[name], method)(*args, **kwargs)
+            except Exception as e:
+                self._handle_error(name, e)
+        raise ConnectionError(f"All nodes failed for cache key '{key}'")
+
+    def _fan_out(self, keys: Iterable[str], func: Callable[[CacheAdapter, List[str]], Any]) -> List[Any]:
+        """
+        Group ``keys`` by node, and call ``func(adapter, node_keys)`` for each node - in parallel if there's more than one.
+        With failover, the keys for any node which fails are re-grouped over the remaining nodes and retried.
+        """
+        groups = self._group(keys)
+        if len(groups) == 0:
+            return []
+        if len(groups) == 1 or not self.parallel:
+            futures = [(n, ks, None) for n, ks in groups.items()]
+        else:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=len(self.nodes), thread_name_prefix='ShardedCache')
+            futures = [(n, ks, self._pool.submit(func, self.nodes[n], ks)) for n, ks in groups.items()]
+        results, retry = [], []
+        for n, ks, fut in futures:
+            try:
+                results.append(func(self.nodes[n], ks) if fut is None else fut.result())
+            except Exception as e:
+                self._handle_error(n, e)
+                retry += ks
+        if len(retry) > 0:
+            if all(self._is_down(n) for n in self.nodes):
+                raise ConnectionError(f"All nodes failed for cache keys: {retry}")
+            results += self._fan_out(retry, func)
+        return results
+
+    def get(self, key: str, default: Any = None, fail: bool = False) -> Any:
+        key = str(key)
+        v = self._call(key, 'get', key, default=NO_RESULT)
+        if v is NO_RESULT:
+            if fail: raise CacheNotFound(f'Cache key "{key}" was not found.')
+            return default
+        return v
+
+    def set(self, key: str, value: Any, timeout: Optional[int] = DEFAULT_CACHE_TIMEOUT):
+        key = str(key)
+        return self._call(key, 'set', key, value, timeout=timeout)
+
+    def add(self, key: str, value: Any, timeout: Optional[int] = DEFAULT_CACHE_TIMEOUT) -> bool:
+        key = str(key)
+        return self._call(key, 'add', key, value, timeout=timeout)
+
+    def remove_if(self, key: str, value: Any) -> bool:
+        key = str(key)
+        return self._call(key, 'remove_if', key, value)
+
+    def remove(self, *key: str) -> bool:
+        return all(self._fan_out([str(k) for k in key], lambda a, ks: a.remove(*ks)))
+
+    def update_timeout(self, key: str, timeout: int = DEFAULT_CACHE_TIMEOUT) -> Any:
+        key = str(key)
+        return self._call(key, 'update_timeout', key, timeout=timeout)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        res = {}
+        for r in self._fan_out([str(k) for k in keys], lambda a, ks: a.get_many(ks)):
+            res.update(r)
+        return res
+
+    def set_many(self, mapping: Mapping[str, Any], timeout: Optional[int] = DEFAULT_CACHE_TIMEOUT):
+        mapping = {str(k): v for k, v in mapping.items()}
+        self._fan_out(list(mapping.keys()), lambda a, ks: a.set_many({k: mapping[k] for k in ks}, timeout=timeout))
+
+    def remove_many(self, keys: Iterable[str]) -> int:
+        return sum(self._fan_out([str(k) for k in keys], lambda a, ks: a.remove_many(ks)))
+
+    def connect(self, *args, **kwargs) -> Any:
+        return [a.connect(*args, **kwargs) for a in self.nodes.values()]
+
+    def close(self, *args, **kwargs) -> Any:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+        return [a.close(*args, **kwargs) for a in self.nodes.values()]
@@ -0,0 +1,258 @@
+import json
+import logging
+import uuid
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
+
+from privex.helpers import settings
+from privex.helpers.common import stringify
+from privex.helpers.collections import DictObject
+from privex.helpers.exceptions import CacheNotFound
+from privex.helpers.settings import DEFAULT_CACHE_TIMEOUT
+from privex.helpers.cache.CacheAdapter import CacheAdapter
+from privex.helpers.cache.memstore import MemoryStore
+from privex.helpers.types import NO_RESULT
+
+log = logging.getLogger(__name__)
+
+
+class TieredBase:
+    """
+    Shared L1 handling for :class:`.TieredCache` and :class:`.AsyncTieredCache` - the private L1 :class:`.MemoryStore`,
+    L1 timeouts, and encoding / handling of invalidation messages.
+    """
+    l1: MemoryStore
+    l1_ttl: float
+    invalidation: bool
+    channel: str
+
+    def _init_l1(self, l1_ttl: Optional[float] = None, l1_max_entries: Optional[int] = None,
+                 invalidation: Optional[bool] = None, channel: Optional[str] = None):
+        self.l1_ttl = float(settings.TIERED_CACHE_L1_TTL if l1_ttl is None else l1_ttl)
+        self.l1 = MemoryStore(
+            max_entries=settings.TIERED_CACHE_L1_MAX_ENTRIES if l1_max_entries is None else l1_max_entries
+        )
+        self.invalidation = settings.TIERED_CACHE_INVALIDATION if invalidation is None else invalidation
+        self.channel = settings.TIERED_CACHE_CHANNEL if channel is None else channel
+        # Used to ignore our own invalidation messages - we've already updated our own L1
+        self.node_id = uuid.uuid4().hex
+
+    @staticmethod
+    def _resolve_l2(l2, cat: str, cls_name: str):
+        # Imported here, as privex.helpers.cache imports this module
+        from privex.helpers.cache import import_adapter
+        l2 = settings.TIERED_CACHE_L2 if l2 is None else l2
+        if isinstance(l2, str):
+            if l2.lower() in ['tiered', 'tier'] or l2 in ['TieredCache', 'AsyncTieredCache']:
+                raise AttributeError(f"{cls_name} can't use another tiered cache as it's L2 adapter.")
+            l2 = import_adapter(l2, cat)()
+        return l2
+
+    def _l1_set(self, key: str, value: Any, timeout: Optional[float] = None):
+        # Never keep a key in L1 longer than it'll exist in L2
+        ttl = self.l1_ttl if timeout is None else min(self.l1_ttl, timeout)
+        if ttl > 0:
+            self.l1.set(key, value, ttl)
+
+    def _l1_get(self, key: str) -> Any:
+        e = self.l1.get_entry(key)
+        return NO_RESULT if e is None else e.value
+
+    def _message(self, keys: List[str]) -> str:
+        return json.dumps({'node': self.node_id, 'keys': keys})
+
+    def _on_message(self, data: Union[str, bytes]):
+        try:
+            msg = json.loads(stringify(data))
+        except (TypeError, ValueError):
+            return log.warning("Ignoring invalid tiered cache invalidation message on channel '%s': %s", self.channel, data)
+        if msg.get('node') == self.node_id:
+            return
+        for k in msg.get('keys', []):
+            self.l1.delete(k)
+
+    def invalidate_local(self, *keys: str):
+        """Drop ``keys`` from this instance's L1 only. If no keys are passed, the entire L1 is cleared."""
+        if not keys:
+            return self.l1.clear()
+        for k in keys:
+            self.l1.delete(str(k))
+
+    def stats(self) -> DictObject:
+        """Return the hit / miss / eviction counters for the L1 store (see :meth:`.MemoryStore.stats`)"""
+        return self.l1.stats()
+
+
+class TieredCache(TieredBase, CacheAdapter):
+    """
+    A two-tier "near cache" - a small, bounded in-process memory cache (L1) in front of any other cache adapter (L2),
+    such as :class:`.RedisCache`, :class:`.MemcachedCache` or :class:`.SqliteCache`.
+
+    * **Read-through** - :meth:`.get` checks L1 first, and on an L1 miss, reads the key from L2 and stores it in L1
+      for up to ``l1_ttl`` seconds (default: :attr:`.TIERED_CACHE_L1_TTL`), so hot keys don't need a network / disk
+      round trip on every read.
+    * **Write-through** - :meth:`.set` / :meth:`.remove` (and their bulk versions) write to L2, then update L1.
+    * **Invalidation** - with ``invalidation=True`` (default: :attr:`.TIERED_CACHE_INVALIDATION`) and a Redis L2, keys
+      which are set / removed are published on a Redis pub/sub channel, and other processes drop them from their L1.
+      Without invalidation, other processes may serve their L1 copy of a changed key for up to ``l1_ttl`` seconds.
+
+    Can be selected as the global cache adapter with ``PRIVEX_CACHE_ADAPTER=tiered``, in which case the L2 adapter is
+    chosen by :attr:`.TIERED_CACHE_L2` (``PRIVEX_TIERED_CACHE_L2``, default ``redis``).
+
+    **Basic Usage**::
+
+        >>> from privex.helpers.cache import TieredCache, RedisCache
+        >>> c = TieredCache(RedisCache(), l1_ttl=2, l1_max_entries=5000)
+        >>> c.set('hello', 'world', timeout=300)     # Stored in Redis + L1
+        >>> c.get('hello')                            # Served from L1 for the next 2 seconds
+        'world'
+
+    """
+
+    def __init__(self, l2: Union[CacheAdapter, str] = None, *args, l1_ttl: Optional[float] = None,
+                 l1_max_entries: Optional[int] = None, invalidation: Optional[bool] = None, channel: Optional[str] = None,
+                 **kwargs):
+        """
+        :param CacheAdapter|str l2: The L2 cache adapter instance, or an adapter name such as ``'redis'``
+                                    (default: :attr:`.TIERED_CACHE_L2`)
+        :param float l1_ttl: Maximum seconds to serve a key from L1 (default: :attr:`.TIERED_CACHE_L1_TTL`)
+        :param int l1_max_entries: Maximum keys held in L1 (default: :attr:`.TIERED_CACHE_L1_MAX_ENTRIES`)
+        :param bool invalidation: Broadcast / listen for invalidations via Redis pub/sub (default: :attr:`.TIERED_CACHE_INVALIDATION`)
+        :param str channel: The Redis pub/sub channel for invalidations (default: :attr:`.TIERED_CACHE_CHANNEL`)
+        """
+        super().__init__(*args, **kwargs)
+        self.l2: CacheAdapter = self._resolve_l2(l2, 'sync', self.__class__.__name__)
+        self._init_l1(l1_ttl, l1_max_entries, invalidation, channel)
+        self._pubsub, self._listener = None, None
+        if self.invalidation:
+            self._start_listener()
+
+    def _pubsub_redis(self):
+        if not hasattr(type(self.l2), 'redis'):
+            return None
+        # A pooled L2 gets it's client back straight away - the PubSub object checks out it's own connection
+        with self.l2._client() as r:
+            return r if hasattr(r, 'pubsub') else None
+
+    def _start_listener(self):
+        r = self._pubsub_redis()
+        if r is None:
+            log.warning("Tiered cache invalidation requires a Redis L2 adapter (got %s) - invalidation disabled.",
+                        self.l2.__class__.__name__)
+            self.invalidation = False
+            return
+        try:
+            self._pubsub = r.pubsub(ignore_subscribe_messages=True)
+            self._pubsub.subscribe(**{self.channel: lambda m: self._on_message(m['data'])})
+            self._listener = self._pubsub.run_in_thread(sleep_time=1, daemon=True)
+        except Exception as e:
+            log.warning("Failed to subscribe to tiered cache invalidation channel '%s' - invalidation disabled. Reason: %s %s",
+                        self.channel, type(e), str(e))
+            self._pubsub, self._listener, self.invalidation = None, None, False
+
+    def _stop_listener(self):
+        if self._listener is not None:
+            self._listener.stop()
+        if self._pubsub is not None:
+            self._pubsub.close()
+        self._pubsub, self._listener = None, None
+
+    def _publish(self, keys: List[str]):
+        if not self.invalidation or not keys:
+            return
+        try:
+            with self.l2._client() as r:
+                r.publish(self.channel, self._message(keys))
+        except Exception as e:
+            log.warning("Failed to publish tiered cache invalidation for keys %s: %s %s", keys, type(e), str(e))
+
+    def get(self, key: str, default: Any = None, fail: bool = False) -> Any:
+        key = str(key)
+        v = self._l1_get(key)
+        if v is not NO_RESULT:
+            return v
+        v = self.l2.get(key, default=NO_RESULT)
+        if v is NO_RESULT:
+            if fail: raise CacheNotFound(f'Cache key "{key}" was not found.')
+            return default
+        self._l1_set(key, v)
+        return v
+
+    def set(self, key: str, value: Any, timeout: Optional[int] = DEFAULT_CACHE_TIMEOUT):
+        key = str(key)
+        res = self.l2.set(key, value, timeout=timeout)
+        self._l1_set(key, value, timeout)
+        self._publish([key])
+        return res
+
+    def add(self, key: str, value: Any, timeout: Optional[int] = DEFAULT_CACHE_TIMEOUT) -> bool:
+        key = str(key)
+        # Always defer to L2, since L1 may not know about keys set by other processes
+        if not self.l2.add(key, value, timeout=timeout):
+            return False
+        self._l1_set(key, value, timeout)
+        self._publish([key])
+        return True
+
+    def remove_if(self, key: str, value: Any) -> bool:
+        key = str(key)
+        if not self.l2.remove_if(key, value):
+            return False
+        self.l1.delete(key)
+        self._publish([key])
+        return True
+
+    def remove(self, *key: str) -> bool:
+        keys = [str(k) for k in key]
+        res = self.l2.remove(*keys)
+        for k in keys:
+            self.l1.delete(k)
+        self._publish(keys)
+        return res
+
+    def update_timeout(self, key: str, timeout: int = DEFAULT_CACHE_TIMEOUT) -> Any:
+        key = str(key)
+        v = self.l2.update_timeout(key, timeout=timeout)
+        self._l1_set(key, v, timeout)
+        return v
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        res, missing = {}, []
+        for k in keys:
+            k = str(k)
+            v = self._l1_get(k)
+            if v is NO_RESULT:
+                missing.append(k)
+            else:
+                res[k] = v
+        if missing:
+            found = self.l2.get_many(missing)
+            for k, v in found.items():
+                self._l1_set(k, v)
+            res.update(found)
+        return res
+
+    def set_many(self, mapping: Mapping[str, Any], timeout: Optional[int] = DEFAULT_CACHE_TIMEOUT):
+        mapping = {str(k): v for k, v in mapping.items()}
+        res = self.l2.set_many(mapping, timeout=timeout)
+        for k, v in mapping.items():
+            self._l1_set(k, v, timeout)
+        self._publish(list(mapping.keys()))
+        return res
+
+    def remove_many(self, keys: Iterable[str]) -> int:
+        keys = [str(k) for k in keys]
+        res = self.l2.remove_many(keys)
+        for k in keys:
+            self.l1.delete(k)
+        self._publish(keys)
+        return res
+
+    def connect(self, *args, **kwargs) -> Any:
+        res = self.l2.connect(*args, **kwargs)
+        if self.invalidation and self._listener is None:
+            self._start_listener()
+        return res
+
+    def close(self, *args, **kwargs) -> Any:
+        self._stop_listener()
+        return self.l2.close(*args, **kwargs)
@@ -143,7 +143,8 @@ We can use the global AsyncIO cache adapter instance (defaults to :class:`.Async
 Much like the standard :class:`.CacheWrapper`, you can get and set keys using dict-like syntax, however
 since ``__getitem__`` and ``__setitem__`` can't be natively async without Python complaining, they use the wrapper decorator
 :func:`.awaitable` for getting, and the synchronous async wrapper function :func:`.loop_run` for setting. The use of these wrappers
-may cause problems in certain scenarios, so it's recommended to avoid using the dict-like cache syntax within AsyncIO code::
+may cause problems in certain scenarios, so it's recommended to avoid using the dict-like cache syntax within AsyncIO code
+(setting a key with ``async_cached['x'] = y`` raises :class:`RuntimeError` while an event loop is running)::
  
     >>> await async_cached['hello']
     'world'
@@ -254,9 +255,13 @@ from privex.helpers.collections import DictObject
 
 log = logging.getLogger(__name__)
 
-from typing import Any, Optional, Union, Type, List
+from typing import Any, Dict, Iterable, Mapping, Optional, Union, Type, List
 from privex.helpers.cache.CacheAdapter import CacheAdapter
 from privex.helpers.cache.MemoryCache import MemoryCache
+from privex.helpers.cache.TieredCache import TieredCache
+from privex.helpers.cache.ShardedCache import ShardedCache
+from privex.helpers.cache.metrics import instrument, uninstrument, get_metrics, metrics_snapshot, reset_metrics, \
+    add_metrics_hook, remove_metrics_hook, register_prefix, CacheMetrics
 
 
 if plugin.HAS_PRIVEX_DB in [True, None]:
@@ -308,12 +313,16 @@ ADAPTER_MAP = DictObject(
         redis='privex.helpers.cache.RedisCache.RedisCache',
         memcached='privex.helpers.cache.MemcachedCache.MemcachedCache',
         sqlite3='privex.helpers.cache.SqliteCache.SqliteCache',
+        tiered='privex.helpers.cache.TieredCache.TieredCache',
+        sharded='privex.helpers.cache.ShardedCache.ShardedCache',
     ),
     asyncio=DictObject(
         memory='privex.helpers.cache.asyncx.AsyncMemoryCache.AsyncMemoryCache',
         redis='privex.helpers.cache.asyncx.AsyncRedisCache.AsyncRedisCache',
         memcached='privex.helpers.cache.asyncx.AsyncMemcachedCache.AsyncMemcachedCache',
         sqlite3='privex.helpers.cache.asyncx.AsyncSqliteCache.AsyncSqliteCache',
+        tiered='privex.helpers.cache.asyncx.AsyncTieredCache.AsyncTieredCache',
+        sharded='privex.helpers.cache.asyncx.AsyncShardedCache.AsyncShardedCache',
     ),
     
 )
@@ -323,20 +332,23 @@ _AM = ADAPTER_MAP
 _AM.sync.ram, _AM.asyncio.ram = _AM.sync.mem, _AM.asyncio.mem = _AM.sync.memory, _AM.asyncio.memory
 _AM.sync.mcache, _AM.asyncio.mcache = _AM.sync.memcache, _AM.asyncio.memcache = _AM.sync.memcached, _AM.asyncio.memcached
 _AM.sync.sqlitedb, _AM.asyncio.sqlitedb = _AM.sync.sqlite, _AM.asyncio.sqlite = _AM.sync.sqlite3, _AM.asyncio.sqlite3
+_AM.sync.tier, _AM.asyncio.tier = _AM.sync.tiered, _AM.asyncio.tiered
+_AM.sync.shard, _AM.asyncio.shard = _AM.sync.sharded, _AM.asyncio.sharded
 
 _AM.shared = DictObject(
     # Synchronous cache adapters
     MemoryCache=_AM.sync.memory, RedisCache=_AM.sync.redis, MemcachedCache=_AM.sync.memcached,
-    SqliteCache=_AM.sync.sqlite3,
+    SqliteCache=_AM.sync.sqlite3, TieredCache=_AM.sync.tiered, ShardedCache=_AM.sync.sharded,
     # Synchronous cache adapters (xxxAdapter aliases)
     MemoryAdapter=_AM.sync.memory, RedisAdapter=_AM.sync.redis, MemcachedAdapter=_AM.sync.memcached,
-    SqliteAdapter=_AM.sync.sqlite3,
+    SqliteAdapter=_AM.sync.sqlite3, TieredAdapter=_AM.sync.tiered, ShardedAdapter=_AM.sync.sharded,
     # AsyncIO cache adapters
     AsyncMemoryCache=_AM.asyncio.memory, AsyncRedisCache=_AM.asyncio.redis, AsyncMemcachedCache=_AM.asyncio.memcached,
-    AsyncSqliteCache=_AM.asyncio.sqlite3,
+    AsyncSqliteCache=_AM.asyncio.sqlite3, AsyncTieredCache=_AM.asyncio.tiered, AsyncShardedCache=_AM.asyncio.sharded,
     # AsyncIO cache adapters (xxxAdapter aliases)
     AsyncMemoryAdapter=_AM.asyncio.memory, AsyncRedisAdapter=_AM.asyncio.redis, AsyncMemcachedAdapter=_AM.asyncio.memcached,
-    AsyncSqliteAdapter=_AM.asyncio.sqlite3
+    AsyncSqliteAdapter=_AM.asyncio.sqlite3, AsyncTieredAdapter=_AM.asyncio.tiered,
+    AsyncShardedAdapter=_AM.asyncio.sharded
 )
 
 
@@ -501,6 +513,21 @@ class CacheWrapper(object):
         cls.cache_instance = c.__init__(c(), *n_args, **n_kwargs)
         return cls.cache_instance
 
+    @classmethod
+    def instrument(cls, name: str = None) -> CacheMetrics:
+        """
+        Instrument the wrapped adapter instance (see :func:`privex.helpers.cache.metrics.instrument`), returning it's
+        :class:`.CacheMetrics`. Only the current adapter is instrumented - set :attr:`.settings.CACHE_METRICS` to
+        instrument every adapter as it's created.
+        """
+        return instrument(cls.get_adapter(), name=name)
+
+    @classmethod
+    def metrics(cls) -> Optional[dict]:
+        """Return a metrics snapshot for the wrapped adapter instance, or ``None`` if it isn't instrumented"""
+        m = get_metrics(cls.get_adapter())
+        return None if m is None else m.snapshot()
+
     def __getattr__(self, item):
         if hasattr(super(), item):
             return getattr(self, item)
@@ -635,7 +662,22 @@ class AsyncCacheWrapper(CacheWrapper):
         async def _wrapper():
             async with AsyncCacheWrapper.get_adapter() as a:
                 return await await_if_needed(a.set(key=key, value=value))
-        return loop_run(_wrapper())
+        return self._run_sync(_wrapper(), f"async_cached[{key!r}] = value", "await async_cached.set(key, value)")
+
+    @staticmethod
+    def _run_sync(coro, action: str, instead: str):
+        """
+        Run ``coro`` in this thread's event loop via :func:`.loop_run`. The AsyncIO adapter's connections belong to the
+        event loop they were created in, so if an event loop is already running in this thread, we can't run ``coro`` in
+        it synchronously - nor in another thread's loop - and a :class:`RuntimeError` is raised telling the caller to use
+        ``instead``.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return loop_run(coro)
+        coro.close()
+        raise RuntimeError(f"Can't use '{action}' while an AsyncIO event loop is running in this thread - use '{instead}' instead.")
     
     # async def __aenter__(self):
     #     """Pass-through to :meth:`.cache_instance.__aenter__` instance AsyncIO context enter method"""
@@ -648,16 +690,16 @@ class AsyncCacheWrapper(CacheWrapper):
         self.get_adapter()  # Make sure cache_instance exists by calling get_adapter (which will set the default if it doesn't)
         # Because this is an AsyncIO-only cache adapter, generally __enter__ isn't used, instead the AsyncIO `__aenter__` and
         # `__aexit__` are used. So, we can try to convert any attempts to use the classic `with x as y` into `async with x as y`
-        # by grabbing the event loop and trying to run `__aenter__` in the AsyncIO event loop.
-        loop = asyncio.get_event_loop()
-        return loop.run_until_complete(self.get_context_tracker().aenter())
+        # by running `__aenter__` in this thread's AsyncIO event loop (only possible while that loop isn't running).
+        return self._run_sync(self.get_context_tracker().aenter(), 'with async_cached', 'async with async_cached')
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         # Because this is an AsyncIO-only cache adapter, generally __exit__ isn't used, instead the AsyncIO `__aenter__` and
         # `__aexit__` are used. So, we can try to convert any attempts to use the classic `with x as y` into `async with x as y`
-        # by grabbing the event loop and trying to run `__aexit__` in the AsyncIO event loop.
-        loop = asyncio.get_event_loop()
-        return loop.run_until_complete(self.get_context_tracker().aexit(exc_type, exc_val, exc_tb))
+        # by running `__aexit__` in this thread's AsyncIO event loop.
+        return self._run_sync(
+            self.get_context_tracker().aexit(exc_type, exc_val, exc_tb), 'with async_cached', 'async with async_cached'
+        )
 
 
 async_cached: Union[AsyncCacheAdapter, AsyncCacheWrapper] = AsyncCacheWrapper()
@@ -857,3 +899,46 @@ def update_timeout(key: str, timeout: int = DEFAULT_CACHE_TIMEOUT) -> Any:
     a = adapter_get()
     return a.update_timeout(key=key, timeout=timeout)
 
+
+def get_many(keys: Iterable[str]) -> Dict[str, Any]:
+    """
+    Retrieve multiple cache keys at once, using the global cache adapter. Keys which don't exist / are expired
+    are left out of the returned dictionary.
+    
+    Adapters such as :class:`.RedisCache` and :class:`.SqliteCache` fetch all of the keys in a single round trip / query.
+    
+    **Example**::
+    
+        >>> from privex.helpers import cache
+        >>> cache.set_many({'hello': 'world', 'lorem': 'ipsum'}, timeout=60)
+        >>> cache.get_many(['hello', 'lorem', 'nonexistent'])
+        {'hello': 'world', 'lorem': 'ipsum'}
+    
+    :param Iterable[str] keys: An iterable (e.g. list / tuple / set) of cache keys to retrieve
+    :return Dict[str,Any] values: A dictionary mapping each found key to it's value
+    """
+    a = adapter_get()
+    return a.get_many(keys)
+
+
+def set_many(mapping: Mapping[str, Any], timeout: Optional[int] = DEFAULT_CACHE_TIMEOUT):
+    """
+    Set multiple cache keys at once from the dictionary ``mapping`` (``{key: value}``), using the global cache adapter.
+    
+    :param Mapping[str,Any] mapping: A dictionary mapping cache keys to the values to store
+    :param int timeout: The amount of seconds to keep the data in cache. Pass ``None`` to disable expiration.
+    """
+    a = adapter_get()
+    return a.set_many(mapping, timeout=timeout)
+
+
+def remove_many(keys: Iterable[str]) -> int:
+    """
+    Remove multiple cache keys at once, using the global cache adapter.
+    
+    :param Iterable[str] keys: An iterable (e.g. list / tuple / set) of cache keys to remove
+    :return int removed: The number of keys which existed and were removed
+    """
+    a = adapter_get()
+    return a.remove_many(keys)
+
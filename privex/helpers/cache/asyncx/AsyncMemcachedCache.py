@@ -1,19 +1,21 @@
 import asyncio
-import pickle
-from typing import Any, Union, Optional
+from typing import Any, Dict, Iterable, Mapping, Union, Optional
 from async_property import async_property
-from privex.helpers.common import empty, byteify
+from privex.helpers.common import byteify, stringify
 from privex.helpers.exceptions import CacheNotFound
+from privex.helpers import settings
 from privex.helpers.settings import DEFAULT_CACHE_TIMEOUT
-from privex.helpers.plugin import get_memcached_async, close_memcached_async
+from privex.helpers.plugin import get_memcached_async, close_memcached_async, get_memcached_async_pool, AsyncConnectionPool
 from privex.helpers.cache.asyncx.base import AsyncCacheAdapter
+from privex.helpers.cache.pooling import AsyncPooledClientMixin
+from privex.helpers.cache.serializers import SerializerMixin
 import aiomcache
 import logging
 
 log = logging.getLogger(__name__)
 
 
-class AsyncMemcachedCache(AsyncCacheAdapter):
+class AsyncMemcachedCache(SerializerMixin, AsyncPooledClientMixin, AsyncCacheAdapter):
     """
     A Memcached backed implementation of :class:`.AsyncCacheAdapter`. Uses the global Memcached instance from
     :py:mod:`privex.helpers.plugin` by default, however custom Memcached instances can be passed in via
@@ -79,9 +81,18 @@ class AsyncMemcachedCache(AsyncCacheAdapter):
     adapter_enter_reconnect: bool = True
     adapter_exit_close: bool = True
 
+    pooled: bool
+    """
+    If ``True``, this adapter borrows a Memcached client from the current event loop's shared connection pool
+    (:func:`.get_memcached_async_pool`) for each operation, or for the whole of an ``async with`` block, and then returns
+    it to the pool (see :mod:`privex.helpers.cache.pooling`). Defaults to :attr:`.settings.CACHE_POOL_ENABLED` - always
+    ``False`` when ``mcache_instance`` is passed.
+    """
+
     _mcache: Optional[aiomcache.Client]
     
-    def __init__(self, use_pickle: bool = None, mcache_instance: aiomcache.Client = None, *args, **kwargs):
+    def __init__(self, use_pickle: bool = None, mcache_instance: aiomcache.Client = None, *args, serializer=None, pooled: bool = None,
+                 **kwargs):
         """
         AsyncMemcachedCache by default uses the global Memcached instance from :py:mod:`privex.helpers.plugin`.
 
@@ -93,10 +104,17 @@ class AsyncMemcachedCache(AsyncCacheAdapter):
 
         :param bool use_pickle: (Default: ``True``) Use the built-in ``pickle`` to serialise values before
                                 storing in Memcached, and un-serialise when loading from Memcached
+        
+        :param str|CacheSerializer serializer: (Default: :attr:`.settings.CACHE_SERIALIZER`) The serializer used when
+                                               ``use_pickle`` is ``True`` - a name such as ``'msgpack'`` / ``'orjson'``,
+                                               or a :class:`.CacheSerializer` (see :mod:`privex.helpers.cache.serializers`)
 
         :param aiomcache.Client mcache_instance: If this isn't ``None`` / ``False``, then this Memcached instance will be
                                                  used instead of the global one from :py:func:`.get_memcached_async`
         
+        :param bool pooled: (Default: :attr:`.settings.CACHE_POOL_ENABLED`) Borrow the Memcached client from the shared
+                            connection pool (:func:`.get_memcached_async_pool`) instead of creating a new client
+        
         :keyword bool enter_reconnect: Pass ``enter_reconnect=False`` to disable calling :meth:`.reconnect` when entering this cache
                                        adapter as a context manager (:meth:`.__aenter__`)
         :keyword bool exit_close: Pass ``exit_close=False`` to disable calling :meth:`.close` when exiting this cache
@@ -104,7 +122,8 @@ class AsyncMemcachedCache(AsyncCacheAdapter):
         """
         super().__init__(*args, **kwargs)
         self._mcache = None if not mcache_instance else mcache_instance
-        self.use_pickle = self.pickle_default if use_pickle is None else use_pickle
+        self._init_pool(False if mcache_instance else (settings.CACHE_POOL_ENABLED if pooled is None else pooled))
+        self._init_serializer(use_pickle, serializer)
     
     @async_property
     async def mcache(self) -> aiomcache.Client:
@@ -115,31 +134,56 @@ class AsyncMemcachedCache(AsyncCacheAdapter):
     
     async def get(self, key: Union[bytes, str], default: Any = None, fail: bool = False) -> Any:
         key = byteify(key)
-        r = await self.mcache
-        res = await r.get(key)
-        if empty(res):
+        async with self._client() as r:
+            res = await r.get(key)
+        if res is None:
             if fail: raise CacheNotFound(f'Cache key "{key}" was not found.')
             return default
-        return pickle.loads(res) if self.use_pickle else res
+        return self._loads(res)
     
     async def set(self, key: Union[bytes, str], value: Any, timeout: Optional[int] = DEFAULT_CACHE_TIMEOUT):
-        r: aiomcache.Client = await self.mcache
-        v = pickle.dumps(value) if self.use_pickle else value
-        return await r.set(byteify(key), v, exptime=timeout)
+        v = self._dumps(value)
+        async with self._client() as r:
+            return await r.set(byteify(key), v, exptime=timeout)
     
     async def remove(self, *key: Union[bytes, str]) -> bool:
         removed = 0
-        for k in key:
-            k = byteify(k)
-            try:
-                await self.get(k, fail=True)
-                r = await self.mcache
-                await r.delete(k)
-                removed += 1
-            except CacheNotFound:
-                pass
-        
+        async with self._client() as r:
+            for k in key:
+                # aiomcache's delete returns True only if the key existed, so there's no need to GET each key first.
+                if await r.delete(byteify(k)):
+                    removed += 1
         return removed == len(key)
+
+    async def add(self, key: Union[bytes, str], value: Any, timeout: Optional[int] = DEFAULT_CACHE_TIMEOUT) -> bool:
+        v = self._dumps(value)
+        async with self._client() as r:
+            return bool(await r.add(byteify(key), v, exptime=timeout or 0))
+
+    async def get_many(self, keys: Iterable[Union[bytes, str]]) -> Dict[str, Any]:
+        keys = [byteify(k) for k in keys]
+        if len(keys) == 0:
+            return {}
+        async with self._client() as r:
+            values = await r.multi_get(*keys)
+        res = {}
+        for k, v in zip(keys, values):
+            if v is None:
+                continue
+            res[stringify(k)] = self._loads(v)
+        return res
+
+    async def set_many(self, mapping: Mapping[Union[bytes, str], Any], timeout: Optional[int] = DEFAULT_CACHE_TIMEOUT):
+        # The memcached text protocol has no multi-set command, so we send the sets concurrently over the client's pool
+        async with self._client() as r:
+            return await asyncio.gather(*[
+                r.set(byteify(k), self._dumps(v), exptime=timeout or 0) for k, v in mapping.items()
+            ])
+
+    async def remove_many(self, keys: Iterable[Union[bytes, str]]) -> int:
+        async with self._client() as r:
+            res = await asyncio.gather(*[r.delete(byteify(k)) for k in keys])
+        return len([x for x in res if x])
     
     async def update_timeout(self, key: str, timeout: int = DEFAULT_CACHE_TIMEOUT) -> Any:
         key, timeout = str(key), int(timeout)
@@ -147,13 +191,21 @@ class AsyncMemcachedCache(AsyncCacheAdapter):
         await self.set(key=key, value=v, timeout=timeout)
         return v
 
+    def _get_pool(self) -> AsyncConnectionPool:
+        return get_memcached_async_pool()
+
     async def connect(self, *args, new_connection=True, **kwargs) -> aiomcache.Client:
+        if self.pooled:
+            return await self._pooled_connect()
         # We can't recycle connections with aiomcache, so we need to make sure to get a new connection for every instance.
         if not self._mcache:
             self._mcache = await get_memcached_async(*args, new_connection=new_connection, **kwargs)
         return self._mcache
 
     async def close(self):
+        if self.pooled:
+            await self._give_back(release_all=True)
+            return True
         if self._mcache is not None:
             log.debug("Closing AsyncIO Memcached instance %s._mcache", self.__class__.__name__)
             await self._mcache.close()
@@ -1,29 +1,29 @@
 import asyncio
-import pickle
-from typing import Any, Union, Optional
+from typing import Any, Dict, Iterable, Mapping, Union, Optional
 
 
 from async_property import async_property
 from redis.asyncio import Redis, ConnectionPool
 
-from privex.helpers.common import empty
-
 # from privex.helpers import plugin
 # from privex.helpers.cache.CacheAdapter import CacheAdapter
 from privex.helpers.exceptions import CacheNotFound
+from privex.helpers import settings
 from privex.helpers.settings import DEFAULT_CACHE_TIMEOUT
 from privex.helpers.types import VAL_FUNC_CORO
 
 # if plugin.HAS_ASYNC_REDIS:
-from privex.helpers.plugin import get_redis_async, close_redis_async
+from privex.helpers.plugin import get_redis_async, close_redis_async, get_redis_async_pool, AsyncConnectionPool
 from privex.helpers.cache.asyncx.base import AsyncCacheAdapter
+from privex.helpers.cache.pooling import AsyncPooledClientMixin
+from privex.helpers.cache.serializers import SerializerMixin
 from redis import asyncio as aioredis
 import logging
 
 log = logging.getLogger(__name__)
 
 
-class AsyncRedisCache(AsyncCacheAdapter):
+class AsyncRedisCache(SerializerMixin, AsyncPooledClientMixin, AsyncCacheAdapter):
     """
     A Redis backed implementation of :class:`.AsyncCacheAdapter`. Uses the global Redis instance from
     :py:mod:`privex.helpers.plugin` by default, however custom Redis instances can be passed in via
@@ -86,10 +86,19 @@ class AsyncRedisCache(AsyncCacheAdapter):
     adapter_enter_reconnect: bool = True
     adapter_exit_close: bool = True
     
+    pooled: bool
+    """
+    If ``True``, this adapter borrows a Redis client from the current event loop's shared connection pool
+    (:func:`.get_redis_async_pool`) for each operation, or for the whole of an ``async with`` block, and then returns it to
+    the pool (see :mod:`privex.helpers.cache.pooling`). Defaults to :attr:`.settings.CACHE_POOL_ENABLED` - always ``False``
+    when ``redis_instance`` is passed.
+    """
+    
     _redis_conn: Optional[Union[aioredis.Redis, ConnectionPool]]
     _redis: Optional[Redis]
     
-    def __init__(self, use_pickle: bool = None, redis_instance: aioredis.Redis = None, *args, **kwargs):
+    def __init__(self, use_pickle: bool = None, redis_instance: aioredis.Redis = None, *args, serializer=None, pooled: bool = None,
+                 **kwargs):
         """
         RedisCache by default uses the global Redis instance from :py:mod:`privex.helpers.plugin`.
 
@@ -101,10 +110,17 @@ class AsyncRedisCache(AsyncCacheAdapter):
 
         :param bool use_pickle: (Default: ``True``) Use the built-in ``pickle`` to serialise values before
                                 storing in Redis, and un-serialise when loading from Redis
+        
+        :param str|CacheSerializer serializer: (Default: :attr:`.settings.CACHE_SERIALIZER`) The serializer used when
+                                               ``use_pickle`` is ``True`` - a name such as ``'msgpack'`` / ``'orjson'``,
+                                               or a :class:`.CacheSerializer` (see :mod:`privex.helpers.cache.serializers`)
 
         :param redis.Redis redis_instance: If this isn't ``None`` / ``False``, then this Redis instance will be
                                            used instead of the global one from :py:func:`.get_redis`
         
+        :param bool pooled: (Default: :attr:`.settings.CACHE_POOL_ENABLED`) Borrow the Redis client from the shared
+                            connection pool (:func:`.get_redis_async_pool`) instead of using the per-thread global instance
+        
         :keyword bool enter_reconnect: Pass ``enter_reconnect=False`` to disable calling :meth:`.reconnect` when entering this cache
                                        adapter as a context manager (:meth:`.__aenter__`)
         :keyword bool exit_close: Pass ``exit_close=False`` to disable calling :meth:`.close` when exiting this cache
@@ -113,7 +129,8 @@ class AsyncRedisCache(AsyncCacheAdapter):
         super().__init__(*args, **kwargs)
         self._redis = None if not redis_instance else redis_instance
         self._redis_conn = None
-        self.use_pickle = self.pickle_default if use_pickle is None else use_pickle
+        self._init_pool(False if redis_instance else (settings.CACHE_POOL_ENABLED if pooled is None else pooled))
+        self._init_serializer(use_pickle, serializer)
     
     @async_property
     async def redis(self) -> aioredis.Redis:
@@ -128,37 +145,72 @@ class AsyncRedisCache(AsyncCacheAdapter):
 
     async def get(self, key: str, default: Any = None, fail: bool = False) -> Any:
         key = str(key)
-        r = await self.redis
-        res = await r.get(key)
-        if empty(res):
+        async with self._client() as r:
+            res = await r.get(key)
+        if res is None:
             if fail: raise CacheNotFound(f'Cache key "{key}" was not found.')
             return default
-        return pickle.loads(res) if self.use_pickle else res
+        return self._loads(res)
     
     async def set(self, key: str, value: Any, timeout: Optional[int] = DEFAULT_CACHE_TIMEOUT):
-        r: aioredis.Redis = await self.redis
-        v = pickle.dumps(value) if self.use_pickle else value
-        if timeout:
-            return await r.setex(str(key), time=timeout, value=v)
-        else:
+        v = self._dumps(value)
+        async with self._client() as r:
+            if timeout:
+                return await r.setex(str(key), time=timeout, value=v)
             return await r.set(str(key), v)
 
     # async def get_or_set(self, key: str, value: VAL_FUNC_CORO, timeout: int = DEFAULT_CACHE_TIMEOUT) -> Any:
     #     return await self.get_or_set_async(key=key, value=value, timeout=timeout)
     
     async def remove(self, *key: str) -> bool:
-        removed = 0
-        for k in key:
-            k = str(k)
-            try:
-                await self.get(k, fail=True)
-                r: aioredis.Redis = await self.redis
-                await r.delete(k)
-                removed += 1
-            except CacheNotFound:
-                pass
-        
-        return removed == len(key)
+        if len(key) == 0:
+            return True
+        # DEL returns the number of keys which existed and were deleted, so there's no need to GET each key first.
+        async with self._client() as r:
+            return await r.delete(*[str(k) for k in key]) == len(key)
+
+    async def add(self, key: str, value: Any, timeout: Optional[int] = DEFAULT_CACHE_TIMEOUT) -> bool:
+        v = self._dumps(value)
+        # SET NX only sets the key if it doesn't exist - returning None instead of True if it already existed
+        async with self._client() as r:
+            return bool(await r.set(str(key), v, nx=True, px=int(timeout * 1000) if timeout else None))
+
+    REMOVE_IF_SCRIPT = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) else return 0 end"
+    """Lua script used by :meth:`.remove_if` - Redis runs scripts atomically, so nothing can change the key between GET and DEL"""
+
+    async def remove_if(self, key: str, value: Any) -> bool:
+        async with self._client() as r:
+            return bool(await r.eval(self.REMOVE_IF_SCRIPT, 1, str(key), self._dumps(value)))
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        keys = [str(k) for k in keys]
+        if len(keys) == 0:
+            return {}
+        async with self._client() as r:
+            values = await r.mget(keys)
+        res = {}
+        for k, v in zip(keys, values):
+            if v is None:
+                continue
+            res[k] = self._loads(v)
+        return res
+
+    async def set_many(self, mapping: Mapping[str, Any], timeout: Optional[int] = DEFAULT_CACHE_TIMEOUT):
+        if len(mapping) == 0:
+            return []
+        # A non-transactional pipeline sends every SET in a single round trip
+        async with self._client() as r:
+            pipe = r.pipeline(transaction=False)
+            for k, v in mapping.items():
+                pipe.set(str(k), self._dumps(v), ex=timeout if timeout else None)
+            return await pipe.execute()
+
+    async def remove_many(self, keys: Iterable[str]) -> int:
+        keys = [str(k) for k in keys]
+        if len(keys) == 0:
+            return 0
+        async with self._client() as r:
+            return await r.delete(*keys)
     
     async def update_timeout(self, key: str, timeout: int = DEFAULT_CACHE_TIMEOUT) -> Any:
         key, timeout = str(key), int(timeout)
@@ -166,7 +218,12 @@ class AsyncRedisCache(AsyncCacheAdapter):
         await self.set(key=key, value=v, timeout=timeout)
         return v
     
+    def _get_pool(self) -> AsyncConnectionPool:
+        return get_redis_async_pool()
+    
     async def connect(self, *args, **kwargs) -> Redis:
+        if self.pooled:
+            return await self._pooled_connect()
         if not self._redis_conn:
             self._redis_conn = await get_redis_async()
         if not self._redis:
@@ -174,6 +231,9 @@ class AsyncRedisCache(AsyncCacheAdapter):
         return self._redis
     
     async def close(self):
+        if self.pooled:
+            await self._give_back(release_all=True)
+            return True
         if self._redis is not None:
             log.debug("Closing AsyncIO Redis instance %s._redis", self.__class__.__name__)
             await self._redis.aclose()
@@ -0,0 +1,114 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Mapping, Optional, Union
+
+from privex.helpers.exceptions import CacheNotFound
+from privex.helpers.settings import DEFAULT_CACHE_TIMEOUT
+from privex.helpers.cache.ShardedCache import ShardedBase
+from privex.helpers.cache.asyncx.base import AsyncCacheAdapter
+from privex.helpers.types import NO_RESULT
+
+log = logging.getLogger(__name__)
+
+
+class AsyncShardedCache(ShardedBase, AsyncCacheAdapter):
+    """
+    AsyncIO version of :class:`.ShardedCache` - distributes keys over multiple AsyncIO cache adapters (nodes), such as
+    several :class:`.AsyncRedisCache` or :class:`.AsyncMemcachedCache` servers, using a consistent hash ring.
+
+    Bulk operations query each node concurrently using :func:`asyncio.gather`.
+
+    **Basic Usage**::
+
+        >>> from privex.helpers.cache import AsyncShardedCache
+        >>> c = AsyncShardedCache(['redis://10.0.0.1:6379/0', 'redis://10.0.0.2:6379/0'], failover=True)
+        >>> await c.set('hello', 'world')
+        >>> await c.get('hello')
+        'world'
+
+    """
+
+    def __init__(self, nodes: Union[Iterable[Union[AsyncCacheAdapter, str]], Mapping[str, AsyncCacheAdapter], str] = None,
+                 *args, vnodes: Optional[int] = None, failover: Optional[bool] = None, retry_after: Optional[float] = None,
+                 **kwargs):
+        """
+        See :meth:`.ShardedCache.__init__` - ``nodes`` must be AsyncIO cache adapter instances, server URLs, or adapter names
+        """
+        super().__init__(*args, **kwargs)
+        self._init_ring(nodes, 'asyncio', vnodes=vnodes, failover=failover, retry_after=retry_after)
+
+    async def _call(self, key: str, method: str, *args, **kwargs) -> Any:
+        for name in self._candidates(key):
+            try:
+                return await getattr(self.nodes[name], method)(*args, **kwargs)
+            except Exception as e:
+                self._handle_error(name, e)
+        raise ConnectionError(f"All nodes failed for cache key '{key}'")
+
+    async def _fan_out(self, keys: Iterable[str], func: Callable[[AsyncCacheAdapter, List[str]], Awaitable[Any]]) -> List[Any]:
+        """See :meth:`.ShardedCache._fan_out` - nodes are queried concurrently on the current event loop"""
+        groups = self._group(keys)
+        if len(groups) == 0:
+            return []
+        names = list(groups.keys())
+        res = await asyncio.gather(*[func(self.nodes[n], groups[n]) for n in names], return_exceptions=True)
+        results, retry = [], []
+        for n, r in zip(names, res):
+            if isinstance(r, BaseException):
+                if not isinstance(r, Exception):
+                    raise r
+                self._handle_error(n, r)
+                retry += groups[n]
+                continue
+            results.append(r)
+        if len(retry) > 0:
+            if all(self._is_down(n) for n in self.nodes):
+                raise ConnectionError(f"All nodes failed for cache keys: {retry}")
+            results += await self._fan_out(retry, func)
+        return results
+
+    async def get(self, key: str, default: Any = None, fail: bool = False) -> Any:
+        key = str(key)
+        v = await self._call(key, 'get', key, default=NO_RESULT)
+        if v is NO_RESULT:
+            if fail: raise CacheNotFound(f'Cache key "{key}" was not found.')
+            return default
+        return v
+
+    async def set(self, key: str, value: Any, timeout: Optional[int] = DEFAULT_CACHE_TIMEOUT):
+        key = str(key)
+        return await self._call(key, 'set', key, value, timeout=timeout)
+
+    async def add(self, key: str, value: Any, timeout: Optional[int] = DEFAULT_CACHE_TIMEOUT) -> bool:
+        key = str(key)
+        return await self._call(key, 'add', key, value, timeout=timeout)
+
+    async def remove_if(self, key: str, value: Any) -> bool:
+        key = str(key)
+        return await self._call(key, 'remove_if', key, value)
+
+    async def remove(self, *key: str) -> bool:
+        return all(await self._fan_out([str(k) for k in key], lambda a, ks: a.remove(*ks)))
+
+    async def update_timeout(self, key: str, timeout: int = DEFAULT_CACHE_TIMEOUT) -> Any:
+        key = str(key)
+        return await self._call(key, 'update_timeout', key, timeout=timeout)
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        res = {}
+        for r in await self._fan_out([str(k) for k in keys], lambda a, ks: a.get_many(ks)):
+            res.update(r)
+        return res
+
+    async def set_many(self, mapping: Mapping[str, Any], timeout: Optional[int] = DEFAULT_CACHE_TIMEOUT):
+        mapping = {str(k): v for k, v in mapping.items()}
+        await self._fan_out(list(mapping.keys()), lambda a, ks: a.set_many({k: mapping[k] for k in ks}, timeout=timeout))
+
+    async def remove_many(self, keys: Iterable[str]) -> int:
+        return sum(await self._fan_out([str(k) for k in keys], lambda a, ks: a.remove_many(ks)))
+
+    async def connect(self, *args, **kwargs) -> Any:
+        return await asyncio.gather(*[a.connect(*args, **kwargs) for a in self.nodes.values()])
+
+    async def close(self, *args, **kwargs) -> Any:
+        return await asyncio.gather(*[a.close(*args, **kwargs) for a in self.nodes.values()])
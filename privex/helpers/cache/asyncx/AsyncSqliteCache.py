@@ -1,11 +1,11 @@
-import pickle
 import time
 import logging
 from os import makedirs
 from os.path import dirname, exists, isabs, join
-from typing import Any, Optional
+from typing import Any, Dict, Iterable, Mapping, Optional
 
 from privex.helpers.cache.asyncx.base import AsyncCacheAdapter
+from privex.helpers.cache.serializers import SerializerMixin
 from privex.helpers.exceptions import CacheNotFound
 from privex.helpers.common import empty, empty_if, is_true
 from privex.helpers import settings
@@ -22,7 +22,7 @@ def _cache_result_expired(res, _auto_purge=True) -> bool:
     return float(res.expires_at) <= time.time()
 
 
-class AsyncSqliteCache(AsyncCacheAdapter):
+class AsyncSqliteCache(SerializerMixin, AsyncCacheAdapter):
     """
     An SQLite3 backed implementation of :class:`.AsyncCacheAdapter`. Creates and uses a semi-global Sqlite instance via
     :py:mod:`privex.helpers.plugin` by default.
@@ -88,7 +88,8 @@ class AsyncSqliteCache(AsyncCacheAdapter):
     
     last_purged_expired: Optional[int] = None
     
-    def __init__(self, db_file: str = None, memory_persist=False, use_pickle: bool = None, connection_kwargs: dict = None, *args, **kwargs):
+    def __init__(self, db_file: str = None, memory_persist=False, use_pickle: bool = None, connection_kwargs: dict = None, *args,
+                 serializer=None, fast_mode: bool = None, **kwargs):
         """
         :class:`.AsyncSqliteCache` uses an auto-generated database filename / path by default, based on the name of the currently running
         script ( retrieved from ``sys.argv[0]`` ), allowing for persistent caching - without any manual configuration of the adapter,
@@ -105,6 +106,10 @@ class AsyncSqliteCache(AsyncCacheAdapter):
         :param bool use_pickle: (Default: ``True``) Use the built-in ``pickle`` to serialise values before
                                 storing in Sqlite3, and un-serialise when loading from Sqlite3
         
+        :param str|CacheSerializer serializer: (Default: :attr:`.settings.CACHE_SERIALIZER`) The serializer used when
+                                               ``use_pickle`` is ``True`` - a name such as ``'msgpack'`` / ``'orjson'``,
+                                               or a :class:`.CacheSerializer` (see :mod:`privex.helpers.cache.serializers`)
+        
         :param dict connection_kwargs: (Optional) Additional / overriding kwargs to pass to :meth:`sqlite3.connect` when
                                         :class:`.AsyncSqliteCacheManager` initialises it's sqlite3 connection.
         
@@ -114,6 +119,11 @@ class AsyncSqliteCache(AsyncCacheAdapter):
                                   if at least ``purge_every`` seconds have passed since the last purge was
                                   triggered ( :attr:`.last_purged_expired` )
 
+        :keyword bool fast_mode: (Default: :attr:`.settings.SQLITE_CACHE_FAST`) Run queries on a long-lived WAL mode
+                                 connection in a worker thread (see :class:`.AsyncSqliteCacheManager`) rather than a new
+                                 connection per query, and purge expired records in batches every ``purge_every`` seconds
+                                 from a background :class:`.SqliteCachePurger` thread, instead of during get / set calls.
+
         """
         from privex.helpers.cache.post_deps import AsyncSqliteCacheManager
         super().__init__(*args, **kwargs)
@@ -129,7 +139,9 @@ class AsyncSqliteCache(AsyncCacheAdapter):
         self.memory_persist = is_true(memory_persist)
         self._wrapper = None
         self.purge_every = kwargs.get('purge_every', 300)
-        self.use_pickle = self.pickle_default if use_pickle is None else use_pickle
+        self.fast_mode = settings.SQLITE_CACHE_FAST if fast_mode is None else is_true(fast_mode)
+        self._purger = None
+        self._init_serializer(use_pickle, serializer)
     
     @property
     def purge_due(self) -> bool:
@@ -145,6 +157,14 @@ class AsyncSqliteCache(AsyncCacheAdapter):
         return self._wrapper
     
     async def purge_expired(self, force=False) -> Optional[int]:
+        if self.fast_mode:
+            if force:
+                return await (await self.wrapper).purge_expired(batch_size=settings.SQLITE_CACHE_PURGE_BATCH)
+            if self._purger is None or not self._purger.is_alive():
+                from privex.helpers.cache.post_deps import SqliteCachePurger
+                w = await self.wrapper
+                self._purger = SqliteCachePurger.start_for(w.db, interval=self.purge_every, connection_kwargs=w.connector_kwargs)
+            return None
         if self.purge_due or force:
             log.debug("%s - Expired items purge is due (or force is True). Purging expired cache items...", self.__class__.__name__)
             res = await (await self.wrapper).purge_expired()
@@ -165,28 +185,51 @@ class AsyncSqliteCache(AsyncCacheAdapter):
             _not_found_msg += ' (key was expired - auto-removed)'
             res = None
         
-        if empty(res):
+        if res is None:
             if fail: raise CacheNotFound(_not_found_msg)
             return default
-        return pickle.loads(res.value) if self.use_pickle else res.value
+        return self._loads(res.value)
     
     async def set(self, key: str, value: T, timeout: Optional[Number] = settings.DEFAULT_CACHE_TIMEOUT, _auto_purge=True) -> T:
         if _auto_purge: await self.purge_expired()
-        v = pickle.dumps(value) if self.use_pickle else value
+        v = self._dumps(value)
         return await (await self.wrapper).set_cache_key(str(key), v, expires_secs=timeout)
     
     async def remove(self, *key: str) -> bool:
         removed = 0
         for k in key:
-            k = str(k)
-            try:
-                await self.get(k, fail=True, _auto_purge=False)
-                await (await self.wrapper).delete_cache_key(k)
-                removed += 1
-            except CacheNotFound:
-                pass
-        
+            removed += await (await self.wrapper).delete_cache_key(str(k))
         return removed == len(key)
+
+    async def add(self, key: str, value: Any, timeout: Optional[Number] = settings.DEFAULT_CACHE_TIMEOUT) -> bool:
+        v = self._dumps(value)
+        return await (await self.wrapper).add_cache_key(str(key), v, expires_secs=timeout)
+
+    async def remove_if(self, key: str, value: Any) -> bool:
+        return await (await self.wrapper).delete_cache_key_if(str(key), self._dumps(value)) > 0
+
+    async def get_many(self, keys: Iterable[str], _auto_purge=True) -> Dict[str, Any]:
+        if _auto_purge: await self.purge_expired()
+        wrapper = await self.wrapper
+        res, expired = {}, []
+        for r in await wrapper.find_cache_keys(keys):
+            if _cache_result_expired(r, _auto_purge=_auto_purge):
+                expired.append(r.name)
+                continue
+            res[r.name] = self._loads(r.value)
+        if len(expired) > 0:
+            log.debug("get_many found %d expired keys - auto-removing them: %s", len(expired), expired)
+            await wrapper.delete_cache_keys(expired)
+        return res
+
+    async def set_many(self, mapping: Mapping[str, Any], timeout: Optional[Number] = settings.DEFAULT_CACHE_TIMEOUT,
+                       _auto_purge=True):
+        if _auto_purge: await self.purge_expired()
+        data = {str(k): self._dumps(v) for k, v in mapping.items()}
+        return await (await self.wrapper).set_cache_keys(data, expires_secs=timeout)
+
+    async def remove_many(self, keys: Iterable[str]) -> int:
+        return await (await self.wrapper).delete_cache_keys(keys)
     
     async def update_timeout(self, key: str, timeout: Number = settings.DEFAULT_CACHE_TIMEOUT) -> Any:
         key, timeout = str(key), int(timeout)
@@ -200,7 +243,7 @@ class AsyncSqliteCache(AsyncCacheAdapter):
     def _connect(self, db=None, *args, connection_kwargs=None, memory_persist=None, **kwargs):
         c_kwargs = dict(
             connection_kwargs=empty_if(connection_kwargs, self.connection_kwargs),
-            memory_persist=empty_if(memory_persist, self.memory_persist)
+            memory_persist=empty_if(memory_persist, self.memory_persist), fast_mode=self.fast_mode
         )
         c_kwargs = {**c_kwargs, **kwargs}
         from privex.helpers.cache.post_deps import AsyncSqliteCacheManager
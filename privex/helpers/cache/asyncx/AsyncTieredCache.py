@@ -0,0 +1,180 @@
+import asyncio
+import logging
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
+
+from privex.helpers.exceptions import CacheNotFound
+from privex.helpers.settings import DEFAULT_CACHE_TIMEOUT
+from privex.helpers.cache.TieredCache import TieredBase
+from privex.helpers.cache.asyncx.base import AsyncCacheAdapter
+from privex.helpers.types import NO_RESULT
+
+log = logging.getLogger(__name__)
+
+
+class AsyncTieredCache(TieredBase, AsyncCacheAdapter):
+    """
+    AsyncIO version of :class:`.TieredCache` - a bounded in-process memory cache (L1) in front of any AsyncIO cache
+    adapter (L2), such as :class:`.AsyncRedisCache`, :class:`.AsyncMemcachedCache` or :class:`.AsyncSqliteCache`.
+
+    With ``invalidation=True`` and an :class:`.AsyncRedisCache` L2, the invalidation listener runs as a task on the event
+    loop which first uses the adapter, and is restarted if the adapter is later used from a different event loop.
+
+    **Basic Usage**::
+
+        >>> from privex.helpers.cache import AsyncTieredCache, AsyncRedisCache
+        >>> c = AsyncTieredCache(AsyncRedisCache(), l1_ttl=2)
+        >>> await c.set('hello', 'world', timeout=300)
+        >>> await c.get('hello')
+        'world'
+
+    """
+
+    def __init__(self, l2: Union[AsyncCacheAdapter, str] = None, *args, l1_ttl: Optional[float] = None,
+                 l1_max_entries: Optional[int] = None, invalidation: Optional[bool] = None, channel: Optional[str] = None,
+                 **kwargs):
+        """
+        See :meth:`.TieredCache.__init__` - ``l2`` must be an AsyncIO cache adapter instance, or adapter name
+        """
+        super().__init__(*args, **kwargs)
+        self.l2: AsyncCacheAdapter = self._resolve_l2(l2, 'asyncio', self.__class__.__name__)
+        self._init_l1(l1_ttl, l1_max_entries, invalidation, channel)
+        self._listener: Optional[asyncio.Task] = None
+
+    async def _pubsub_redis(self):
+        if not hasattr(type(self.l2), 'redis'):
+            return None
+        # A pooled L2 gets it's client back straight away - the PubSub object checks out it's own connection
+        async with self.l2._client() as r:
+            return r if hasattr(r, 'pubsub') else None
+
+    async def _ensure_listener(self):
+        if not self.invalidation:
+            return
+        loop = asyncio.get_running_loop()
+        if self._listener is not None and not self._listener.done() and self._listener.get_loop() is loop:
+            return
+        r = await self._pubsub_redis()
+        if r is None:
+            log.warning("Tiered cache invalidation requires a Redis L2 adapter (got %s) - invalidation disabled.",
+                        self.l2.__class__.__name__)
+            self.invalidation = False
+            return
+        try:
+            ps = r.pubsub(ignore_subscribe_messages=True)
+            await ps.subscribe(self.channel)
+        except Exception as e:
+            log.warning("Failed to subscribe to tiered cache invalidation channel '%s' - invalidation disabled. Reason: %s %s",
+                        self.channel, type(e), str(e))
+            self.invalidation = False
+            return
+        self._listener = loop.create_task(self._listen(ps))
+
+    async def _listen(self, ps):
+        try:
+            async for m in ps.listen():
+                if m.get('type') == 'message':
+                    self._on_message(m['data'])
+        finally:
+            await ps.close()
+
+    async def _publish(self, keys: List[str]):
+        if not self.invalidation or not keys:
+            return
+        try:
+            async with self.l2._client() as r:
+                await r.publish(self.channel, self._message(keys))
+        except Exception as e:
+            log.warning("Failed to publish tiered cache invalidation for keys %s: %s %s", keys, type(e), str(e))
+
+    async def get(self, key: str, default: Any = None, fail: bool = False) -> Any:
+        key = str(key)
+        await self._ensure_listener()
+        v = self._l1_get(key)
+        if v is not NO_RESULT:
+            return v
+        v = await self.l2.get(key, default=NO_RESULT)
+        if v is NO_RESULT:
+            if fail: raise CacheNotFound(f'Cache key "{key}" was not found.')
+            return default
+        self._l1_set(key, v)
+        return v
+
+    async def set(self, key: str, value: Any, timeout: Optional[int] = DEFAULT_CACHE_TIMEOUT):
+        key = str(key)
+        await self._ensure_listener()
+        res = await self.l2.set(key, value, timeout=timeout)
+        self._l1_set(key, value, timeout)
+        await self._publish([key])
+        return res
+
+    async def add(self, key: str, value: Any, timeout: Optional[int] = DEFAULT_CACHE_TIMEOUT) -> bool:
+        key = str(key)
+        if not await self.l2.add(key, value, timeout=timeout):
+            return False
+        self._l1_set(key, value, timeout)
+        await self._publish([key])
+        return True
+
+    async def remove_if(self, key: str, value: Any) -> bool:
+        key = str(key)
+        if not await self.l2.remove_if(key, value):
+            return False
+        self.l1.delete(key)
+        await self._publish([key])
+        return True
+
+    async def remove(self, *key: str) -> bool:
+        keys = [str(k) for k in key]
+        res = await self.l2.remove(*keys)
+        for k in keys:
+            self.l1.delete(k)
+        await self._publish(keys)
+        return res
+
+    async def update_timeout(self, key: str, timeout: int = DEFAULT_CACHE_TIMEOUT) -> Any:
+        key = str(key)
+        v = await self.l2.update_timeout(key, timeout=timeout)
+        self._l1_set(key, v, timeout)
+        return v
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        await self._ensure_listener()
+        res, missing = {}, []
+        for k in keys:
+            k = str(k)
+            v = self._l1_get(k)
+            if v is NO_RESULT:
+                missing.append(k)
+            else:
+                res[k] = v
+        if missing:
+            found = await self.l2.get_many(missing)
+            for k, v in found.items():
+                self._l1_set(k, v)
+            res.update(found)
+        return res
+
+    async def set_many(self, mapping: Mapping[str, Any], timeout: Optional[int] = DEFAULT_CACHE_TIMEOUT):
+        mapping = {str(k): v for k, v in mapping.items()}
+        res = await self.l2.set_many(mapping, timeout=timeout)
+        for k, v in mapping.items():
+            self._l1_set(k, v, timeout)
+        await self._publish(list(mapping.keys()))
+        return res
+
+    async def remove_many(self, keys: Iterable[str]) -> int:
+        keys = [str(k) for k in keys]
+        res = await self.l2.remove_many(keys)
+        for k in keys:
+            self.l1.delete(k)
+        await self._publish(keys)
+        return res
+
+    async def connect(self, *args, **kwargs) -> Any:
+        return await self.l2.connect(*args, **kwargs)
+
+    async def close(self, *args, **kwargs) -> Any:
+        if self._listener is not None and not self._listener.done():
+            self._listener.cancel()
+        self._listener = None
+        return await self.l2.close(*args, **kwargs)
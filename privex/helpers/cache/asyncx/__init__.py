@@ -55,6 +55,10 @@ must be awaited, just like any async function::
 
  * :class:`.AsyncMemcachedCache` - Stores cache entries using a Memcached server. Depends on the package ``aiomcache``
 
+ * :class:`.AsyncTieredCache` - A bounded in-process memory cache (L1) in front of any other AsyncIO cache adapter (L2)
+
+ * :class:`.AsyncShardedCache` - Distributes keys over multiple AsyncIO cache adapters using consistent hashing
+
  
 """
 import logging
@@ -65,8 +69,10 @@ HAS_ASYNC_MEMORY = False
 HAS_ASYNC_REDIS = False
 HAS_ASYNC_MEMCACHED = False
 HAS_ASYNC_SQLITE = False
+HAS_ASYNC_TIERED = False
+HAS_ASYNC_SHARDED = False
 
-__all__ = ['HAS_ASYNC_REDIS', 'HAS_ASYNC_MEMORY', 'HAS_ASYNC_MEMCACHED', 'HAS_ASYNC_SQLITE']
+__all__ = ['HAS_ASYNC_REDIS', 'HAS_ASYNC_MEMORY', 'HAS_ASYNC_MEMCACHED', 'HAS_ASYNC_SQLITE', 'HAS_ASYNC_TIERED', 'HAS_ASYNC_SHARDED']
 
 try:
     from privex.helpers.cache.asyncx.base import AsyncCacheAdapter
@@ -112,4 +118,20 @@ except ImportError:
     log.debug("[%s] Failed to import %s from %s (missing package 'privex-db' or 'aiosqlite' maybe?)",
               __name__, 'AsyncSqliteCache', f'{__name__}.AsyncSqliteCache')
 
+try:
+    from privex.helpers.cache.asyncx.AsyncTieredCache import AsyncTieredCache
+    
+    HAS_ASYNC_TIERED = True
+    __all__ += ['AsyncTieredCache']
+except ImportError:
+    log.exception("[%s] Failed to import %s from %s (unknown error!)", __name__, 'AsyncTieredCache', f'{__name__}.AsyncTieredCache')
+
+try:
+    from privex.helpers.cache.asyncx.AsyncShardedCache import AsyncShardedCache
+    
+    HAS_ASYNC_SHARDED = True
+    __all__ += ['AsyncShardedCache']
+except ImportError:
+    log.exception("[%s] Failed to import %s from %s (unknown error!)", __name__, 'AsyncShardedCache', f'{__name__}.AsyncShardedCache')
+
 
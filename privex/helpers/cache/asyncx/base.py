@@ -4,14 +4,15 @@ Core classes/functions used by AsyncIO Cache Adapters, including the base class
 """
 import asyncio
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from typing import Any, Dict, Iterable, Mapping, Optional
 
 from privex.helpers.common import empty_if
 from privex.helpers.exceptions import CacheNotFound
 
 from privex.helpers.cache.CacheAdapter import CacheAdapter
 from privex.helpers.settings import DEFAULT_CACHE_TIMEOUT
-from privex.helpers.types import VAL_FUNC_CORO
+from privex.helpers.types import VAL_FUNC_CORO, NO_RESULT
+from privex.helpers.cache.singleflight import async_single_flight, flight_opts
 
 
 class AsyncCacheAdapter(CacheAdapter, ABC):
@@ -56,24 +57,44 @@ class AsyncCacheAdapter(CacheAdapter, ABC):
         self.ins_exit_close = empty_if(exit_close, self.adapter_exit_close)
         super().__init__(*args, **kwargs)
     
-    async def get_or_set(self, key: str, value: VAL_FUNC_CORO, timeout: int = DEFAULT_CACHE_TIMEOUT) -> Any:
-        return await self.get_or_set_async(key=key, value=value, timeout=timeout)
+    async def get_or_set(self, key: str, value: VAL_FUNC_CORO, timeout: int = DEFAULT_CACHE_TIMEOUT, **kwargs) -> Any:
+        return await self.get_or_set_async(key=key, value=value, timeout=timeout, **kwargs)
 
-    async def get_or_set_async(self, key: str, value: VAL_FUNC_CORO, timeout: int = DEFAULT_CACHE_TIMEOUT) -> Any:
-        key, timeout = str(key), int(timeout)
+    async def get_or_set_async(self, key: str, value: VAL_FUNC_CORO, timeout: int = DEFAULT_CACHE_TIMEOUT,
+                               single_flight: Optional[bool] = None, lock_timeout: Optional[float] = None,
+                               distributed_lock: Optional[bool] = None) -> Any:
+        """
+        Attempt to return the value of ``key`` in the cache. If ``key`` doesn't exist or is expired, then it will be
+        set to ``value`` (which may be a plain value, a function, a coroutine function, or a coroutine), and
+        the value will be returned.
+        
+        Pass ``single_flight=True`` to ensure only one coroutine per event loop computes a missing key at a time, and
+        ``distributed_lock=True`` to also hold a lock in the cache backend - see :meth:`.CacheAdapter.get_or_set`
+        """
+        key, timeout = str(key), None if timeout is None else int(timeout)
         try:
-            k = await self.get(key, fail=True)
+            return await self.get(key, fail=True)
         except CacheNotFound:
+            pass
+        
+        async def _compute():
             k = value
-            
             if asyncio.iscoroutinefunction(value):
                 k = await value(key)
-            if asyncio.iscoroutine(value):
+            elif asyncio.iscoroutine(value):
                 k = await value
             elif callable(value):
                 k = value(key)
             await self.set(key=key, value=k, timeout=timeout)
-        return k
+            return k
+        
+        single_flight, lock_timeout, distributed_lock = flight_opts(single_flight, lock_timeout, distributed_lock)
+        if not single_flight:
+            return await _compute()
+        return await async_single_flight(
+            key, lambda: self.get(key, default=NO_RESULT), _compute, adapter=self,
+            lock_timeout=lock_timeout, distributed=distributed_lock
+        )
     
     @abstractmethod
     async def get(self, key: str, default: Any = None, fail: bool = False) -> Any:
@@ -91,6 +112,44 @@ class AsyncCacheAdapter(CacheAdapter, ABC):
     async def update_timeout(self, key: str, timeout: int = DEFAULT_CACHE_TIMEOUT) -> Any:
         raise NotImplemented(f'{self.__class__.__name__} must implement .extend_timeout()')
 
+    async def add(self, key: str, value: Any, timeout: Optional[int] = DEFAULT_CACHE_TIMEOUT) -> bool:
+        """AsyncIO version of :meth:`.CacheAdapter.add` - default implementation is a non-atomic get + set"""
+        key = str(key)
+        if await self.get(key, default=NO_RESULT) is not NO_RESULT:
+            return False
+        await self.set(key, value, timeout=timeout)
+        return True
+
+    async def remove_if(self, key: str, value: Any) -> bool:
+        """AsyncIO version of :meth:`.CacheAdapter.remove_if` - default implementation is a non-atomic get + remove"""
+        key = str(key)
+        if await self.get(key, default=NO_RESULT) != value:
+            return False
+        return await self.remove(key)
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """AsyncIO version of :meth:`.CacheAdapter.get_many` - default implementation awaits :meth:`.get` for each key"""
+        res = {}
+        for k in keys:
+            k = str(k)
+            v = await self.get(k, default=NO_RESULT)
+            if v is not NO_RESULT:
+                res[k] = v
+        return res
+
+    async def set_many(self, mapping: Mapping[str, Any], timeout: Optional[int] = DEFAULT_CACHE_TIMEOUT):
+        """AsyncIO version of :meth:`.CacheAdapter.set_many` - default implementation awaits :meth:`.set` for each key"""
+        for k, v in mapping.items():
+            await self.set(str(k), v, timeout=timeout)
+
+    async def remove_many(self, keys: Iterable[str]) -> int:
+        """AsyncIO version of :meth:`.CacheAdapter.remove_many` - default implementation awaits :meth:`.remove` per key"""
+        removed = 0
+        for k in keys:
+            if await self.remove(k):
+                removed += 1
+        return removed
+
     async def close(self, *args, **kwargs) -> Any:
         """
         Close any cache library connections, and destroy their local class instances by setting them to ``None``.
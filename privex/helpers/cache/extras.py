@@ -2,17 +2,20 @@ import functools
 import threading
 import logging
 import inspect
+import weakref
 from contextlib import contextmanager
-from time import sleep
-from typing import Any, Callable, ContextManager, Set, Type, Union, Optional
+from time import monotonic, sleep
+from typing import Any, Callable, ContextManager, Dict, Set, Tuple, Type, Union, Optional
 
 import attr
-from privex.helpers.common import DictObject, auto_list, empty, empty_if
+from privex.helpers.common import auto_list, empty, empty_if
 from privex.helpers.cache import CacheNotFound, cached
-from privex.helpers.decorators import r_cache, FO
+from privex.helpers.cache.keys import KeyBuilder, encode_key_value
+from privex.helpers.cache.metrics import register_prefix
+from privex.helpers.cache.registry import KeyRegistry, get_key_registry
+from privex.helpers.decorators import r_cache, FO, _format_key
 from privex.helpers.types import AnyNum, AUTO
 from privex.helpers.thread import lock_acquire_timeout
-from privex.helpers.black_magic import caller_name
 
 log = logging.getLogger(__name__)
 
@@ -25,6 +28,17 @@ NO_LOCK = type('NoLock', (), {})
 ANY_LCK = Optional[Union[threading.Lock, Type[NO_LOCK]]]
 
 
+_pending_keys: Dict[str, Set[str]] = {}
+"""Cache key names waiting to be flushed to each key log (keyed by key log name) when batched logging is enabled"""
+_pending_since: Dict[str, float] = {}
+_pending_lock = threading.Lock()
+_generations: "weakref.WeakKeyDictionary[KeyRegistry, Dict[str, Tuple[int, float]]]" = weakref.WeakKeyDictionary()
+"""
+Locally memoized ``(generation, checked_at)`` for each key log name, when generation counters are enabled. Keyed by the
+:class:`.KeyRegistry` (i.e. the cache adapter) first, so switching the global adapter doesn't re-use another adapter's generation.
+"""
+
+
 @contextmanager
 def fake_lock_manager(lock: threading.Lock = None, *args, **kwargs):
     yield True
@@ -96,6 +110,10 @@ def z_cache(cls: CACHE_MGR = None, cache_key: Union[str, callable] = None, cache
     your method's passed arguments and inserting them into the cache key, ensuring method calls with certain arguments, are cached
     separately from other method calls with a different set of arguments.
     
+    Cache settings are read from your class the first time the wrapped method is called for that class, and the resulting
+    :func:`.r_cache` wrapper is re-used for later calls - so settings must be set on the class (not on individual instances),
+    and changing them after the first call won't affect that method.
+    
     Example::
         
         >>> from privex.helpers.cache.extras import CacheManagerMixin, z_cache
@@ -162,114 +180,96 @@ def z_cache(cls: CACHE_MGR = None, cache_key: Union[str, callable] = None, cache
                                    class/instance using the first argument - instead, if ``cls`` isn't passed, it will immediately
                                    fall back to using the original parent class for settings - :class:`.CacheManagerMixin`
     
-    :param opts:                   See the docs for :func:`.r_cache`
+    :param opts:                   See the docs for :func:`.r_cache` - including ``soft_ttl`` (stale-while-revalidate) and
+                                   ``xfetch_beta`` (probabilistic early refresh), which are passed through to :func:`.r_cache`.
+                                   ``cache_time`` remains the hard TTL.
+    
+    :keyword key_builder:          Pass ``True`` (or a :class:`.KeyBuilder`) to generate cache keys by binding the arguments
+                                   to the method's signature with :class:`.KeyBuilder` (see :mod:`privex.helpers.cache.keys`),
+                                   instead of :meth:`.CacheManagerMixin.gen_cache_key`. Defaults to the class's
+                                   :attr:`.CacheManagerMixin.structured_cache_keys`
     :return:
     """
-    f_gen_cache_key = opts.get('gen_cache_key', cls.gen_cache_key if cls is not None else None)
-    f_key_add_prefix = opts.get('key_add_prefix', cls.key_add_prefix if cls is not None else None)
-    
-    def _mk_key(_func: callable, _ck: Union[str, callable] = None, g_cachekey: callable = None, *zargs, **zkwargs):
-        zargs = list(zargs)
-        if _ck in [None, '', b'', False, True, 0, [], ()]:
-            log.debug(" [_mk_key] No cache key specified, generating cache key based on function name + arguments")
-            if len(zargs) > 0 and (inspect.isclass(zargs[0]) or inspect.ismethod(zargs[0])):
-                log.debug(" [_mk_key] First argument appears to be cls/self - popping argument 0 to prevent wasteful cache repr() caching.")
-                zargs.pop(0)
-            gk = g_cachekey(*zargs, _comps_start=_func.__name__, **zkwargs)
-            log.debug(" [_mk_key] Generated cache key: %s", gk)
-            return gk
-        return _ck
-    
-    # Sharing normal variables between the outer z_cache, and the intter wrapper function causes a lot of problems,
-    # however, we're able to share an actual object instance easily - so we use a DictObject to make various variables
-    # available from within the inner wrapper functions.
-    z_opts = DictObject(
-        {
-            'cache_key':     cache_key, 'cache_time': cache_time, 'format_args': format_args, 'format_opt': format_opt,
-            'extract_class': extract_class, 'gen_cache_key': f_gen_cache_key, 'key_add_prefix': f_key_add_prefix,
-            'opts':          dict(opts)
-        }
-    )
-    
-    # _cls = cls
+    opts = dict(opts)
+    f_gen_cache_key, f_key_add_prefix = opts.pop('gen_cache_key', None), opts.pop('key_add_prefix', None)
+    key_builder = opts.pop('key_builder', None)
+    whitelist = opts.get('whitelist', True)
+    fmt_args = [] if not format_args else list(format_args)
+    needs_fmt = not empty(fmt_args, itr=True) or not whitelist
+    
+    def _settings(src) -> CacheSettings:
+        try:
+            cset = CacheSettings.from_class(src)
+        except Exception as e:
+            log.warning(f"Failed to generate CacheSettings object from class object: {src} - reason: {type(e)} {str(e)}")
+            cset = CacheSettings.from_class(CacheManagerMixin)
+        if f_gen_cache_key is not None: cset._gen_cache_key = f_gen_cache_key
+        if f_key_add_prefix is not None: cset._key_add_prefix = f_key_add_prefix
+        return cset
+    
+    def _is_mgr(obj) -> bool:
+        return bool(obj) and (isinstance(obj, type) or isinstance(obj, CacheManagerMixin))
+    
+    def _settings_source(args, kwargs):
+        """Find the class/instance to load cache settings from - ``kwargs['cls']``, then ``args[0]``, then ``kwargs['self']``"""
+        if kwargs:
+            c_cls = kwargs.get('cls')
+            if _is_mgr(c_cls): return c_cls
+        if args and _is_mgr(args[0]): return args[0]
+        if kwargs:
+            c_self = kwargs.get('self')
+            if _is_mgr(c_self): return c_self
+        return None
     
     def _decorator(f):
-        @functools.wraps(f)
-        def wrapper(*args, **kwargs):
-            kwargs = dict(kwargs)
-            z_kwargs = dict(kwargs)
-            zo = DictObject(z_opts)
-            ex_class = zo.pop('extract_class', None)
-            cset: Optional[CacheSettings] = None
-            # gen_cache_key = zo.pop('gen_cache_key', None)
-            # key_add_prefix = zo.pop('key_add_prefix', None)
-            
-            if ex_class:
-                # First check if the first positional argument is a class, or an instance of CacheManagerMixin
-                # If it is, and we don't already have a valid gen_cache_key set, then try to use gen_cache_key from that.
-                if len(args) > 0:
-                    if args[0] and (inspect.isclass(args[0]) or isinstance(args[0], CacheManagerMixin)):
-                        log.debug(" [z_cache] Setting gen_cache_key to 'args[0].gen_cache_key'")
-                        _cls: CacheManagerMixin = args[0]
-                        if cset is None:
-                            try:
-                                cset = CacheSettings.from_class(_cls)
-                            except Exception as e:
-                                log.warning(f"Failed to generate CacheSettings object from class object: {_cls} "
-                                            f"- reason: {type(e)} {str(e)}")
-                            
-                        # key_add_prefix = getattr(args[0], 'key_add_prefix', None) if key_add_prefix is None else key_add_prefix
-                        # gen_cache_key = getattr(args[0], 'gen_cache_key', None) if gen_cache_key is None else gen_cache_key
-                        #
-                # If gen_cache_key is still None, see if 'self' or 'cls' are present in the keyword arguments
-                # Just like with the positional args, we try to extract 'gen_cache_key' from the class/instance if it's possibly.
-                if len(kwargs) > 0:
-                    c_self, c_cls = kwargs.get('self'), kwargs.get('cls')
-                    if c_self and (inspect.isclass(c_self) or isinstance(c_self, CacheManagerMixin)):
-                        log.debug(" [z_cache] Setting gen_cache_key to 'c_self.gen_cache_key' (kwargs['self'])")
-                        if cset is None:
-                            try:
-                                cset = CacheSettings.from_class(c_self)
-                            except Exception as e:
-                                log.warning(f"Failed to generate CacheSettings object from class object: {c_self} "
-                                            f"- reason: {type(e)} {str(e)}")
-                        # key_add_prefix = getattr(c_self, 'key_add_prefix', None) if key_add_prefix is None else key_add_prefix
-                        # gen_cache_key = getattr(c_self, 'gen_cache_key', None) if gen_cache_key is None else gen_cache_key
-                    if c_cls and (inspect.isclass(c_cls) or isinstance(c_cls, CacheManagerMixin)):
-                        log.debug(" [z_cache] Setting gen_cache_key to 'c_cls.gen_cache_key' (kwargs['cls'])")
-                        try:
-                            cset = CacheSettings.from_class(c_cls)
-                        except Exception as e:
-                            log.warning(f"Failed to generate CacheSettings object from class object: {c_cls} "
-                                        f"- reason: {type(e)} {str(e)}")
-                        # key_add_prefix = getattr(c_cls, 'key_add_prefix', None) if key_add_prefix is None else key_add_prefix
-                        # gen_cache_key = getattr(c_cls, 'gen_cache_key', None) if gen_cache_key is None else gen_cache_key
+        compiled: Dict[Any, Callable] = {}
+        """Maps each class (or ``None`` for the fallback settings) to the :func:`.r_cache` wrapped ``f`` using it's settings"""
+        
+        def _compile(src) -> Callable:
+            src = CacheManagerMixin if src is None else src
+            cset = _settings(src)
+            x_ct = cset.default_cache_time if cache_time in [None, AUTO] else cache_time
+            use_kb = getattr(src, 'structured_cache_keys', False) if key_builder is None else key_builder
+            kb = None
+            if use_kb:
+                kb = key_builder.bind(f) if isinstance(key_builder, KeyBuilder) else KeyBuilder(f, sep=cset.cache_sep)
             
-            cset: CacheSettings = CacheSettings.from_class(CacheManagerMixin) if cset is None else cset
-            # zo = DictObject(z_opts)
-            # If gen_cache_key is STILL None, then we fallback to CacheManagerMixin.gen_cache_key
-            # gen_cache_key = CacheManagerMixin.gen_cache_key if gen_cache_key is None else gen_cache_key
-            # If key_add_prefix is STILL None, then we fallback to CacheManagerMixin.key_add_prefix
-            # key_add_prefix = CacheManagerMixin.key_add_prefix if key_add_prefix is None else key_add_prefix
+            def _gen_key(args, kwargs) -> str:
+                if kb is not None:
+                    pfx = src._key_prefix() if hasattr(src, '_key_prefix') else cset.cache_prefix
+                    k = kb.build_key(args, kwargs, prefix=cset.cache_sep.join([pfx, f.__name__]))
+                    # key_add_prefix adds the key to the cache key log
+                    return cset.key_add_prefix(k, auto_prefix=False)
+                zargs = list(args)
+                if len(zargs) > 0 and (isinstance(zargs[0], (type, src)) or inspect.ismethod(zargs[0])):
+                    # First argument appears to be cls/self - popping argument 0 to prevent wasteful cache repr() caching.
+                    zargs.pop(0)
+                return cset.gen_cache_key(*zargs, _comps_start=f.__name__, **kwargs)
             
-            # If the decorator was passed a custom cache_key, then we need to pass it to key_add_prefix to ensure that the
-            # key is both prefixed, and added to the known cache key list for easy removal later on.
-            if zo.get('cache_key') is not None:
-                log.debug(f" [z_cache] Calling key_add_prefix with cache key '{zo.cache_key}' + args ({args}) + kwargs ({kwargs})")
-                # noinspection PyTypeChecker
-                zo.cache_key = cset.key_add_prefix(zo.cache_key, call_args=list(args), call_kwargs=dict(kwargs))
-                log.debug(f" [z_cache] New prefixed cache key is: '{zo.cache_key}'")
-            # We use _mk_key - a wrapper for gen_cache_key, to auto-generate a cache key, depending on if the
-            # passed cache_key was empty.
-            zo.cache_key = _mk_key(f, zo.get('cache_key'), cset.gen_cache_key, *args, **z_kwargs)
+            def _mk_key(*args, **kwargs) -> str:
+                # If the decorator was passed a custom cache_key, then we need to pass it to key_add_prefix to ensure that the
+                # key is both prefixed, and added to the known cache key list for easy removal later on.
+                ck = None
+                if cache_key is not None:
+                    # noinspection PyTypeChecker
+                    ck = cset.key_add_prefix(cache_key, call_args=list(args), call_kwargs=dict(kwargs))
+                if ck in [None, '', b'', False, True, 0, [], ()]:
+                    # No cache key specified, generate cache key based on function name + arguments
+                    ck = _gen_key(args, kwargs)
+                return _format_key(args, kwargs, ck, whitelist, format_opt, fmt_args) if needs_fmt else ck
             
-            x_ck, x_ct = zo.pop('cache_key'), zo.pop('cache_time', None)
-            x_ct = cset.default_cache_time if x_ct in [None, AUTO] else x_ct
-            x_fmtargs, x_fmtopts = zo.pop('format_args', None), zo.pop('format_opt', None)
-            z_kwargs.pop('_func', None), z_kwargs.pop('_ck', None), z_kwargs.pop('g_cachekey', None)
-            log.debug(f" [z_cache] Calling r_cache: {x_ck}, {x_ct}, {x_fmtargs}, {x_fmtopts}, {z_opts.opts}")
-            log.debug(f" [z_cache] func args: {args} || kwargs: {kwargs}")
-            return r_cache(x_ck, x_ct, x_fmtargs, x_fmtopts, **zo.opts)(f)(*args, **kwargs)
+            return r_cache(_mk_key, x_ct, **opts)(f)
+        
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            src = _settings_source(args, kwargs) if extract_class else cls
+            src = cls if src is None else src
+            # Settings are resolved once per class (and read from the class, not the instance), rather than on every call
+            k = src if src is None or isinstance(src, type) else type(src)
+            fn = compiled.get(k)
+            if fn is None:
+                fn = compiled[k] = _compile(k)
+            return fn(*args, **kwargs)
         
         return wrapper
     
@@ -361,8 +361,9 @@ class CacheManagerMixin:
     """
     cache_key_lock: Optional[threading.Lock] = None
     """
-    A :class:`threading.Lock` lock object which is used when adding cache keys to :attr:`.cache_key_log_name` to prevent
-    the risk of two simultaneous cache key additions causing one call to overwrite the other's addition attempt.
+    A :class:`threading.Lock` lock object which is used by :meth:`.clear_cache_keys`. Adding / removing keys from the
+    cache key log doesn't need this lock, as the key registry (see :mod:`privex.helpers.cache.registry`) uses atomic
+    set operations where the cache backend supports them.
     """
     cache_prefix: str = 'pvx_cmgr'
     """The prefix used for all cache keys generated for your class"""
@@ -374,12 +375,40 @@ class CacheManagerMixin:
     """Default number of seconds to cache the log of known cache keys"""
     default_cache_time: Union[float, int] = 300
     """Default number of seconds to cache any objects"""
+    cache_key_log_batch: int = 1
+    """
+    Number of newly created cache key names to collect in memory before writing them to the cache key log in one batch.
+    The default of ``1`` writes each key immediately. Pending keys are always written before the log is read or cleared,
+    and once :attr:`.cache_key_log_interval` seconds have passed since the oldest pending key.
+    """
+    cache_key_log_interval: Union[float, int] = 1.0
+    """Maximum number of seconds a key may wait in the batch before the batch is written (see :attr:`.cache_key_log_batch`)"""
+    cache_key_generations: bool = False
+    """
+    When ``True``, a generation number is embedded in every cache key created for your class, and :meth:`.clear_all_cache_keys`
+    simply increments the generation (``O(1)``) - instantly orphaning every existing key (they expire via their normal timeout),
+    instead of enumerating and deleting them.
+    """
+    cache_key_generation_ttl: Union[float, int] = 1.0
+    """
+    Number of seconds to memoize the generation number locally before re-reading it from the cache. Generation bumps made
+    by other processes may take up to this long to be noticed.
+    """
+    structured_cache_keys: bool = False
+    """
+    When ``True``, :func:`.z_cache` builds cache keys for your methods with :class:`.KeyBuilder` - binding arguments to the
+    method's signature (so defaults and positional / keyword usage don't change the key), and hashing long or complex
+    arguments into fixed-length components. See :mod:`privex.helpers.cache.keys`
+    """
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Group this class's keys under it's cache_prefix in the cache metrics (privex.helpers.cache.metrics)
+        register_prefix(cls.cache_prefix)
     
     @classmethod
     def _get_lock(cls, lock: ANY_LCK = None, timeout=30, fail=True) -> ContextManager:
-        log.debug("Lock requested by caller: %s", caller_name())
         if lock == NO_LOCK:
-            log.debug("Returning fake lock to caller: %s", caller_name())
             return fake_lock_manager()
         if lock is None:
             if cls.cache_key_lock is None:
@@ -387,39 +416,69 @@ class CacheManagerMixin:
                 cls.cache_key_lock = threading.Lock()
             log.debug("Returning cls.cache_key_lock")
             lock = cls.cache_key_lock
-        log.debug("Returning lock_acquire_timeout(%s, timeout=%s, fail=%s)", lock, timeout, fail)
         return lock_acquire_timeout(lock, timeout=timeout, fail=fail)
     
+    @classmethod
+    def _key_log_name(cls) -> str:
+        return cls.cache_sep.join([cls.cache_prefix, cls.cache_key_log_name])
+    
+    @classmethod
+    def cache_registry(cls) -> KeyRegistry:
+        """Returns the :class:`.KeyRegistry` used for the cache key log of the current global cache adapter"""
+        return get_key_registry()
+    
+    @classmethod
+    def cache_generation(cls) -> int:
+        """
+        Returns the current cache key generation for this class (see :attr:`.cache_key_generations`). The generation is
+        memoized locally for :attr:`.cache_key_generation_ttl` seconds.
+        """
+        lk, reg, now = cls._key_log_name(), cls.cache_registry(), monotonic()
+        gens = _generations.setdefault(reg, {})
+        g = gens.get(lk)
+        if g is None or now - g[1] >= cls.cache_key_generation_ttl:
+            g = gens[lk] = (reg.generation(lk), now)
+        return g[0]
+    
+    @classmethod
+    def _key_prefix(cls) -> str:
+        """The prefix for new cache keys - :attr:`.cache_prefix`, plus the current generation if generations are enabled"""
+        if not cls.cache_key_generations:
+            return cls.cache_prefix
+        return cls.cache_sep.join([cls.cache_prefix, f'g{cls.cache_generation()}'])
+    
     @classmethod
     def gen_cache_key(cls, *args, _auto_cache=True, _comps_start: list = None, _comps_end: list = None, **query) -> str:
         _comps_start, _comps_end = auto_list(_comps_start), auto_list(_comps_end)
-        kcomps = [cls.cache_prefix] + _comps_start
+        kcomps = [cls._key_prefix()] + _comps_start
         args, query = list(args), dict(query)
+        # Structured keys encode each value by type (see privex.helpers.cache.keys), so e.g. '1' / 1 and 'a,b' / 'a', 'b'
+        # don't share a key - otherwise values are converted with str(), so existing keys stay the same
+        enc = encode_key_value if cls.structured_cache_keys else str
         if len(args) > 0:  # If there are positional args, join them up with commas and add to kcomps
-            kcomps.append(','.join([str(a) for a in args]))
+            kcomps.append(','.join([enc(a) for a in args]))
         if len(query) > 0:  # if there are kwargs, convert them into a list of strings 'key=value' and merge with kcomps
-            ql = [f'{k}={v}' for k, v in query.items()]
+            ql = [f'{k}={enc(v)}' for k, v in query.items()]
             ql.sort()
             kcomps += ql
         kcomps += _comps_end
         # convert kcomps into a string by joining all items with the configured cache key separator
         k = cls.cache_sep.join(kcomps)
         if _auto_cache:
-            cls.log_cache_key(k)
+            cls._add_cache_key(k)
         return k
     
     @classmethod
     def get_all_cache_keys(cls) -> Set[str]:
         """
-        Retrieve the list of cache keys as a :class:`.set` from the cache key ``'query_cache_keys'`` which
-        stores the list of ``query_hidden:xxx:xxx:xxx`` keys, allowing for easy clearing of those cache keys when needed.
+        Retrieve the set of known cache keys for this class from the cache key log ( :attr:`.cache_key_log_name` ),
+        allowing for easy clearing of those cache keys when needed.
+        
+        Any keys waiting in the log batch (see :attr:`.cache_key_log_batch`) are written to the log first.
         :return:
         """
-        lk = cls.cache_sep.join([cls.cache_prefix, cls.cache_key_log_name])
-        qk = cached.get_or_set(lk, set(), cls.default_cache_key_time)
-        qk = set() if empty(qk, True, True) else qk
-        if isinstance(qk, (list, tuple)): qk = set(qk)
-        return qk
+        cls.flush_cache_key_log()
+        return cls.cache_registry().members(cls._key_log_name())
     
     @classmethod
     def log_cache_key(cls, key: str, _lock: ANY_LCK = None) -> Set[str]:
@@ -427,20 +486,47 @@ class CacheManagerMixin:
         Add a cache key name to the cache key log :attr:`.cache_key_log_name`. This usually doesn't need to be called from outside
         of this class, since most methods which may add or edit a cache key should also insert/update the key into the cache key log.
         
+        The key is added with :meth:`._add_cache_key` - a single set addition in the cache backend - and then the whole key log
+        is read back to be returned. Internal callers use :meth:`._add_cache_key` directly, skipping the read.
+        
         :param str key:  The key to add to the cache key log.
-        :param ANY_LCK _lock:  You may optionally pass a :class:`.Lock` instance if needed, e.g. to prevent a conflict
-                               where the calling function/method has already acquired the class-level lock :attr:`.cache_key_lock`
-                               It can also be set to the dummy type :class:`.NO_LOCK` ``NO_LOCK`` to prevent using a lock.
-        :return Set[str] cache_key_log: The cache key log after adding ``ckeys``
+        :param ANY_LCK _lock:  No longer used, as registry updates are atomic. Kept for backwards compatibility.
+        :return Set[str] cache_key_log: The cache key log after adding ``key``
         """
-        lk = cls.cache_sep.join([cls.cache_prefix, cls.cache_key_log_name])
-        with cls._get_lock(_lock):
-            log.debug(f"Adding cache key '{key}' to list of cached query keys: '{lk}'")
-            keys = cls.get_all_cache_keys()
-            keys.add(key)
-            cached.set(lk, keys, cls.default_cache_key_time)
-            log.debug(f"Successfully added '{key}' to '{lk}' and wrote back to cache. Current key list: {keys}")
-        return keys
+        cls._add_cache_key(key)
+        return cls.get_all_cache_keys()
+    
+    @classmethod
+    def _add_cache_key(cls, key: str):
+        """
+        Add a cache key name to the cache key log, without reading the log back. Each call is a single set addition in the
+        cache backend (e.g. Redis ``SADD``) - or when :attr:`.cache_key_log_batch` is above ``1``, the key is collected in memory
+        and written along with the rest of it's batch.
+        """
+        lk = cls._key_log_name()
+        if cls.cache_key_log_batch <= 1:
+            cls.cache_registry().add(lk, key, timeout=cls.default_cache_key_time)
+            return
+        with _pending_lock:
+            pending = _pending_keys.setdefault(lk, set())
+            if not pending:
+                _pending_since[lk] = monotonic()
+            pending.add(key)
+            due = len(pending) >= cls.cache_key_log_batch or monotonic() - _pending_since[lk] >= cls.cache_key_log_interval
+        if due:
+            cls.flush_cache_key_log()
+    
+    @classmethod
+    def flush_cache_key_log(cls) -> int:
+        """Write any cache key names waiting in the log batch to the cache key log. Returns the number of keys written."""
+        lk = cls._key_log_name()
+        with _pending_lock:
+            pending = _pending_keys.pop(lk, None)
+            _pending_since.pop(lk, None)
+        if not pending:
+            return 0
+        cls.cache_registry().add(lk, *pending, timeout=cls.default_cache_key_time)
+        return len(pending)
     
     @classmethod
     def log_delete_cache_keys(cls, *ckeys: str, _lock: ANY_LCK = None) -> Set[str]:
@@ -450,33 +536,28 @@ class CacheManagerMixin:
         the cache key itself from the global cache.
         
         :param str ckeys:      One or more cache keys to remove from the cache key log
-        :param ANY_LCK _lock:  You may optionally pass a :class:`.Lock` instance if needed, e.g. to prevent a conflict
-                               where the calling function/method has already acquired the class-level lock :attr:`.cache_key_lock`
-                               It can also be set to the dummy type :class:`.NO_LOCK` ``NO_LOCK`` to prevent using a lock.
+        :param ANY_LCK _lock:  No longer used, as registry updates are atomic. Kept for backwards compatibility.
         :return Set[str] cache_key_log: The cache key log after removing ``ckeys``
         """
-        lk = cls.cache_sep.join([cls.cache_prefix, cls.cache_key_log_name])
-        ckeys = list(ckeys)
-        log.debug(f"Removing {len(ckeys)} keys from cache key list. Keys to be removed: {ckeys}")
-        log.debug(f" [log_delete_cache_keys] Obtaining hold on lock: {_lock}")
-        with cls._get_lock(_lock):
-            keys = cls.get_all_cache_keys()
-            for key in ckeys:
-                log.debug(f"Removing cache key '{key}' from list of cached query keys: '{lk}'")
-                if key not in keys:
-                    log.debug(f"The key '{key}' isn't in the key list. Skipping.")
-                    continue
-                keys.remove(key)
-                log.debug(f"Successfully removed '{key}' from '{lk}'.")
-            cached.set(lk, keys, cls.default_cache_key_time)
-            log.debug(
-                f"Finished removing {len(ckeys)} keys from cache key list. Wrote new key list back to cache. "
-                f"Current key list: {keys}")
-        log.debug(f" [log_delete_cache_keys] Releasing hold on lock: {_lock}")
-        return keys
+        cls._remove_cache_keys(*ckeys)
+        return cls.get_all_cache_keys()
     
     log_delete_cache_key = log_delete_cache_keys
     
+    @classmethod
+    def _remove_cache_keys(cls, *ckeys: str) -> int:
+        """
+        Remove cache key names from the cache key log (and the pending log batch), without reading the log back.
+        Returns the number of keys which were removed from the cache key log.
+        """
+        lk = cls._key_log_name()
+        with _pending_lock:
+            pending = _pending_keys.get(lk)
+            if pending:
+                pending.difference_update(ckeys)
+        log.debug("Removing %d keys from cache key log '%s'", len(ckeys), lk)
+        return cls.cache_registry().remove(lk, *ckeys)
+    
     @classmethod
     def cache_set(cls, key: str, value: Any, timeout: Optional[AnyNum] = AUTO, auto_prefix: bool = True):
         """
@@ -578,18 +659,16 @@ class CacheManagerMixin:
         :param dict call_kwargs:   If ``key`` is a callable (e.g. a lambda), ``call_kwargs`` can be set to a :class:`.dict` of
                                    keyword arguments to pass to the callable function ``key``
         
-        :param ANY_LCK _lock:      This method itself does not use a lock, but it calls upon :meth:`.log_cache_key` which does use
-                                   a lock. You may optionally pass a :class:`.Lock` instance if needed, e.g. to prevent a conflict
-                                   where the calling function/method has already acquired the class-level lock.
-                                   It can also be set to the dummy type :class:`.NO_LOCK` ``NO_LOCK`` to prevent using a lock.
+        :param ANY_LCK _lock:      No longer used, as :meth:`.log_cache_key` updates the key registry atomically.
+                                   Kept for backwards compatibility.
         :return str new_key:       The original ``key`` after it may or may not have had a prefix prepended to it.
         """
         if callable(key):
             call_args, call_kwargs = auto_list(call_args), empty_if(call_kwargs, {}, itr=True, zero=True)
             key = key(*call_args, **call_kwargs)
-        key = key if key.startswith(cls.cache_prefix) or not auto_prefix else cls.cache_sep.join([cls.cache_prefix, key])
+        key = key if key.startswith(cls.cache_prefix) or not auto_prefix else cls.cache_sep.join([cls._key_prefix(), key])
         if _auto_cache:   # By default, _auto_cache is enabled, which means we log all created keys to the cache key log
-            cls.log_cache_key(key, _lock=_lock)
+            cls._add_cache_key(key)
         return key
     
     key_add_prefix = _pfx_key
@@ -613,7 +692,7 @@ class CacheManagerMixin:
             if remove_log:
                 log.debug(f" [clear_cache_keys] remove_log is True. Removing {len(pk)} keys from cache key log: {pk}")
                 # nlock = threading.Lock()
-                cls.log_delete_cache_keys(*pk, _lock=NO_LOCK)
+                cls._remove_cache_keys(*pk)
         log.debug(f" [clear_cache_keys] Released hold on lock: {_lock}")
         
         return res
@@ -623,13 +702,24 @@ class CacheManagerMixin:
         """
         Remove all known cache keys related to this class which aren't expired.
         
-        Uses the ``cache key log`` under the class specific key name :attr:`.cache_key_log_name`, which is a cached list
+        Uses the ``cache key log`` under the class specific key name :attr:`.cache_key_log_name`, which is a cached set
         that contains all known cache keys that have been created by this class, whether via :meth:`.cache_set`, or
         using the CacheManager decorator :func:`.z_cache`
+        
+        When :attr:`.cache_key_generations` is enabled, this doesn't enumerate any keys - it increments the class's
+        generation number, so every existing key is no longer used, and empties the cache key log.
         """
+        if cls.cache_key_generations:
+            lk, reg = cls._key_log_name(), cls.cache_registry()
+            with _pending_lock:
+                _pending_keys.pop(lk, None)
+                _pending_since.pop(lk, None)
+            _generations.setdefault(reg, {})[lk] = (reg.bump_generation(lk), monotonic())
+            reg.clear(lk)
+            return True
         keys = list(cls.get_all_cache_keys())
         if len(keys) < 1:
             return "NO_CACHE_KEYS"
-        return cls.clear_cache_keys(*list(cls.get_all_cache_keys()))
+        return cls.clear_cache_keys(*keys)
 
 
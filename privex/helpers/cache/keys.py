@@ -0,0 +1,313 @@
+"""
+Structured cache key building for :func:`.r_cache`, :func:`.r_cache_async` and :func:`.z_cache`
+
+:class:`.KeyBuilder` binds a function's arguments to it's signature (the :class:`inspect.Signature` is resolved once per
+function and cached), so ``func(1)``, ``func(x=1)`` and ``func(1, y=2)`` (where ``y`` defaults to ``2``) all produce the same
+key. Each argument value is converted into a stable string by :func:`.encode_key_value`, and any component longer than
+:attr:`.settings.CACHE_KEY_HASH_THRESHOLD` - or a whole key longer than :attr:`.settings.CACHE_KEY_MAX_LENGTH` - is replaced
+with a fixed-length blake2b hash::
+
+    >>> from privex.helpers.cache.keys import KeyBuilder
+    >>> def get_user(user_id, fields=('id', 'name'), active=True): ...
+    >>> kb = KeyBuilder(get_user, prefix='users')
+    >>> kb(5)
+    "users:user_id=5:fields=('id','name'):active=True"
+    >>> kb(user_id=5) == kb(5, ('id', 'name'))
+    True
+    >>> kb(list(range(1000)))
+    "users:user_id=#6f0b1c...:fields=('id','name'):active=True"
+
+Values are encoded by type, so that different values never produce the same key component - strings are always quoted
+(with any quotes / backslashes inside of them escaped, as :func:`repr` does), so ``'1'`` / ``1``, ``'None'`` / ``None``
+and ``['a,b']`` / ``['a', 'b']`` all encode differently, and other types are tagged with their type name where their
+plain string form could be confused with another type (e.g. ``Decimal('1.5')``, ``date(2020-01-01)``, ``set()``).
+Dict / set items are sorted so their key doesn't depend on insertion order, and objects using the default
+``object.__repr__`` (which contains a memory address) are encoded from their attributes instead.
+Objects which contain themselves (directly or through another container) are encoded as ``<ClassName...>`` where they
+repeat, and values nested deeper than :attr:`.MAX_KEY_DEPTH` levels are encoded by their type and :func:`id` instead.
+Objects may define a ``__cache_key__`` method returning their own key component, and encoders for other types can be
+added with :func:`.register_key_encoder`::
+
+    >>> from privex.helpers.cache.keys import register_key_encoder
+    >>> register_key_encoder(MyModel, lambda m: f'MyModel:{m.pk}')
+
+To use the key builder with the caching decorators, pass ``key_builder=True`` to :func:`.r_cache` /
+:func:`.r_cache_async` / :func:`.z_cache`, or set :attr:`.CacheManagerMixin.structured_cache_keys` on your class.
+
+
+**Copyright**::
+
+        +===================================================+
+        |                 © 2020 Privex Inc.                |
+        |               https://www.privex.io               |
+        +===================================================+
+        |                                                   |
+        |        Originally Developed by Privex Inc.        |
+        |        License: X11 / MIT                         |
+        |                                                   |
+        |        Core Developer(s):                         |
+        |                                                   |
+        |          (+)  Chris (@someguy123) [Privex]        |
+        |          (+)  Kale (@kryogenic) [Privex]          |
+        |                                                   |
+        +===================================================+
+
+    Copyright 2020     Privex Inc.   ( https://www.privex.io )
+
+"""
+import functools
+import hashlib
+import inspect
+import logging
+import threading
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+from uuid import UUID
+
+from privex.helpers import settings
+
+log = logging.getLogger(__name__)
+
+__all__ = [
+    'KEY_DIGEST_SIZE', 'MAX_KEY_DEPTH', 'hash_key_component', 'encode_key_value', 'register_key_encoder', 'KeyBuilder', 'get_signature',
+]
+
+KEY_DIGEST_SIZE = 16
+"""Size of blake2b digests used for hashed key components (in bytes - the hex digest is twice as long)"""
+
+MAX_KEY_DEPTH = 32
+"""Values nested deeper than this many containers / objects are encoded by their type and :func:`id`"""
+
+_ENCODERS: Dict[type, Callable[[Any], str]] = {}
+_resolved: Dict[type, Callable[[Any], str]] = {}
+_encoding = threading.local()
+"""``_encoding.active`` holds the :func:`id` of each container / object currently being encoded in this thread"""
+
+
+def hash_key_component(value: str) -> str:
+    """Hash the string ``value`` into a fixed-length key component, e.g. ``#3b5d...`` (``#`` + 32 hex chars)"""
+    return '#' + hashlib.blake2b(value.encode('utf-8', 'surrogatepass'), digest_size=KEY_DIGEST_SIZE).hexdigest()
+
+
+def register_key_encoder(obj_type: Type, encoder: Callable[[Any], str]):
+    """
+    Use ``encoder`` to convert instances of ``obj_type`` (and sub-classes of it) into cache key components.
+
+    ``encoder`` should return a :class:`str` which is the same for any two values you consider equal. It may call
+    :func:`.encode_key_value` to encode nested values.
+    """
+    _ENCODERS[obj_type] = encoder
+    _resolved.clear()
+
+
+def _encode_seq(value, opening: str, closing: str) -> str:
+    return opening + ','.join(_encode(v) for v in value) + closing
+
+
+def _encode_object(value) -> str:
+    if hasattr(value, '__cache_key__'):
+        return str(value.__cache_key__())
+    cls = type(value)
+    if cls.__repr__ is object.__repr__:
+        # The default repr contains the memory address, which differs between otherwise equal objects / processes
+        attrs = getattr(value, '__dict__', None)
+        if attrs is None:
+            attrs = {k: getattr(value, k) for k in getattr(cls, '__slots__', ()) if hasattr(value, k)}
+        return cls.__qualname__ + _encode(attrs)
+    return repr(value)
+
+
+def _str(value) -> str:
+    return str(value)
+
+
+def _encode_set(value) -> str:
+    # An empty set is 'set()' (like it's repr), so it can't be confused with an empty dict '{}'
+    return '{' + ','.join(sorted(_encode(i) for i in value)) + '}' if value else 'set()'
+
+
+# Strings are the only type encoded with quotes, and repr() escapes any quotes / backslashes inside of them - so separators
+# inside of a string can never be mistaken for the separators between list items / dict entries / key components
+_ENCODERS.update({
+    str: repr, int: _str, bool: _str, type(None): _str,
+    float: repr, Decimal: repr, UUID: repr,
+    bytes: repr, bytearray: repr,
+    datetime: lambda v: f'datetime({v.isoformat()})', date: lambda v: f'date({v.isoformat()})',
+    time: lambda v: f'time({v.isoformat()})',
+    timedelta: lambda v: f'timedelta({v.total_seconds()!r})',
+    Enum: lambda v: f'{type(v).__name__}.{v.name}',
+    list: lambda v: _encode_seq(v, '[', ']'),
+    tuple: lambda v: _encode_seq(v, '(', ')'),
+    set: _encode_set,
+    frozenset: _encode_set,
+    dict: lambda v: '{' + ','.join(sorted(f'{_encode(k)}={_encode(i)}' for k, i in v.items())) + '}',
+    type: lambda v: f'class({v.__module__}.{v.__qualname__})',
+})
+
+
+def _resolve_encoder(cls: type) -> Callable[[Any], str]:
+    enc = _resolved.get(cls)
+    if enc is None:
+        # Enums which mix in another type (e.g. IntEnum) are encoded as enum members, rather than as the mixed in type
+        mro = (cls, Enum) + cls.__mro__[1:] if issubclass(cls, Enum) else cls.__mro__
+        enc = next((_ENCODERS[c] for c in mro if c in _ENCODERS), _encode_object)
+        _resolved[cls] = enc
+    return enc
+
+
+_LEAF_TYPES = frozenset({str, int, bool, type(None), float, Decimal, UUID, bytes, datetime, date, time, timedelta})
+
+
+def _encode(value) -> str:
+    cls = type(value)
+    if cls in _LEAF_TYPES:
+        return _resolve_encoder(cls)(value)
+    active = getattr(_encoding, 'active', None)
+    if active is None:
+        active = _encoding.active = set()
+    vid = id(value)
+    if vid in active:
+        # The value contains itself - encode the repeat as a marker, rather than recursing forever
+        return f'<{cls.__qualname__}...>'
+    if len(active) >= MAX_KEY_DEPTH:
+        return f'<{cls.__qualname__}@{vid:x}>'
+    active.add(vid)
+    try:
+        return _resolve_encoder(cls)(value)
+    finally:
+        active.discard(vid)
+
+
+def encode_key_value(value: Any, hash_threshold: Optional[int] = None) -> str:
+    """
+    Convert ``value`` into a stable string for use as a cache key component. If the encoded string is longer than
+    ``hash_threshold`` (default: :attr:`.settings.CACHE_KEY_HASH_THRESHOLD`), it's hashed with :func:`.hash_key_component`.
+
+        >>> encode_key_value({'b': 2, 'a': [1, 2.5, None], 'c': '1,2'})
+        "{'a'=[1,2.5,None],'b'=2,'c'='1,2'}"
+
+    """
+    hash_threshold = settings.CACHE_KEY_HASH_THRESHOLD if hash_threshold is None else hash_threshold
+    enc = _encode(value)
+    return hash_key_component(enc) if len(enc) > hash_threshold else enc
+
+
+@functools.lru_cache(maxsize=1024)
+def get_signature(func: Callable) -> inspect.Signature:
+    """Returns :func:`inspect.signature` for ``func``, caching it for future calls"""
+    return inspect.signature(func)
+
+
+class KeyBuilder:
+    """
+    Builds cache keys from a function's arguments - see the module docs :mod:`privex.helpers.cache.keys`
+
+    Keys are made up of ``prefix``, followed by a ``name=value`` component for each argument (in the order of the function's
+    parameters, with defaults applied), joined with ``sep``. An argument named ``self`` or ``cls`` in the first position
+    is left out of the key, unless ``skip_self`` is ``False``.
+
+    Instances are callable with the same arguments as the function - ``KeyBuilder(func)(*args, **kwargs)`` - so they can be
+    passed directly as the ``cache_key`` of :func:`.r_cache`.
+    """
+
+    def __init__(self, func: Callable = None, prefix: str = None, sep: str = ':', skip_self: bool = True,
+                 exclude: List[str] = None, hash_threshold: int = None, max_length: int = None):
+        """
+        :param callable func: The function whose arguments are used to build keys. If ``None``, use :meth:`.bind` to create a
+                              builder for a function later on.
+        :param str prefix: Prepended to every key. Defaults to the module and qualified name of ``func``
+        :param str sep: Separator placed between the prefix and each argument component
+        :param bool skip_self: Leave a first argument named ``self`` / ``cls`` out of the key
+        :param list exclude: Names of any other arguments to leave out of the key
+        :param int hash_threshold: (default: :attr:`.settings.CACHE_KEY_HASH_THRESHOLD`) Hash components longer than this
+        :param int max_length: (default: :attr:`.settings.CACHE_KEY_MAX_LENGTH`) If a key is longer than this, all of it's
+                               argument components are hashed together into a single component
+        """
+        self.func, self.sep, self.skip_self = func, sep, skip_self
+        self.exclude = set() if not exclude else set(exclude)
+        self.hash_threshold = settings.CACHE_KEY_HASH_THRESHOLD if hash_threshold is None else hash_threshold
+        self.max_length = settings.CACHE_KEY_MAX_LENGTH if max_length is None else max_length
+        self._prefix = prefix
+        self.prefix = prefix
+        self._names: Tuple[str, ...] = ()
+        self._fast = False
+        if func is not None:
+            self.prefix = f'{func.__module__}.{func.__qualname__}' if prefix is None else prefix
+            self._prepare(get_signature(func))
+
+    def _prepare(self, sig: inspect.Signature):
+        self.signature = sig
+        params = list(sig.parameters.values())
+        skip = set(self.exclude)
+        if self.skip_self and params and params[0].name in ('self', 'cls'):
+            skip.add(params[0].name)
+        self._skip = skip
+        self._names = tuple(p.name for p in params)
+        self._pos_names = tuple(
+            p.name for p in params if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)
+        )
+        self._kw_names = frozenset(p.name for p in params if p.kind in (p.POSITIONAL_OR_KEYWORD, p.KEYWORD_ONLY))
+        self._defaults = {p.name: p.default for p in params if p.default is not p.empty}
+        # Functions without *args / **kwargs / positional-only params can be bound without inspect.Signature.bind
+        self._fast = all(p.kind in (p.POSITIONAL_OR_KEYWORD, p.KEYWORD_ONLY) for p in params)
+
+    def bind(self, func: Callable) -> "KeyBuilder":
+        """Return a copy of this builder for the function ``func``"""
+        return self.__class__(
+            func, prefix=self._prefix, sep=self.sep, skip_self=self.skip_self, exclude=list(self.exclude),
+            hash_threshold=self.hash_threshold, max_length=self.max_length
+        )
+
+    def bound_arguments(self, args: tuple, kwargs: dict) -> List[Tuple[str, Any]]:
+        """Returns ``(name, value)`` for each argument included in the key, in the order of the function's parameters"""
+        if self._fast and len(args) <= len(self._pos_names) and self._kw_names.issuperset(kwargs):
+            vals = dict(self._defaults)
+            vals.update(zip(self._pos_names, args))
+            vals.update(kwargs)
+            if len(vals) == len(self._names):
+                return [(n, vals[n]) for n in self._names if n not in self._skip]
+        # Slow path for *args / **kwargs - also raises TypeError for missing / unexpected arguments
+        bound = self.signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        res = []
+        for n, v in bound.arguments.items():
+            if n in self._skip:
+                continue
+            kind = self.signature.parameters[n].kind
+            if kind == inspect.Parameter.VAR_POSITIONAL:
+                res.extend((f'{n}[{i}]', x) for i, x in enumerate(v))
+            elif kind == inspect.Parameter.VAR_KEYWORD:
+                res.extend((k, v[k]) for k in sorted(v))
+            else:
+                res.append((n, v))
+        return res
+
+    def components(self, args: tuple, kwargs: dict) -> List[str]:
+        """Returns the encoded ``name=value`` components of the key for the given arguments"""
+        threshold = self.hash_threshold
+        return [f'{n}={encode_key_value(v, threshold)}' for n, v in self.bound_arguments(args, kwargs)]
+
+    def build_key(self, args: tuple = (), kwargs: dict = None, prefix: str = None) -> str:
+        """
+        Build the cache key for calling the function with ``args`` / ``kwargs``
+
+        :param tuple args: Positional arguments the function was called with
+        :param dict kwargs: Keyword arguments the function was called with
+        :param str prefix: Override the builder's :attr:`.prefix` for this key
+        """
+        if self.func is None:
+            raise ValueError(f"{self.__class__.__name__} has no function - use .bind(func) to create a builder for a function")
+        prefix = self.prefix if prefix is None else prefix
+        comps = self.components(args, {} if kwargs is None else kwargs)
+        key = self.sep.join([prefix] + comps) if prefix else self.sep.join(comps)
+        if len(key) > self.max_length:
+            key = self.sep.join([prefix, hash_key_component(self.sep.join(comps))]) if prefix else hash_key_component(key)
+        return key
+
+    def __call__(self, *args, **kwargs) -> str:
+        return self.build_key(args, kwargs)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} func={self.func!r} prefix={self.prefix!r}>"
@@ -0,0 +1,489 @@
+"""
+Thread-safe, optionally size-bounded key/value store used as the backend for :class:`.MemoryCache` and
+:class:`.AsyncMemoryCache`.
+
+The store keeps an expiry index (a min-heap ordered by expiration time), so expired keys are reclaimed
+in ``O(log n)`` each time a key is set - without ever scanning the whole cache - rather than only when somebody
+happens to ``get()`` that exact key again.
+
+When ``max_entries`` and/or ``max_bytes`` are set, keys are evicted according to one of the following policies:
+
+    ==============  ====================================================================================================
+    Policy          Description
+    ==============  ====================================================================================================
+    ``lru``         Evict the least recently used key
+    ``lfu``         Evict the least frequently used key - ties are broken by evicting the least recently used key
+    ``tinylfu``     LRU ordering, with a TinyLFU admission filter. Access frequencies (including misses) are estimated
+                    with a small count-min sketch, and a new key only replaces the LRU victim if it has been requested
+                    more often than the victim. Protects the cache from being flushed by one-off keys.
+    ==============  ====================================================================================================
+
+**Basic Usage**::
+
+    >>> from privex.helpers.cache.memstore import MemoryStore
+    >>> st = MemoryStore(max_entries=1000, eviction='lfu')
+    >>> st.set('hello', 'world', timeout=60)
+    >>> st.get_entry('hello').value
+    'world'
+    >>> st.stats()
+    {'hits': 1, 'misses': 0, 'evictions': 0, 'expirations': 0, 'rejections': 0, 'entries': 1, 'bytes': 0, ...}
+
+
+**Copyright**::
+
+        +===================================================+
+        |                 © 2020 Privex Inc.                |
+        |               https://www.privex.io               |
+        +===================================================+
+        |                                                   |
+        |        Originally Developed by Privex Inc.        |
+        |        License: X11 / MIT                         |
+        |                                                   |
+        |        Core Developer(s):                         |
+        |                                                   |
+        |          (+)  Chris (@someguy123) [Privex]        |
+        |          (+)  Kale (@kryogenic) [Privex]          |
+        |                                                   |
+        +===================================================+
+
+    Copyright 2020     Privex Inc.   ( https://www.privex.io )
+
+"""
+import heapq
+import logging
+import math
+import sys
+import threading
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from privex.helpers.collections import DictObject
+
+log = logging.getLogger(__name__)
+
+__all__ = ['MemoryStore', 'CacheEntry', 'NEVER', 'EVICTION_POLICIES', 'default_sizeof']
+
+NEVER = math.inf
+"""
+The :attr:`.CacheEntry.deadline` used for keys which never expire. As it's a float which compares greater than any
+:func:`time.monotonic` value, checking whether an entry has expired is always a single float comparison.
+"""
+
+
+class CacheEntry:
+    """
+    A compact cache entry stored by :class:`.MemoryStore`.
+
+    ``deadline`` is a :func:`time.monotonic` timestamp (unaffected by system clock changes) after which the entry is
+    expired, or :attr:`.NEVER` for keys without a timeout. ``size`` is the estimated size in bytes, which is only
+    calculated when the store has a ``max_bytes`` limit (otherwise it's ``0``).
+    """
+    __slots__ = ('value', 'deadline', 'size')
+
+    def __init__(self, value: Any, deadline: float = NEVER, size: int = 0):
+        self.value, self.deadline, self.size = value, deadline, size
+
+    @property
+    def expired(self) -> bool:
+        return self.deadline < monotonic()
+
+    def __repr__(self):
+        return f'<CacheEntry value={self.value!r} deadline={self.deadline} size={self.size}>'
+
+
+def _deadline(timeout: Optional[float]) -> float:
+    return NEVER if timeout is None else monotonic() + timeout
+
+
+def default_sizeof(key: str, value: Any) -> int:
+    """
+    Estimate the memory used by a cache entry (shallow :func:`sys.getsizeof` of the key plus the value).
+    Used by :class:`.MemoryStore` when ``max_bytes`` is set, unless a custom ``sizeof`` function is passed.
+    """
+    return sys.getsizeof(key) + sys.getsizeof(value)
+
+
+class _LRUPolicy:
+    """Tracks key recency with an :class:`.OrderedDict` - the victim is always the least recently used key"""
+    def __init__(self, capacity: int = 0):
+        self._order = OrderedDict()
+
+    def record(self, key: str):
+        """Called on every lookup (hit or miss) and every insert. Used by admission filters."""
+        pass
+
+    def add(self, key: str):
+        self._order[key] = None
+
+    def touch(self, key: str):
+        self._order.move_to_end(key)
+
+    def remove(self, key: str):
+        self._order.pop(key, None)
+
+    def victim(self, exclude: str = None) -> Optional[str]:
+        for key in self._order:
+            if key != exclude:
+                return key
+        return None
+
+    def admit(self, candidate: str, victim: str) -> bool:
+        return True
+
+    def clear(self):
+        self._order.clear()
+
+
+class _LFUPolicy:
+    """
+    O(1) LFU - keys are grouped into per-frequency buckets (each an :class:`.OrderedDict`, so ties are broken by LRU),
+    and the lowest non-empty frequency is tracked in ``_min``.
+    """
+    def __init__(self, capacity: int = 0):
+        self._freq: Dict[str, int] = {}
+        self._buckets: Dict[int, OrderedDict] = {}
+        self._min = 0
+
+    def record(self, key: str):
+        pass
+
+    def _unlink(self, key: str, freq: int):
+        bucket = self._buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[freq]
+
+    def add(self, key: str):
+        self._freq[key] = 1
+        self._buckets.setdefault(1, OrderedDict())[key] = None
+        self._min = 1
+
+    def touch(self, key: str):
+        f = self._freq[key]
+        self._unlink(key, f)
+        if self._min == f and f not in self._buckets:
+            self._min = f + 1
+        self._freq[key] = f + 1
+        self._buckets.setdefault(f + 1, OrderedDict())[key] = None
+
+    def remove(self, key: str):
+        f = self._freq.pop(key, None)
+        if f is None:
+            return
+        self._unlink(key, f)
+        if self._min == f and f not in self._buckets:
+            self._min = min(self._buckets) if self._buckets else 0
+
+    def victim(self, exclude: str = None) -> Optional[str]:
+        if not self._freq:
+            return None
+        for key in self._buckets[self._min]:
+            if key != exclude:
+                return key
+        # ``exclude`` is the only key with the lowest frequency - fall back to the next lowest frequency bucket
+        nxt = min((f for f in self._buckets if f != self._min), default=None)
+        return None if nxt is None else next(iter(self._buckets[nxt]))
+
+    def admit(self, candidate: str, victim: str) -> bool:
+        return True
+
+    def clear(self):
+        self._freq.clear()
+        self._buckets.clear()
+        self._min = 0
+
+
+class _FrequencySketch:
+    """
+    A 4-row count-min sketch with 4-bit saturating counters (stored in :class:`bytearray`'s), used to estimate how often a key
+    has been requested. All counters are halved once ``10 * capacity`` increments have happened, so that old popularity
+    decays over time.
+    """
+    _seeds = (0x9E3779B1, 0x85EBCA77, 0xC2B2AE3D, 0x27D4EB2F)
+
+    def __init__(self, capacity: int):
+        capacity = max(int(capacity), 16)
+        width = 1 << (capacity * 4 - 1).bit_length()
+        self._mask = width - 1
+        self._rows = [bytearray(width) for _ in self._seeds]
+        self._sample_size = capacity * 10
+        self._additions = 0
+
+    def _indexes(self, key: str):
+        h = hash(key)
+        return [((h * s) >> 16) & self._mask for s in self._seeds]
+
+    def increment(self, key: str):
+        for row, i in zip(self._rows, self._indexes(key)):
+            if row[i] < 15:
+                row[i] += 1
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._rows = [bytearray(c >> 1 for c in row) for row in self._rows]
+            self._additions //= 2
+
+    def estimate(self, key: str) -> int:
+        return min(row[i] for row, i in zip(self._rows, self._indexes(key)))
+
+
+class _TinyLFUPolicy(_LRUPolicy):
+    """LRU ordering, with admission of new keys decided by comparing :class:`._FrequencySketch` estimates"""
+    def __init__(self, capacity: int = 0):
+        super().__init__(capacity)
+        self._capacity = capacity
+        self._sketch = _FrequencySketch(capacity or 1024)
+
+    def record(self, key: str):
+        self._sketch.increment(key)
+
+    def admit(self, candidate: str, victim: str) -> bool:
+        return self._sketch.estimate(candidate) > self._sketch.estimate(victim)
+
+    def clear(self):
+        super().clear()
+        self._sketch = _FrequencySketch(self._capacity or 1024)
+
+
+EVICTION_POLICIES = {
+    'lru': _LRUPolicy,
+    'lfu': _LFUPolicy,
+    'tinylfu': _TinyLFUPolicy,
+}
+"""Maps eviction policy names accepted by :class:`.MemoryStore` to their implementation classes"""
+
+
+class MemoryStore:
+    """
+    A thread-safe in-memory key/value store with expiration, an ``O(log n)`` expiry index, and optional
+    entry count / byte size bounds enforced by an LRU, LFU or TinyLFU eviction policy.
+
+    Entries are stored as :class:`.CacheEntry` objects, with a :func:`time.monotonic` based expiry deadline.
+
+    When neither ``max_entries`` nor ``max_bytes`` are set, the store is unbounded, and no recency / frequency
+    bookkeeping is done - expired keys are still reclaimed via the expiry index.
+
+    All methods are protected by a re-entrant lock, so a single store can safely be shared between threads (and
+    between :class:`.MemoryCache` instances).
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None, eviction: str = 'lru',
+                 sizeof: Callable[[str, Any], int] = default_sizeof):
+        """
+        :param int max_entries: Maximum number of keys to hold before evicting. ``None`` / ``0`` = no limit.
+        :param int max_bytes: Maximum approximate size of all keys + values (as measured by ``sizeof``) before
+                              evicting. ``None`` / ``0`` = no limit.
+        :param str eviction: The eviction policy to use when bounded - ``lru``, ``lfu`` or ``tinylfu``
+        :raises ValueError: When ``eviction`` isn't one of :attr:`.EVICTION_POLICIES`
+        :param callable sizeof: A function ``(key, value) -> int`` used to estimate the size of an entry in bytes.
+                                Only called when ``max_bytes`` is set.
+        """
+        eviction = str(eviction).lower()
+        if eviction not in EVICTION_POLICIES:
+            raise ValueError(f'Invalid eviction policy "{eviction}". Valid policies: {list(EVICTION_POLICIES.keys())}')
+        self.max_entries = int(max_entries) if max_entries else 0
+        self.max_bytes = int(max_bytes) if max_bytes else 0
+        self.eviction = eviction
+        self.sizeof = sizeof
+        self._policy = None
+        if self.bounded:
+            self._policy = EVICTION_POLICIES[eviction](self.max_entries or 1024)
+
+        self._data: Dict[str, CacheEntry] = {}
+        self._expiry: List[Tuple[float, str]] = []
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.hits = self.misses = self.evictions = self.expirations = self.rejections = 0
+
+    @property
+    def bounded(self) -> bool:
+        """``True`` if this store has an entry count or byte size limit"""
+        return bool(self.max_entries or self.max_bytes)
+
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        """
+        Return the :class:`.CacheEntry` for ``key``, or ``None`` if it doesn't exist / has expired (expired entries
+        are removed immediately).
+        """
+        with self._lock:
+            p = self._policy
+            if p is not None:
+                p.record(key)
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.deadline < monotonic():
+                log.debug('Cache key "%s" has expired. Removing from cache.', key)
+                self._drop(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self.hits += 1
+            if p is not None:
+                p.touch(key)
+            return entry
+
+    def set(self, key: str, value: Any, timeout: Optional[float]) -> Optional[CacheEntry]:
+        """
+        Set ``key`` to ``value``, expiring ``timeout`` seconds from now (``None`` = never expire). Also reclaims any keys
+        which have expired.
+
+        :return CacheEntry|None entry: The stored entry, or ``None`` if the key was rejected by the eviction policy (e.g. TinyLFU
+                                 decided it's less popular than the victim, or a single entry is larger than ``max_bytes``)
+        """
+        with self._lock:
+            self._purge(monotonic())
+            size = self.sizeof(key, value) if self.max_bytes else 0
+            old = self._data.get(key)
+            p = self._policy
+            if old is not None:
+                self._bytes -= old.size
+                if p is not None:
+                    p.touch(key)
+            elif p is not None:
+                p.record(key)
+                if not self._make_room(key, size):
+                    self.rejections += 1
+                    return None
+                p.add(key)
+
+            entry = CacheEntry(value, _deadline(timeout), size)
+            self._data[key] = entry
+            self._bytes += size
+            self._index(key, entry.deadline)
+            if old is not None and self.max_bytes:
+                self._shrink(exclude=key)
+            return entry
+
+    def add(self, key: str, value: Any, timeout: Optional[float]) -> bool:
+        """Atomically set ``key`` only if it doesn't already exist (or has expired). Returns ``True`` if it was set."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry.deadline >= monotonic():
+                return False
+            return self.set(key, value, timeout) is not None
+
+    def touch(self, key: str, timeout: Optional[float]) -> Optional[CacheEntry]:
+        """Reset the expiration of an existing (non-expired) ``key`` to ``timeout`` seconds from now (``None`` = never)"""
+        with self._lock:
+            entry = self.get_entry(key)
+            if entry is None:
+                return None
+            entry.deadline = _deadline(timeout)
+            self._index(key, entry.deadline)
+            return entry
+
+    def delete(self, key: str) -> bool:
+        """Remove ``key`` from the store. Returns ``True`` if it existed."""
+        with self._lock:
+            if key not in self._data:
+                return False
+            self._drop(key)
+            return True
+
+    def delete_if(self, key: str, value: Any) -> bool:
+        """Atomically remove ``key`` only if it hasn't expired, and it's value equals ``value``. Returns ``True`` if it was removed."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry.deadline < monotonic() or entry.value != value:
+                return False
+            self._drop(key)
+            return True
+
+    def purge_expired(self) -> int:
+        """Remove all keys which have expired, returning the number of keys removed"""
+        with self._lock:
+            return self._purge(monotonic())
+
+    def clear(self):
+        """Remove every key from the store (counters are left untouched, see :meth:`.reset_stats`)"""
+        with self._lock:
+            self._data.clear()
+            self._expiry.clear()
+            self._bytes = 0
+            if self._policy is not None:
+                self._policy.clear()
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = self.evictions = self.expirations = self.rejections = 0
+
+    def stats(self) -> DictObject:
+        """
+        Return a :class:`.DictObject` containing the hit / miss / eviction / expiration / rejection counters, along with
+        the current number of entries, their approximate size in bytes, and the configured limits.
+        """
+        with self._lock:
+            return DictObject(
+                hits=self.hits, misses=self.misses, evictions=self.evictions, expirations=self.expirations,
+                rejections=self.rejections, entries=len(self._data), bytes=self._bytes,
+                max_entries=self.max_entries, max_bytes=self.max_bytes, eviction=self.eviction,
+            )
+
+    def _index(self, key: str, deadline: float):
+        if deadline == NEVER:
+            return
+        heapq.heappush(self._expiry, (deadline, key))
+        # Overwritten / removed keys leave stale items in the heap, which are skipped lazily in _purge. Once the
+        # stale items outnumber the live ones, rebuild the heap from the live entries.
+        if len(self._expiry) > 2 * len(self._data) + 64:
+            self._expiry = [(e.deadline, k) for k, e in self._data.items() if e.deadline != NEVER]
+            heapq.heapify(self._expiry)
+
+    def _purge(self, now: float) -> int:
+        heap, data, removed = self._expiry, self._data, 0
+        while heap and heap[0][0] < now:
+            deadline, key = heapq.heappop(heap)
+            entry = data.get(key)
+            # Skip stale heap items for keys which were removed, or have been re-set / touched since
+            if entry is None or entry.deadline != deadline:
+                continue
+            self._drop(key)
+            removed += 1
+        self.expirations += removed
+        return removed
+
+    def _drop(self, key: str):
+        entry = self._data.pop(key)
+        self._bytes -= entry.size
+        if self._policy is not None:
+            self._policy.remove(key)
+
+    def _over(self, extra_entries: int = 0, extra_bytes: int = 0) -> bool:
+        if self.max_entries and len(self._data) + extra_entries > self.max_entries:
+            return True
+        return bool(self.max_bytes and self._bytes + extra_bytes > self.max_bytes)
+
+    def _make_room(self, key: str, size: int) -> bool:
+        """Evict keys until a new entry ``key`` of ``size`` bytes fits. Returns ``False`` if it shouldn't be admitted."""
+        if self.max_bytes and size > self.max_bytes:
+            return False
+        p = self._policy
+        while self._over(1, size):
+            victim = p.victim()
+            if victim is None:
+                break
+            if not p.admit(key, victim):
+                return False
+            self._drop(victim)
+            self.evictions += 1
+        return True
+
+    def _shrink(self, exclude: str):
+        """Evict keys (other than ``exclude``) while the store is over its byte budget"""
+        p = self._policy
+        while self._over():
+            victim = p.victim(exclude)
+            if victim is None:
+                break
+            self._drop(victim)
+            self.evictions += 1
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and entry.deadline >= monotonic()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,615 @@
+"""
+Instrumentation for cache adapters - per-adapter hit / miss / set / eviction / error counters, bytes read and written,
+and latency histograms for each operation, broken down by key prefix.
+
+Instrumentation is opt-in. An adapter is only instrumented when you call :func:`.instrument` on it, or when
+:attr:`privex.helpers.settings.CACHE_METRICS` is ``True`` when it's constructed - in which case the adapter's methods are
+wrapped on that instance only. Adapters which aren't instrumented are never touched, so there's no overhead at all
+when metrics are disabled.
+
+**Basic Usage**::
+
+    >>> from privex.helpers.cache import MemoryCache
+    >>> from privex.helpers.cache.metrics import instrument, metrics_snapshot
+    >>> c = MemoryCache()
+    >>> m = instrument(c)
+    >>> c.set('myapp:hello', 'world')
+    >>> c.get('myapp:hello'), c.get('myapp:missing')
+    ('world', None)
+    >>> snap = m.snapshot()
+    >>> snap['hits'], snap['misses'], snap['sets']
+    (1, 1, 1)
+    >>> snap['prefixes']['myapp']['latency']['get']['count']
+    2
+    >>> metrics_snapshot()        # Snapshots of every instrumented adapter, keyed by adapter name
+    {'MemoryCache': {'adapter': 'MemoryCache', 'hits': 1, ...}}
+
+Key prefixes are the part of a key before the first ``:``, unless the key starts with a prefix registered using
+:func:`.register_prefix` - every :class:`.CacheManagerMixin` sub-class registers it's :attr:`.CacheManagerMixin.cache_prefix`
+automatically.
+
+**Exporting metrics**
+
+Hooks added with :func:`.add_metrics_hook` are called with ``(metric, value, tags)`` for every recorded event, allowing
+metrics to be pushed to StatsD, Prometheus, etc. Ready-made hooks are available for StatsD-style clients
+(:func:`.statsd_hook`) and ``prometheus_client`` (:func:`.prometheus_hook`)::
+
+    >>> import statsd
+    >>> add_metrics_hook(statsd_hook(statsd.StatsClient('localhost', 8125)))
+    >>> add_metrics_hook(prometheus_hook())
+
+
+**Copyright**::
+
+        +===================================================+
+        |                 © 2020 Privex Inc.                |
+        |               https://www.privex.io               |
+        +===================================================+
+        |                                                   |
+        |        Originally Developed by Privex Inc.        |
+        |        License: X11 / MIT                         |
+        |                                                   |
+        |        Core Developer(s):                         |
+        |                                                   |
+        |          (+)  Chris (@someguy123) [Privex]        |
+        |          (+)  Kale (@kryogenic) [Privex]          |
+        |                                                   |
+        +===================================================+
+
+    Copyright 2020     Privex Inc.   ( https://www.privex.io )
+
+"""
+import functools
+import inspect
+import logging
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from privex.helpers import settings
+from privex.helpers.exceptions import CacheNotFound
+
+log = logging.getLogger(__name__)
+
+try:
+    import prometheus_client
+    HAS_PROMETHEUS = True
+except ImportError:
+    prometheus_client = None
+    HAS_PROMETHEUS = False
+    log.debug('%s failed to import "prometheus_client", prometheus_hook will be unavailable.', __name__)
+
+__all__ = [
+    'DEFAULT_BUCKETS', 'INSTRUMENTED_METHODS', 'LatencyHistogram', 'CacheMetrics', 'instrument', 'uninstrument', 'get_metrics',
+    'metrics_snapshot', 'reset_metrics', 'register_prefix', 'key_prefix', 'add_metrics_hook', 'remove_metrics_hook',
+    'statsd_hook', 'prometheus_hook', 'HAS_PROMETHEUS'
+]
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0
+)
+"""Upper bounds (in seconds) of the latency histogram buckets - an extra ``+Inf`` bucket catches anything slower"""
+
+INSTRUMENTED_METHODS: Tuple[str, ...] = (
+    'get', 'set', 'add', 'remove', 'update_timeout', 'get_many', 'set_many', 'remove_many'
+)
+"""
+The adapter methods wrapped by :func:`.instrument`. Composite methods such as ``get_or_set`` are measured through the
+``get`` / ``set`` calls they make.
+"""
+
+NO_PREFIX = '__none__'
+"""Prefix label used for keys which don't contain a prefix"""
+
+OTHER_PREFIX = '__other__'
+"""Prefix label used once an adapter is tracking :attr:`.settings.CACHE_METRICS_MAX_PREFIXES` distinct prefixes"""
+
+_MISS = object()
+
+_active: ContextVar[Optional['CacheMetrics']] = ContextVar('pvx_cache_metrics_active', default=None)
+"""
+The metrics of the instrumented call currently running in this context - calls an adapter makes to it's own instrumented
+methods (e.g. a ``get_many`` implemented by calling ``get`` for each key) pass straight through, so they aren't counted twice.
+"""
+
+_PREFIXES: List[str] = []
+_HOOKS: List[Callable[[str, float, Dict[str, str]], Any]] = []
+_INSTRUMENTED = weakref.WeakSet()
+_lock = threading.Lock()
+
+
+class LatencyHistogram:
+    """
+    A fixed-bucket latency histogram (Prometheus style). Observations are counted in the first bucket whose upper bound
+    is greater than or equal to the observed duration.
+    """
+    __slots__ = ('buckets', 'counts', 'count', 'total', 'max')
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count, self.total, self.max = 0, 0.0, 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """Estimate the ``q`` quantile (e.g. ``0.99``) - returns the upper bound of the bucket the quantile falls in"""
+        if self.count == 0:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank and c > 0:
+                return min(self.buckets[i], self.max) if i < len(self.buckets) else self.max
+        return self.max
+
+    def snapshot(self) -> dict:
+        cumulative, seen = {}, 0
+        for le, c in zip(self.buckets + ('+Inf',), self.counts):
+            seen += c
+            cumulative[str(le)] = seen
+        return dict(
+            count=self.count, sum=self.total, max=self.max, mean=self.total / self.count if self.count else 0.0,
+            p50=self.quantile(0.5), p90=self.quantile(0.9), p99=self.quantile(0.99), buckets=cumulative,
+        )
+
+
+class _Stats:
+    __slots__ = ('hits', 'misses', 'sets', 'errors', 'latency', 'buckets')
+
+    def __init__(self, buckets: Sequence[float]):
+        self.hits = self.misses = self.sets = self.errors = 0
+        self.latency: Dict[str, LatencyHistogram] = {}
+        self.buckets = buckets
+
+    def add(self, op: str, duration: float, hits: int, misses: int, sets: int, errors: int):
+        self.hits += hits
+        self.misses += misses
+        self.sets += sets
+        self.errors += errors
+        h = self.latency.get(op)
+        if h is None:
+            h = self.latency[op] = LatencyHistogram(self.buckets)
+        h.observe(duration)
+
+    def snapshot(self) -> dict:
+        lookups = self.hits + self.misses
+        return dict(
+            hits=self.hits, misses=self.misses, hit_ratio=self.hits / lookups if lookups else 0.0, sets=self.sets,
+            errors=self.errors, latency={op: h.snapshot() for op, h in self.latency.items()},
+        )
+
+
+class CacheMetrics:
+    """
+    The metrics recorded for a single instrumented adapter - returned by :func:`.instrument` / :func:`.get_metrics`.
+    Use :meth:`.snapshot` to get a plain ``dict`` of the current values.
+    """
+    def __init__(self, name: str, buckets: Sequence[float] = DEFAULT_BUCKETS, max_prefixes: int = None):
+        self.name = name
+        self.buckets = tuple(buckets)
+        self.max_prefixes = settings.CACHE_METRICS_MAX_PREFIXES if max_prefixes is None else max_prefixes
+        self.eviction_source: Optional[Callable[[], int]] = None
+        """Optional function returning the number of evictions by the adapter's backend (e.g. :class:`.MemoryStore`)"""
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Reset every counter and histogram to zero"""
+        with self._lock:
+            self.since = time.time()
+            self.evictions = self.bytes_read = self.bytes_written = 0
+            self._eviction_base = self._source_evictions()
+            self._total = _Stats(self.buckets)
+            self._prefixes: Dict[str, _Stats] = {}
+
+    def _source_evictions(self) -> int:
+        try:
+            return self.eviction_source() if self.eviction_source is not None else 0
+        except Exception:
+            return 0
+
+    def _prefix_stats(self, prefix: str) -> _Stats:
+        st = self._prefixes.get(prefix)
+        if st is None:
+            if len(self._prefixes) >= self.max_prefixes:
+                prefix = OTHER_PREFIX
+                st = self._prefixes.get(prefix)
+            if st is None:
+                st = self._prefixes[prefix] = _Stats(self.buckets)
+        return st
+
+    def record(self, op: str, duration: float, key: Any = None, hits: int = 0, misses: int = 0, sets: int = 0,
+               errors: int = 0):
+        """Record a single call of the adapter method ``op`` which took ``duration`` seconds"""
+        prefix = key_prefix(key)
+        with self._lock:
+            self._total.add(op, duration, hits, misses, sets, errors)
+            self._prefix_stats(prefix).add(op, duration, hits, misses, sets, errors)
+        if len(_HOOKS) > 0:
+            result = 'error' if errors else ('miss' if misses and not hits else ('hit' if hits else 'ok'))
+            tags = dict(adapter=self.name, op=op, prefix=prefix, result=result)
+            _emit('cache.latency', duration, tags)
+            for metric, n in (('cache.hits', hits), ('cache.misses', misses), ('cache.sets', sets), ('cache.errors', errors)):
+                if n: _emit(metric, n, tags)
+
+    def record_bytes(self, read: int = 0, written: int = 0):
+        with self._lock:
+            self.bytes_read += read
+            self.bytes_written += written
+        if len(_HOOKS) > 0:
+            if read: _emit('cache.bytes_read', read, dict(adapter=self.name))
+            if written: _emit('cache.bytes_written', written, dict(adapter=self.name))
+
+    def record_eviction(self, count: int = 1):
+        """Record evictions which the adapter can't report via :attr:`.eviction_source`"""
+        with self._lock:
+            self.evictions += count
+
+    def snapshot(self) -> dict:
+        """
+        Return the current metrics as a ``dict`` - the adapter wide counters, a ``latency`` dict of histogram snapshots
+        keyed by operation, and a ``prefixes`` dict containing the same counters and histograms for each key prefix.
+        """
+        with self._lock:
+            evictions = self.evictions + self._source_evictions() - self._eviction_base
+            return dict(
+                adapter=self.name, since=self.since, **self._total.snapshot(), evictions=evictions,
+                bytes_read=self.bytes_read, bytes_written=self.bytes_written,
+                prefixes={p: st.snapshot() for p, st in self._prefixes.items()},
+            )
+
+    def __repr__(self):
+        t = self._total
+        return f"<CacheMetrics adapter='{self.name}' hits={t.hits} misses={t.misses} sets={t.sets} errors={t.errors}>"
+
+
+def register_prefix(prefix: str):
+    """
+    Register a known key prefix, so keys starting with ``prefix`` are grouped under it in the per-prefix metrics
+    (instead of the portion of the key before the first ``:``). The longest matching registered prefix wins.
+    """
+    with _lock:
+        if prefix and prefix not in _PREFIXES:
+            _PREFIXES.append(prefix)
+            _PREFIXES.sort(key=len, reverse=True)
+
+
+def key_prefix(key: Any, sep: str = ':') -> str:
+    """Return the metrics prefix label for the cache key ``key`` - see :func:`.register_prefix`"""
+    if key is None:
+        return NO_PREFIX
+    key = key.decode('utf-8', 'replace') if isinstance(key, bytes) else str(key)
+    for p in _PREFIXES:
+        if key.startswith(p):
+            return p
+    return key.split(sep, 1)[0] if sep in key else NO_PREFIX
+
+
+def add_metrics_hook(hook: Callable[[str, float, Dict[str, str]], Any]):
+    """
+    Add a hook which is called with ``(metric, value, tags)`` for each event recorded by any instrumented adapter:
+
+      * ``cache.latency`` - the duration of an operation in seconds, tagged with ``adapter``, ``op``, ``prefix`` and ``result``
+        (``hit`` / ``miss`` / ``ok`` / ``error``)
+      * ``cache.hits`` / ``cache.misses`` / ``cache.sets`` / ``cache.errors`` - counts, with the same tags as ``cache.latency``
+      * ``cache.bytes_read`` / ``cache.bytes_written`` - serialized value sizes, tagged with ``adapter``
+
+    Exceptions raised by hooks are logged and ignored.
+    """
+    with _lock:
+        if hook not in _HOOKS:
+            _HOOKS.append(hook)
+
+
+def remove_metrics_hook(hook: Callable) -> bool:
+    with _lock:
+        if hook in _HOOKS:
+            _HOOKS.remove(hook)
+            return True
+    return False
+
+
+def _emit(metric: str, value: float, tags: Dict[str, str]):
+    for h in list(_HOOKS):
+        try:
+            h(metric, value, tags)
+        except Exception as e:
+            log.warning("Cache metrics hook %s raised an exception: %s %s", h, type(e), str(e))
+
+
+def statsd_hook(client, prefix: str = 'privex.cache') -> Callable[[str, float, Dict[str, str]], None]:
+    """
+    Create a metrics hook for a StatsD-style client (any object with ``timing(name, ms)`` and ``incr(name, count)``,
+    e.g. ``statsd.StatsClient``). Metric names are ``{prefix}.{adapter}.{op}`` for timings, and
+    ``{prefix}.{adapter}.{hits|misses|sets|errors|bytes_read|bytes_written}`` for counters.
+
+        >>> add_metrics_hook(statsd_hook(statsd.StatsClient('localhost', 8125), prefix='myapp.cache'))
+
+    """
+    def _hook(metric: str, value: float, tags: Dict[str, str]):
+        name = f"{prefix}.{tags['adapter']}"
+        if metric == 'cache.latency':
+            return client.timing(f"{name}.{tags['op']}", value * 1000)
+        return client.incr(f"{name}.{metric.split('.', 1)[1]}", value)
+    return _hook
+
+
+def prometheus_hook(namespace: str = 'privex_cache', registry=None,
+                    buckets: Sequence[float] = DEFAULT_BUCKETS) -> Callable[[str, float, Dict[str, str]], None]:
+    """
+    Create a metrics hook which records into ``prometheus_client`` metrics (requires the ``prometheus_client`` package):
+
+      * ``{namespace}_op_duration_seconds`` - histogram, labelled by ``adapter``, ``op``, ``prefix`` and ``result``
+      * ``{namespace}_hits_total`` / ``_misses_total`` / ``_sets_total`` / ``_errors_total`` - counters, labelled by ``adapter``
+        and ``prefix``
+      * ``{namespace}_read_bytes_total`` / ``_written_bytes_total`` - counters, labelled by ``adapter``
+
+    :param str namespace: Prefix for the metric names
+    :param registry: The ``prometheus_client`` registry to register the metrics with (default: the global ``REGISTRY``)
+    :param buckets: Histogram bucket upper bounds in seconds
+    """
+    if not HAS_PROMETHEUS:
+        raise ImportError(f"prometheus_hook requires the package 'prometheus_client' - please install it (pip3 install prometheus_client)")
+    kw = {} if registry is None else dict(registry=registry)
+    latency = prometheus_client.Histogram(
+        f'{namespace}_op_duration_seconds', 'Cache operation latency', ['adapter', 'op', 'prefix', 'result'], buckets=buckets, **kw
+    )
+    counters = {
+        f'cache.{n}': prometheus_client.Counter(f'{namespace}_{n}', f'Cache {n}', ['adapter', 'prefix'], **kw)
+        for n in ('hits', 'misses', 'sets', 'errors')
+    }
+    byte_counters = {
+        'cache.bytes_read': prometheus_client.Counter(f'{namespace}_read_bytes', 'Bytes read from the cache', ['adapter'], **kw),
+        'cache.bytes_written': prometheus_client.Counter(f'{namespace}_written_bytes', 'Bytes written to the cache', ['adapter'], **kw),
+    }
+
+    def _hook(metric: str, value: float, tags: Dict[str, str]):
+        if metric == 'cache.latency':
+            return latency.labels(tags['adapter'], tags['op'], tags['prefix'], tags['result']).observe(value)
+        if metric in counters:
+            return counters[metric].labels(tags['adapter'], tags['prefix']).inc(value)
+        if metric in byte_counters:
+            return byte_counters[metric].labels(tags['adapter']).inc(value)
+    return _hook
+
+
+def _key_of(op: str, args: tuple, kwargs: dict) -> Any:
+    if op == 'set_many':
+        mapping = args[0] if len(args) > 0 else kwargs.get('mapping', {})
+        return next(iter(mapping), None)
+    if op in ('get_many', 'remove_many'):
+        keys = args[0] if len(args) > 0 else kwargs.get('keys', [])
+        return keys[0] if len(keys) > 0 else None
+    if len(args) > 0:
+        return args[0]
+    return kwargs.get('key')
+
+
+def _counts(op: str, res: Any, args: tuple, kwargs: dict) -> dict:
+    if op == 'get_many':
+        keys = args[0] if len(args) > 0 else kwargs.get('keys', [])
+        return dict(hits=len(res), misses=len(keys) - len(res))
+    if op == 'set':
+        return dict(sets=1)
+    if op == 'add':
+        return dict(sets=1 if res else 0)
+    if op == 'set_many':
+        return dict(sets=len(args[0] if len(args) > 0 else kwargs.get('mapping', {})))
+    return {}
+
+
+def _bind_get(args: tuple, kwargs: dict) -> Tuple[Any, Any, bool]:
+    key = args[0] if len(args) > 0 else kwargs['key']
+    default = args[1] if len(args) > 1 else kwargs.get('default')
+    fail = args[2] if len(args) > 2 else kwargs.get('fail', False)
+    return key, default, fail
+
+
+def _wrap_get(m: CacheMetrics, orig: Callable) -> Callable:
+    if inspect.iscoroutinefunction(orig):
+        @functools.wraps(orig)
+        async def get(*args, **kwargs):
+            if _active.get() is m:
+                return await orig(*args, **kwargs)
+            key, default, fail = _bind_get(args, kwargs)
+            token, start = _active.set(m), perf_counter()
+            try:
+                res = await orig(key, default=_MISS, fail=fail)
+            except CacheNotFound:
+                m.record('get', perf_counter() - start, key, misses=1)
+                raise
+            except Exception:
+                m.record('get', perf_counter() - start, key, errors=1)
+                raise
+            finally:
+                _active.reset(token)
+            hit = res is not _MISS
+            m.record('get', perf_counter() - start, key, hits=int(hit), misses=int(not hit))
+            return res if hit else default
+        return get
+
+    @functools.wraps(orig)
+    def get(*args, **kwargs):
+        if _active.get() is m:
+            return orig(*args, **kwargs)
+        key, default, fail = _bind_get(args, kwargs)
+        token, start = _active.set(m), perf_counter()
+        try:
+            res = orig(key, default=_MISS, fail=fail)
+        except CacheNotFound:
+            m.record('get', perf_counter() - start, key, misses=1)
+            raise
+        except Exception:
+            m.record('get', perf_counter() - start, key, errors=1)
+            raise
+        finally:
+            _active.reset(token)
+        hit = res is not _MISS
+        m.record('get', perf_counter() - start, key, hits=int(hit), misses=int(not hit))
+        return res if hit else default
+    return get
+
+
+def _wrap_op(m: CacheMetrics, op: str, orig: Callable) -> Callable:
+    def _prep(args: tuple, kwargs: dict) -> tuple:
+        # Key iterables may be generators, so they must be converted to a list before they can be both used and counted
+        if op in ('get_many', 'remove_many') and len(args) > 0:
+            args = (list(args[0]),) + args[1:]
+        elif op in ('get_many', 'remove_many') and 'keys' in kwargs:
+            kwargs['keys'] = list(kwargs['keys'])
+        return args
+
+    if inspect.iscoroutinefunction(orig):
+        @functools.wraps(orig)
+        async def wrapper(*args, **kwargs):
+            if _active.get() is m:
+                return await orig(*args, **kwargs)
+            args = _prep(args, kwargs)
+            token, start = _active.set(m), perf_counter()
+            try:
+                res = await orig(*args, **kwargs)
+            except CacheNotFound:
+                m.record(op, perf_counter() - start, _key_of(op, args, kwargs), misses=1)
+                raise
+            except Exception:
+                m.record(op, perf_counter() - start, _key_of(op, args, kwargs), errors=1)
+                raise
+            finally:
+                _active.reset(token)
+            m.record(op, perf_counter() - start, _key_of(op, args, kwargs), **_counts(op, res, args, kwargs))
+            return res
+        return wrapper
+
+    @functools.wraps(orig)
+    def wrapper(*args, **kwargs):
+        if _active.get() is m:
+            return orig(*args, **kwargs)
+        args = _prep(args, kwargs)
+        token, start = _active.set(m), perf_counter()
+        try:
+            res = orig(*args, **kwargs)
+        except CacheNotFound:
+            m.record(op, perf_counter() - start, _key_of(op, args, kwargs), misses=1)
+            raise
+        except Exception:
+            m.record(op, perf_counter() - start, _key_of(op, args, kwargs), errors=1)
+            raise
+        finally:
+            _active.reset(token)
+        m.record(op, perf_counter() - start, _key_of(op, args, kwargs), **_counts(op, res, args, kwargs))
+        return res
+    return wrapper
+
+
+def _sizeof(data: Any) -> int:
+    return len(data) if isinstance(data, (bytes, bytearray, memoryview, str)) else 0
+
+
+def _wrap_serializer(m: CacheMetrics, dumps: Optional[Callable], loads: Optional[Callable]) -> dict:
+    wrapped = {}
+    if dumps is not None:
+        def _dumps(value):
+            data = dumps(value)
+            m.record_bytes(written=_sizeof(data))
+            return data
+        wrapped['_dumps'] = _dumps
+    if loads is not None:
+        def _loads(data):
+            m.record_bytes(read=_sizeof(data))
+            return loads(data)
+        wrapped['_loads'] = _loads
+    return wrapped
+
+
+def instrument(adapter, name: str = None, buckets: Sequence[float] = DEFAULT_BUCKETS) -> CacheMetrics:
+    """
+    Instrument the cache adapter instance ``adapter`` (sync or AsyncIO), wrapping the methods in :attr:`.INSTRUMENTED_METHODS`
+    on the instance, plus it's ``_dumps`` / ``_loads`` serializer methods (for bytes read / written) if it has them.
+
+    Calling this on an adapter which is already instrumented simply returns it's existing :class:`.CacheMetrics`.
+
+    :param adapter: A :class:`.CacheAdapter` or :class:`.AsyncCacheAdapter` instance
+    :param str name: The name to report metrics under (default: the adapter's class name, suffixed with ``#2``, ``#3`` etc.
+                     if other instances of the same class are already instrumented)
+    :param buckets: Latency histogram bucket upper bounds in seconds
+    :return CacheMetrics metrics: The metrics object for the adapter
+    """
+    m: Optional[CacheMetrics] = adapter.__dict__.get('_metrics')
+    if m is not None:
+        return m
+    with _lock:
+        if name is None:
+            name = base = adapter.__class__.__name__
+            taken, n = set(getattr(a, '_metrics').name for a in _INSTRUMENTED), 1
+            while name in taken:
+                n += 1
+                name = f"{base}#{n}"
+        m = CacheMetrics(name, buckets=buckets)
+        if hasattr(type(adapter), 'store'):
+            # Adapters backed by a MemoryStore report it's eviction counter. The store is looked up on each snapshot,
+            # as adapters are instrumented from CacheAdapter.__init__ - before sub-classes have set up their store.
+            ref = weakref.ref(adapter)
+            m.eviction_source = lambda: getattr(getattr(ref(), 'store', None), 'evictions', 0)
+            m.reset()
+        wrapped = {}
+        for op in INSTRUMENTED_METHODS:
+            orig = getattr(adapter, op, None)
+            if orig is None:
+                continue
+            wrapped[op] = _wrap_get(m, orig) if op == 'get' else _wrap_op(m, op, orig)
+        wrapped.update(_wrap_serializer(m, getattr(adapter, '_dumps', None), getattr(adapter, '_loads', None)))
+        adapter.__dict__.update(wrapped)
+        adapter._metrics = m
+        adapter._metrics_wrapped = tuple(wrapped.keys())
+        _INSTRUMENTED.add(adapter)
+    return m
+
+
+def uninstrument(adapter) -> bool:
+    """Remove the instrumentation added by :func:`.instrument` from ``adapter``. Returns ``False`` if it wasn't instrumented."""
+    if adapter.__dict__.get('_metrics') is None:
+        return False
+    with _lock:
+        for attr in adapter.__dict__.pop('_metrics_wrapped', ()):
+            adapter.__dict__.pop(attr, None)
+        del adapter.__dict__['_metrics']
+        _INSTRUMENTED.discard(adapter)
+    return True
+
+
+def get_metrics(adapter) -> Optional[CacheMetrics]:
+    """Return the :class:`.CacheMetrics` for ``adapter``, or ``None`` if it isn't instrumented"""
+    return adapter.__dict__.get('_metrics')
+
+
+def metrics_snapshot(adapter=None) -> Dict[str, Any]:
+    """
+    Return a snapshot ``dict`` of the metrics for ``adapter``, or when ``adapter`` is ``None``, a ``dict`` mapping
+    the names of every instrumented adapter to their snapshots.
+
+    :raises ValueError: When ``adapter`` is given but isn't instrumented
+    """
+    if adapter is not None:
+        m = get_metrics(adapter)
+        if m is None:
+            raise ValueError(f"The cache adapter {adapter!r} isn't instrumented - see privex.helpers.cache.metrics.instrument")
+        return m.snapshot()
+    return {a._metrics.name: a._metrics.snapshot() for a in list(_INSTRUMENTED)}
+
+
+def reset_metrics(adapter=None):
+    """Reset the metrics for ``adapter``, or for every instrumented adapter if ``adapter`` is ``None``"""
+    for a in ([adapter] if adapter is not None else list(_INSTRUMENTED)):
+        m = get_metrics(a)
+        if m is not None:
+            m.reset()
@@ -0,0 +1,202 @@
+"""
+Result encoding for :func:`.r_cache` / :func:`.r_cache_async` - allows ``None`` results and selected exceptions to be
+cached ("negative caching"), on every cache adapter.
+
+Cache adapters can't tell the difference between a key that's missing, and a key which contains ``None``. So ``None``
+results, and exceptions, are stored as small tagged lists beginning with :attr:`.RESULT_TAG` - e.g. ``[RESULT_TAG, 'none']``
+- which are stored using the adapter's normal serializer (pickle, json, msgpack etc.), and decoded again by
+:func:`.decode_result`. A real result which happens to look like a tagged list is escaped as ``[RESULT_TAG, 'value', result]``,
+so no function result can ever be mistaken for ``None`` or an exception.
+
+Exceptions are never pickled - only their class name and (primitive) arguments are stored, and they're re-created on
+decode only if the class is a builtin exception, or a subclass of one of the ``cache_exceptions`` types passed to the
+decorator.
+
+Adapters which store values as-is without a serializer (``use_pickle=False``, see :func:`.can_store_objects`) can't store
+lists, so with ``objects=False`` the markers are encoded as tagged strings instead - ``RESULT_TAG:none``, and
+``RESULT_TAG:exc:["module:QualName", [args]]`` (the class name and arguments as JSON). These also survive adapters which
+return strings as :class:`bytes` (e.g. Redis). A string result which starts with ``RESULT_TAG:`` is escaped as
+``RESULT_TAG:value:<result>``.
+
+Any other value - including falsey values such as ``0``, ``''``, ``[]`` and ``False`` - is stored unchanged.
+
+**Copyright**::
+
+        +===================================================+
+        |                 © 2020 Privex Inc.                |
+        |               https://www.privex.io               |
+        +===================================================+
+        |                                                   |
+        |        Originally Developed by Privex Inc.        |
+        |        License: X11 / MIT                         |
+        |                                                   |
+        |        Core Developer(s):                         |
+        |                                                   |
+        |          (+)  Chris (@someguy123) [Privex]        |
+        |          (+)  Kale (@kryogenic) [Privex]          |
+        |                                                   |
+        +===================================================+
+
+    Copyright 2020     Privex Inc.   ( https://www.privex.io )
+
+"""
+import builtins
+import json
+import logging
+import sys
+from typing import Any, Optional, Tuple, Type, Union
+
+from privex.helpers.common import stringify
+from privex.helpers.types import NO_RESULT
+
+log = logging.getLogger(__name__)
+
+__all__ = [
+    'RESULT_TAG', 'encode_result', 'encode_exception', 'decode_result', 'exception_types', 'result_ttl', 'can_store_objects'
+]
+
+RESULT_TAG = '__pvx_cached_result__'
+"""First item of the tagged lists which :func:`.encode_result` / :func:`.encode_exception` store ``None`` / exceptions as"""
+
+_PRIMITIVES = (str, int, float, bool, type(None))
+
+_STR_TAG = f'{RESULT_TAG}:'
+_BYTES_TAG = _STR_TAG.encode()
+
+
+def _is_tagged(value: Any) -> bool:
+    # Matches our own tagged lists, and anything else using the '__pvx_' tag convention (e.g. packed CacheEnvelope's)
+    return isinstance(value, (list, tuple)) and len(value) > 0 and isinstance(value[0], str) and value[0].startswith('__pvx_')
+
+
+def _class_name(cls: type) -> str:
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def _find_exception(name: str, allowed: Tuple[Type[BaseException], ...] = ()) -> Optional[Type[BaseException]]:
+    """
+    Find the exception class ``module:QualName`` - only looking in modules which are already imported, and only returning
+    builtin exceptions, or subclasses of the ``allowed`` exception types.
+    """
+    mod_name, _, qualname = stringify(name).partition(':')
+    obj = sys.modules.get(mod_name)
+    for part in qualname.split('.'):
+        obj = getattr(obj, part, None) if obj is not None and part else None
+    if not isinstance(obj, type) or not issubclass(obj, BaseException):
+        return None
+    if obj.__module__ == 'builtins' and getattr(builtins, obj.__name__, None) is obj:
+        return obj
+    return obj if allowed and issubclass(obj, tuple(allowed)) else None
+
+
+def encode_result(value: Any, objects: bool = True) -> Any:
+    """
+    Encode the function result ``value`` for storage in the cache. With ``objects=False``, ``None`` is encoded as a tagged
+    string instead of a tagged list, for adapters which can only store plain values.
+    """
+    if not objects:
+        if value is None:
+            return f'{_STR_TAG}none'
+        if isinstance(value, str) and value.startswith(_STR_TAG):
+            return f'{_STR_TAG}value:{value}'
+        if isinstance(value, (bytes, bytearray)) and value.startswith(_BYTES_TAG):
+            return _BYTES_TAG + b'value:' + bytes(value)
+        return value
+    if value is None:
+        return [RESULT_TAG, 'none']
+    return [RESULT_TAG, 'value', value] if _is_tagged(value) else value
+
+
+def encode_exception(exc: BaseException, allowed: Tuple[Type[BaseException], ...] = (), objects: bool = True) -> Optional[Any]:
+    """
+    Encode ``exc`` for storage in the cache, as it's class name and arguments. Returns ``None`` if the exception
+    couldn't be re-created by :func:`.decode_result` - i.e. it's not a builtin exception or a subclass of ``allowed``.
+    Arguments which aren't plain str / int / float / bool / None values are replaced with ``str(exc)``.
+
+    With ``objects=False``, the exception is encoded as a tagged string instead of a tagged list.
+    """
+    name = _class_name(type(exc))
+    if _find_exception(name, allowed) is not type(exc):
+        log.debug("Not caching exception %s as it's not a builtin exception or a subclass of %s", name, allowed)
+        return None
+    args = list(exc.args) if all(isinstance(a, _PRIMITIVES) for a in exc.args) else [str(exc)]
+    if not objects:
+        return f'{_STR_TAG}exc:{json.dumps([name, args])}'
+    return [RESULT_TAG, 'exc', name, args]
+
+
+def _decode_str(value: Union[str, bytes]) -> Any:
+    """Convert a tagged string from :func:`.encode_result` / :func:`.encode_exception` into it's tagged list form"""
+    is_bytes = not isinstance(value, str)
+    body = value[len(_STR_TAG):]
+    kind, _, rest = body.partition(b':' if is_bytes else ':')
+    kind = kind.decode() if is_bytes else kind
+    if kind == 'none' and not rest:
+        return [RESULT_TAG, 'none']
+    if kind == 'value':
+        return [RESULT_TAG, 'value', rest]
+    if kind == 'exc':
+        try:
+            name, args = json.loads(rest)
+            return [RESULT_TAG, 'exc', name, list(args)]
+        except (ValueError, TypeError):
+            pass
+    return value
+
+
+def decode_result(value: Any, allowed: Tuple[Type[BaseException], ...] = ()) -> Any:
+    """
+    Decode a value stored by :func:`.encode_result` / :func:`.encode_exception` (in either their list or string form).
+    Re-raises the original exception if ``value`` is an encoded exception.
+    
+    Returns :class:`.NO_RESULT` (i.e. treat it as a cache miss) if ``value`` is an encoded exception which isn't a
+    builtin exception, or a subclass of ``allowed``.
+    """
+    if isinstance(value, str) and value.startswith(_STR_TAG):
+        value = _decode_str(value)
+    elif isinstance(value, (bytes, bytearray)) and value.startswith(_BYTES_TAG):
+        value = _decode_str(bytes(value))
+    if not isinstance(value, (list, tuple)) or len(value) < 2 or value[0] != RESULT_TAG:
+        return value
+    kind = value[1]
+    if kind == 'none':
+        return None
+    if kind == 'value' and len(value) == 3:
+        return value[2]
+    if kind == 'exc' and len(value) == 4:
+        cls = _find_exception(value[2], allowed)
+        if cls is None:
+            log.warning("Ignoring cached exception %s - it's not a builtin exception or a subclass of %s", value[2], allowed)
+            return NO_RESULT
+        raise cls(*value[3])
+    return value
+
+
+def can_store_objects(adapter) -> bool:
+    """
+    Returns ``False`` if ``adapter`` stores values as-is without a serializer (``use_pickle=False``), meaning it can't
+    store the tagged lists used for ``None`` results, exceptions, or stale-while-revalidate envelopes - so ``None`` results
+    and exceptions must be encoded with ``objects=False`` (as tagged strings) instead.
+    """
+    # The global cache wrappers (privex.helpers.cache.cached) proxy attributes as methods, so check their real adapter
+    get_adapter = getattr(type(adapter), 'get_adapter', None)
+    if callable(get_adapter):
+        adapter = get_adapter()
+    return getattr(adapter, 'use_pickle', True) is not False
+
+
+def exception_types(cache_exceptions: Union[bool, Type[BaseException], Tuple[Type[BaseException], ...], None]) -> tuple:
+    """
+    Convert the ``cache_exceptions`` decorator option into a tuple usable with ``except``. ``True`` means any
+    :class:`Exception`, while ``None`` / ``False`` results in an empty tuple (which never matches).
+    """
+    if cache_exceptions is True:
+        return (Exception,)
+    if not cache_exceptions:
+        return ()
+    return tuple(cache_exceptions) if isinstance(cache_exceptions, (list, tuple, set)) else (cache_exceptions,)
+
+
+def result_ttl(value: Any, cache_time: int, negative_ttl: Optional[int] = None) -> int:
+    """Returns the TTL to cache ``value`` for - ``negative_ttl`` for ``None`` results (if set), otherwise ``cache_time``"""
+    return negative_ttl if value is None and negative_ttl is not None else cache_time
@@ -0,0 +1,218 @@
+"""
+Connection pool borrowing for the Redis / Memcached cache adapters - :class:`.RedisCache`, :class:`.MemcachedCache` and
+their AsyncIO versions.
+
+When an adapter is ``pooled``, it doesn't keep a client for it's whole lifetime. Instead, a client is borrowed from the
+shared pool (e.g. :func:`.get_redis_pool`) for each cache operation, and returned as soon as the operation finishes - so
+any number of adapter instances can share a small pool, without needing to be closed.
+
+Inside of a ``with adapter:`` / ``async with adapter:`` block, one client is borrowed when the block is entered, used for
+every operation inside of the block, and returned when the block exits::
+
+    >>> rc = RedisCache(pooled=True)
+    >>> rc.set('hello', 'world')        # Borrows a client for the SET, then returns it to the pool
+    >>> with rc:                        # Borrows a client until the block exits
+    ...     rc.set('lorem', 'ipsum')
+    ...     rc.get('lorem')
+
+Sync adapters borrow a separate client for each thread (as clients such as :class:`pylibmc.Client` aren't thread-safe),
+while AsyncIO adapters borrow a separate client for each event loop.
+
+Calling :meth:`.connect` (or using the ``redis`` / ``mcache`` property) outside of a ``with`` block borrows a client which is
+kept until :meth:`.close` is called, like an un-pooled adapter.
+
+
+**Copyright**::
+
+        +===================================================+
+        |                 © 2020 Privex Inc.                |
+        |               https://www.privex.io               |
+        +===================================================+
+        |                                                   |
+        |        Originally Developed by Privex Inc.        |
+        |        License: X11 / MIT                         |
+        |                                                   |
+        |        Core Developer(s):                         |
+        |                                                   |
+        |          (+)  Chris (@someguy123) [Privex]        |
+        |          (+)  Kale (@kryogenic) [Privex]          |
+        |                                                   |
+        +===================================================+
+
+    Copyright 2020     Privex Inc.   ( https://www.privex.io )
+
+"""
+import asyncio
+import logging
+import threading
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any
+
+from privex.helpers.plugin import AsyncConnectionPool, ConnectionPool
+
+log = logging.getLogger(__name__)
+
+__all__ = ['PooledClientMixin', 'AsyncPooledClientMixin']
+
+
+class _Held:
+    """A client borrowed from a pool, and the number of operations / ``with`` blocks currently using it"""
+    __slots__ = ('pool', 'client', 'depth', 'lock')
+
+    def __init__(self):
+        self.pool, self.client, self.depth, self.lock = None, None, 0, None
+
+
+class PooledClientMixin:
+    """
+    Mixin for sync cache adapters which borrow their client from a :class:`.ConnectionPool` when :attr:`.pooled` is ``True``
+    (see the module docs :mod:`privex.helpers.cache.pooling`). Adapters should call :meth:`._init_pool` from their
+    constructor, implement :meth:`._get_pool`, and run each operation inside of ``with self._client() as c:``
+    """
+    pooled: bool
+    """If ``True``, borrow a client from the shared connection pool for each operation / ``with`` block"""
+
+    def _init_pool(self, pooled: bool):
+        self.pooled = pooled
+        self._pool_local = threading.local()
+
+    def _get_pool(self) -> ConnectionPool:
+        """Return the shared :class:`.ConnectionPool` to borrow clients from"""
+        raise NotImplementedError(f"{self.__class__.__name__} must implement _get_pool")
+
+    def _held(self) -> _Held:
+        h = getattr(self._pool_local, 'held', None)
+        if h is None:
+            h = self._pool_local.held = _Held()
+        return h
+
+    def _borrow(self) -> Any:
+        """Borrow a client for the current thread - or re-use the one it has already borrowed"""
+        h = self._held()
+        if h.depth == 0:
+            pool = self._get_pool()
+            h.client, h.pool = pool.acquire(), pool
+        h.depth += 1
+        return h.client
+
+    def _give_back(self, release_all: bool = False) -> bool:
+        """Return the current thread's client to the pool once nothing is using it (or immediately with ``release_all``)"""
+        h = self._held()
+        if h.depth == 0:
+            return False
+        h.depth = 0 if release_all else h.depth - 1
+        if h.depth == 0:
+            pool, client = h.pool, h.client
+            h.pool, h.client = None, None
+            log.debug("Returning client %s to the connection pool for %s", client, self.__class__.__name__)
+            pool.release(client)
+        return True
+
+    def _pooled_connect(self) -> Any:
+        """:meth:`.connect` for pooled adapters - the client borrowed by the current thread, borrowing one if needed"""
+        h = self._held()
+        return h.client if h.depth > 0 else self._borrow()
+
+    @contextmanager
+    def _client(self):
+        """Context manager yielding the client to run a single operation with"""
+        if not self.pooled:
+            yield self.connect()
+            return
+        client = self._borrow()
+        try:
+            yield client
+        finally:
+            self._give_back()
+
+    def __enter__(self):
+        if not self.pooled:
+            return super().__enter__()
+        self._borrow()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if not self.pooled:
+            return super().__exit__(exc_type, exc_val, exc_tb)
+        self._give_back()
+        return None
+
+
+class AsyncPooledClientMixin:
+    """
+    AsyncIO version of :class:`.PooledClientMixin` - borrows from the current event loop's :class:`.AsyncConnectionPool`,
+    and each operation runs inside of ``async with self._client() as c:``
+    """
+    pooled: bool
+    """If ``True``, borrow a client from the event loop's shared connection pool for each operation / ``async with`` block"""
+
+    def _init_pool(self, pooled: bool):
+        self.pooled = pooled
+        self._pool_loops = weakref.WeakKeyDictionary()
+
+    def _get_pool(self) -> AsyncConnectionPool:
+        """Return the current event loop's shared :class:`.AsyncConnectionPool` to borrow clients from"""
+        raise NotImplementedError(f"{self.__class__.__name__} must implement _get_pool")
+
+    def _held(self) -> _Held:
+        loop = asyncio.get_event_loop()
+        h = self._pool_loops.get(loop)
+        if h is None:
+            h = self._pool_loops[loop] = _Held()
+        return h
+
+    async def _borrow(self) -> Any:
+        """Borrow a client for the current event loop - or re-use the one it has already borrowed"""
+        h = self._held()
+        if h.lock is None:
+            h.lock = asyncio.Lock()
+        # Coroutines which start an operation while the first one is waiting for the pool share it's client
+        async with h.lock:
+            if h.depth == 0:
+                pool = self._get_pool()
+                h.client, h.pool = await pool.acquire(), pool
+            h.depth += 1
+            return h.client
+
+    async def _give_back(self, release_all: bool = False) -> bool:
+        """Return the event loop's client to the pool once nothing is using it (or immediately with ``release_all``)"""
+        h = self._held()
+        if h.depth == 0:
+            return False
+        h.depth = 0 if release_all else h.depth - 1
+        if h.depth == 0:
+            pool, client = h.pool, h.client
+            h.pool, h.client = None, None
+            log.debug("Returning client %s to the connection pool for %s", client, self.__class__.__name__)
+            await pool.release(client)
+        return True
+
+    async def _pooled_connect(self) -> Any:
+        """:meth:`.connect` for pooled adapters - the client borrowed for the current event loop, borrowing one if needed"""
+        h = self._held()
+        return h.client if h.depth > 0 else await self._borrow()
+
+    @asynccontextmanager
+    async def _client(self):
+        """Async context manager yielding the client to run a single operation with"""
+        if not self.pooled:
+            yield await self.connect()
+            return
+        client = await self._borrow()
+        try:
+            yield client
+        finally:
+            await self._give_back()
+
+    async def __aenter__(self):
+        if not self.pooled:
+            return await super().__aenter__()
+        await self._borrow()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if not self.pooled:
+            return await super().__aexit__(exc_type, exc_val, exc_tb)
+        await self._give_back()
+        return None
@@ -1,13 +1,17 @@
 import asyncio
+import os
 import sqlite3
 import sys
+import threading
 import time
 from collections import namedtuple
 from datetime import datetime
 from decimal import Decimal
 from os import getenv as env
 from os.path import basename, expanduser, join
-from typing import Any, Callable, Coroutine, List, Optional, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Coroutine, Dict, Iterable, List, Mapping, Optional, Tuple, Union
 
 from async_property import async_property
 
@@ -27,7 +31,7 @@ from privex.helpers.types import Number, T
 log = logging.getLogger(__name__)
 
 __all__ = [
-    'SqliteCacheResult', 'sqlite_cache_set_dbfolder', 'sqlite_cache_set_dbname', 'SqliteCacheManager'
+    'SqliteCacheResult', 'sqlite_cache_set_dbfolder', 'sqlite_cache_set_dbname', 'SqliteCacheManager', 'SqliteCachePurger'
 ]
 
 SqliteCacheResult = namedtuple('SqliteCacheResult', 'name value expires_at')
@@ -73,7 +77,60 @@ class _SQManagerBase:
             raise ValueError(f"{self.__class__.__name__}._calc_expires expected expires_at to be a datetime or numeric object. "
                              f"object passed was type: {type(expires_at)} || repr: {repr(expires_at)}")
         return time.time() + float(expires_secs) if not empty(expires_secs, zero=True) else None
-    
+
+    SQL_SET = "INSERT INTO pvcache (name, value, expires_at) VALUES (?, ?, ?) " \
+              "ON CONFLICT(name) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at;"
+    """Insert or update a key in a single statement, updating the existing row in-place rather than deleting and re-inserting it"""
+    SQL_FIND = "SELECT name, value, expires_at FROM pvcache WHERE name = ?;"
+    SQL_DELETE = "DELETE FROM pvcache WHERE name = ?;"
+    SQL_DELETE_EXPIRED = "DELETE FROM pvcache WHERE name = ? AND expires_at IS NOT NULL AND expires_at <= ?;"
+    """Ran before :attr:`.SQL_DELETE`, so keys which have already expired are deleted without being counted as removed"""
+    SQL_DELETE_IF = "DELETE FROM pvcache WHERE name = ? AND value = ? AND (expires_at IS NULL OR expires_at > ?);"
+    """Compare-and-delete - only removes the key if it hasn't expired, and still contains the given (serialized) value"""
+    SQL_ADD = "INSERT INTO pvcache (name, value, expires_at) VALUES (?, ?, ?) " \
+              "ON CONFLICT(name) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at " \
+              "WHERE pvcache.expires_at IS NOT NULL AND pvcache.expires_at <= ?;"
+    """
+    Inserts a key only if it doesn't exist, or the existing row has expired. As SQLite serialises writers, this is atomic
+    across every process using the database.
+    """
+    SQL_KEYREG_ADD = "INSERT OR REPLACE INTO pvcache_keyreg (name, key, expires_at) VALUES (?, ?, ?);"
+    SQL_KEYREG_REMOVE = "DELETE FROM pvcache_keyreg WHERE name = ? AND key = ?;"
+    SQL_KEYREG_MEMBERS = "SELECT key FROM pvcache_keyreg WHERE name = ? AND (expires_at IS NULL OR expires_at > ?);"
+    """Queries for the cache key registry side table, used by :class:`.SqliteKeyRegistry`"""
+    SQL_KEYREG_GEN = "SELECT gen FROM pvcache_keyreg_gen WHERE name = ?;"
+    SQL_KEYREG_BUMP = "INSERT INTO pvcache_keyreg_gen (name, gen) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET gen = gen + 1;"
+    """Atomically increments the generation counter for a registry name - or inserts it with the given initial value"""
+    SQL_PURGE_BATCH = "DELETE FROM pvcache WHERE rowid IN " \
+                      "(SELECT rowid FROM pvcache WHERE expires_at <= ? LIMIT ?);"
+    SQL_KEYREG_PURGE_BATCH = "DELETE FROM pvcache_keyreg WHERE rowid IN " \
+                             "(SELECT rowid FROM pvcache_keyreg WHERE expires_at <= ? LIMIT ?);"
+    """Delete at most ``LIMIT`` expired rows - used by :meth:`.SqliteCacheManager.purge_expired` with ``batch_size``"""
+    BULK_CHUNK_SIZE = 500
+    """Maximum number of keys to place in a single ``WHERE name IN (...)`` query (must be below SQLite's variable limit)"""
+
+    @staticmethod
+    def _in_query(names: List[str]) -> str:
+        return f"SELECT * FROM pvcache WHERE name IN ({', '.join('?' * len(names))});"
+
+    def _bulk_rows(self, mapping: Mapping[str, Any], expires_secs: Number = None) -> List[Tuple[str, Any, Optional[float]]]:
+        expires_at = self._calc_expires(expires_secs=expires_secs)
+        return [(str(k), v, expires_at) for k, v in mapping.items()]
+
+    @staticmethod
+    def _fast_pragmas(db: str) -> List[str]:
+        """
+        Connection pragmas applied in fast mode. WAL lets readers run concurrently with a writer (and is persistent
+        for the database file), while ``synchronous=NORMAL`` only fsyncs at WAL checkpoints - which is safe from
+        corruption in WAL mode, at the cost of possibly losing the most recent writes on power loss. For a cache
+        that's a reasonable trade.
+        """
+        pragmas = [
+            "PRAGMA synchronous=NORMAL;", "PRAGMA temp_store=MEMORY;", f"PRAGMA mmap_size={int(settings.SQLITE_CACHE_MMAP_SIZE)};"
+        ]
+        # In-memory databases can't use WAL
+        return pragmas if ':memory:' in db or 'mode=memory' in db else ["PRAGMA journal_mode=WAL;"] + pragmas
+
 
 class SqliteCacheManager(SqliteWrapper, _SQManagerBase):
     ###
@@ -94,20 +151,69 @@ class SqliteCacheManager(SqliteWrapper, _SQManagerBase):
                     "expires_at REAL DEFAULT NULL"
                     ");"
          ),
+        ('pvcache_keyreg', "CREATE TABLE pvcache_keyreg ("
+                           "name TEXT NOT NULL, "
+                           "key TEXT NOT NULL, "
+                           "expires_at REAL DEFAULT NULL, "
+                           "PRIMARY KEY (name, key)"
+                           ");"
+         ),
+        ('pvcache_keyreg_gen', "CREATE TABLE pvcache_keyreg_gen ("
+                               "name TEXT PRIMARY KEY, "
+                               "gen INTEGER NOT NULL DEFAULT 0"
+                               ");"
+         ),
+        # Indexes are listed here so they're created alongside the tables. As they aren't tables, create_schema
+        # always runs these statements (once per database per process), hence the IF NOT EXISTS.
+        ('pvcache_expires_idx', "CREATE INDEX IF NOT EXISTS pvcache_expires_idx ON pvcache (expires_at);"),
+        ('pvcache_keyreg_expires_idx', "CREATE INDEX IF NOT EXISTS pvcache_keyreg_expires_idx ON pvcache_keyreg (expires_at);"),
         # ('items', "CREATE TABLE items (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT);"),
     ]
-    
+
+    def __init__(self, db: str = None, isolation_level=None, **kwargs):
+        """
+        Accepts the same arguments as :class:`privex.db.SqliteWrapper`, plus:
+
+        :key bool fast_mode: (Default: :attr:`.settings.SQLITE_CACHE_FAST`) Enable WAL + ``synchronous=NORMAL`` on
+                             connections, and run cache queries directly on :attr:`.conn` (re-using sqlite3's
+                             prepared statement cache) instead of via the privex-db cursor wrappers.
+        """
+        # Must be set before calling the parent constructor, as it connects to create the schemas
+        self.fast_mode = bool(kwargs.pop('fast_mode', settings.SQLITE_CACHE_FAST))
+        super().__init__(db, isolation_level=isolation_level, **kwargs)
+
     def make_connection(self, *args, **kwargs) -> sqlite3.Connection:
-        return self.connector_func(*args, **kwargs)
+        conn = self.connector_func(*args, **kwargs)
+        if self.fast_mode:
+            for p in self._fast_pragmas(self.db):
+                conn.execute(p)
+        return conn
     
+    @property
+    def _conn_key(self) -> str:
+        # The threadstore connection is per database (and per mode, as fast mode connections have their own pragmas),
+        # otherwise managers for different databases used within the same thread would share one connection
+        return f"sqlite3cache_conn:{self.db}" + (':fast' if self.fast_mode else '')
+
     @property
     def conn(self) -> sqlite3.Connection:
-        k = 'sqlite3cache_conn'
+        k = self._conn_key
         t = _get_threadstore(k)
         if t is None:
             return _set_threadstore(k, self.make_connection(*self.connector_args, **self.connector_kwargs))
         return t
     
+    def _execute(self, sql: str, params: Iterable = ()) -> sqlite3.Cursor:
+        """
+        Run ``sql`` directly on :attr:`.conn` (used in fast mode). sqlite3 caches prepared statements per connection,
+        so the constant queries on :class:`._SQManagerBase` are only compiled once per connection.
+        """
+        conn = self.conn
+        cur = conn.execute(sql, params)
+        if conn.isolation_level is not None and conn.in_transaction:
+            conn.commit()
+        return cur
+
     @property
     def cache_builder(self) -> SqliteQueryBuilder:
         return self.builder('pvcache')
@@ -116,6 +222,9 @@ class SqliteCacheManager(SqliteWrapper, _SQManagerBase):
         return self._conv_result(self.fetchall("SELECT * FROM pvcache;"))
     
     def find_cache_key(self, name: str) -> Optional[SqliteCacheResult]:
+        if self.fast_mode:
+            f = self._execute(self.SQL_FIND, (name,)).fetchone()
+            return None if f is None else SqliteCacheResult(*f)
         # self.cache_builder.select('*').where('name', name).fetch()
         f = self.fetchone("SELECT * FROM pvcache WHERE name = ?;", [name])
         return self._conv_result(f)
@@ -143,19 +252,149 @@ class SqliteCacheManager(SqliteWrapper, _SQManagerBase):
         return self.action("UPDATE pvcache SET value = ?, expires_at = ? WHERE name = ?;", (value, expires_at, name))
 
     def set_cache_key(self, name: str, value: Any, expires_secs: Number = None, expires_at: Union[Number, datetime] = None):
-        # expires_at = self._calc_expires(expires_at=expires_at, expires_secs=expires_secs)
-        cfunc: Callable = self.update_cache_key if self.cache_key_exists(name) else self.insert_cache_key
-        return cfunc(name=name, value=value, expires_at=expires_at, expires_secs=expires_secs)
+        """Insert or update the cache key ``name`` with a single upsert query (:attr:`.SQL_SET`)"""
+        expires_at = self._calc_expires(expires_at=expires_at, expires_secs=expires_secs)
+        if self.fast_mode:
+            return self._execute(self.SQL_SET, (name, value, expires_at)).rowcount
+        return self.action(self.SQL_SET, (name, value, expires_at))
+
+    def add_cache_key(self, name: str, value: Any, expires_secs: Number = None) -> bool:
+        """Insert the cache key ``name`` only if it doesn't already exist (or has expired). Returns ``True`` if inserted."""
+        expires_at = self._calc_expires(expires_secs=expires_secs)
+        if self.fast_mode:
+            return self._execute(self.SQL_ADD, (name, value, expires_at, time.time())).rowcount > 0
+        return self.action(self.SQL_ADD, (name, value, expires_at, time.time())) > 0
 
     def delete_cache_key(self, name: str) -> int:
-        return self.action("DELETE FROM pvcache WHERE name = ?;", [name])
+        """Delete the cache key ``name``. Returns ``1`` if it existed and hadn't expired, otherwise ``0``."""
+        if self.fast_mode:
+            self._execute(self.SQL_DELETE_EXPIRED, (name, time.time()))
+            return self._execute(self.SQL_DELETE, (name,)).rowcount
+        self.action(self.SQL_DELETE_EXPIRED, [name, time.time()])
+        return self.action(self.SQL_DELETE, [name])
+
+    def delete_cache_key_if(self, name: str, value: Any) -> int:
+        """Atomically delete the cache key ``name`` only if it's (serialized) value equals ``value``. Returns the rows deleted."""
+        if self.fast_mode:
+            return self._execute(self.SQL_DELETE_IF, (name, value, time.time())).rowcount
+        return self.action(self.SQL_DELETE_IF, [name, value, time.time()])
+
+    @contextmanager
+    def transaction(self) -> sqlite3.Cursor:
+        """
+        Context manager which yields a cursor from :attr:`.conn` inside of an explicit transaction. The transaction is
+        committed when the context manager exits, or rolled back if an exception was raised.
+        """
+        conn = self.conn
+        cur = conn.cursor()
+        # With isolation_level=None (autocommit - the default), sqlite3 won't open a transaction for us
+        if conn.isolation_level is None:
+            cur.execute("BEGIN;")
+        try:
+            yield cur
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            cur.close()
+
+    def find_cache_keys(self, names: Iterable[str]) -> List[SqliteCacheResult]:
+        """Find multiple cache keys using ``WHERE name IN (...)`` queries - at most :attr:`.BULK_CHUNK_SIZE` keys per query"""
+        names, results, sz = [str(n) for n in names], [], self.BULK_CHUNK_SIZE
+        for i in range(0, len(names), sz):
+            chunk = names[i:i + sz]
+            rows = self._execute(self._in_query(chunk), chunk).fetchall() if self.fast_mode else \
+                self.fetchall(self._in_query(chunk), chunk)
+            results += [self._conv_result(r) for r in rows]
+        return results
+
+    def set_cache_keys(self, mapping: Mapping[str, Any], expires_secs: Number = None) -> int:
+        """Insert / replace every key in ``mapping`` using ``executemany`` within a single transaction"""
+        rows = self._bulk_rows(mapping, expires_secs)
+        if len(rows) == 0:
+            return 0
+        with self.transaction() as cur:
+            cur.executemany(self.SQL_SET, rows)
+        return len(rows)
+
+    def delete_cache_keys(self, names: Iterable[str]) -> int:
+        """
+        Delete multiple cache keys using ``executemany`` within a single transaction. Returns the number of keys deleted
+        which hadn't expired yet.
+        """
+        names, now = [(str(n),) for n in names], time.time()
+        if len(names) == 0:
+            return 0
+        with self.transaction() as cur:
+            cur.executemany(self.SQL_DELETE_EXPIRED, [(n, now) for n, in names])
+            cur.executemany(self.SQL_DELETE, names)
+            return int(cur.rowcount)
+
+    def registry_add(self, name: str, keys: Iterable[str], expires_secs: Number = None) -> int:
+        """Add ``keys`` to the cache key registry set ``name`` (see :class:`.SqliteKeyRegistry`)"""
+        expires_at = self._calc_expires(expires_secs=expires_secs)
+        rows = [(name, str(k), expires_at) for k in keys]
+        with self.transaction() as cur:
+            cur.executemany(self.SQL_KEYREG_ADD, rows)
+        return len(rows)
+
+    def registry_remove(self, name: str, keys: Iterable[str]) -> int:
+        """Remove ``keys`` from the cache key registry set ``name``. Returns the number of keys removed."""
+        with self.transaction() as cur:
+            cur.executemany(self.SQL_KEYREG_REMOVE, [(name, str(k)) for k in keys])
+            return int(cur.rowcount)
+
+    def registry_members(self, name: str) -> List[str]:
+        """Return the non-expired keys in the cache key registry set ``name``"""
+        return [r['key'] if isinstance(r, dict) else r[0] for r in self.fetchall(self.SQL_KEYREG_MEMBERS, [name, time.time()])]
 
-    def purge_expired(self) -> int:
-        return self.action("DELETE FROM pvcache WHERE expires_at <= ?;", [time.time()])
+    def registry_clear(self, name: str) -> int:
+        return self.action("DELETE FROM pvcache_keyreg WHERE name = ?;", [name])
+
+    def registry_generation(self, name: str) -> Optional[int]:
+        """Return the generation counter for the registry name ``name``, or ``None`` if it's never been bumped"""
+        row = self.fetchone(self.SQL_KEYREG_GEN, [name])
+        if row is None:
+            return None
+        return int(row['gen'] if isinstance(row, dict) else row[0])
+
+    def registry_bump_generation(self, name: str, initial: int = 1) -> int:
+        """
+        Increment the generation counter for ``name`` (or set it to ``initial`` if it doesn't exist yet), returning the
+        new generation. The increment and the read run in one transaction - as SQLite serialises writers, no other
+        process can bump the counter in between.
+        """
+        with self.transaction() as cur:
+            cur.execute(self.SQL_KEYREG_BUMP, (name, int(initial)))
+            row = cur.execute(self.SQL_KEYREG_GEN, (name,)).fetchone()
+            return int(row['gen'] if isinstance(row, dict) else row[0])
+
+    def purge_expired(self, batch_size: int = None) -> int:
+        """
+        Delete all expired cache keys (and expired cache key registry entries). Returns the number of cache keys deleted.
+
+        :param int batch_size: If specified, expired rows are deleted at most ``batch_size`` rows per statement, each
+                               committed separately - so that the write lock isn't held for the entire purge, allowing
+                               other processes to write between batches.
+        """
+        now = time.time()
+        if empty(batch_size, zero=True):
+            self.action("DELETE FROM pvcache_keyreg WHERE expires_at <= ?;", [now])
+            return self.action("DELETE FROM pvcache WHERE expires_at <= ?;", [now])
+        total = 0
+        for sql in (self.SQL_KEYREG_PURGE_BATCH, self.SQL_PURGE_BATCH):
+            while True:
+                deleted = self._execute(sql, (now, int(batch_size))).rowcount
+                if sql is self.SQL_PURGE_BATCH:
+                    total += deleted
+                if deleted < batch_size:
+                    break
+        return total
 
     def close(self, clean_all=False, thread_id=None):
         self.close_cursor()
-        k = 'sqlite3cache_conn'
+        k = self._conn_key
         t: Optional[sqlite3.Connection] = _get_threadstore(k)
         if t is not None:
             t.close()
@@ -163,6 +402,52 @@ class SqliteCacheManager(SqliteWrapper, _SQManagerBase):
         return clean_threadstore(thread_id=thread_id, name=k, clean_all=clean_all)
 
 
+class SqliteCachePurger(threading.Thread):
+    """
+    Daemon thread which periodically purges expired rows from an SQLite cache database in bounded batches
+    (see :meth:`.SqliteCacheManager.purge_expired`), using it's own fast mode :class:`.SqliteCacheManager`.
+
+    Used by :class:`.SqliteCache` / :class:`.AsyncSqliteCache` in fast mode, instead of purging inline during get/set.
+    Use :meth:`.start_for` rather than constructing this directly, which ensures only one purger runs per database
+    file per process (a forked process, e.g. a gunicorn worker, starts it's own).
+    """
+    _purgers: Dict[Tuple[int, str], "SqliteCachePurger"] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, db: str, interval: Number = 300, batch_size: int = None, connection_kwargs: dict = None):
+        super().__init__(name=f'SqliteCachePurger({basename(db)})', daemon=True)
+        self.db, self.interval, self.connection_kwargs = db, float(interval), dict(connection_kwargs or {})
+        self.batch_size = settings.SQLITE_CACHE_PURGE_BATCH if batch_size is None else batch_size
+        self.stopped = threading.Event()
+
+    def run(self):
+        mgr = SqliteCacheManager(self.db, fast_mode=True, connection_kwargs=self.connection_kwargs)
+        try:
+            while not self.stopped.is_set():
+                try:
+                    deleted = mgr.purge_expired(batch_size=self.batch_size)
+                    log.debug("%s purged %d expired cache keys", self.name, deleted)
+                except Exception as e:
+                    log.warning("%s failed to purge expired keys. Reason: %s - %s", self.name, type(e), str(e))
+                self.stopped.wait(self.interval)
+        finally:
+            mgr.close()
+
+    def stop(self):
+        self.stopped.set()
+
+    @classmethod
+    def start_for(cls, db: str, interval: Number = 300, batch_size: int = None, connection_kwargs: dict = None) -> "SqliteCachePurger":
+        """Start a purger for the database ``db``, unless one is already running for it in this process"""
+        k = (os.getpid(), db)
+        with cls._lock:
+            p = cls._purgers.get(k)
+            if p is None or not p.is_alive():
+                p = cls._purgers[k] = cls(db, interval=interval, batch_size=batch_size, connection_kwargs=connection_kwargs)
+                p.start()
+        return p
+
+
 try:
     from privex.db import SqliteAsyncWrapper, SqliteAsyncQueryBuilder
     import aiosqlite
@@ -186,9 +471,61 @@ try:
                         "expires_at REAL DEFAULT NULL"
                         ");"
              ),
+            ('pvcache_keyreg', "CREATE TABLE pvcache_keyreg ("
+                               "name TEXT NOT NULL, "
+                               "key TEXT NOT NULL, "
+                               "expires_at REAL DEFAULT NULL, "
+                               "PRIMARY KEY (name, key)"
+                               ");"
+             ),
+            ('pvcache_keyreg_gen', "CREATE TABLE pvcache_keyreg_gen ("
+                                   "name TEXT PRIMARY KEY, "
+                                   "gen INTEGER NOT NULL DEFAULT 0"
+                                   ");"
+             ),
+            ('pvcache_expires_idx', "CREATE INDEX IF NOT EXISTS pvcache_expires_idx ON pvcache (expires_at);"),
+            ('pvcache_keyreg_expires_idx', "CREATE INDEX IF NOT EXISTS pvcache_keyreg_expires_idx ON pvcache_keyreg (expires_at);"),
             # ('items', "CREATE TABLE items (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT);"),
         ]
 
+        _fast_workers: Dict[Tuple[int, str], Tuple[ThreadPoolExecutor, dict]] = {}
+        _fast_lock = threading.Lock()
+
+        def __init__(self, db: str = None, isolation_level=None, **kwargs):
+            """
+            Accepts the same arguments as :class:`privex.db.SqliteAsyncWrapper`, plus:
+
+            :key bool fast_mode: (Default: :attr:`.settings.SQLITE_CACHE_FAST`) Instead of opening a new aiosqlite
+                                 connection for every query, run queries on a long-lived fast mode
+                                 :class:`.SqliteCacheManager`, owned by a single worker thread shared by every
+                                 instance using the same database file (in this process).
+            """
+            self.fast_mode = bool(kwargs.pop('fast_mode', settings.SQLITE_CACHE_FAST))
+            super().__init__(db, isolation_level=isolation_level, **kwargs)
+
+        def _fast_worker(self) -> Tuple[ThreadPoolExecutor, dict]:
+            k = (os.getpid(), self.db)
+            w = self._fast_workers.get(k)
+            if w is None:
+                with self._fast_lock:
+                    w = self._fast_workers.get(k)
+                    if w is None:
+                        pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f'AsyncSqliteCache({basename(self.db)})')
+                        w = self._fast_workers[k] = (pool, {})
+            return w
+
+        async def _fast_call(self, method: str, *args, **kwargs):
+            """Call ``method`` on the fast mode :class:`.SqliteCacheManager` for this database, within it's worker thread"""
+            pool, store = self._fast_worker()
+
+            def _call():
+                # The manager is created lazily within the worker thread, so that it's connection belongs to that thread
+                if 'mgr' not in store:
+                    store['mgr'] = SqliteCacheManager(self.db, fast_mode=True, connection_kwargs=self.connector_kwargs)
+                return getattr(store['mgr'], method)(*args, **kwargs)
+
+            return await asyncio.get_event_loop().run_in_executor(pool, _call)
+
         @awaitable
         def make_connection(self, *args, **kwargs) -> Union[aiosqlite.Connection, Coroutine[Any, Any, aiosqlite.Connection]]:
             return self._make_connection(*args, **kwargs)
@@ -204,7 +541,7 @@ try:
 
         @async_property
         async def conn(self) -> aiosqlite.Connection:
-            k = 'sqlite3cache_async_conn'
+            k = f'sqlite3cache_async_conn:{self.db}'
             t = _get_threadstore(k)
             if t is None:
                 conn = await self._make_connection(*self.connector_args, **self.connector_kwargs)
@@ -219,6 +556,8 @@ try:
             return self._conv_result(await await_if_needed(self.fetchall("SELECT * FROM pvcache;")))
     
         async def find_cache_key(self, name: str) -> Optional[SqliteCacheResult]:
+            if self.fast_mode:
+                return await self._fast_call('find_cache_key', name)
             # self.cache_builder.select('*').where('name', name).fetch()
             f = await await_if_needed(self.fetchone("SELECT * FROM pvcache WHERE name = ?;", [name]))
             return self._conv_result(f)
@@ -249,19 +588,90 @@ try:
     
         async def set_cache_key(self, name: str, value: T, expires_secs: Number = None, expires_at: Union[Number, datetime] = None) -> T:
             expires_at = self._calc_expires(expires_at=expires_at, expires_secs=expires_secs)
-            cfunc: Callable = self.update_cache_key if await self.cache_key_exists(name) else self.insert_cache_key
-            await cfunc(name=name, value=value, expires_at=expires_at, expires_secs=expires_secs)
+            if self.fast_mode:
+                await self._fast_call('set_cache_key', name, value, expires_at=expires_at)
+            else:
+                await await_if_needed(self.action(self.SQL_SET, (name, value, expires_at)))
             return value
     
+        async def add_cache_key(self, name: str, value: Any, expires_secs: Number = None) -> bool:
+            if self.fast_mode:
+                return await self._fast_call('add_cache_key', name, value, expires_secs=expires_secs)
+            expires_at = self._calc_expires(expires_secs=expires_secs)
+            return await await_if_needed(self.action(self.SQL_ADD, (name, value, expires_at, time.time()))) > 0
+
         async def delete_cache_key(self, name: str) -> int:
-            return await await_if_needed(self.action("DELETE FROM pvcache WHERE name = ?;", [name]))
+            if self.fast_mode:
+                return await self._fast_call('delete_cache_key', name)
+            await await_if_needed(self.action(self.SQL_DELETE_EXPIRED, [name, time.time()]))
+            return await await_if_needed(self.action(self.SQL_DELETE, [name]))
+    
+        async def delete_cache_key_if(self, name: str, value: Any) -> int:
+            if self.fast_mode:
+                return await self._fast_call('delete_cache_key_if', name, value)
+            return await await_if_needed(self.action(self.SQL_DELETE_IF, [name, value, time.time()]))
     
-        async def purge_expired(self) -> int:
-            return await await_if_needed(self.action("DELETE FROM pvcache WHERE expires_at < ?;", [time.time()]))
+        async def _executemany(self, sql: str, rows: List[tuple]) -> int:
+            # Like SqliteAsyncWrapper.execute, we use a fresh connection, but run all rows within one explicit transaction
+            _conn: aiosqlite.Connection = await self._get_connection(new=True, await_conn=False)
+            async with _conn as conn:
+                await conn.execute("BEGIN;")
+                try:
+                    async with conn.executemany(sql, rows) as cur:
+                        count = int(cur.rowcount)
+                    await conn.commit()
+                except BaseException:
+                    await conn.rollback()
+                    raise
+            return count
+
+        async def find_cache_keys(self, names: Iterable[str]) -> List[SqliteCacheResult]:
+            if self.fast_mode:
+                return await self._fast_call('find_cache_keys', list(names))
+            names, results, sz = [str(n) for n in names], [], self.BULK_CHUNK_SIZE
+            for i in range(0, len(names), sz):
+                chunk = names[i:i + sz]
+                rows = await await_if_needed(self.fetchall(self._in_query(chunk), chunk))
+                results += [self._conv_result(r) for r in rows]
+            return results
+
+        async def set_cache_keys(self, mapping: Mapping[str, Any], expires_secs: Number = None) -> int:
+            if self.fast_mode:
+                return await self._fast_call('set_cache_keys', dict(mapping), expires_secs=expires_secs)
+            rows = self._bulk_rows(mapping, expires_secs)
+            if len(rows) == 0:
+                return 0
+            await self._executemany(self.SQL_SET, rows)
+            return len(rows)
+
+        async def delete_cache_keys(self, names: Iterable[str]) -> int:
+            if self.fast_mode:
+                return await self._fast_call('delete_cache_keys', list(names))
+            names, now = [(str(n),) for n in names], time.time()
+            if len(names) == 0:
+                return 0
+            await self._executemany(self.SQL_DELETE_EXPIRED, [(n, now) for n, in names])
+            return await self._executemany(self.SQL_DELETE, names)
+
+        async def purge_expired(self, batch_size: int = None) -> int:
+            """See :meth:`.SqliteCacheManager.purge_expired`"""
+            if self.fast_mode:
+                return await self._fast_call('purge_expired', batch_size=batch_size)
+            if empty(batch_size, zero=True):
+                return await await_if_needed(self.action("DELETE FROM pvcache WHERE expires_at < ?;", [time.time()]))
+            now, total = time.time(), 0
+            for sql in (self.SQL_KEYREG_PURGE_BATCH, self.SQL_PURGE_BATCH):
+                while True:
+                    deleted = await await_if_needed(self.action(sql, (now, int(batch_size))))
+                    if sql is self.SQL_PURGE_BATCH:
+                        total += deleted
+                    if deleted < batch_size:
+                        break
+            return total
     
         async def close(self, clean_all=False, thread_id=None):
             await await_if_needed(self.close_cursor())
-            k = 'sqlite3cache_async_conn'
+            k = f'sqlite3cache_async_conn:{self.db}'
             t: Optional[aiosqlite.Connection] = _get_threadstore(k)
             if t is not None:
                 await t.close()
@@ -0,0 +1,196 @@
+"""
+Stale-while-revalidate and probabilistic early refresh ("XFetch") helpers, used by :func:`.r_cache`,
+:func:`.r_cache_async` and :func:`.z_cache`.
+
+When a cached value expires, the next caller normally has to wait for the value to be recomputed. To avoid that latency
+spike, the decorators can store their results inside of a :class:`.CacheEnvelope`, which records when the value should
+be refreshed, and how long it took to compute. The cache key itself is still stored with the normal (hard) ``cache_time``.
+
+* **Stale-while-revalidate** (``soft_ttl``) - once ``soft_ttl`` seconds have passed, callers continue to receive the
+  stale value, while the value is recomputed in the background (a thread pool for synchronous functions, or a task
+  for async functions). Only one background refresh runs per key at a time.
+* **XFetch** (``xfetch_beta``) - each caller has a small, randomly chosen chance of triggering the refresh early. The
+  chance increases as the refresh time approaches, and with how long the previous computation took (``delta``), so slow
+  functions are refreshed earlier than fast ones. ``beta=1.0`` is a sensible default - higher values refresh earlier.
+  See "Optimal Probabilistic Cache Stampede Prevention" (Vattani, Chierichetti, Lowenstein 2015).
+
+Both modes can be combined - XFetch then refreshes relative to ``soft_ttl`` instead of ``cache_time``.
+
+The envelope is stored as a plain, tagged list (see :meth:`.CacheEnvelope.pack`), so it works with every cache adapter
+and serializer (pickle, json, orjson, msgpack, marshal) - the only requirement is that the function result itself can
+be stored by the adapter.
+
+**Basic Usage**::
+
+    >>> from privex.helpers import r_cache
+    >>> # Keep the value for up to 10 minutes, but refresh it in the background once it's more than 1 minute old
+    >>> @r_cache('mykey', cache_time=600, soft_ttl=60)
+    ... def slow_func(): ...
+    >>> # Probabilistically refresh the value before it expires, based on how long slow_func takes to run
+    >>> @r_cache('otherkey', cache_time=600, xfetch_beta=1.0)
+    ... def slow_func(): ...
+
+
+**Copyright**::
+
+        +===================================================+
+        |                 © 2020 Privex Inc.                |
+        |               https://www.privex.io               |
+        +===================================================+
+        |                                                   |
+        |        Originally Developed by Privex Inc.        |
+        |        License: X11 / MIT                         |
+        |                                                   |
+        |        Core Developer(s):                         |
+        |                                                   |
+        |          (+)  Chris (@someguy123) [Privex]        |
+        |          (+)  Kale (@kryogenic) [Privex]          |
+        |                                                   |
+        +===================================================+
+
+    Copyright 2020     Privex Inc.   ( https://www.privex.io )
+
+"""
+import asyncio
+import logging
+import math
+import random
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from privex.helpers import settings
+
+log = logging.getLogger(__name__)
+
+__all__ = ['CacheEnvelope', 'refresh_in_background', 'refresh_in_background_async']
+
+
+class CacheEnvelope:
+    """
+    Wraps a cached value together with the (wall clock) time it should be refreshed at, and the number of seconds
+    the value took to compute. Wall clock time is used instead of :func:`time.monotonic`, since the envelope may be
+    read by other processes / servers sharing the cache.
+    """
+    __slots__ = ('value', 'refresh_at', 'delta')
+    
+    TAG = '__pvx_cache_envelope__'
+    """The first item of a :meth:`.pack`'d envelope, used by :meth:`.unpack` to tell envelopes apart from normal values"""
+
+    def __init__(self, value: Any, refresh_at: float, delta: float = 0.0):
+        self.value, self.refresh_at, self.delta = value, refresh_at, delta
+
+    @classmethod
+    def wrap(cls, value: Any, refresh_after: float, delta: float = 0.0) -> "CacheEnvelope":
+        """Create an envelope for ``value`` which should be refreshed after ``refresh_after`` seconds"""
+        return cls(value, time.time() + refresh_after, delta)
+
+    def pack(self) -> list:
+        """
+        Convert the envelope into a plain list ``[TAG, value, refresh_at, delta]``, which can be stored by any cache adapter /
+        serializer - unlike the envelope object itself, which would need pickle.
+        """
+        return [self.TAG, self.value, self.refresh_at, self.delta]
+
+    @classmethod
+    def unpack(cls, data: Any) -> Optional["CacheEnvelope"]:
+        """
+        Convert a :meth:`.pack`'d envelope (a list, or a tuple if the serializer returned one) back into a
+        :class:`.CacheEnvelope`. Returns ``None`` if ``data`` isn't an envelope, i.e. it's a plain cached value.
+        """
+        if isinstance(data, cls):
+            return data
+        if isinstance(data, (list, tuple)) and len(data) == 4 and data[0] == cls.TAG:
+            return cls(data[1], data[2], data[3])
+        return None
+
+    def should_refresh(self, beta: Optional[float] = None, now: Optional[float] = None) -> bool:
+        """
+        Returns ``True`` if the value should be refreshed - either because :attr:`.refresh_at` has passed, or
+        because an XFetch early refresh was randomly chosen (only when ``beta`` is a positive number).
+        """
+        now = time.time() if now is None else now
+        if now >= self.refresh_at:
+            return True
+        if not beta or self.delta <= 0:
+            return False
+        # log() of a number in (0, 1] is <= 0, so this moves 'now' forward by a random, exponentially distributed amount
+        return now - self.delta * beta * math.log(1.0 - random.random()) >= self.refresh_at
+
+    def __getstate__(self):
+        return self.value, self.refresh_at, self.delta
+
+    def __setstate__(self, state):
+        self.value, self.refresh_at, self.delta = state
+
+    def __repr__(self):
+        return f"<CacheEnvelope refresh_at={self.refresh_at!r} delta={self.delta!r} value={self.value!r}>"
+
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+_refreshing: Set[str] = set()
+_async_refreshing: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=settings.CACHE_REFRESH_WORKERS, thread_name_prefix='pvx-cache-refresh')
+    return _pool
+
+
+def _run_refresh(key: str, fn: Callable[[], Any]):
+    try:
+        fn()
+    except Exception as e:
+        log.warning("Background refresh of cache key '%s' failed: %s %s", key, type(e), str(e))
+    finally:
+        with _pool_lock:
+            _refreshing.discard(key)
+
+
+def refresh_in_background(key: str, fn: Callable[[], Any]) -> bool:
+    """
+    Run ``fn()`` (which should recompute and store the value for ``key``) in the background refresh thread pool,
+    unless a refresh of ``key`` is already queued or running.
+
+    :return bool scheduled: ``True`` if a refresh was scheduled, ``False`` if one was already in progress
+    """
+    with _pool_lock:
+        if key in _refreshing:
+            return False
+        _refreshing.add(key)
+        pool = _get_pool()
+    log.debug("Refreshing cache key '%s' in the background", key)
+    pool.submit(_run_refresh, key, fn)
+    return True
+
+
+async def _run_refresh_async(key: str, fn: Callable[[], Awaitable]):
+    try:
+        await fn()
+    except Exception as e:
+        log.warning("Background refresh of cache key '%s' failed: %s %s", key, type(e), str(e))
+
+
+def refresh_in_background_async(key: str, fn: Callable[[], Awaitable]) -> bool:
+    """
+    AsyncIO version of :func:`.refresh_in_background` - schedules ``fn()`` as a task on the running event loop, unless
+    a refresh of ``key`` is already running in this loop.
+    """
+    loop = asyncio.get_running_loop()
+    tasks: Dict[str, asyncio.Task] = _async_refreshing.setdefault(loop, {})
+    if key in tasks:
+        return False
+    log.debug("Refreshing cache key '%s' in the background", key)
+    task = tasks[key] = loop.create_task(_run_refresh_async(key, fn))
+
+    def _done(t):
+        if tasks.get(key) is t:
+            del tasks[key]
+
+    task.add_done_callback(_done)
+    return True
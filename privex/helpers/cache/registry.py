@@ -0,0 +1,355 @@
+"""
+Cache key registries - sets of known cache key names, used by :class:`.CacheManagerMixin` to track the keys created by a
+class, so they can be cleared later with :meth:`.CacheManagerMixin.clear_all_cache_keys`.
+
+Rather than reading an entire ``set`` from the cache, adding one key, and writing the whole set back (``O(n)`` per key,
+and racy between processes), each registry uses native set operations offered by the cache backend:
+
+  * :class:`.RedisKeyRegistry` - ``SADD`` / ``SREM`` / ``SMEMBERS`` on a Redis set, plus ``INCR`` for generations
+  * :class:`.SqliteKeyRegistry` - a side table ``pvcache_keyreg`` in the cache database (one row per key), plus an atomic
+    ``UPDATE`` of ``pvcache_keyreg_gen`` for generations
+  * :class:`.MemoryKeyRegistry` - an in-process ``dict`` of sets, for :class:`.MemoryCache`
+  * :class:`.MemcachedKeyRegistry` - stores sets like :class:`.CacheKeyRegistry`, with memcached's atomic ``incr`` for generations
+  * :class:`.CacheKeyRegistry` - fallback for any other adapter, storing the whole set as a single cache key,
+    updated under a process-local lock (the previous behaviour)
+
+Each registry also offers a **generation counter** (:meth:`.KeyRegistry.generation` / :meth:`.KeyRegistry.bump_generation`),
+which :class:`.CacheManagerMixin` can embed in it's cache keys - so clearing every key for a class is a single increment,
+rather than enumerating and deleting each key.
+
+Use :func:`.get_key_registry` to get the registry for an adapter (by default, the global :attr:`.cached` adapter)::
+
+    >>> from privex.helpers.cache.registry import get_key_registry
+    >>> reg = get_key_registry()
+    >>> reg.add('myapp:all_keys', 'myapp:hello', 'myapp:world', timeout=300)
+    >>> reg.members('myapp:all_keys')
+    {'myapp:hello', 'myapp:world'}
+
+Registries for other adapter classes can be added with :func:`.register_key_registry`.
+
+
+**Copyright**::
+
+        +===================================================+
+        |                 © 2020 Privex Inc.                |
+        |               https://www.privex.io               |
+        +===================================================+
+        |                                                   |
+        |        Originally Developed by Privex Inc.        |
+        |        License: X11 / MIT                         |
+        |                                                   |
+        |        Core Developer(s):                         |
+        |                                                   |
+        |          (+)  Chris (@someguy123) [Privex]        |
+        |          (+)  Kale (@kryogenic) [Privex]          |
+        |                                                   |
+        +===================================================+
+
+    Copyright 2020     Privex Inc.   ( https://www.privex.io )
+
+"""
+import logging
+import threading
+import weakref
+from time import monotonic
+from typing import Dict, Iterable, Optional, Set, Type
+
+from privex.helpers.cache.CacheAdapter import CacheAdapter
+from privex.helpers.types import Number
+
+log = logging.getLogger(__name__)
+
+__all__ = [
+    'KeyRegistry', 'CacheKeyRegistry', 'MemoryKeyRegistry', 'RedisKeyRegistry', 'SqliteKeyRegistry', 'MemcachedKeyRegistry',
+    'register_key_registry', 'get_key_registry',
+]
+
+
+class KeyRegistry:
+    """
+    Base class for cache key registries. A registry holds named sets of cache key names, which expire ``timeout`` seconds
+    after they were last added to, along with a generation counter per name.
+    """
+
+    def __init__(self, adapter: CacheAdapter):
+        self.adapter = adapter
+
+    def add(self, name: str, *keys: str, timeout: Optional[Number] = None):
+        """Add one or more ``keys`` to the set ``name``, which will expire after ``timeout`` seconds (``None`` = never)"""
+        raise NotImplementedError(f'{self.__class__.__name__} must implement .add()')
+
+    def remove(self, name: str, *keys: str) -> int:
+        """Remove one or more ``keys`` from the set ``name``, returning the number of keys which were removed"""
+        raise NotImplementedError(f'{self.__class__.__name__} must implement .remove()')
+
+    def members(self, name: str) -> Set[str]:
+        """Return all keys in the set ``name``"""
+        raise NotImplementedError(f'{self.__class__.__name__} must implement .members()')
+
+    def clear(self, name: str):
+        """Remove the set ``name`` entirely"""
+        raise NotImplementedError(f'{self.__class__.__name__} must implement .clear()')
+
+    @staticmethod
+    def _gen_key(name: str) -> str:
+        return f'{name}:gen'
+
+    def generation(self, name: str) -> int:
+        """Return the current generation number for ``name`` (``0`` if it's never been bumped)"""
+        return int(self.adapter.get(self._gen_key(name), 0) or 0)
+
+    def bump_generation(self, name: str) -> int:
+        """
+        Increment the generation number for ``name``, returning the new generation.
+        
+        This default implementation is a plain get + set, so concurrent bumps may be lost - registries for adapters
+        with an atomic increment (e.g. :class:`.RedisKeyRegistry`, :class:`.SqliteKeyRegistry`) override it.
+        """
+        g = self.generation(name) + 1
+        self.adapter.set(self._gen_key(name), g, timeout=None)
+        return g
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} adapter={self.adapter!r}>"
+
+
+class CacheKeyRegistry(KeyRegistry):
+    """
+    Fallback registry for adapters without native set support - stores each set as a single cache key, which is read,
+    modified and written back under a process-local lock. Concurrent updates from other processes may be lost.
+    
+    Sets are stored as sorted lists, so they can be stored by any of the cache serializers (json / msgpack can't store sets).
+    """
+
+    def __init__(self, adapter: CacheAdapter):
+        super().__init__(adapter)
+        self.lock = threading.Lock()
+        self._timeouts: Dict[str, Optional[Number]] = {}
+
+    def _get(self, name: str) -> Set[str]:
+        keys = self.adapter.get(name)
+        return set() if not keys else set(keys)
+
+    def add(self, name: str, *keys: str, timeout: Optional[Number] = None):
+        with self.lock:
+            current = self._get(name)
+            current.update(keys)
+            self._timeouts[name] = timeout
+            self.adapter.set(name, sorted(current), timeout=timeout)
+
+    def remove(self, name: str, *keys: str) -> int:
+        with self.lock:
+            current = self._get(name)
+            removed = len(current)
+            current.difference_update(keys)
+            removed -= len(current)
+            if removed > 0:
+                self.adapter.set(name, sorted(current), timeout=self._timeouts.get(name))
+        return removed
+
+    def members(self, name: str) -> Set[str]:
+        return self._get(name)
+
+    def clear(self, name: str):
+        with self.lock:
+            self.adapter.remove(name)
+
+    def bump_generation(self, name: str) -> int:
+        # Atomic within this process - other processes using the same adapter may still race us
+        with self.lock:
+            return super().bump_generation(name)
+
+
+class MemcachedKeyRegistry(CacheKeyRegistry):
+    """
+    Registry for :class:`.MemcachedCache` - sets are stored like :class:`.CacheKeyRegistry`, while generations use
+    memcached's atomic ``incr`` on a raw (unserialized) counter key.
+    """
+
+    @staticmethod
+    def _counter_key(name: str) -> str:
+        return f'{name}:gen:n'
+
+    def generation(self, name: str) -> int:
+        with self.adapter._client() as mc:
+            g = mc.get(self._counter_key(name))
+        # Generations bumped before the counter key existed were stored with adapter.set under the plain gen key
+        return super().generation(name) if g is None else int(g)
+
+    def bump_generation(self, name: str) -> int:
+        k = self._counter_key(name)
+        # 'add' only succeeds for the first bump, carrying on from any generation stored under the old gen key
+        initial = super().generation(name) + 1
+        with self.adapter._client() as mc:
+            if mc.add(k, initial, 0):
+                return initial
+            return int(mc.incr(k, 1))
+
+
+class MemoryKeyRegistry(KeyRegistry):
+    """In-process registry for :class:`.MemoryCache` - each key records it's own expiry time"""
+    _sets: Dict[str, Dict[str, Optional[float]]]
+    _generations: Dict[str, int]
+
+    def __init__(self, adapter: CacheAdapter):
+        super().__init__(adapter)
+        self._sets, self._generations = {}, {}
+        self.lock = threading.Lock()
+
+    def add(self, name: str, *keys: str, timeout: Optional[Number] = None):
+        deadline = None if not timeout else monotonic() + float(timeout)
+        with self.lock:
+            s = self._sets.setdefault(name, {})
+            for k in keys:
+                s[k] = deadline
+
+    def remove(self, name: str, *keys: str) -> int:
+        removed = 0
+        with self.lock:
+            s = self._sets.get(name)
+            if not s:
+                return 0
+            for k in keys:
+                if s.pop(k, False) is not False:
+                    removed += 1
+        return removed
+
+    def members(self, name: str) -> Set[str]:
+        now = monotonic()
+        with self.lock:
+            s = self._sets.get(name)
+            if not s:
+                return set()
+            expired = [k for k, d in s.items() if d is not None and d <= now]
+            for k in expired:
+                del s[k]
+            return set(s.keys())
+
+    def clear(self, name: str):
+        with self.lock:
+            self._sets.pop(name, None)
+
+    def generation(self, name: str) -> int:
+        return self._generations.get(name, 0)
+
+    def bump_generation(self, name: str) -> int:
+        with self.lock:
+            g = self._generations[name] = self._generations.get(name, 0) + 1
+        return g
+
+
+class RedisKeyRegistry(KeyRegistry):
+    """
+    Registry for :class:`.RedisCache` - uses a native Redis set per name, and ``INCR`` for generations. Each call runs
+    on the adapter's client, borrowing one from the pool for the call when the adapter is pooled.
+    """
+
+    def add(self, name: str, *keys: str, timeout: Optional[Number] = None):
+        if not keys:
+            return
+        with self.adapter._client() as r:
+            pipe = r.pipeline(transaction=False)
+            pipe.sadd(name, *keys)
+            if timeout:
+                pipe.expire(name, int(timeout))
+            pipe.execute()
+
+    def remove(self, name: str, *keys: str) -> int:
+        if not keys:
+            return 0
+        with self.adapter._client() as r:
+            return int(r.srem(name, *keys))
+
+    def members(self, name: str) -> Set[str]:
+        with self.adapter._client() as r:
+            res = r.smembers(name)
+        return {k.decode('utf-8') if isinstance(k, bytes) else k for k in res}
+
+    def clear(self, name: str):
+        with self.adapter._client() as r:
+            r.delete(name)
+
+    def generation(self, name: str) -> int:
+        with self.adapter._client() as r:
+            return int(r.get(self._gen_key(name)) or 0)
+
+    def bump_generation(self, name: str) -> int:
+        with self.adapter._client() as r:
+            return int(r.incr(self._gen_key(name)))
+
+
+class SqliteKeyRegistry(KeyRegistry):
+    """
+    Registry for :class:`.SqliteCache` - stores one row per key in the side table ``pvcache_keyreg``, so adding or removing
+    a key is a single ``INSERT`` / ``DELETE``, made atomic across processes by SQLite itself. Generations are stored in the
+    side table ``pvcache_keyreg_gen``, and bumped with a single atomic ``INSERT ... ON CONFLICT DO UPDATE SET gen = gen + 1``.
+    """
+
+    @property
+    def wrapper(self):
+        return self.adapter.wrapper
+
+    def add(self, name: str, *keys: str, timeout: Optional[Number] = None):
+        if keys:
+            self.wrapper.registry_add(name, keys, expires_secs=timeout)
+
+    def remove(self, name: str, *keys: str) -> int:
+        return self.wrapper.registry_remove(name, keys) if keys else 0
+
+    def members(self, name: str) -> Set[str]:
+        return set(self.wrapper.registry_members(name))
+
+    def clear(self, name: str):
+        self.wrapper.registry_clear(name)
+
+    def generation(self, name: str) -> int:
+        g = self.wrapper.registry_generation(name)
+        # Generations bumped before the pvcache_keyreg_gen table existed were stored as a normal cache key
+        return super().generation(name) if g is None else g
+
+    def bump_generation(self, name: str) -> int:
+        return self.wrapper.registry_bump_generation(name, initial=super().generation(name) + 1)
+
+
+_REGISTRY_TYPES: Dict[str, Type[KeyRegistry]] = {
+    'MemoryCache': MemoryKeyRegistry,
+    'RedisCache': RedisKeyRegistry,
+    'SqliteCache': SqliteKeyRegistry,
+    'MemcachedCache': MemcachedKeyRegistry,
+}
+"""Maps adapter class names to the :class:`.KeyRegistry` used for them - see :func:`.register_key_registry`"""
+
+_registries = weakref.WeakKeyDictionary()
+_registries_lock = threading.Lock()
+
+
+def register_key_registry(adapter_cls: Type[CacheAdapter], registry_cls: Type[KeyRegistry]):
+    """Use ``registry_cls`` as the key registry for instances of ``adapter_cls`` (and sub-classes of it)"""
+    _REGISTRY_TYPES[adapter_cls.__name__] = registry_cls
+
+
+def _registry_class(adapter: CacheAdapter) -> Type[KeyRegistry]:
+    for c in type(adapter).__mro__:
+        if c.__name__ in _REGISTRY_TYPES:
+            return _REGISTRY_TYPES[c.__name__]
+    return CacheKeyRegistry
+
+
+def get_key_registry(adapter: Optional[CacheAdapter] = None) -> KeyRegistry:
+    """
+    Return the :class:`.KeyRegistry` for the cache adapter ``adapter`` (default: the global :attr:`.cached` adapter).
+
+    The same registry instance is returned for each adapter instance. For a :class:`.TieredCache`, the registry for it's
+    L2 adapter is used, since that's the adapter shared with other processes.
+    """
+    if adapter is None:
+        from privex.helpers.cache import CacheWrapper
+        adapter = CacheWrapper.get_adapter()
+    adapter = getattr(adapter, 'l2', adapter)
+    reg = _registries.get(adapter)
+    if reg is None:
+        with _registries_lock:
+            reg = _registries.get(adapter)
+            if reg is None:
+                reg = _registries[adapter] = _registry_class(adapter)(adapter)
+    return reg
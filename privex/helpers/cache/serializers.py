@@ -0,0 +1,358 @@
+"""
+Pluggable value serializers (and optional compression) used by the cache adapters which store values outside of
+the Python process - :class:`.RedisCache`, :class:`.MemcachedCache`, :class:`.SqliteCache` and their AsyncIO versions.
+
+Every value is stored with a 3 byte header - a magic byte, followed by a tag identifying the serializer, and a tag
+identifying the compression (if any). This means a value records how it was encoded, so values can always be
+decoded, even after the configured serializer / compression is changed, and values stored by older versions
+(plain :mod:`pickle` without a header) are still readable. Header-less values are only unpickled if they start with the
+pickle protocol header - any other header-less value was never written by us, and is returned as plain bytes.
+
+**Serializers** (``serializer=``):
+
+  * ``pickle`` (default) - any picklable Python object. Uses pickle protocol 5 where available, with out-of-band buffers,
+    so large ``bytearray`` / ``memoryview`` / numpy buffers are written without being copied into the pickle stream.
+  * ``msgpack`` - fast and compact, supports basic types (dict, list, str, bytes, int, float, bool, None).
+    Requires the package ``msgpack``
+  * ``orjson`` - very fast JSON. Requires the package ``orjson``
+  * ``json`` - JSON via the standard library
+  * ``marshal`` - very fast, basic Python types only. The format may change between Python versions, so avoid sharing
+    a cache between applications running different Python versions.
+
+**Compression** (``compression=``) - applied to values which are at least ``compress_threshold`` bytes once serialized,
+and only kept if it actually reduced the size:
+
+  * ``zlib`` - standard library
+  * ``lz4`` - very fast, requires the package ``lz4``
+  * ``zstd`` - fast with a good ratio, requires the package ``zstandard``
+
+**Selecting a serializer**
+
+Globally, via :attr:`.settings.CACHE_SERIALIZER` / :attr:`.settings.CACHE_COMPRESSION` /
+:attr:`.settings.CACHE_COMPRESS_THRESHOLD` (env vars ``PRIVEX_CACHE_SERIALIZER`` etc.), or per adapter instance::
+
+    >>> from privex.helpers.cache import RedisCache
+    >>> from privex.helpers.cache.serializers import CacheSerializer
+    >>> rc = RedisCache(serializer='msgpack')
+    >>> rc = RedisCache(serializer=CacheSerializer('orjson', compression='zstd', compress_threshold=4096))
+
+
+**Copyright**::
+
+        +===================================================+
+        |                 © 2020 Privex Inc.                |
+        |               https://www.privex.io               |
+        +===================================================+
+        |                                                   |
+        |        Originally Developed by Privex Inc.        |
+        |        License: X11 / MIT                         |
+        |                                                   |
+        |        Core Developer(s):                         |
+        |                                                   |
+        |          (+)  Chris (@someguy123) [Privex]        |
+        |          (+)  Kale (@kryogenic) [Privex]          |
+        |                                                   |
+        +===================================================+
+
+    Copyright 2020     Privex Inc.   ( https://www.privex.io )
+
+"""
+import json
+import logging
+import marshal
+import pickle
+import struct
+import zlib
+from typing import Any, Dict, Optional, Union
+
+from privex.helpers import settings
+
+log = logging.getLogger(__name__)
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+__all__ = [
+    'MAGIC', 'PICKLE_HEADER', 'Serializer', 'PickleSerializer', 'MsgpackSerializer', 'OrjsonSerializer', 'JsonSerializer',
+    'MarshalSerializer', 'Compressor', 'ZlibCompressor', 'Lz4Compressor', 'ZstdCompressor', 'SERIALIZERS', 'COMPRESSORS',
+    'CacheSerializer', 'SerializerMixin', 'get_serializer',
+]
+
+MAGIC = b'\xa7'
+"""First byte of every value encoded by :class:`.CacheSerializer`. Pickled values never start with this byte."""
+
+NO_COMPRESSION = b'-'
+
+PICKLE_HEADER = b'\x80'
+"""First byte of a pickle stream (the PROTO opcode) - used to recognise legacy values stored before the 3 byte header"""
+
+
+def _require(mod, name: str, package: str):
+    if mod is None:
+        raise ImportError(f"The cache serializer / compressor '{name}' requires the package '{package}' (pip3 install {package})")
+    return mod
+
+
+class Serializer:
+    """Base class for value serializers - subclasses must set a unique single byte :attr:`.tag`"""
+    name: str = ''
+    tag: bytes = b''
+
+    def dumps(self, value: Any) -> bytes:
+        raise NotImplementedError(f'{self.__class__.__name__} must implement .dumps()')
+
+    def loads(self, data: Union[bytes, memoryview]) -> Any:
+        raise NotImplementedError(f'{self.__class__.__name__} must implement .loads()')
+
+
+class PickleSerializer(Serializer):
+    """
+    Pickle serializer. With protocol 5+, any out-of-band buffers are stored after the pickle stream (tag ``B``),
+    and passed back to :func:`pickle.loads` as zero-copy :class:`memoryview` slices.
+    """
+    name, tag = 'pickle', b'P'
+    oob_tag = b'B'
+
+    def __init__(self, protocol: Optional[int] = None):
+        self.protocol = pickle.HIGHEST_PROTOCOL if protocol is None else protocol
+        self.oob = self.protocol >= 5
+
+    def dumps(self, value: Any) -> bytes:
+        if not self.oob:
+            return pickle.dumps(value, protocol=self.protocol)
+        buffers = []
+        data = pickle.dumps(value, protocol=self.protocol, buffer_callback=buffers.append)
+        if not buffers:
+            return data
+        raws = [b.raw() for b in buffers]
+        # Layout: <buffer count> <length of each buffer> <pickle length> <pickle stream> <buffer 1> ... <buffer n>
+        header = struct.pack(f'!I{len(raws)}QQ', len(raws), *[r.nbytes for r in raws], len(data))
+        return b''.join([header, data, *raws])
+
+    def loads_oob(self, data: Union[bytes, memoryview]) -> Any:
+        view = memoryview(data)
+        count, = struct.unpack_from('!I', view)
+        sizes = struct.unpack_from(f'!{count}QQ', view, 4)
+        pos = 4 + 8 * (count + 1)
+        stream, pos = view[pos:pos + sizes[-1]], pos + sizes[-1]
+        buffers = []
+        for size in sizes[:-1]:
+            buffers.append(view[pos:pos + size])
+            pos += size
+        return pickle.loads(stream, buffers=buffers)
+
+    def loads(self, data: Union[bytes, memoryview]) -> Any:
+        return pickle.loads(data)
+
+
+class MsgpackSerializer(Serializer):
+    name, tag = 'msgpack', b'K'
+
+    def dumps(self, value: Any) -> bytes:
+        return _require(msgpack, self.name, 'msgpack').packb(value, use_bin_type=True)
+
+    def loads(self, data: Union[bytes, memoryview]) -> Any:
+        return _require(msgpack, self.name, 'msgpack').unpackb(data, raw=False, strict_map_key=False)
+
+
+class OrjsonSerializer(Serializer):
+    name, tag = 'orjson', b'O'
+
+    def dumps(self, value: Any) -> bytes:
+        return _require(orjson, self.name, 'orjson').dumps(value)
+
+    def loads(self, data: Union[bytes, memoryview]) -> Any:
+        return _require(orjson, self.name, 'orjson').loads(data)
+
+
+class JsonSerializer(Serializer):
+    name, tag = 'json', b'J'
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+    def loads(self, data: Union[bytes, memoryview]) -> Any:
+        return json.loads(bytes(data))
+
+
+class MarshalSerializer(Serializer):
+    name, tag = 'marshal', b'M'
+
+    def dumps(self, value: Any) -> bytes:
+        return marshal.dumps(value)
+
+    def loads(self, data: Union[bytes, memoryview]) -> Any:
+        return marshal.loads(data)
+
+
+class Compressor:
+    """Base class for compressors - subclasses must set a unique single byte :attr:`.tag`"""
+    name: str = ''
+    tag: bytes = b''
+
+    def __init__(self, level: Optional[int] = None):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        raise NotImplementedError(f'{self.__class__.__name__} must implement .compress()')
+
+    def decompress(self, data: Union[bytes, memoryview]) -> bytes:
+        raise NotImplementedError(f'{self.__class__.__name__} must implement .decompress()')
+
+
+class ZlibCompressor(Compressor):
+    name, tag = 'zlib', b'z'
+
+    def compress(self, data: bytes) -> bytes:
+        return zlib.compress(data, -1 if self.level is None else self.level)
+
+    def decompress(self, data: Union[bytes, memoryview]) -> bytes:
+        return zlib.decompress(data)
+
+
+class Lz4Compressor(Compressor):
+    name, tag = 'lz4', b'4'
+
+    def compress(self, data: bytes) -> bytes:
+        return _require(lz4_frame, self.name, 'lz4').compress(data, compression_level=self.level or 0)
+
+    def decompress(self, data: Union[bytes, memoryview]) -> bytes:
+        return _require(lz4_frame, self.name, 'lz4').decompress(data)
+
+
+class ZstdCompressor(Compressor):
+    name, tag = 'zstd', b's'
+
+    def compress(self, data: bytes) -> bytes:
+        return _require(zstandard, self.name, 'zstandard').ZstdCompressor(level=self.level or 3).compress(data)
+
+    def decompress(self, data: Union[bytes, memoryview]) -> bytes:
+        return _require(zstandard, self.name, 'zstandard').ZstdDecompressor().decompress(data)
+
+
+SERIALIZERS: Dict[str, type] = {
+    s.name: s for s in [PickleSerializer, MsgpackSerializer, OrjsonSerializer, JsonSerializer, MarshalSerializer]
+}
+"""Maps serializer names to their :class:`.Serializer` classes"""
+
+COMPRESSORS: Dict[str, type] = {c.name: c for c in [ZlibCompressor, Lz4Compressor, ZstdCompressor]}
+"""Maps compression names to their :class:`.Compressor` classes"""
+
+_SERIALIZER_TAGS: Dict[bytes, Serializer] = {s.tag: s() for s in SERIALIZERS.values()}
+_COMPRESSOR_TAGS: Dict[bytes, Compressor] = {c.tag: c() for c in COMPRESSORS.values()}
+
+
+class CacheSerializer:
+    """
+    Encodes values with a :class:`.Serializer`, optionally compresses them, and prepends the 3 byte format header.
+
+    :meth:`.loads` decodes any value written by any :class:`.CacheSerializer` (whatever it's configuration), as well
+    as plain pickled values without a header (only if they start with the pickle protocol header ``\\x80``).
+    """
+
+    def __init__(self, serializer: Union[str, Serializer] = 'pickle', compression: Union[str, Compressor, None] = None,
+                 compress_threshold: Optional[int] = None, compress_level: Optional[int] = None):
+        """
+        :param str|Serializer serializer: A serializer name from :attr:`.SERIALIZERS`, or a :class:`.Serializer` instance
+        :param str|Compressor compression: ``None`` / ``''`` for no compression, a name from :attr:`.COMPRESSORS`,
+                                           or a :class:`.Compressor` instance
+        :param int compress_threshold: Only compress serialized values of at least this many bytes
+                                       (default: :attr:`.settings.CACHE_COMPRESS_THRESHOLD`)
+        :param int compress_level: Compression level passed to the compressor (default: the compressor's default)
+        """
+        if isinstance(serializer, str):
+            if serializer.lower() not in SERIALIZERS:
+                raise AttributeError(f"Unknown cache serializer '{serializer}'. Valid serializers: {list(SERIALIZERS.keys())}")
+            serializer = SERIALIZERS[serializer.lower()]()
+        if isinstance(compression, str) and compression:
+            if compression.lower() not in COMPRESSORS:
+                raise AttributeError(f"Unknown cache compression '{compression}'. Valid options: {list(COMPRESSORS.keys())}")
+            compression = COMPRESSORS[compression.lower()](compress_level)
+        self.serializer: Serializer = serializer
+        self.compressor: Optional[Compressor] = compression or None
+        self.compress_threshold = settings.CACHE_COMPRESS_THRESHOLD if compress_threshold is None else compress_threshold
+
+    def dumps(self, value: Any) -> bytes:
+        s = self.serializer
+        data, stag, ctag = s.dumps(value), s.tag, NO_COMPRESSION
+        if isinstance(s, PickleSerializer) and s.oob and data[:1] != PICKLE_HEADER:
+            stag = s.oob_tag
+        if self.compressor is not None and len(data) >= self.compress_threshold:
+            compressed = self.compressor.compress(data)
+            if len(compressed) < len(data):
+                data, ctag = compressed, self.compressor.tag
+        return b''.join([MAGIC, stag, ctag, data])
+
+    def loads(self, data: Union[bytes, bytearray, memoryview]) -> Any:
+        view = memoryview(data)
+        if view[:1] != MAGIC:
+            # A value stored before serializers were added - these were always plain pickle (protocol 2+), starting with
+            # the pickle PROTO opcode. Anything else wasn't stored by us, so it's returned as-is instead of being unpickled.
+            if view[:1] == PICKLE_HEADER:
+                return pickle.loads(view)
+            return bytes(view)
+        stag, ctag, payload = bytes(view[1:2]), bytes(view[2:3]), view[3:]
+        if ctag != NO_COMPRESSION:
+            if ctag not in _COMPRESSOR_TAGS:
+                raise ValueError(f"Cache value was compressed with an unknown compression tag {ctag!r}")
+            payload = _COMPRESSOR_TAGS[ctag].decompress(payload)
+        if stag == PickleSerializer.oob_tag:
+            return _SERIALIZER_TAGS[PickleSerializer.tag].loads_oob(payload)
+        if stag not in _SERIALIZER_TAGS:
+            raise ValueError(f"Cache value was serialized with an unknown serializer tag {stag!r}")
+        return _SERIALIZER_TAGS[stag].loads(payload)
+
+    def __repr__(self):
+        c = 'none' if self.compressor is None else self.compressor.name
+        return f"<CacheSerializer serializer='{self.serializer.name}' compression='{c}' threshold={self.compress_threshold}>"
+
+
+def get_serializer(serializer: Union[str, Serializer, CacheSerializer, None] = None) -> CacheSerializer:
+    """
+    Return a :class:`.CacheSerializer` for ``serializer`` - which may be a serializer name, a :class:`.Serializer`,
+    or an existing :class:`.CacheSerializer`. ``None`` returns one configured from :attr:`.settings.CACHE_SERIALIZER`,
+    :attr:`.settings.CACHE_COMPRESSION` and :attr:`.settings.CACHE_COMPRESS_THRESHOLD`
+    """
+    if isinstance(serializer, CacheSerializer):
+        return serializer
+    return CacheSerializer(
+        settings.CACHE_SERIALIZER if serializer is None else serializer, compression=settings.CACHE_COMPRESSION
+    )
+
+
+class SerializerMixin:
+    """
+    Mixin for cache adapters which serialize values, providing :meth:`._dumps` / :meth:`._loads`. Adapters should call
+    :meth:`._init_serializer` from their constructor.
+    """
+    pickle_default: bool = True
+    use_pickle: bool
+    serializer: CacheSerializer
+
+    def _init_serializer(self, use_pickle: Optional[bool] = None,
+                         serializer: Union[str, Serializer, CacheSerializer, None] = None):
+        self.use_pickle = self.pickle_default if use_pickle is None else use_pickle
+        self.serializer = get_serializer(serializer)
+
+    def _dumps(self, value: Any) -> Any:
+        return self.serializer.dumps(value) if self.use_pickle else value
+
+    def _loads(self, data: Any) -> Any:
+        return self.serializer.loads(data) if self.use_pickle else data
@@ -0,0 +1,328 @@
+"""
+Single-flight (cache stampede protection) helpers, used by :meth:`.CacheAdapter.get_or_set`, :func:`.r_cache`
+and :func:`.r_cache_async`.
+
+When a popular key expires, every caller which misses would normally recompute the value at the same moment. With
+single-flight enabled, only the first caller for a given key (the "leader") runs the computation, while any other caller
+asking for the same key waits for - and then shares - the leader's result:
+
+* **Threads** - all threads in the process share one flight table (:class:`.SingleFlight`)
+* **AsyncIO** - each event loop has it's own flight table (:class:`.AsyncSingleFlight`), since futures can't be
+  shared between loops
+* **Processes / servers** - optionally (``distributed=True``), the leader also acquires a lock key stored in the
+  cache backend itself using :meth:`.CacheAdapter.add` (Redis ``SET NX PX``, memcached ``add``, an SQLite
+  ``INSERT`` which only replaces expired rows). Leaders in other processes which fail to acquire the lock poll the cache
+  until the value appears, the lock is released, or ``lock_timeout`` passes.
+
+Waiting is always bounded by ``lock_timeout`` - once it passes, a waiter stops waiting and computes the value itself,
+so a hung leader can't block other callers forever.
+
+**Basic Usage**::
+
+    >>> from privex.helpers.cache import MemoryCache
+    >>> c = MemoryCache()
+    >>> c.get_or_set('expensive', lambda key: slow_lookup(), timeout=60, single_flight=True)
+
+    >>> from privex.helpers import r_cache
+    >>> @r_cache('mykey', cache_time=60, single_flight=True, distributed_lock=True)
+    ... def slow_func(): ...
+
+
+**Copyright**::
+
+        +===================================================+
+        |                 © 2020 Privex Inc.                |
+        |               https://www.privex.io               |
+        +===================================================+
+        |                                                   |
+        |        Originally Developed by Privex Inc.        |
+        |        License: X11 / MIT                         |
+        |                                                   |
+        |        Core Developer(s):                         |
+        |                                                   |
+        |          (+)  Chris (@someguy123) [Privex]        |
+        |          (+)  Kale (@kryogenic) [Privex]          |
+        |                                                   |
+        +===================================================+
+
+    Copyright 2020     Privex Inc.   ( https://www.privex.io )
+
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+import uuid
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+from privex.helpers import settings
+from privex.helpers.asyncx import await_if_needed
+from privex.helpers.types import NO_RESULT
+
+log = logging.getLogger(__name__)
+
+__all__ = [
+    'LOCK_SUFFIX', 'LOCK_POLL_INTERVAL', 'SingleFlight', 'AsyncSingleFlight', 'single_flight', 'async_single_flight',
+    'backend_lock', 'async_backend_lock', 'lock_key', 'flight_opts',
+]
+
+LOCK_SUFFIX = ':sflock'
+"""Appended to a cache key to form the name of it's distributed single-flight lock key"""
+
+LOCK_POLL_INTERVAL = 0.05
+"""How often (in seconds) a process which failed to acquire a distributed lock checks whether the value has appeared"""
+
+
+def lock_key(key: str) -> str:
+    """Return the name of the distributed lock key for the cache key ``key``"""
+    return f'{key}{LOCK_SUFFIX}'
+
+
+def flight_opts(single_flight: Optional[bool] = None, lock_timeout: Optional[float] = None,
+                distributed_lock: Optional[bool] = None) -> tuple:
+    """
+    Fill in ``None`` single-flight options with their defaults from :attr:`.settings.CACHE_SINGLE_FLIGHT`,
+    :attr:`.settings.CACHE_LOCK_TIMEOUT` and :attr:`.settings.CACHE_DISTRIBUTED_LOCK`
+
+    :return tuple opts: ``(single_flight: bool, lock_timeout: float, distributed_lock: bool)``
+    """
+    return (
+        settings.CACHE_SINGLE_FLIGHT if single_flight is None else single_flight,
+        settings.CACHE_LOCK_TIMEOUT if lock_timeout is None else lock_timeout,
+        settings.CACHE_DISTRIBUTED_LOCK if distributed_lock is None else distributed_lock,
+    )
+
+
+def _lock_token() -> str:
+    return f'{os.getpid()}:{threading.get_ident()}:{uuid.uuid4().hex}'
+
+
+class _Call:
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event, self.result, self.error = threading.Event(), None, None
+
+
+class SingleFlight:
+    """
+    A thread-safe flight table - :meth:`.do` ensures only one thread at a time runs the function for a given key,
+    while other threads requesting the same key block until the result is available.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+    def do(self, key: str, fn: Callable[[], Any], wait_timeout: Optional[float] = None) -> Any:
+        """
+        Run ``fn()`` if no other thread is currently running it for ``key``, otherwise wait up to ``wait_timeout``
+        seconds for that thread's result (or exception). If the wait times out, ``fn()`` is called by this thread instead.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            if call.event.wait(wait_timeout):
+                if call.error is not None:
+                    raise call.error
+                return call.result
+            log.warning("Timed out after %s seconds waiting for in-flight computation of key '%s' - computing it ourselves.",
+                        wait_timeout, key)
+            return fn()
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.event.set()
+
+
+_LEADER_CANCELLED = object()
+"""Result given to the coroutines waiting on an :class:`.AsyncSingleFlight` leader which was cancelled, telling them to retry"""
+
+
+class AsyncSingleFlight:
+    """
+    An AsyncIO flight table - :meth:`.do` ensures only one coroutine at a time awaits the computation for a given key
+    within each event loop, while other coroutines requesting the same key await the leader's result.
+    """
+
+    def __init__(self):
+        self._loops: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def _calls(self) -> Dict[str, asyncio.Future]:
+        loop = asyncio.get_running_loop()
+        calls = self._loops.get(loop)
+        if calls is None:
+            calls = self._loops[loop] = {}
+        return calls
+
+    async def do(self, key: str, fn: Callable[[], Awaitable], wait_timeout: Optional[float] = None) -> Any:
+        """
+        AsyncIO version of :meth:`.SingleFlight.do` - ``fn`` must return an awaitable (e.g. a coroutine function)
+
+        If the leader is cancelled, the coroutines waiting on it aren't - they retry, and one of them becomes the new leader.
+        """
+        calls = self._calls()
+        deadline = None if wait_timeout is None else time.monotonic() + wait_timeout
+        while key in calls:
+            try:
+                remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+                res = await asyncio.wait_for(asyncio.shield(calls[key]), remaining)
+            except asyncio.TimeoutError:
+                log.warning("Timed out after %s seconds waiting for in-flight computation of key '%s' - computing it ourselves.",
+                            wait_timeout, key)
+                return await fn()
+            if res is not _LEADER_CANCELLED:
+                return res
+
+        fut = calls[key] = asyncio.get_running_loop().create_future()
+        try:
+            res = await fn()
+            fut.set_result(res)
+            return res
+        except asyncio.CancelledError:
+            fut.set_result(_LEADER_CANCELLED)
+            raise
+        except BaseException as e:
+            fut.set_exception(e)
+            fut.exception()     # Mark the exception as retrieved, in case nobody else was waiting for this key
+            raise
+        finally:
+            if calls.get(key) is fut:
+                del calls[key]
+
+
+_FLIGHT = SingleFlight()
+_ASYNC_FLIGHT = AsyncSingleFlight()
+
+
+@contextmanager
+def backend_lock(adapter, key: str, lock_timeout: float = None):
+    """
+    Context manager which attempts to acquire the distributed lock for ``key`` using ``adapter.add``, yielding ``True``
+    if the lock was acquired, or ``False`` if another process holds it. The lock key expires after ``lock_timeout``
+    seconds, and is removed on exit if we still own it.
+    
+    The lock is released with :meth:`.CacheAdapter.remove_if`, which is an atomic compare-and-delete for the Memory, Redis and
+    SQLite adapters. Memcached has no compare-and-delete, so it uses the default (non-atomic) get + remove - with memcached,
+    a lock which expires just as it's owner releases it may remove a lock which was acquired by another process.
+    """
+    lock_timeout = settings.CACHE_LOCK_TIMEOUT if lock_timeout is None else lock_timeout
+    lk, token = lock_key(key), _lock_token()
+    acquired = adapter.add(lk, token, timeout=max(int(lock_timeout), 1))
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            adapter.remove_if(lk, token)
+
+
+@asynccontextmanager
+async def async_backend_lock(adapter, key: str, lock_timeout: float = None):
+    """AsyncIO version of :func:`.backend_lock` - ``adapter`` may be either a sync or async cache adapter"""
+    lock_timeout = settings.CACHE_LOCK_TIMEOUT if lock_timeout is None else lock_timeout
+    lk, token = lock_key(key), _lock_token()
+    acquired = await await_if_needed(adapter.add(lk, token, timeout=max(int(lock_timeout), 1)))
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            await await_if_needed(adapter.remove_if(lk, token))
+
+
+def single_flight(key: str, load: Callable[[], Any], compute: Callable[[], Any], adapter=None,
+                  lock_timeout: float = None, distributed: bool = False) -> Any:
+    """
+    Load ``key`` via ``load()``, or if it's missing, compute (and store) it with ``compute()`` - ensuring that only one
+    thread in this process (and with ``distributed=True``, one process sharing the cache backend) computes it at a time.
+
+    :param str key: The cache key being loaded / computed
+    :param callable load: A function which returns the cached value for ``key``, or :class:`.NO_RESULT` if it's missing
+    :param callable compute: A function which computes the value, stores it in the cache, and returns it
+    :param CacheAdapter adapter: The cache adapter used for the distributed lock (only required if ``distributed=True``)
+    :param float lock_timeout: Maximum seconds to wait for another caller's computation (default: :attr:`.CACHE_LOCK_TIMEOUT`)
+    :param bool distributed: Also hold a lock key in the cache backend while computing
+    :return Any value: The loaded or computed value
+    """
+    lock_timeout = settings.CACHE_LOCK_TIMEOUT if lock_timeout is None else lock_timeout
+
+    def _leader():
+        # Another thread / process may have stored the value while we were waiting to become the leader
+        v = load()
+        if v is not NO_RESULT:
+            return v
+        if not distributed:
+            return compute()
+        with backend_lock(adapter, key, lock_timeout) as acquired:
+            if not acquired:
+                log.debug("Distributed lock for key '%s' is held by another process. Waiting for it's result...", key)
+                v = _wait_for_value(adapter, key, load, lock_timeout)
+                if v is not NO_RESULT:
+                    return v
+            return compute()
+
+    return _FLIGHT.do(key, _leader, wait_timeout=lock_timeout)
+
+
+async def async_single_flight(key: str, load: Callable[[], Any], compute: Callable[[], Any], adapter=None,
+                              lock_timeout: float = None, distributed: bool = False) -> Any:
+    """
+    AsyncIO version of :func:`.single_flight`. ``load`` and ``compute`` may be either plain functions, or coroutine
+    functions, and ``adapter`` may be either a sync or async cache adapter.
+    """
+    lock_timeout = settings.CACHE_LOCK_TIMEOUT if lock_timeout is None else lock_timeout
+
+    async def _leader():
+        v = await await_if_needed(load)
+        if v is not NO_RESULT:
+            return v
+        if not distributed:
+            return await await_if_needed(compute)
+        async with async_backend_lock(adapter, key, lock_timeout) as acquired:
+            if not acquired:
+                log.debug("Distributed lock for key '%s' is held by another process. Waiting for it's result...", key)
+                v = await _async_wait_for_value(adapter, key, load, lock_timeout)
+                if v is not NO_RESULT:
+                    return v
+            return await await_if_needed(compute)
+
+    return await _ASYNC_FLIGHT.do(key, _leader, wait_timeout=lock_timeout)
+
+
+def _wait_for_value(adapter, key: str, load: Callable[[], Any], lock_timeout: float) -> Any:
+    lk, deadline = lock_key(key), time.monotonic() + lock_timeout
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        v = load()
+        if v is not NO_RESULT:
+            return v
+        # The lock was released (or expired) without the value being stored - e.g. the other process raised an exception
+        if adapter.get(lk) is None:
+            break
+    return NO_RESULT
+
+
+async def _async_wait_for_value(adapter, key: str, load: Callable[[], Any], lock_timeout: float) -> Any:
+    lk, deadline = lock_key(key), time.monotonic() + lock_timeout
+    while time.monotonic() < deadline:
+        await asyncio.sleep(LOCK_POLL_INTERVAL)
+        v = await await_if_needed(load)
+        if v is not NO_RESULT:
+            return v
+        if await await_if_needed(adapter.get(lk)) is None:
+            break
+    return NO_RESULT
@@ -26,12 +26,19 @@ import asyncio
 import functools
 import logging
 from enum import Enum
-from time import sleep
-from typing import Any, Union, List
+from time import sleep, monotonic
+from typing import Any, Callable, List, Optional, Union
 
 from privex.helpers.cache import cached, async_adapter_get
+from privex.helpers.cache.keys import KeyBuilder
+from privex.helpers.cache.negative import (
+    can_store_objects, decode_result, encode_exception, encode_result, exception_types, result_ttl
+)
+from privex.helpers.cache.refresh import CacheEnvelope, refresh_in_background, refresh_in_background_async
+from privex.helpers.cache.singleflight import single_flight, async_single_flight, flight_opts
 from privex.helpers.common import empty, is_true
 from privex.helpers.asyncx import await_if_needed
+from privex.helpers.types import NO_RESULT
 
 DEF_RETRY_MSG = "Exception while running '%s', will retry %d more times."
 DEF_FAIL_MSG = "Giving up after attempting to retry function '%s' %d times."
@@ -392,6 +399,77 @@ def _format_key(args, kwargs, cache_key: str, whitelist: bool = True, fmt_opt: F
         return cache_key.format(*pos_args, **kw_args)
 
 
+def _key_formatter(cache_key, whitelist: bool = True, fmt_opt: FO = FO.POS_AUTO, fmt_args: list = None) -> Optional[Callable]:
+    """
+    Internal function used by :func:`.r_cache` and :func:`.r_cache_async` - resolves the whitelisted positional arg numbers
+    and kwarg names in ``fmt_args`` once at decoration time, and returns a function ``(args, kwargs) -> str`` which formats
+    ``cache_key`` the same way as :func:`._format_key`.
+    
+    Returns ``None`` if ``cache_key`` doesn't need formatting (no ``fmt_args`` while ``whitelist`` is ``True``, or it's not a string).
+    """
+    fmt_args = [] if not fmt_args else list(fmt_args)
+    if not isinstance(cache_key, str) or (empty(fmt_args, itr=True) and whitelist):
+        return None
+    if not whitelist or fmt_opt not in (FO.POS_AUTO, FO.POS_ONLY, FO.KWARG_ONLY, FO.MIX):
+        return lambda args, kwargs: _format_key(args, kwargs, cache_key, whitelist=whitelist, fmt_opt=fmt_opt, fmt_args=fmt_args)
+    
+    pos_idx, kw_names, fmt = [i for i in fmt_args if type(i) is int], [i for i in fmt_args if type(i) is str], cache_key.format
+    
+    def _pos(args):
+        return [args[i] for i in pos_idx if len(args) > i]
+    
+    def _kw(kwargs):
+        return {i: kwargs[i] for i in kw_names if i in kwargs}
+    
+    if fmt_opt == FO.POS_ONLY:
+        return lambda args, kwargs: fmt(*_pos(args))
+    if fmt_opt == FO.KWARG_ONLY:
+        return lambda args, kwargs: fmt(**_kw(kwargs))
+    if fmt_opt == FO.MIX:
+        return lambda args, kwargs: fmt(*_pos(args), **_kw(kwargs))
+    
+    def _pos_auto(args, kwargs):
+        try:
+            return fmt(*_pos(args))
+        except (KeyError, IndexError):
+            return fmt(*[kwargs[i] for i in kw_names if i in kwargs])
+    return _pos_auto
+
+
+def _builder_key(cache_key, func, key_builder=None):
+    """
+    Internal function used by :func:`.r_cache` and :func:`.r_cache_async` - returns the :class:`.KeyBuilder` for ``func``
+    if ``key_builder`` is ``True`` (using a string ``cache_key`` as the prefix) or a :class:`.KeyBuilder`, otherwise ``cache_key``
+    """
+    if not key_builder:
+        return cache_key
+    if isinstance(key_builder, KeyBuilder):
+        return key_builder.bind(func) if key_builder.func is None else key_builder
+    return KeyBuilder(func, prefix=cache_key if isinstance(cache_key, str) and cache_key else None)
+
+
+def _encode_result(value, delta: float, cache_time, soft_ttl=None, negative_ttl=None, envelope: bool = False,
+                   objects: bool = True) -> tuple:
+    """
+    Internal function used by :func:`.r_cache` and :func:`.r_cache_async` - returns the ``(value, timeout)`` to store
+    the function result ``value`` with, or ``(NO_RESULT, None)`` if it shouldn't be cached (``negative_ttl=0``).
+    With ``objects=False`` (adapters without a serializer), ``None`` is stored as a tagged string, and no envelope is used.
+    """
+    if value is None and negative_ttl == 0:
+        return NO_RESULT, None
+    ttl, v = result_ttl(value, cache_time, negative_ttl), encode_result(value, objects)
+    if envelope and objects:
+        v = CacheEnvelope.wrap(v, ttl if soft_ttl is None else soft_ttl, delta).pack()
+    return v, ttl
+
+
+def _encode_error(exc: BaseException, cache_time, negative_ttl=None, allowed: tuple = (), objects: bool = True) -> tuple:
+    """Internal function used by :func:`.r_cache` and :func:`.r_cache_async` - like :func:`._encode_result` for exceptions"""
+    ttl = cache_time if negative_ttl is None else negative_ttl
+    v = NO_RESULT if ttl == 0 else encode_exception(exc, allowed, objects)
+    return (NO_RESULT, None) if v is None else (v, ttl)
+
+
 def r_cache_async(cache_key: Union[str, callable], cache_time=300, format_args: list = None, format_opt: FO = FO.POS_AUTO, **opts) -> Any:
     """
     Async function/method compatible version of :func:`.r_cache` - see docs for :func:`.r_cache`
@@ -431,46 +509,120 @@ def r_cache_async(cache_key: Union[str, callable], cache_time=300, format_args:
     :param int cache_time: The amount of time in seconds to cache the result for (default: 300 seconds)
     :keyword bool whitelist: (default: ``True``) If True, only use specified arg positions / kwarg keys when formatting
                              ``cache_key`` placeholders. Otherwise, trust whatever args/kwargs were passed to the func.
+    :keyword bool single_flight: (default: :attr:`.settings.CACHE_SINGLE_FLIGHT`) Stampede protection - when the cache key
+                                 is missing, only one caller at a time runs the wrapped function, while other callers for
+                                 the same key wait for it's result. See :mod:`privex.helpers.cache.singleflight`
+    :keyword float lock_timeout: (default: :attr:`.settings.CACHE_LOCK_TIMEOUT`) Maximum seconds to wait for another
+                                 caller's result before running the function anyway
+    :keyword bool distributed_lock: (default: :attr:`.settings.CACHE_DISTRIBUTED_LOCK`) With ``single_flight``, also hold
+                                    a lock key in the cache backend, so only one process sharing the cache runs the function
+    :keyword int soft_ttl: (default: ``None``) Stale-while-revalidate - once the result is older than ``soft_ttl`` seconds,
+                           keep returning the stale result while it's refreshed in the background. ``cache_time`` remains
+                           the hard TTL. See :mod:`privex.helpers.cache.refresh`
+    :keyword float xfetch_beta: (default: ``None``) Enable XFetch probabilistic early refresh - callers randomly trigger a
+                                background refresh before the result expires, more eagerly the longer the function takes
+                                to run. ``1.0`` is a sensible value, higher values refresh earlier.
+    :keyword int negative_ttl: (default: ``cache_time``) Number of seconds to cache ``None`` results (and exceptions
+                               listed in ``cache_exceptions``) for. Set to ``0`` to never cache ``None`` results.
+                               Other falsey results such as ``0``, ``''`` and ``[]`` are always cached for ``cache_time``.
+    :keyword cache_exceptions: (default: ``None``) An exception class, or tuple of classes, which should be cached for
+                               ``negative_ttl`` seconds when raised by the function, and re-raised from the cache on
+                               subsequent calls. Pass ``True`` to cache any :class:`Exception`. Exceptions are stored
+                               as their class name and arguments (never pickled), so only builtin exceptions and
+                               subclasses of the listed classes are re-created - see :mod:`privex.helpers.cache.negative`
+    :keyword key_builder: (default: ``None``) Pass ``True`` to build the cache key from the function's arguments with a
+                          :class:`.KeyBuilder`, using ``cache_key`` as the key prefix (see :mod:`privex.helpers.cache.keys`).
+                          You may also pass your own :class:`.KeyBuilder` instance.
     :return Any res: The return result, either from the wrapped function, or from the cache.
     """
-    fmt_args = [] if not format_args else format_args
     # Using normal 'cached' often results in "event loop already running" errors due to the synchronous async wrapper
     # in CacheWrapper. So to be safe, we get the adapter directly to avoid issues.
     cache_adapter = async_adapter_get()
     whitelist = opts.get('whitelist', True)
+    single_flight_opt, lock_timeout_opt = opts.get('single_flight'), opts.get('lock_timeout')
+    distributed_opt = opts.get('distributed_lock')
+    soft_ttl, xfetch_beta = opts.get('soft_ttl'), opts.get('xfetch_beta')
+    use_envelope = soft_ttl is not None or bool(xfetch_beta)
+    negative_ttl, cache_exc = opts.get('negative_ttl'), exception_types(opts.get('cache_exceptions'))
+    # Resolve how the cache key should be formatted once, instead of on every call
+    fmt_key = None if opts.get('key_builder') else _key_formatter(cache_key, whitelist, format_opt, format_args)
     
     def _decorator(f):
+        f_key = _builder_key(cache_key, f, opts.get('key_builder'))
+        
         @functools.wraps(f)
         async def wrapper(*args, **kwargs):
             
             # Extract r_cache and r_cache_key from the wrapped function's kwargs if they're specified,
             # then remove them from the kwargs so they don't interfere with the wrapped function.
-            enable_cache, rk = kwargs.get('r_cache', True), kwargs.get('r_cache_key', cache_key)
-            if 'r_cache' in kwargs: del kwargs['r_cache']
-            if 'r_cache_key' in kwargs: del kwargs['r_cache_key']
+            enable_cache, rk = (kwargs.pop('r_cache', True), kwargs.pop('r_cache_key', f_key)) if kwargs else (True, f_key)
 
             if not isinstance(rk, str):
                 rk = await await_if_needed(rk, *args, **kwargs)
-            elif not empty(fmt_args, itr=True) or not whitelist:
+            elif fmt_key is not None:
                 # If the cache key contains a format placeholder, e.g. {somevar} - then attempt to replace the
-                # placeholders using the function's kwargs
-                log.debug('Format_args not empty (or whitelist=False), formatting cache_key "%s"', cache_key)
-                rk = _format_key(args, kwargs, cache_key=cache_key, whitelist=whitelist, fmt_opt=format_opt, fmt_args=format_args)
+                # placeholders using the function's args / kwargs
+                rk = fmt_key(args, kwargs)
             # To ensure no event loop / thread cache instance conflicts, we use the cache adapter as a context manager, which
             # is supposed to disconnect + destroy the connection library instance, and re-create it in the current loop/thread.
             async with cache_adapter as r:
-                # If using an async cache adapter, r.get might be async...
-                log.debug('Trying to load "%s" from cache', rk)
-                data = await await_if_needed(r.get, rk)
+                data, env = NO_RESULT, None
+                if enable_cache:
+                    # If using an async cache adapter, r.get might be async...
+                    log.debug('Trying to load "%s" from cache', rk)
+                    data = await await_if_needed(r.get, rk, default=NO_RESULT)
+                    env = CacheEnvelope.unpack(data)
+                    # Fast path for plain cache hits - avoids building the closures below on every call
+                    if data is not NO_RESULT and env is None:
+                        res = decode_result(data, cache_exc)
+                        if res is not NO_RESULT:
+                            return res
                 
-                if empty(data) or not enable_cache:
+                async def _load():
+                    d = await await_if_needed(r.get, rk, default=NO_RESULT)
+                    e = CacheEnvelope.unpack(d)
+                    return decode_result(d if e is None else e.value, cache_exc)
+                
+                async def _compute(adapter=r):
                     log.debug('Not found in cache, or "r_cache" set to false. Calling wrapped async function.')
-                    data = await await_if_needed(f, *args, **kwargs)
-    
-                    # If using an async cache adapter, r.get might be async...
-                    await await_if_needed(r.set, rk, data, timeout=cache_time)
-            
-            return data
+                    started = monotonic()
+                    try:
+                        d = await await_if_needed(f, *args, **kwargs)
+                    except cache_exc as e:
+                        v, ttl = _encode_error(e, cache_time, negative_ttl, cache_exc, can_store_objects(adapter))
+                        if v is not NO_RESULT:
+                            await await_if_needed(adapter.set, rk, v, timeout=ttl)
+                        raise
+                    v, ttl = _encode_result(
+                        d, monotonic() - started, cache_time, soft_ttl, negative_ttl, envelope=use_envelope,
+                        objects=can_store_objects(adapter)
+                    )
+                    # If using an async cache adapter, r.set might be async...
+                    if v is not NO_RESULT:
+                        await await_if_needed(adapter.set, rk, v, timeout=ttl)
+                    return d
+                
+                if not enable_cache:
+                    return await _compute()
+                if env is None:
+                    sf, lock_timeout, distributed = flight_opts(single_flight_opt, lock_timeout_opt, distributed_opt)
+                    if not sf:
+                        return await _compute()
+                    return await async_single_flight(
+                        rk, _load, _compute, adapter=r, lock_timeout=lock_timeout, distributed=distributed
+                    )
+                
+                async def _refresh():
+                    # The refresh outlives this call's adapter context (which closes the adapter on exit), so it uses the
+                    # adapter as a context manager itself - just like any other call - rather than writing through
+                    # a connection which has already been closed.
+                    async with cache_adapter as ra:
+                        return await _compute(ra)
+                
+                # Stale-while-revalidate / XFetch - return the cached result now, and refresh it in the background
+                if env.should_refresh(xfetch_beta):
+                    refresh_in_background_async(rk, _refresh)
+                return decode_result(env.value, cache_exc)
         
         return wrapper
     
@@ -600,38 +752,104 @@ def r_cache(cache_key: Union[str, callable], cache_time=300, format_args: list =
     :param int cache_time: The amount of time in seconds to cache the result for (default: 300 seconds)
     :keyword bool whitelist: (default: ``True``) If True, only use specified arg positions / kwarg keys when formatting
                              ``cache_key`` placeholders. Otherwise, trust whatever args/kwargs were passed to the func.
+    :keyword bool single_flight: (default: :attr:`.settings.CACHE_SINGLE_FLIGHT`) Stampede protection - when the cache key
+                                 is missing, only one caller at a time runs the wrapped function, while other callers for
+                                 the same key wait for it's result. See :mod:`privex.helpers.cache.singleflight`
+    :keyword float lock_timeout: (default: :attr:`.settings.CACHE_LOCK_TIMEOUT`) Maximum seconds to wait for another
+                                 caller's result before running the function anyway
+    :keyword bool distributed_lock: (default: :attr:`.settings.CACHE_DISTRIBUTED_LOCK`) With ``single_flight``, also hold
+                                    a lock key in the cache backend, so only one process sharing the cache runs the function
+    :keyword int soft_ttl: (default: ``None``) Stale-while-revalidate - once the result is older than ``soft_ttl`` seconds,
+                           keep returning the stale result while it's refreshed in the background. ``cache_time`` remains
+                           the hard TTL. See :mod:`privex.helpers.cache.refresh`
+    :keyword float xfetch_beta: (default: ``None``) Enable XFetch probabilistic early refresh - callers randomly trigger a
+                                background refresh before the result expires, more eagerly the longer the function takes
+                                to run. ``1.0`` is a sensible value, higher values refresh earlier.
+    :keyword int negative_ttl: (default: ``cache_time``) Number of seconds to cache ``None`` results (and exceptions
+                               listed in ``cache_exceptions``) for. Set to ``0`` to never cache ``None`` results.
+                               Other falsey results such as ``0``, ``''`` and ``[]`` are always cached for ``cache_time``.
+    :keyword cache_exceptions: (default: ``None``) An exception class, or tuple of classes, which should be cached for
+                               ``negative_ttl`` seconds when raised by the function, and re-raised from the cache on
+                               subsequent calls. Pass ``True`` to cache any :class:`Exception`. Exceptions are stored
+                               as their class name and arguments (never pickled), so only builtin exceptions and
+                               subclasses of the listed classes are re-created - see :mod:`privex.helpers.cache.negative`
+    :keyword key_builder: (default: ``None``) Pass ``True`` to build the cache key from the function's arguments with a
+                          :class:`.KeyBuilder`, using ``cache_key`` as the key prefix (see :mod:`privex.helpers.cache.keys`).
+                          You may also pass your own :class:`.KeyBuilder` instance.
     :return Any res: The return result, either from the wrapped function, or from the cache.
     """
-    fmt_args = [] if not format_args else format_args
     r = cached
     whitelist = opts.get('whitelist', True)
+    single_flight_opt, lock_timeout_opt = opts.get('single_flight'), opts.get('lock_timeout')
+    distributed_opt = opts.get('distributed_lock')
+    soft_ttl, xfetch_beta = opts.get('soft_ttl'), opts.get('xfetch_beta')
+    use_envelope = soft_ttl is not None or bool(xfetch_beta)
+    negative_ttl, cache_exc = opts.get('negative_ttl'), exception_types(opts.get('cache_exceptions'))
+    # Resolve how the cache key should be formatted once, instead of on every call
+    fmt_key = None if opts.get('key_builder') else _key_formatter(cache_key, whitelist, format_opt, format_args)
 
     def _decorator(f):
+        f_key = _builder_key(cache_key, f, opts.get('key_builder'))
+
         @functools.wraps(f)
         def wrapper(*args, **kwargs):
 
             # Extract r_cache and r_cache_key from the wrapped function's kwargs if they're specified,
             # then remove them from the kwargs so they don't interfere with the wrapped function.
-            enable_cache, rk = kwargs.get('r_cache', True), kwargs.get('r_cache_key', cache_key)
-            if 'r_cache' in kwargs: del kwargs['r_cache']
-            if 'r_cache_key' in kwargs: del kwargs['r_cache_key']
+            enable_cache, rk = (kwargs.pop('r_cache', True), kwargs.pop('r_cache_key', f_key)) if kwargs else (True, f_key)
 
             if callable(rk):
                 rk = rk(*args, **kwargs)
-            elif not empty(fmt_args, itr=True) or not whitelist:
+            elif fmt_key is not None:
                 # If the cache key contains a format placeholder, e.g. {somevar} - then attempt to replace the
-                # placeholders using the function's kwargs
-                log.debug('Format_args not empty (or whitelist=False), formatting cache_key "%s"', cache_key)
-                rk = _format_key(args, kwargs, cache_key=cache_key, whitelist=whitelist, fmt_opt=format_opt, fmt_args=format_args)
-            log.debug('Trying to load "%s" from cache', rk)
-            data = r.get(rk)
-
-            if empty(data) or not enable_cache:
+                # placeholders using the function's args / kwargs
+                rk = fmt_key(args, kwargs)
+            data, env = NO_RESULT, None
+            if enable_cache:
+                log.debug('Trying to load "%s" from cache', rk)
+                data = r.get(rk, default=NO_RESULT)
+                env = CacheEnvelope.unpack(data)
+                # Fast path for plain cache hits - avoids building the closures below on every call
+                if data is not NO_RESULT and env is None:
+                    res = decode_result(data, cache_exc)
+                    if res is not NO_RESULT:
+                        return res
+
+            def _load():
+                d = r.get(rk, default=NO_RESULT)
+                e = CacheEnvelope.unpack(d)
+                return decode_result(d if e is None else e.value, cache_exc)
+
+            def _compute():
                 log.debug('Not found in cache, or "r_cache" set to false. Calling wrapped function.')
-                data = f(*args, **kwargs)
-                r.set(rk, data, timeout=cache_time)
-
-            return data
+                started = monotonic()
+                try:
+                    d = f(*args, **kwargs)
+                except cache_exc as e:
+                    v, ttl = _encode_error(e, cache_time, negative_ttl, cache_exc, can_store_objects(r))
+                    if v is not NO_RESULT:
+                        r.set(rk, v, timeout=ttl)
+                    raise
+                v, ttl = _encode_result(
+                    d, monotonic() - started, cache_time, soft_ttl, negative_ttl, envelope=use_envelope,
+                    objects=can_store_objects(r)
+                )
+                if v is not NO_RESULT:
+                    r.set(rk, v, timeout=ttl)
+                return d
+
+            if not enable_cache:
+                return _compute()
+            if env is not None:
+                # Stale-while-revalidate / XFetch - always return the cached value, refreshing it in the background if needed
+                if env.should_refresh(xfetch_beta):
+                    refresh_in_background(rk, _compute)
+                return decode_result(env.value, cache_exc)
+
+            sf, lock_timeout, distributed = flight_opts(single_flight_opt, lock_timeout_opt, distributed_opt)
+            if not sf:
+                return _compute()
+            return single_flight(rk, _load, _compute, adapter=r, lock_timeout=lock_timeout, distributed=distributed)
 
         return wrapper
 
@@ -174,3 +174,16 @@ class EventWaitTimeout(PrivexException):
 class ValidatorNotMatched(PrivexException):
     pass
 
+
+class ConnectionPoolExhausted(PrivexException):
+    """
+    Raised by :class:`privex.helpers.plugin.ConnectionPool` / :class:`.AsyncConnectionPool` when every client in the pool is
+    in use, and none were returned before the borrow timeout was reached.
+    """
+
+
+class ConnectionPoolClosed(PrivexException):
+    """
+    Raised by :class:`privex.helpers.plugin.ConnectionPool` / :class:`.AsyncConnectionPool` when trying to borrow a client
+    from a pool which has been closed.
+    """
@@ -65,6 +65,17 @@ Accessing :class:`geoip2.database.Reader` via the plugin module::
     True
 
 
+Looking up large numbers of IPs
+^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^
+
+:func:`.geolocate_bulk` (and the async generator :func:`.geolocate_bulk_async`) deduplicate their input, answer repeat IPs
+and IPs within an already looked up network from a bounded :class:`.GeoIPCache`, and run the remaining lookups in a thread
+pool (or the event loop's executor)::
+
+    >>> for ip, g in geolocate_bulk(ips_from_logs, workers=4):
+    ...     print(ip, g.country_code if g else None)
+
+
 
 **Copyright**::
 
@@ -87,23 +98,33 @@ Accessing :class:`geoip2.database.Reader` via the plugin module::
 
 
 """
+import asyncio
 import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from ipaddress import IPv4Network, IPv6Network, ip_address, ip_network
+
 import attr
 import geoip2.database
 import geoip2.models
 import geoip2.errors
 from contextlib import contextmanager
-from typing import Optional, Tuple, Generator
-from privex.helpers import plugin
+from typing import AsyncGenerator, Iterable, List, Optional, Tuple, Generator, Union
+from privex.helpers import plugin, settings
 from privex.helpers.extras.attrs import AttribDictable
-from privex.helpers.exceptions import GeoIPAddressNotFound
+from privex.helpers.exceptions import GeoIPAddressNotFound, GeoIPDatabaseNotFound
 from privex.helpers.common import empty
-from privex.helpers.types import IP_OR_STR
+from privex.helpers.types import IP_OR_STR, NO_RESULT
 
 log = logging.getLogger(__name__)
 
 __all__ = [
-    'GeoIPResult', 'geolocate_ip', 'geolocate_ips', 'cleanup_geoip', 'geoip_manager'
+    'GeoIPResult', 'geolocate_ip', 'geolocate_ips', 'cleanup_geoip', 'geoip_manager', 'GeoIPCache', 'get_geoip_cache',
+    'geolocate_bulk', 'geolocate_bulk_async', 'GeoIPPrefixCache', 'get_prefix_cache'
 ]
 
 
@@ -140,7 +161,7 @@ class GeoIPResult(AttribDictable):
     """The raw object returned by :meth:`geoip2.database.Reader.city` """
 
 
-def geolocate_ip(addr: IP_OR_STR, throw=True) -> Optional[GeoIPResult]:
+def geolocate_ip(addr: IP_OR_STR, throw=True, prefix_cache: Union[bool, "GeoIPPrefixCache"] = None) -> Optional[GeoIPResult]:
     """
     Looks up the IPv4/IPv6 address ``addr`` against GeoIP2 City + ASN, and returns a :class:`.GeoIPResult` containing the GeoIP data.
     
@@ -156,6 +177,9 @@ def geolocate_ip(addr: IP_OR_STR, throw=True) -> Optional[GeoIPResult]:
     :param IP_OR_STR addr: An IPv4 or IPv6 address to geo-locate
     :param bool throw: (Default: ``True``) If ``True``, will raise :class:`.GeoIPAddressNotFound` if an IP address isn't found
                        in the GeoIP database. If ``False``, will simply return ``None`` if it's not found.
+    :param GeoIPPrefixCache|bool prefix_cache: Answer ``addr`` from a :class:`.GeoIPPrefixCache` if it's inside of a network
+                       that was already looked up, and cache the network of the result. ``True`` uses the shared cache from
+                       :func:`.get_prefix_cache`, ``False`` disables it. Default (``None``): :attr:`privex.helpers.settings.GEOIP_PREFIX_CACHE`
     :raises GeoIPAddressNotFound: When ``throw`` is ``True`` and ``addr`` can't be found in a GeoIP database.
     :raises ValueError: When ``addr`` is not a valid IP address.
     :return Optional[GeoIPResult] res: A :class:`.GeoIPResult` containing the GeoIP data for the IP - or ``None`` if ``throw`` is
@@ -163,49 +187,71 @@ def geolocate_ip(addr: IP_OR_STR, throw=True) -> Optional[GeoIPResult]:
                                        
     """
     addr = str(addr)
-    res = GeoIPResult()
+    pc = _prefix_cache(prefix_cache)
+    if pc is not None:
+        res = pc.get(addr)
+        if res is not NO_RESULT:
+            if res is None and throw:
+                raise GeoIPAddressNotFound(f"The address {addr} is not in the GeoIP database.")
+            return res
+    not_found = []
     try:
-        # with geoip2.database.Reader(settings.GEOCITY) as g:
-        g = plugin.get_geoip('city')
-        try:
-            response: geoip2.models.City = g.city(addr)
-            res.geocity_data = response
-            res.country_code = response.country.iso_code
-            res.country = response.country.names.get('en', None)
-            res.city = response.city.names.get('en', None)
-            res.postcode = response.postal.code
-            res.long = response.location.longitude
-            res.lat = response.location.latitude
-        except geoip2.errors.AddressNotFoundError as e:
-            if throw:
-                raise GeoIPAddressNotFound(str(e))
-            return None
-        except ValueError as e:
-            # We always raise ValueError regardless of the 'throw' param - since ValueError
-            # usually means the address is completely invalid.
-            raise e
-        except Exception as e:
-            log.warning("Failed to resolve Country / City for %s - Reason: %s %s", addr, type(e), str(e))
-        g = plugin.get_geoip('asn')
-        try:
-            response: geoip2.models.ASN = g.asn(addr)
-            res.as_name = response.autonomous_system_organization
-            res.as_number = response.autonomous_system_number
-            res.network = response.network
-            res.ip_address = response.ip_address
-            res.geoasn_data = response
-        except geoip2.errors.AddressNotFoundError as e:
-            if throw:
-                raise GeoIPAddressNotFound(str(e))
-        except ValueError as e:
-            # We always raise ValueError regardless of the 'throw' param - since ValueError
-            # usually means the address is completely invalid.
-            raise e
-        except Exception as e:
-            log.warning("Failed to resolve ASN for %s - Reason: %s %s", addr, type(e), str(e))
+        res = _geolocate(addr, throw, plugin.get_geoip('city'), partial(plugin.get_geoip, 'asn'), not_found=not_found)
     except Exception as e:
+        if pc is not None and len(not_found) > 0: pc.set(not_found[0], None)
         log.exception("Serious error while resolving GeoIP for %s", addr)
         raise e
+    if pc is not None:
+        if res is None and len(not_found) > 0: pc.set(not_found[0], None)
+        if res is not None: pc.add(res)
+    return res
+
+
+def _geolocate(addr: str, throw: bool, city_geo, asn_geo, not_found: list = None) -> Optional[GeoIPResult]:
+    """
+    Look up ``addr`` against the GeoIP2 City reader ``city_geo`` and ASN reader ``asn_geo`` - used by :func:`.geolocate_ip` and
+    the bulk lookup functions. ``asn_geo`` may be a callable returning the reader, so it's only opened if the City lookup succeeds.
+    
+    If ``addr`` isn't in the City database, and ``not_found`` is a list, the network which contains no City data
+    (if the ``geoip2`` version provides it, otherwise ``None``) is appended to ``not_found``.
+    """
+    res = GeoIPResult()
+    try:
+        response: geoip2.models.City = city_geo.city(addr)
+        res.geocity_data = response
+        res.country_code = response.country.iso_code
+        res.country = response.country.names.get('en', None)
+        res.city = response.city.names.get('en', None)
+        res.postcode = response.postal.code
+        res.long = response.location.longitude
+        res.lat = response.location.latitude
+    except geoip2.errors.AddressNotFoundError as e:
+        if not_found is not None:
+            not_found.append(getattr(e, 'network', None))
+        if throw:
+            raise GeoIPAddressNotFound(str(e))
+        return None
+    except ValueError as e:
+        # We always raise ValueError regardless of the 'throw' param - since ValueError
+        # usually means the address is completely invalid.
+        raise e
+    except Exception as e:
+        log.warning("Failed to resolve Country / City for %s - Reason: %s %s", addr, type(e), str(e))
+    g = asn_geo() if callable(asn_geo) else asn_geo
+    try:
+        response: geoip2.models.ASN = g.asn(addr)
+        res.as_name = response.autonomous_system_organization
+        res.as_number = response.autonomous_system_number
+        res.network = response.network
+        res.ip_address = response.ip_address
+        res.geoasn_data = response
+    except geoip2.errors.AddressNotFoundError as e:
+        if throw:
+            raise GeoIPAddressNotFound(str(e))
+    except ValueError as e:
+        raise e
+    except Exception as e:
+        log.warning("Failed to resolve ASN for %s - Reason: %s %s", addr, type(e), str(e))
     return res
 
 
@@ -251,6 +297,470 @@ def geolocate_ips(*addrs, throw=False) -> Generator[Tuple[str, Optional[GeoIPRes
         yield (addr, res)
 
 
+def _result_network(res: GeoIPResult) -> Optional[Union[IPv4Network, IPv6Network]]:
+    """
+    Returns the network which every field of ``res`` is valid for - the most specific of the ASN network (:attr:`.GeoIPResult.network`)
+    and the City network (``geocity_data.traits.network``), since the two databases split their networks differently.
+    """
+    city_net = getattr(getattr(res.geocity_data, 'traits', None), 'network', None)
+    if res.geocity_data is not None and (empty(city_net) or res.geoasn_data is None):
+        # Without both networks, we can't be sure that the same City + ASN data applies to every IP in either network
+        return None
+    nets = [city_net, res.network]
+    nets = [n if isinstance(n, (IPv4Network, IPv6Network)) else ip_network(str(n), strict=False) for n in nets if not empty(n)]
+    return max(nets, key=lambda n: n.prefixlen) if len(nets) > 0 else None
+
+
+class GeoIPCache:
+    """
+    A bounded, thread-safe LRU cache of :class:`.GeoIPResult`'s, used by :func:`.geolocate_bulk` / :func:`.geolocate_bulk_async`.
+    
+    Results are stored by IP address, and with ``by_network`` enabled (the default), also by the network that the result is
+    valid for (see :func:`._result_network`). Any later IP inside a network that's already cached is answered from the cache
+    with a copy of the result (with :attr:`.GeoIPResult.ip_address` changed to the new IP) - instead of reading the GeoIP databases.
+    
+    IPs which aren't in the GeoIP databases are cached as ``None``.
+    
+    Usage::
+    
+        >>> cache = GeoIPCache(max_entries=50000)
+        >>> res = dict(geolocate_bulk(['185.130.44.5', '185.130.44.10'], cache=cache))
+        >>> cache.hits, cache.misses
+        (1, 1)
+    
+    """
+    
+    def __init__(self, max_entries: int = None, by_network: bool = True):
+        """
+        :param int max_entries: Maximum number of IP addresses to cache (and separately, maximum number of networks).
+                                Defaults to :attr:`privex.helpers.settings.GEOIP_CACHE_SIZE`
+        :param bool by_network: (Default: ``True``) Answer IPs from the cache if they're within a network which is already cached.
+        """
+        self.max_entries = settings.GEOIP_CACHE_SIZE if max_entries is None else int(max_entries)
+        self.by_network = by_network
+        self.hits, self.misses = 0, 0
+        self._ips = OrderedDict()
+        self._nets = OrderedDict()
+        self._prefixes = {4: {}, 6: {}}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _net_key(version: int, prefixlen: int, addr_int: int) -> Tuple[int, int, int]:
+        return version, prefixlen, addr_int >> ((32 if version == 4 else 128) - prefixlen)
+    
+    def get(self, addr: IP_OR_STR, default=NO_RESULT) -> Optional[GeoIPResult]:
+        """
+        Get the cached :class:`.GeoIPResult` for ``addr`` - or ``None`` if it's cached as not being in the GeoIP databases.
+        Returns ``default`` (:attr:`.NO_RESULT` unless specified) if ``addr`` isn't cached.
+        """
+        addr = str(addr)
+        with self._lock:
+            if addr in self._ips:
+                self._ips.move_to_end(addr)
+                self.hits += 1
+                return self._ips[addr]
+            if self.by_network and len(self._nets) > 0:
+                try:
+                    ip = ip_address(addr)
+                except ValueError:
+                    self.misses += 1
+                    return default
+                addr_int = int(ip)
+                # Check the most specific networks first, as networks of different sizes can overlap
+                for prefixlen in sorted(self._prefixes[ip.version].keys(), reverse=True):
+                    key = self._net_key(ip.version, prefixlen, addr_int)
+                    if key in self._nets:
+                        self._nets.move_to_end(key)
+                        self.hits += 1
+                        return attr.evolve(self._nets[key], ip_address=addr)
+            self.misses += 1
+            return default
+    
+    def set(self, addr: IP_OR_STR, res: Optional[GeoIPResult]):
+        """Cache the :class:`.GeoIPResult` ``res`` (or ``None`` if it wasn't found) for ``addr``, plus the network it's valid for"""
+        addr = str(addr)
+        with self._lock:
+            self._ips[addr] = res
+            self._ips.move_to_end(addr)
+            while len(self._ips) > self.max_entries:
+                self._ips.popitem(last=False)
+            net = _result_network(res) if self.by_network and res is not None else None
+            if net is None:
+                return
+            key = self._net_key(net.version, net.prefixlen, int(net.network_address))
+            if key not in self._nets:
+                prefixes = self._prefixes[net.version]
+                prefixes[net.prefixlen] = prefixes.get(net.prefixlen, 0) + 1
+            self._nets[key] = res
+            self._nets.move_to_end(key)
+            while len(self._nets) > self.max_entries:
+                (version, prefixlen, _), _ = self._nets.popitem(last=False)
+                prefixes = self._prefixes[version]
+                prefixes[prefixlen] -= 1
+                if prefixes[prefixlen] <= 0: del prefixes[prefixlen]
+    
+    def clear(self):
+        """Remove all cached IPs and networks, and reset :attr:`.hits` / :attr:`.misses`"""
+        with self._lock:
+            self._ips.clear()
+            self._nets.clear()
+            self._prefixes = {4: {}, 6: {}}
+            self.hits, self.misses = 0, 0
+    
+    def __len__(self):
+        return len(self._ips)
+    
+    def __contains__(self, addr):
+        return self.get(addr) is not NO_RESULT
+
+
+_GEOIP_CACHE: Optional[GeoIPCache] = None
+_GEOIP_CACHE_LOCK = threading.Lock()
+
+
+def get_geoip_cache() -> GeoIPCache:
+    """Get (or create) the process-wide :class:`.GeoIPCache` used by the bulk lookup functions when ``cache=True``"""
+    global _GEOIP_CACHE
+    if _GEOIP_CACHE is None:
+        with _GEOIP_CACHE_LOCK:
+            if _GEOIP_CACHE is None:
+                _GEOIP_CACHE = GeoIPCache()
+    return _GEOIP_CACHE
+
+
+def _bulk_cache(cache: Union[GeoIPCache, bool, None]) -> Optional[GeoIPCache]:
+    if cache is True: return get_geoip_cache()
+    return cache if isinstance(cache, GeoIPCache) else None
+
+
+def _geolocate_chunk(addrs: List[str], throw: bool, cache: Optional[GeoIPCache], city_geo, asn_geo) -> List[Tuple[str, Optional[GeoIPResult]]]:
+    """Look up a list of unique IP addresses, using / filling ``cache`` if it isn't ``None`` - used by the bulk lookup functions"""
+    results = []
+    for addr in addrs:
+        res = NO_RESULT if cache is None else cache.get(addr)
+        if res is NO_RESULT:
+            try:
+                res = _geolocate(addr, False, city_geo, asn_geo)
+            except ValueError as e:
+                if throw: raise e
+                log.warning("Ignoring invalid IP address '%s' while geo-locating: %s %s", addr, type(e), str(e))
+                results.append((addr, None))
+                continue
+            if cache is not None: cache.set(addr, res)
+        if res is None and throw:
+            raise GeoIPAddressNotFound(f"The address {addr} is not in the GeoIP database.")
+        results.append((addr, res))
+    return results
+
+
+def _bulk_prepare(addrs: Iterable[IP_OR_STR], chunk_size: Optional[int]) -> Tuple[List[List[str]], object, object]:
+    """Deduplicate ``addrs`` (keeping their order), split them into chunks, and get the GeoIP City + ASN readers"""
+    unique = list(dict.fromkeys(str(a) for a in addrs))
+    chunk_size = max(1, settings.GEOIP_BULK_CHUNK_SIZE if chunk_size is None else int(chunk_size))
+    chunks = [unique[i:i + chunk_size] for i in range(0, len(unique), chunk_size)]
+    # GeoIP2 readers are safe to share between threads, so worker threads use the calling thread's readers, instead of
+    # each opening their own.
+    return chunks, plugin.get_geoip('city'), plugin.get_geoip('asn')
+
+
+def geolocate_bulk(addrs: Iterable[IP_OR_STR], throw=False, cache: Union[GeoIPCache, bool] = True, workers: int = None,
+                   chunk_size: int = None) -> Generator[Tuple[str, Optional[GeoIPResult]], None, None]:
+    """
+    Geo-locate a large number of IP addresses. Duplicate addresses in ``addrs`` are only looked up (and returned) once,
+    results are cached in a :class:`.GeoIPCache` (so IPs within a network that was already looked up don't need a database
+    read), and the lookups are split into chunks which are ran in a thread pool.
+    
+    Results are yielded in the same order as ``addrs`` (minus duplicates).
+    
+    Usage::
+    
+        >>> for ip, g in geolocate_bulk(['185.130.44.5', '8.8.4.4', '185.130.44.5', '185.130.44.20']):
+        ...     print(ip, g.country, g.as_name)
+        185.130.44.5 Sweden Privex Inc.
+        8.8.4.4 United States Google LLC
+        185.130.44.20 Sweden Privex Inc.
+    
+    :param Iterable[IP_OR_STR] addrs: An iterable of IPv4 / IPv6 addresses to geo-locate
+    :param bool throw: (Default: ``False``) If ``True``, raise :class:`.GeoIPAddressNotFound` / :class:`ValueError` if an address
+                       isn't in the GeoIP database / is invalid. If ``False``, those addresses are returned with a ``None`` result.
+    :param GeoIPCache|bool cache: (Default: ``True``) ``True`` to use the shared cache from :func:`.get_geoip_cache`, a
+                                  :class:`.GeoIPCache` instance to use that cache, or ``False`` to disable caching.
+    :param int workers: Number of threads to run lookups in (default: :attr:`privex.helpers.settings.GEOIP_BULK_WORKERS`).
+                        If ``1`` (or there's only one chunk), lookups are ran in the calling thread.
+    :param int chunk_size: Number of addresses per thread pool task (default: :attr:`privex.helpers.settings.GEOIP_BULK_CHUNK_SIZE`)
+    :return Tuple[str, Optional[GeoIPResult]] res: A generator yielding tuples of ``(address, GeoIPResult_or_None)``
+    """
+    cache = _bulk_cache(cache)
+    chunks, city_geo, asn_geo = _bulk_prepare(addrs, chunk_size)
+    workers = settings.GEOIP_BULK_WORKERS if workers is None else int(workers)
+    lookup = partial(_geolocate_chunk, throw=throw, cache=cache, city_geo=city_geo, asn_geo=asn_geo)
+    
+    if workers <= 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            yield from lookup(chunk)
+        return
+    
+    with ThreadPoolExecutor(max_workers=min(workers, len(chunks)), thread_name_prefix='privex-geoip') as pool:
+        futures = [pool.submit(lookup, chunk) for chunk in chunks]
+        try:
+            for fut in futures:
+                yield from fut.result()
+        finally:
+            # If the generator is closed early (or a lookup raised), don't run the chunks which haven't started yet.
+            for fut in futures: fut.cancel()
+
+
+async def geolocate_bulk_async(addrs: Iterable[IP_OR_STR], throw=False, cache: Union[GeoIPCache, bool] = True,
+                               chunk_size: int = None, executor: Executor = None) -> AsyncGenerator[Tuple[str, Optional[GeoIPResult]], None]:
+    """
+    AsyncIO version of :func:`.geolocate_bulk` - an async generator which yields ``(address, GeoIPResult_or_None)`` tuples.
+    
+    Addresses which are already cached are yielded straight away, while the remaining addresses are looked up in chunks
+    using ``executor`` (default: the event loop's default executor), so the event loop is never blocked by database reads.
+    Since chunks are yielded as they complete, results are NOT guaranteed to be in the same order as ``addrs``.
+    
+    Usage::
+    
+        >>> async for ip, g in geolocate_bulk_async(ips):
+        ...     print(ip, g.country if g else None)
+    
+    :param Iterable[IP_OR_STR] addrs: An iterable of IPv4 / IPv6 addresses to geo-locate
+    :param bool throw: See :func:`.geolocate_bulk`
+    :param GeoIPCache|bool cache: See :func:`.geolocate_bulk`
+    :param int chunk_size: Number of addresses per executor task (default: :attr:`privex.helpers.settings.GEOIP_BULK_CHUNK_SIZE`)
+    :param Executor executor: A :class:`concurrent.futures.Executor` to run lookups in (default: the loop's default executor)
+    """
+    cache = _bulk_cache(cache)
+    chunks, city_geo, asn_geo = _bulk_prepare(addrs, chunk_size)
+    pending = []
+    for chunk in chunks:
+        uncached = []
+        for addr in chunk:
+            res = NO_RESULT if cache is None else cache.get(addr)
+            if res is NO_RESULT:
+                uncached.append(addr)
+                continue
+            if res is None and throw:
+                raise GeoIPAddressNotFound(f"The address {addr} is not in the GeoIP database.")
+            yield addr, res
+        if len(uncached) > 0: pending.append(uncached)
+    
+    loop = asyncio.get_event_loop()
+    # Cache hits were already counted above - don't count the same addresses again as misses inside of the executor
+    futures = [
+        loop.run_in_executor(executor, partial(_geolocate_chunk, c, throw=throw, cache=None, city_geo=city_geo, asn_geo=asn_geo))
+        for c in pending
+    ]
+    try:
+        for fut in asyncio.as_completed(futures):
+            for addr, res in await fut:
+                if cache is not None: cache.set(addr, res)
+                yield addr, res
+    finally:
+        for fut in futures: fut.cancel()
+
+
+_EMPTY = object()
+"""Marks :class:`.GeoIPPrefixCache` trie nodes which don't hold a result (as ``None`` is a valid cached result)"""
+
+
+class GeoIPPrefixCache:
+    """
+    A bounded cache of :class:`.GeoIPResult`'s keyed by network, stored in a binary prefix trie (one for IPv4, one for IPv6).
+    
+    Each looked up network is stored together with its result, so any later IP within a cached network is answered with
+    a trie walk (at most 32 / 128 steps) instead of two MaxMind database reads. Networks which don't exist in the GeoIP City
+    database are cached too (as ``None``), if the installed ``geoip2`` version reports them.
+    
+    When more than ``max_networks`` are cached, the least recently used networks are removed. The whole cache is cleared when
+    the modification time of any of the ``watch_files`` changes - by default the GeoIP2 City + ASN databases, checked at
+    most once every ``check_interval`` seconds.
+    
+    This is used by :func:`.geolocate_ip` when ``prefix_cache=True`` is passed, or :attr:`privex.helpers.settings.GEOIP_PREFIX_CACHE`
+    is enabled::
+    
+        >>> geolocate_ip('185.130.44.5', prefix_cache=True)     # Reads the City + ASN databases
+        >>> geolocate_ip('185.130.44.20', prefix_cache=True)    # Answered from the cached network 185.130.44.0/24
+        >>> get_prefix_cache().hits
+        1
+    
+    """
+    
+    def __init__(self, max_networks: int = None, watch_files: Iterable[str] = None, check_interval: float = None, on_change=None):
+        """
+        :param int max_networks: Maximum number of networks to cache (default: :attr:`privex.helpers.settings.GEOIP_PREFIX_CACHE_SIZE`)
+        :param Iterable[str] watch_files: Clear the cache when any of these files are modified. By default, the GeoIP2 City + ASN
+                                          databases from :func:`privex.helpers.plugin.get_geoip_db`
+        :param float check_interval: Minimum seconds between checking the modification time of ``watch_files``. ``0`` disables
+                                     the checks. Default: :attr:`privex.helpers.settings.GEOIP_PREFIX_CACHE_CHECK`
+        :param callable on_change: An optional function to call (with no arguments) after the cache was cleared due to
+                                   a changed ``watch_files`` file, e.g. to re-open GeoIP readers.
+        """
+        self.max_networks = settings.GEOIP_PREFIX_CACHE_SIZE if max_networks is None else int(max_networks)
+        self.watch_files = None if watch_files is None else list(watch_files)
+        self.check_interval = settings.GEOIP_PREFIX_CACHE_CHECK if check_interval is None else check_interval
+        self.on_change = on_change
+        self.hits, self.misses = 0, 0
+        self._lock = threading.RLock()
+        self._mtimes = None
+        self._next_check = 0.0
+        self.clear()
+    
+    @staticmethod
+    def _node() -> list:
+        # [child for bit 0, child for bit 1, cached result, LRU key]
+        return [None, None, _EMPTY, None]
+    
+    def clear(self):
+        """Remove every cached network, and reset :attr:`.hits` / :attr:`.misses`"""
+        with self._lock:
+            self._roots = {4: self._node(), 6: self._node()}
+            self._lru = OrderedDict()
+            self.hits, self.misses = 0, 0
+    
+    def _files(self) -> List[str]:
+        if self.watch_files is not None:
+            return self.watch_files
+        files = []
+        for geo_type in ['city', 'asn']:
+            try:
+                files.append(plugin.get_geoip_db(geo_type))
+            except GeoIPDatabaseNotFound:
+                pass
+        return files
+    
+    def check_files(self) -> bool:
+        """
+        Clear the cache if the modification time of any file in :attr:`.watch_files` has changed since the last check.
+        Returns ``True`` if the files changed (and the cache was cleared).
+        """
+        mtimes = {}
+        for f in self._files():
+            try:
+                mtimes[f] = os.stat(f).st_mtime_ns
+            except OSError:
+                mtimes[f] = None
+        with self._lock:
+            if self._mtimes is None or self._mtimes == mtimes:
+                self._mtimes = mtimes
+                return False
+            self._mtimes = mtimes
+            log.info("GeoIP database(s) changed - clearing GeoIP prefix cache (%d networks)", len(self._lru))
+            self.clear()
+        if self.on_change is not None:
+            self.on_change()
+        return True
+    
+    def _maybe_check(self):
+        if not self.check_interval or self.check_interval <= 0:
+            return
+        now = time.monotonic()
+        if now >= self._next_check:
+            self._next_check = now + self.check_interval
+            self.check_files()
+    
+    def get(self, addr: IP_OR_STR, default=NO_RESULT) -> Optional[GeoIPResult]:
+        """
+        Get a copy of the cached :class:`.GeoIPResult` for the most specific cached network containing ``addr`` (with its
+        :attr:`.GeoIPResult.ip_address` set to ``addr``) - or ``None`` if the network is cached as not being in the GeoIP database.
+        Returns ``default`` (:attr:`.NO_RESULT` unless specified) if no cached network contains ``addr``.
+        """
+        self._maybe_check()
+        try:
+            ip = ip_address(str(addr))
+        except ValueError:
+            self.misses += 1
+            return default
+        n, shift = int(ip), ip.max_prefixlen
+        with self._lock:
+            node, best = self._roots[ip.version], None
+            while node is not None:
+                if node[2] is not _EMPTY: best = node
+                if shift == 0: break
+                shift -= 1
+                node = node[(n >> shift) & 1]
+            if best is None:
+                self.misses += 1
+                return default
+            self._lru.move_to_end(best[3])
+            self.hits += 1
+            res = best[2]
+        return None if res is None else attr.evolve(res, ip_address=str(addr))
+    
+    def set(self, network: Union[str, IPv4Network, IPv6Network], res: Optional[GeoIPResult]):
+        """Cache the :class:`.GeoIPResult` ``res`` (or ``None`` if it's not in the GeoIP database) for every IP in ``network``"""
+        if network is None:
+            return
+        self._maybe_check()
+        network = network if isinstance(network, (IPv4Network, IPv6Network)) else ip_network(str(network), strict=False)
+        plen, bits = network.prefixlen, network.max_prefixlen
+        prefix = int(network.network_address) >> (bits - plen)
+        key = (network.version, plen, prefix)
+        with self._lock:
+            node = self._roots[network.version]
+            for shift in range(plen - 1, -1, -1):
+                bit = (prefix >> shift) & 1
+                if node[bit] is None: node[bit] = self._node()
+                node = node[bit]
+            node[2], node[3] = res, key
+            self._lru[key] = True
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_networks:
+                self._remove(self._lru.popitem(last=False)[0])
+    
+    def add(self, res: GeoIPResult) -> bool:
+        """
+        Cache ``res`` under the network it's valid for (see :func:`._result_network`).
+        Returns ``False`` if the network couldn't be determined, so the result wasn't cached.
+        """
+        net = _result_network(res)
+        if net is None:
+            return False
+        self.set(net, res)
+        return True
+    
+    def _remove(self, key: Tuple[int, int, int]):
+        """Remove the result for the trie node ``key``, and remove any of its parent nodes which are no longer needed"""
+        version, plen, prefix = key
+        path = [self._roots[version]]
+        for shift in range(plen - 1, -1, -1):
+            path.append(path[-1][(prefix >> shift) & 1])
+        path[-1][2], path[-1][3] = _EMPTY, None
+        for depth in range(plen, 0, -1):
+            node = path[depth]
+            if node[0] is not None or node[1] is not None or node[2] is not _EMPTY:
+                break
+            path[depth - 1][(prefix >> (plen - depth)) & 1] = None
+    
+    def __len__(self):
+        return len(self._lru)
+    
+    def __contains__(self, addr):
+        return self.get(addr) is not NO_RESULT
+
+
+_PREFIX_CACHE: Optional[GeoIPPrefixCache] = None
+
+
+def get_prefix_cache() -> GeoIPPrefixCache:
+    """
+    Get (or create) the process-wide :class:`.GeoIPPrefixCache` used by :func:`.geolocate_ip`. When the GeoIP databases
+    are modified, it's cleared and the calling thread's GeoIP readers are re-opened (see :func:`.cleanup`).
+    """
+    global _PREFIX_CACHE
+    if _PREFIX_CACHE is None:
+        with _GEOIP_CACHE_LOCK:
+            if _PREFIX_CACHE is None:
+                _PREFIX_CACHE = GeoIPPrefixCache(on_change=cleanup)
+    return _PREFIX_CACHE
+
+
+def _prefix_cache(prefix_cache: Union[GeoIPPrefixCache, bool, None]) -> Optional[GeoIPPrefixCache]:
+    if prefix_cache is None: prefix_cache = settings.GEOIP_PREFIX_CACHE
+    if prefix_cache is True: return get_prefix_cache()
+    return prefix_cache if isinstance(prefix_cache, GeoIPPrefixCache) else None
+
+
 def cleanup(geo_type: str = None):
     """
     With no arguments, closes and removes GeoIP city + asn + country from thread store.
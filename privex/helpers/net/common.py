@@ -36,8 +36,8 @@ from privex.helpers.common import byteify, empty, empty_if, is_true
 from privex.helpers.asyncx import run_coro_thread_async
 from privex.helpers.net import base as netbase
 from privex.helpers.net.dns import resolve_ip, resolve_ip_async
-from privex.helpers.net.socket import AsyncSocketWrapper
-from privex.helpers.net.util import get_ssl_context, ip_is_v6
+from privex.helpers.net.socket import AsyncSocketWrapper, happy_eyeballs_connect
+from privex.helpers.net.util import get_ssl_context, ip_is_v6, sock_ver
 from privex.helpers.types import AUTO, AnyNum, IP_OR_STR
 
 log = logging.getLogger(__name__)
@@ -98,15 +98,16 @@ def check_host(host: IP_OR_STR, port: AnyNum, version='any', throw=False, **kwar
         timeout = 10.0 if not t else t
     
     try:
-        s_ver = socket.AF_INET
-        ip = resolve_ip(host, version)
-    
-        if ip_is_v6(ip): s_ver = socket.AF_INET6
-    
         if port == 443 and use_ssl is None:
             log.warning("check_host: automatically setting use_ssl=True as port is 443 and use_ssl was not specified.")
             use_ssl = True
-        with socket.socket(s_ver, stype) as s:
+        if settings.HAPPY_EYEBALLS and stype == socket.SOCK_STREAM:
+            # Race the host's IPv6 / IPv4 addresses (RFC 8305), so broken IPv6 doesn't make the check fail / time out
+            sock, addr = happy_eyeballs_connect(host, port, version, timeout=timeout, type=stype), None
+        else:
+            ip = resolve_ip(host, version)
+            sock, addr = socket.socket(socket.AF_INET6 if ip_is_v6(ip) else socket.AF_INET, stype), (ip, int(port))
+        with sock as s:
             orig_sock = s
             if timeout: s.settimeout(float(timeout))
             if use_ssl:
@@ -118,7 +119,7 @@ def check_host(host: IP_OR_STR, port: AnyNum, version='any', throw=False, **kwar
                     do_handshake_on_connect=kwargs.get('do_handshake_on_connect', True),
                 )
                 
-            s.connect((ip, int(port)))
+            if addr is not None: s.connect(addr)
             if not empty(send):
                 s.sendall(byteify(send))
             if receive > 0:
@@ -182,10 +183,12 @@ async def check_host_async(host: IP_OR_STR, port: AnyNum, version='any', throw=F
         timeout = settings.DEFAULT_SOCKET_TIMEOUT if not t else t
     
     # loop = asyncio.get_event_loop()
-    s_ver = socket.AF_INET
-    ip = await resolve_ip_async(host, version)
-    
-    if ip_is_v6(ip): s_ver = socket.AF_INET6
+    if settings.HAPPY_EYEBALLS and sock_ver(version) is None:
+        # AsyncSocketWrapper races the host's IPv6 / IPv4 addresses using Happy Eyeballs when the family is auto (-1)
+        s_ver = -1
+    else:
+        ip = await resolve_ip_async(host, version)
+        s_ver = socket.AF_INET6 if ip_is_v6(ip) else socket.AF_INET
     
     try:
         aw = AsyncSocketWrapper(host, int(port), family=s_ver, use_ssl=use_ssl, timeout=timeout)
@@ -23,76 +23,209 @@ Functions/classes related to hostnames/domains/reverse DNS etc. - network relate
 """
 
 import asyncio
+import os
+import re
 import socket
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, TimeoutError as FutureTimeout, wait
 from ipaddress import IPv4Address, IPv6Address, ip_address
 
-from typing import AsyncGenerator, Generator, List, Optional, Tuple, Union
+from typing import Any, AsyncGenerator, Awaitable, Callable, Dict, Generator, Iterable, List, Optional, Tuple, Union
 
-from privex.helpers import plugin
+from privex.helpers import plugin, settings
+from privex.helpers.cache.singleflight import AsyncSingleFlight, SingleFlight
 from privex.helpers.common import empty
 from privex.helpers.exceptions import BoundaryException, InvalidHost, ReverseDNSNotFound
 import logging
 
 from privex.helpers.net.util import is_ip, sock_ver
-from privex.helpers.types import IP_OR_STR
+from privex.helpers.types import IP_OR_STR, NO_RESULT
 
 log = logging.getLogger(__name__)
 
 __all__ = [
     'ip_to_rdns', 'ip4_to_rdns', 'ip6_to_rdns', 'resolve_ips_async', 'resolve_ip_async', 'resolve_ips_multi_async',
-    'resolve_ips', 'resolve_ip', 'resolve_ips_multi', 'get_rdns_async', 'get_rdns', 'get_rdns_multi'
+    'resolve_ips', 'resolve_ip', 'resolve_ips_multi', 'get_rdns_async', 'get_rdns', 'get_rdns_multi', 'get_rdns_multi_async',
+    'DNSCache', 'get_dns_cache', 'get_resolver', 'get_async_resolver', 'set_resolver', 'asn_to_name', 'asn_to_name_async',
+    'asn_to_name_many', 'asn_to_name_many_async', 'get_asn_cache', 'load_asn_table'
 ]
 
 
 try:
     from dns.resolver import Resolver, NoAnswer, NXDOMAIN
     
+    try:
+        from dns.asyncresolver import Resolver as AsyncResolver
+    except ImportError:     # dnspython < 2.0
+        AsyncResolver = None
     
-    def asn_to_name(as_number: Union[int, str], quiet: bool = True) -> str:
-        """
-        Look up an integer Autonomous System Number and return the human readable
-        name of the organization.
+    plugin.HAS_DNSPYTHON = True
 
-        Usage:
+except ImportError:
+    class NXDOMAIN(Exception):
+        """Placeholder for :class:`dns.resolver.NXDOMAIN` when dnspython isn't installed"""
+    
+    NoAnswer = NXDOMAIN
+    Resolver = AsyncResolver = None
+    log.debug('privex.helpers.net failed to import "dns.resolver" (pypi package "dnspython"), using the system resolver')
 
-        >>> asn_to_name(210083)
-        'PRIVEX, SE'
-        >>> asn_to_name('13335')
-        'CLOUDFLARENET - Cloudflare, Inc., US'
 
-        This helper function requires ``dnspython>=1.16.0``, it will not be visible unless
-        you install the dnspython package in your virtualenv, or systemwide::
+_RESOLVERS = {}
+_RESOLVER_LOCK = threading.Lock()
 
-            pip3 install dnspython
 
+def _new_resolver(cls):
+    nameservers = [ns.strip() for ns in settings.DNS_NAMESERVERS.split(',') if ns.strip()]
+    # Only read /etc/resolv.conf if we aren't going to replace the nameservers anyway
+    res = cls(configure=len(nameservers) == 0)
+    if len(nameservers) > 0:
+        res.nameservers = nameservers
+    res.port = settings.DNS_PORT
+    res.lifetime = settings.DNS_TIMEOUT
+    res.timeout = min(res.timeout, res.lifetime)
+    return res
 
-        :param int/str as_number: The AS number as a string or integer, e.g. 210083 or '210083'
-        :param bool quiet:        (default True) If True, returns 'Unknown ASN' if a lookup fails.
-                                  If False, raises a KeyError if no results are found.
-        :raises KeyError:         Raised when a lookup returns no results, and ``quiet`` is set to False.
-        :return str as_name:      The name and country code of the ASN, e.g. 'PRIVEX, SE'
-        """
-        
-        try:
-            res = Resolver().query('AS{}.asn.cymru.com'.format(as_number), "TXT")
-            if len(res) > 0:
-                # res[0] is formatted like such: "15169 | US | arin | 2000-03-30 | GOOGLE - Google LLC, US" with
-                # literal quotes. we need to strip them, split by pipe, extract the last element, then strip spaces.
-                asname = str(res[0]).strip('"').split('|')[-1:][0].strip()
-                return str(asname)
-            raise NoAnswer('privex.helpers.net.asn_to_name returned no results.')
-        except (NoAnswer, NXDOMAIN):
-            if quiet:
-                return 'Unknown ASN'
-            raise KeyError('ASN {} was not found, or server did not respond.'.format(as_number))
-    
-    
-    __all__ += ['asn_to_name']
-    plugin.HAS_DNSPYTHON = True
 
-except ImportError:
-    log.debug('privex.helpers.net failed to import "dns.resolver" (pypi package "dnspython"), skipping some helpers')
-    pass
+def _shared_resolver(key: str, cls):
+    res = _RESOLVERS.get(key)
+    if res is None:
+        if cls is None:
+            raise ImportError(f"The dnspython {key} resolver isn't available - install / upgrade it with: pip3 install -U dnspython")
+        with _RESOLVER_LOCK:
+            res = _RESOLVERS.get(key)
+            if res is None:
+                res = _RESOLVERS[key] = _new_resolver(cls)
+    return res
+
+
+def get_resolver() -> "Resolver":
+    """
+    Get the dnspython :class:`dns.resolver.Resolver` shared by :func:`.asn_to_name`, :func:`.resolve_ips` and :func:`.get_rdns`.
+    
+    It's created on first use from :attr:`privex.helpers.settings.DNS_NAMESERVERS`, :attr:`privex.helpers.settings.DNS_PORT`
+    and :attr:`privex.helpers.settings.DNS_TIMEOUT` - so the nameserver configuration is only parsed once. Use :func:`.set_resolver`
+    to replace it, or to re-create it after changing those settings.
+    
+    :raises ImportError: When ``dnspython`` isn't installed
+    """
+    return _shared_resolver('sync', Resolver)
+
+
+def get_async_resolver() -> "AsyncResolver":
+    """
+    Get the dnspython :class:`dns.asyncresolver.Resolver` shared by :func:`.resolve_ips_async` and :func:`.get_rdns_async`.
+    See :func:`.get_resolver` for how it's configured.
+    
+    :raises ImportError: When ``dnspython`` isn't installed, or is older than 2.0 (which added ``dns.asyncresolver``)
+    """
+    return _shared_resolver('async', AsyncResolver)
+
+
+def set_resolver(resolver: "Resolver" = None, async_resolver: "AsyncResolver" = None):
+    """
+    Replace the shared dnspython resolvers returned by :func:`.get_resolver` and :func:`.get_async_resolver`, e.g. with
+    resolvers pointed at a specific nameserver::
+    
+        >>> from dns.resolver import Resolver
+        >>> from dns.asyncresolver import Resolver as AsyncResolver
+        >>> res, ares = Resolver(configure=False), AsyncResolver(configure=False)
+        >>> res.nameservers = ares.nameservers = ['127.0.0.1']
+        >>> set_resolver(res, ares)
+    
+    Any resolver passed as ``None`` is re-created from the settings the next time it's used - so calling ``set_resolver()``
+    with no arguments applies changes to :attr:`privex.helpers.settings.DNS_NAMESERVERS` etc.
+    """
+    with _RESOLVER_LOCK:
+        _RESOLVERS.clear()
+        if resolver is not None: _RESOLVERS['sync'] = resolver
+        if async_resolver is not None: _RESOLVERS['async'] = async_resolver
+
+
+def _dns_query(res, qname: str, rdtype: str):
+    """Query ``qname`` using the dnspython resolver ``res`` (for an async resolver, the result must be awaited)"""
+    query = getattr(res, 'resolve', None) or res.query    # dnspython 1.x only has 'query'
+    return query(qname, rdtype)
+
+
+_HOSTS_FILE: Tuple[Optional[str], Optional[float], frozenset] = (None, None, frozenset())
+"""The path, modification time and names / IPs of the last hosts file read by :func:`._hosts_entries`"""
+
+
+def _normalize_host(host: str) -> str:
+    host = str(host).strip().lower().rstrip('.')
+    try:
+        return ip_address(host.split('%', 1)[0]).compressed
+    except ValueError:
+        return host
+
+
+def _hosts_entries() -> frozenset:
+    """The names and IPs listed in :attr:`privex.helpers.settings.DNS_HOSTS_FILE` - re-read when it's modification time changes"""
+    global _HOSTS_FILE
+    path = settings.DNS_HOSTS_FILE
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return frozenset()
+    if _HOSTS_FILE[0] == path and _HOSTS_FILE[1] == mtime:
+        return _HOSTS_FILE[2]
+    entries = set()
+    try:
+        with open(path, encoding='utf-8', errors='replace') as fh:
+            for line in fh:
+                entries.update(_normalize_host(h) for h in line.split('#', 1)[0].split())
+    except OSError as e:
+        log.debug("Failed to read hosts file %s - reason: %s %s", path, type(e), str(e))
+    _HOSTS_FILE = (path, mtime, frozenset(entries))
+    return _HOSTS_FILE[2]
+
+
+def _in_hosts_file(addr: str) -> bool:
+    """Whether ``addr`` (a name or IP) should be left to the system resolver, as it's listed in the hosts file"""
+    return settings.DNS_BACKEND == 'auto' and _normalize_host(addr) in _hosts_entries()
+
+
+def _use_dnspython(addr: str = None) -> bool:
+    """Whether to look up ``addr`` with dnspython (see :attr:`privex.helpers.settings.DNS_BACKEND`)"""
+    if not plugin.HAS_DNSPYTHON or settings.DNS_BACKEND == 'system':
+        return False
+    if addr is None:
+        return True
+    # Single label names (e.g. 'localhost' or LAN hostnames), and names in the hosts file are left to the system resolver
+    return '.' in addr.strip('.') and not _in_hosts_file(addr)
+
+
+def _is_local_ip(ip: str) -> bool:
+    """Private / loopback / link-local IPs, whose rDNS is often only in ``/etc/hosts`` rather than public DNS"""
+    try:
+        ip = ip_address(ip)
+    except ValueError:
+        return False
+    return ip.is_private or ip.is_loopback or ip.is_link_local
+
+
+def _ptr_name(ans) -> Optional[str]:
+    for r in ans:
+        return str(r.target).rstrip('.')
+    return None
+
+
+def _ptr_lookup(ip: str) -> Optional[str]:
+    """Look up the PTR record for ``ip`` using the shared dnspython resolver - returns ``None`` if there isn't one"""
+    try:
+        return _ptr_name(_dns_query(get_resolver(), ip_to_rdns(ip), 'PTR'))
+    except (NXDOMAIN, NoAnswer):
+        return None
+
+
+async def _ptr_lookup_async(ip: str) -> Optional[str]:
+    """AsyncIO version of :func:`._ptr_lookup`"""
+    try:
+        return _ptr_name(await _dns_query(get_async_resolver(), ip_to_rdns(ip), 'PTR'))
+    except (NXDOMAIN, NoAnswer):
+        return None
 
 
 def ip_to_rdns(ip: str, boundary: bool = False, v6_boundary: int = 32, v4_boundary: int = 24) -> str:
@@ -203,7 +336,448 @@ def ip6_to_rdns(ip_obj: IPv6Address, v6_boundary: int = 32, boundary: bool = Fal
     return addr_joined + '.ip6.arpa'            # and finally, return the completed string, a.f.0.0.1.0.0.2.ip6.arpa
 
 
-async def resolve_ips_async(addr: IP_OR_STR, version: Union[str, int] = 'any', v4_convert=False) -> List[str]:
+LOOKUP_RESULT = Tuple[List[str], Optional[float]]
+"""The return type of DNS lookup functions used by :class:`.DNSCache` - a list of IPs, and their TTL (or ``None`` if unknown)"""
+
+
+class DNSCache:
+    """
+    A bounded, TTL-aware cache of resolved hostnames, shared between :func:`.resolve_ips` and :func:`.resolve_ips_async`
+    (and everything that uses them - :func:`.check_host`, :func:`.send_data`, :class:`.SocketWrapper` etc.)
+    
+     * Entries expire after the record TTL when it's known (hostnames resolved with ``dnspython``), otherwise after ``default_ttl``.
+     * Hostnames which don't exist / have no addresses are cached as an empty list for ``negative_ttl`` seconds.
+     * Once there are more than ``max_entries`` hostnames cached, the least recently used entries are removed.
+     * Concurrent lookups for the same hostname are de-duplicated using :class:`.SingleFlight` (between threads) and
+       :class:`.AsyncSingleFlight` (between coroutines on the same event loop) - only the first caller runs the lookup,
+       and the others wait for its result.
+    
+    The cache used by default is returned by :func:`.get_dns_cache`, and can be disabled with :attr:`privex.helpers.settings.DNS_CACHE`::
+    
+        >>> resolve_ips('privex.io')            # Looked up via DNS
+        ['2a07:e00::abc', '185.130.44.10']
+        >>> resolve_ips('privex.io', 'v4')      # IPv4 and IPv6 lookups are cached separately
+        ['185.130.44.10']
+        >>> resolve_ips('privex.io')            # Returned from the cache
+        ['2a07:e00::abc', '185.130.44.10']
+        >>> get_dns_cache().hits, get_dns_cache().misses
+        (1, 2)
+    
+    """
+    
+    def __init__(self, max_entries: int = None, default_ttl: float = None, negative_ttl: float = None,
+                 min_ttl: float = None, max_ttl: float = None):
+        """
+        :param int max_entries: Maximum number of hostname + IP version entries (default: :attr:`privex.helpers.settings.DNS_CACHE_SIZE`)
+        :param float default_ttl: Seconds to cache results without a known TTL (default: :attr:`privex.helpers.settings.DNS_CACHE_TTL`)
+        :param float negative_ttl: Seconds to cache non-existent hostnames (default: :attr:`privex.helpers.settings.DNS_CACHE_NEGATIVE_TTL`)
+        :param float min_ttl: Lower bound for record TTLs (default: :attr:`privex.helpers.settings.DNS_CACHE_MIN_TTL`)
+        :param float max_ttl: Upper bound for record TTLs (default: :attr:`privex.helpers.settings.DNS_CACHE_MAX_TTL`)
+        """
+        self.max_entries = settings.DNS_CACHE_SIZE if max_entries is None else int(max_entries)
+        self.default_ttl = settings.DNS_CACHE_TTL if default_ttl is None else default_ttl
+        self.negative_ttl = settings.DNS_CACHE_NEGATIVE_TTL if negative_ttl is None else negative_ttl
+        self.min_ttl = settings.DNS_CACHE_MIN_TTL if min_ttl is None else min_ttl
+        self.max_ttl = settings.DNS_CACHE_MAX_TTL if max_ttl is None else max_ttl
+        self.hits, self.misses = 0, 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._flights, self._async_flights = SingleFlight(), AsyncSingleFlight()
+    
+    @staticmethod
+    def _key(host: str, family: int) -> Tuple[str, int]:
+        return str(host).lower().rstrip('.'), family or 0
+    
+    def _ttl(self, ips: List[str], ttl: Optional[float]) -> float:
+        if len(ips) == 0:
+            return self.negative_ttl
+        if ttl is None:
+            return self.default_ttl
+        return min(max(ttl, self.min_ttl), self.max_ttl)
+    
+    def _get(self, key: Tuple[str, int]):
+        ent = self._entries.get(key)
+        if ent is None:
+            return NO_RESULT
+        if ent[0] <= time.monotonic():
+            del self._entries[key]
+            return NO_RESULT
+        self._entries.move_to_end(key)
+        return ent[1]
+    
+    def get(self, host: str, family: int = 0, default=NO_RESULT) -> Union[List[str], type(NO_RESULT)]:
+        """
+        Get the cached IPs for ``host`` (resolved for the address ``family``, e.g. :attr:`socket.AF_INET`, or ``0`` for any).
+        Returns an empty list if ``host`` is cached as non-existent, or ``default`` if it's not cached / has expired.
+        """
+        with self._lock:
+            res = self._get(self._key(host, family))
+        return default if res is NO_RESULT else list(res)
+    
+    def set(self, host: str, family: int, ips: List[str], ttl: float = None):
+        """
+        Cache the IPs ``ips`` for ``host`` / ``family``. An empty ``ips`` is cached for :attr:`.negative_ttl` seconds, otherwise
+        ``ttl`` is clamped between :attr:`.min_ttl` and :attr:`.max_ttl` - or :attr:`.default_ttl` is used if ``ttl`` is ``None``.
+        """
+        ttl, key = self._ttl(ips, ttl), self._key(host, family)
+        with self._lock:
+            if ttl <= 0:
+                self._entries.pop(key, None)
+                return
+            self._entries[key] = (time.monotonic() + ttl, tuple(ips))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def remove(self, host: str, family: int = None):
+        """Remove ``host`` from the cache - for a single address ``family``, or for every family if ``family`` is ``None``"""
+        with self._lock:
+            families = [family] if family is not None else [0, socket.AF_INET, socket.AF_INET6]
+            for f in families:
+                self._entries.pop(self._key(host, f), None)
+    
+    def clear(self):
+        """Remove every cached hostname, and reset :attr:`.hits` / :attr:`.misses`"""
+        with self._lock:
+            self._entries.clear()
+            self.hits, self.misses = 0, 0
+    
+    def _hit(self, key: Tuple[str, int], count_miss: bool = False):
+        """Returns the cached IPs for ``key`` (counting a hit), or :class:`.NO_RESULT` (counting a miss if ``count_miss``)"""
+        with self._lock:
+            res = self._get(key)
+            if res is not NO_RESULT:
+                self.hits += 1
+                return list(res)
+            if count_miss:
+                self.misses += 1
+            return NO_RESULT
+    
+    @staticmethod
+    def _flight_key(key: Tuple[str, int]) -> str:
+        return f'{key[1]}:{key[0]}'
+    
+    def resolve(self, host: str, family: int, lookup: Callable[[str, int], LOOKUP_RESULT]) -> List[str]:
+        """
+        Return the cached IPs for ``host`` / ``family`` - or call ``lookup(host, family)`` (which must return a tuple of
+        ``(ips, ttl)``) and cache the result. If another thread is already looking up ``host``, waits for its result.
+        
+        Exceptions raised by ``lookup`` aren't cached, and are raised to every caller waiting on that lookup.
+        """
+        key = self._key(host, family)
+        res = self._hit(key)
+        if res is not NO_RESULT:
+            return res
+        
+        def _lookup():
+            # Another thread may have cached the result while we were waiting to become the leader
+            r = self._hit(key, count_miss=True)
+            if r is not NO_RESULT:
+                return r
+            ips, ttl = lookup(host, family)
+            self.set(host, family, ips, ttl)
+            return ips
+        
+        return list(self._flights.do(self._flight_key(key), _lookup))
+    
+    async def resolve_async(self, host: str, family: int, lookup: Callable[[str, int], Awaitable[LOOKUP_RESULT]]) -> List[str]:
+        """
+        AsyncIO version of :meth:`.resolve` - ``lookup`` must be an async function (or return an awaitable). Waits for the
+        result of a coroutine on the same event loop which is already looking up ``host``.
+        """
+        key = self._key(host, family)
+        res = self._hit(key)
+        if res is not NO_RESULT:
+            return res
+        
+        async def _lookup():
+            r = self._hit(key, count_miss=True)
+            if r is not NO_RESULT:
+                return r
+            ips, ttl = await lookup(host, family)
+            self.set(host, family, ips, ttl)
+            return ips
+        
+        return list(await self._async_flights.do(self._flight_key(key), _lookup))
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def __contains__(self, host):
+        return any(self.get(host, f) is not NO_RESULT for f in [0, socket.AF_INET, socket.AF_INET6])
+
+
+_DNS_CACHE: Optional[DNSCache] = None
+_DNS_CACHE_LOCK = threading.Lock()
+
+
+def get_dns_cache() -> DNSCache:
+    """Get (or create) the process-wide :class:`.DNSCache` used by :func:`.resolve_ips` and :func:`.resolve_ips_async`"""
+    global _DNS_CACHE
+    if _DNS_CACHE is None:
+        with _DNS_CACHE_LOCK:
+            if _DNS_CACHE is None:
+                _DNS_CACHE = DNSCache()
+    return _DNS_CACHE
+
+
+def _dns_cache(cache: Union[DNSCache, bool, None]) -> Optional[DNSCache]:
+    if cache is None: cache = settings.DNS_CACHE
+    if cache is True: return get_dns_cache()
+    return cache if isinstance(cache, DNSCache) else None
+
+
+_NOT_FOUND_ERRORS = [getattr(socket, e) for e in ['EAI_NONAME', 'EAI_NODATA', 'EAI_ADDRFAMILY'] if hasattr(socket, e)]
+"""``socket.gaierror`` error numbers meaning the hostname doesn't exist / has no addresses (so the result can be negatively cached)"""
+
+
+def _gai_result(addr: str, res: Optional[list], err: Optional[socket.gaierror]) -> LOOKUP_RESULT:
+    if err is None:
+        return [ip[-1][0] for ip in res], None
+    if err.errno in _NOT_FOUND_ERRORS:
+        log.warning("Exception occurred while resolving host %s - reason: %s %s", addr, type(err), str(err))
+        return [], None
+    raise err
+
+
+def _gai_lookup(addr: str, family: int) -> LOOKUP_RESULT:
+    try:
+        return _gai_result(addr, socket.getaddrinfo(addr, 2001, family=family, proto=socket.IPPROTO_TCP), None)
+    except socket.gaierror as e:
+        return _gai_result(addr, None, e)
+
+
+async def _gai_lookup_async(addr: str, family: int) -> LOOKUP_RESULT:
+    loop = asyncio.get_event_loop()
+    try:
+        return _gai_result(addr, await loop.getaddrinfo(addr, 2001, family=family, proto=socket.IPPROTO_TCP), None)
+    except socket.gaierror as e:
+        return _gai_result(addr, None, e)
+
+
+def _rdtypes(family: int) -> List[str]:
+    return {socket.AF_INET: ['A'], socket.AF_INET6: ['AAAA']}.get(family, ['AAAA', 'A'])
+
+
+def _answers_result(answers: list) -> LOOKUP_RESULT:
+    ips = [str(r) for ans in answers for r in ans]
+    return ips, (min(ans.rrset.ttl for ans in answers) if len(answers) > 0 else None)
+
+
+def _dnspython_lookup(addr: str, family: int) -> LOOKUP_RESULT:
+    """Resolve the AAAA and/or A records for ``addr`` using dnspython - returning the IPs, and the lowest TTL of the records"""
+    res, answers = get_resolver(), []
+    for rdtype in _rdtypes(family):
+        try:
+            answers.append(_dns_query(res, addr, rdtype))
+        except NXDOMAIN:
+            break
+        except NoAnswer:
+            continue
+    return _answers_result(answers)
+
+
+async def _dnspython_lookup_async(addr: str, family: int) -> LOOKUP_RESULT:
+    """AsyncIO version of :func:`._dnspython_lookup` - uses :func:`.get_async_resolver` if it's available"""
+    if AsyncResolver is None:
+        return await asyncio.get_event_loop().run_in_executor(None, _dnspython_lookup, addr, family)
+    res, answers = get_async_resolver(), []
+    for rdtype in _rdtypes(family):
+        try:
+            answers.append(await _dns_query(res, addr, rdtype))
+        except NXDOMAIN:
+            break
+        except NoAnswer:
+            continue
+    return _answers_result(answers)
+
+
+def _lookup(addr: str, family: int) -> LOOKUP_RESULT:
+    if _use_dnspython(addr):
+        try:
+            res = _dnspython_lookup(addr, family)
+            if len(res[0]) > 0: return res
+        except Exception as e:
+            log.debug("dnspython failed to resolve %s, falling back to getaddrinfo - reason: %s %s", addr, type(e), str(e))
+    return _gai_lookup(addr, family)
+
+
+async def _lookup_async(addr: str, family: int) -> LOOKUP_RESULT:
+    if _use_dnspython(addr):
+        try:
+            res = await _dnspython_lookup_async(addr, family)
+            if len(res[0]) > 0: return res
+        except Exception as e:
+            log.debug("dnspython failed to resolve %s, falling back to getaddrinfo - reason: %s %s", addr, type(e), str(e))
+    return await _gai_lookup_async(addr, family)
+
+
+_END = object()
+
+MULTI_RESULT = Tuple[Any, Any, Optional[BaseException]]
+"""Items yielded by :func:`._multi_threaded` / :func:`._multi_async` - ``(item, result, exception)``"""
+
+
+def _multi_items(items: tuple):
+    """
+    The ``*hosts`` of the ``_multi`` functions may also be a single iterable (e.g. a generator or open file), which is
+    consumed lazily instead of being expanded into a tuple.
+    """
+    if len(items) == 1 and not isinstance(items[0], (str, bytes, IPv4Address, IPv6Address)):
+        if hasattr(items[0], '__iter__') or hasattr(items[0], '__aiter__'):
+            return items[0]
+    return items
+
+
+def _multi_settings(concurrency: Optional[int], timeout: Optional[float]) -> Tuple[int, Optional[float]]:
+    concurrency = settings.DNS_MULTI_CONCURRENCY if concurrency is None else concurrency
+    timeout = settings.DNS_MULTI_TIMEOUT if timeout is None else timeout
+    return max(int(concurrency), 1), (None if not timeout or timeout <= 0 else float(timeout))
+
+
+def _future_result(fut: Future, deadline: Optional[float], timeout: Optional[float]) -> Tuple[Any, Optional[BaseException]]:
+    try:
+        return fut.result(timeout=None if deadline is None else max(0.0, deadline - time.monotonic())), None
+    except FutureTimeout:
+        return None, TimeoutError(f"Lookup timed out after {timeout} seconds")
+    except Exception as e:
+        return None, e
+
+
+def _multi_threaded(func: Callable[[Any], Any], items: Iterable, concurrency: int = None, timeout: float = None,
+                    ordered: bool = True) -> Generator[MULTI_RESULT, None, None]:
+    """
+    Call ``func(item)`` for each of ``items`` using a pool of ``concurrency`` threads, yielding ``(item, result, exception)``
+    tuples in input order (``ordered=True``), or as each call completes (``ordered=False``).
+    
+    At most ``concurrency`` items are pulled from ``items`` at once, so memory use doesn't grow with the number of items. Calls which
+    take longer than ``timeout`` seconds (measured from when the call started) are yielded with a :class:`TimeoutError`. The thread
+    can't be interrupted, so it stays stuck on the lookup until ``func`` returns - the pool starts another worker in its place,
+    so one hung lookup can't hold up the items queued behind it. At most :attr:`.settings.DNS_MULTI_MAX_ABANDONED` workers are
+    replaced like this - once every worker is stuck, the next item waits up to ``timeout`` seconds for one to become free, and
+    is yielded with a :class:`TimeoutError` if none does.
+    """
+    concurrency, timeout = _multi_settings(concurrency, timeout)
+    if concurrency == 1 and timeout is None:
+        for item in items:
+            try:
+                yield item, func(item), None
+            except Exception as e:
+                yield item, None, e
+        return
+    workers = concurrency + max(int(settings.DNS_MULTI_MAX_ABANDONED), 0)
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='pvx-dns-multi')
+    it, pending, stuck = iter(items), OrderedDict(), set()     # pending: Future -> (item, deadline)
+    
+    def _result(fut: Future, item, deadline) -> MULTI_RESULT:
+        res, err = _future_result(fut, deadline, timeout)
+        if not fut.done():
+            stuck.add(fut)      # Timed out - the worker running it is stuck until func returns
+        return item, res, err
+    
+    try:
+        exhausted = False
+        while True:
+            stuck.difference_update([f for f in stuck if f.done()])
+            # Items are only submitted when a worker is free to start them, so their deadline starts with the call
+            while not exhausted and len(pending) < concurrency and len(pending) + len(stuck) < workers:
+                item = next(it, _END)
+                if item is _END:
+                    exhausted = True
+                    break
+                pending[pool.submit(func, item)] = (item, None if timeout is None else time.monotonic() + timeout)
+            if len(pending) == 0:
+                if exhausted:
+                    return
+                # Every worker is stuck on a timed out lookup, and no more may be started
+                done, _ = wait(list(stuck), timeout=timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    item = next(it, _END)
+                    if item is _END:
+                        return
+                    yield item, None, TimeoutError(f"Lookup timed out after {timeout} seconds (no free worker threads)")
+                continue
+            if ordered:
+                fut, (item, deadline) = pending.popitem(last=False)
+                yield _result(fut, item, deadline)
+                continue
+            wait_for = None if timeout is None else max(0.0, min(d for _, d in pending.values()) - time.monotonic())
+            done, _ = wait(list(pending.keys()), timeout=wait_for, return_when=FIRST_COMPLETED)
+            now = time.monotonic()
+            for fut in [f for f, (_, d) in pending.items() if f in done or (d is not None and d <= now)]:
+                item, deadline = pending.pop(fut)
+                yield _result(fut, item, deadline)
+    finally:
+        for fut in pending: fut.cancel()
+        pool.shutdown(wait=False)
+
+
+async def _multi_async(func: Callable[[Any], Awaitable], items, concurrency: int = None, timeout: float = None,
+                       ordered: bool = True) -> AsyncGenerator[MULTI_RESULT, None]:
+    """
+    AsyncIO version of :func:`._multi_threaded` - runs ``await func(item)`` for each of ``items`` (which may be an async iterable),
+    with at most ``concurrency`` tasks running at once. Tasks which take longer than ``timeout`` seconds are cancelled, and yielded
+    with a :class:`TimeoutError`.
+    """
+    concurrency, timeout = _multi_settings(concurrency, timeout)
+    is_async = hasattr(items, '__aiter__')
+    it = items.__aiter__() if is_async else iter(items)
+    
+    async def _next():
+        if not is_async: return next(it, _END)
+        try:
+            return await it.__anext__()
+        except StopAsyncIteration:
+            return _END
+    
+    async def _run(item):
+        return await (func(item) if timeout is None else asyncio.wait_for(func(item), timeout))
+    
+    async def _result(task: asyncio.Future) -> Tuple[Any, Optional[BaseException]]:
+        try:
+            return await task, None
+        except asyncio.TimeoutError:
+            return None, TimeoutError(f"Lookup timed out after {timeout} seconds")
+        except Exception as e:
+            return None, e
+    
+    pending = OrderedDict()     # Task -> item
+    try:
+        while True:
+            while len(pending) < concurrency:
+                item = await _next()
+                if item is _END: break
+                pending[asyncio.ensure_future(_run(item))] = item
+            if len(pending) == 0:
+                return
+            if ordered:
+                task, item = pending.popitem(last=False)
+                res, err = await _result(task)
+                yield item, res, err
+                continue
+            done, _ = await asyncio.wait(list(pending.keys()), return_when=asyncio.FIRST_COMPLETED)
+            for task in [t for t in pending if t in done]:
+                item = pending.pop(task)
+                res, err = await _result(task)
+                yield item, res, err
+    finally:
+        for task in pending: task.cancel()
+
+
+def _multi_resolve_error(addr, err: BaseException):
+    """Log a failed :func:`.resolve_ips_multi` / :func:`.resolve_ips_multi_async` lookup - or raise ``err`` if it's unexpected"""
+    if isinstance(err, socket.gaierror):
+        log.warning("[resolve_ips_multi socket.gaierror] Failed to resolve host: %s - Ex: %s %s", addr, type(err), str(err))
+    elif isinstance(err, AttributeError):
+        log.warning("[resolve_ips_multi AttributeError] Invalid IP: %s - Ex: %s %s", addr, type(err), str(err))
+    elif isinstance(err, TimeoutError):
+        log.warning("[resolve_ips_multi TimeoutError] Timed out resolving host: %s - Ex: %s", addr, str(err))
+    else:
+        raise err
+
+
+async def resolve_ips_async(addr: IP_OR_STR, version: Union[str, int] = 'any', v4_convert=False,
+                            cache: Union[bool, DNSCache] = None) -> List[str]:
     """
     AsyncIO version of :func:`.resolve_ips_async` - resolves the IPv4/v6 addresses for a given host (``addr``)
     
@@ -223,24 +797,25 @@ async def resolve_ips_async(addr: IP_OR_STR, version: Union[str, int] = 'any', v
     :param bool v4_convert: (Default: ``False``) If set to ``True``, will allow IPv6-wrapped IPv4 addresses starting with ``::ffff:`` to
                             be returned when requesting version ``v6`` from an IPv4-only hostname.
 
+    :param DNSCache|bool cache: The :class:`.DNSCache` to use. ``True`` uses the shared cache from :func:`.get_dns_cache`, ``False``
+                                disables caching. Default (``None``): use the shared cache if :attr:`privex.helpers.settings.DNS_CACHE` is enabled.
+
     :raises AttributeError: Raised when an IPv4 address is passed and ``version`` is set to IPv6 - as well as vice versa (IPv6 passed
                             while version is set to IPv4)
 
     :return List[str] ips: Zero or more IP addresses in a list of :class:`str`'s
     """
-    loop = asyncio.get_event_loop()
     addr, version = str(addr), sock_ver(version)
     ips = []
     ip = is_ip(addr, version)
     if ip: return [str(ip)]
+    family = version if version in [socket.AF_INET, socket.AF_INET6] else 0
     try:
-        if version in [socket.AF_INET, socket.AF_INET6]:
-            _ips = await loop.getaddrinfo(addr, 2001, family=version, proto=socket.IPPROTO_TCP)
+        dc = _dns_cache(cache)
+        if dc is None:
+            ips = (await _lookup_async(addr, family))[0]
         else:
-            _ips = await loop.getaddrinfo(addr, 2001, proto=socket.IPPROTO_TCP)
-        
-        for ip in _ips:
-            ips += [ip[-1][0]]
+            ips = await dc.resolve_async(addr, family, _lookup_async)
         # If a hostname has no AAAA records, and we request AF_INET6, getaddrinfo often converts the A records
         # into IPv6-wrapped IPv4 addresses like so: ``::ffff:13.77.161.179``
         # Most people who specifically request IPv6 want only real IPv6 addresses, not IPv4 addresses wrapped in IPv6 format.
@@ -262,12 +837,18 @@ async def resolve_ip_async(addr: IP_OR_STR, version: Union[str, int] = 'any', v4
     return ips[0]
 
 
-async def resolve_ips_multi_async(*addr: IP_OR_STR, version: Union[str, int] = 'any', v4_convert=False) \
-        -> AsyncGenerator[Tuple[str, Optional[List[str]]], None]:
+async def resolve_ips_multi_async(*addr: IP_OR_STR, version: Union[str, int] = 'any', v4_convert=False, concurrency: int = None,
+                                  timeout: float = None, ordered: bool = True) -> AsyncGenerator[Tuple[str, Optional[List[str]]], None]:
     """
     Async version of :func:`.resolve_ips_multi`. Resolve IPv4/v6 addresses for multiple hosts specified as positional arguments.
     
     Returns results as an AsyncIO generator, to allow for efficient handling of a large amount of hostnames to resolve.
+    Up to ``concurrency`` hostnames are resolved at once (as AsyncIO tasks), and ``addr`` may also be a single iterable
+    or async iterable of hostnames, which is consumed as results are returned - so memory usage stays flat::
+    
+        >>> with open('hosts.txt') as fh:
+        ...     async for host, ips in resolve_ips_multi_async((l.strip() for l in fh), concurrency=200, ordered=False):
+        ...         print(host, ips)
 
     Using the AsyncIO generator in a loop efficiently::
 
@@ -303,24 +884,27 @@ async def resolve_ips_multi_async(*addr: IP_OR_STR, version: Union[str, int] = '
     :param str|int version: (Default: ``any``) - ``4`` (int), ``'v4'``, ``6`` (int), ``'v6'`` (see :func:`.resolve_ips` for more options)
     :param bool v4_convert: (Default: ``False``) If set to ``True``, will allow IPv6-wrapped IPv4 addresses starting with ``::ffff:`` to
                             be returned when requesting version ``v6`` from an IPv4-only hostname.
+    :param int concurrency: Maximum number of lookups to run at once (default: :attr:`privex.helpers.settings.DNS_MULTI_CONCURRENCY`).
+                            ``1`` resolves each host in sequence.
+    :param float timeout: Maximum seconds to wait for each lookup, after which its result is ``None``
+                          (default: :attr:`privex.helpers.settings.DNS_MULTI_TIMEOUT` - ``0`` / ``None`` for no timeout)
+    :param bool ordered: (Default: ``True``) Return results in the same order as ``addr``. If ``False``, results are returned
+                         as soon as each lookup completes, so one slow host doesn't hold up the rest.
 
     :return Tuple[str,Optional[List[str]] gen:  An async generator which returns tuples containing a hostname/IP, and a list of it's
         resolved IPs. If the IP was rejected (e.g. IPv4 IP passed with ``v6`` ``version`` param), then the list may instead be ``None``.
     
     """
-    for a in addr:
-        try:
-            res = await resolve_ips_async(a, version=version, v4_convert=v4_convert)
-            yield (a, res)
-        except socket.gaierror as e:
-            log.warning("[resolve_ips_multi socket.gaierror] Failed to resolve host: %s - Ex: %s %s", addr, type(e), str(e))
-            yield (a, None)
-        except AttributeError as e:
-            log.warning("[resolve_ips_multi AttributeError] Invalid IP: %s - Ex: %s %s", a, type(e), str(e))
-            yield (a, None)
+    async def _resolve(a):
+        return await resolve_ips_async(a, version=version, v4_convert=v4_convert)
+    
+    async for a, res, err in _multi_async(_resolve, _multi_items(addr), concurrency, timeout, ordered):
+        if err is not None:
+            _multi_resolve_error(a, err)
+        yield (a, res)
 
 
-def resolve_ips(addr: IP_OR_STR, version: Union[str, int] = 'any', v4_convert=False) -> List[str]:
+def resolve_ips(addr: IP_OR_STR, version: Union[str, int] = 'any', v4_convert=False, cache: Union[bool, DNSCache] = None) -> List[str]:
     """
     With just a single hostname argument, both IPv4 and IPv6 addresses will be returned as strings::
     
@@ -385,6 +969,9 @@ def resolve_ips(addr: IP_OR_STR, version: Union[str, int] = 'any', v4_convert=Fa
     :param bool v4_convert: (Default: ``False``) If set to ``True``, will allow IPv6-wrapped IPv4 addresses starting with ``::ffff:`` to
                             be returned when requesting version ``v6`` from an IPv4-only hostname.
     
+    :param DNSCache|bool cache: The :class:`.DNSCache` to use. ``True`` uses the shared cache from :func:`.get_dns_cache`, ``False``
+                                disables caching. Default (``None``): use the shared cache if :attr:`privex.helpers.settings.DNS_CACHE` is enabled.
+    
     :raises AttributeError: Raised when an IPv4 address is passed and ``version`` is set to IPv6 - as well as vice versa (IPv6 passed
                             while version is set to IPv4)
     
@@ -393,13 +980,10 @@ def resolve_ips(addr: IP_OR_STR, version: Union[str, int] = 'any', v4_convert=Fa
     addr, version, ips = str(addr), sock_ver(version), []
     ip = is_ip(addr, version)
     if ip: return [str(ip)]
+    family = version if version in [socket.AF_INET, socket.AF_INET6] else 0
     try:
-        if version in [socket.AF_INET, socket.AF_INET6]:
-            _ips = socket.getaddrinfo(addr, 2001, family=version, proto=socket.IPPROTO_TCP)
-        else:
-            _ips = socket.getaddrinfo(addr, 2001, proto=socket.IPPROTO_TCP)
-        for ip in _ips:
-            ips += [ip[-1][0]]
+        dc = _dns_cache(cache)
+        ips = _lookup(addr, family)[0] if dc is None else dc.resolve(addr, family, _lookup)
         # If a hostname has no AAAA records, and we request AF_INET6, getaddrinfo often converts the A records
         # into IPv6-wrapped IPv4 addresses like so: ``::ffff:13.77.161.179``
         # Most people who specifically request IPv6 want only real IPv6 addresses, not IPv4 addresses wrapped in IPv6 format.
@@ -448,12 +1032,18 @@ def resolve_ip(addr: IP_OR_STR, version: Union[str, int] = 'any', v4_convert=Fal
     return ips[0]
 
 
-def resolve_ips_multi(*addr: IP_OR_STR, version: Union[str, int] = 'any', v4_convert=False) \
-        -> Generator[Tuple[str, Optional[List[str]]], None, None]:
+def resolve_ips_multi(*addr: IP_OR_STR, version: Union[str, int] = 'any', v4_convert=False, concurrency: int = None,
+                      timeout: float = None, ordered: bool = True) -> Generator[Tuple[str, Optional[List[str]]], None, None]:
     """
     Resolve IPv4/v6 addresses for multiple hosts specified as positional arguments.
     
     Returns results as a generator, to allow for efficient handling of a large amount of hostnames to resolve.
+    Up to ``concurrency`` hostnames are resolved at once using a thread pool, and ``addr`` may also be a single iterable
+    of hostnames, which is consumed as results are returned - so memory usage stays flat::
+    
+        >>> with open('hosts.txt') as fh:
+        ...     for host, ips in resolve_ips_multi((l.strip() for l in fh), concurrency=50, timeout=5, ordered=False):
+        ...         print(host, ips)
     
     Using the generator in a loop efficiently::
     
@@ -487,20 +1077,23 @@ def resolve_ips_multi(*addr: IP_OR_STR, version: Union[str, int] = 'any', v4_con
     :param str|int version: (Default: ``any``) - ``4`` (int), ``'v4'``, ``6`` (int), ``'v6'`` (see :func:`.resolve_ips` for more options)
     :param bool v4_convert: (Default: ``False``) If set to ``True``, will allow IPv6-wrapped IPv4 addresses starting with ``::ffff:`` to
                             be returned when requesting version ``v6`` from an IPv4-only hostname.
-                            
+    :param int concurrency: Maximum number of lookups to run at once (default: :attr:`privex.helpers.settings.DNS_MULTI_CONCURRENCY`).
+                            ``1`` resolves each host in sequence.
+    :param float timeout: Maximum seconds to wait for each lookup, after which its result is ``None``
+                          (default: :attr:`privex.helpers.settings.DNS_MULTI_TIMEOUT` - ``0`` / ``None`` for no timeout)
+    :param bool ordered: (Default: ``True``) Return results in the same order as ``addr``. If ``False``, results are returned
+                         as soon as each lookup completes, so one slow host doesn't hold up the rest.
+
     :return Tuple[str,Optional[List[str]] gen:  A generator which returns tuples containing a hostname/IP, and a list of it's resolved
         IPs. If the IP was rejected (e.g. IPv4 IP passed with ``v6`` ``version`` param), then the list may instead be ``None``.
     """
-    for a in addr:
-        try:
-            res = resolve_ips(a, version=version, v4_convert=v4_convert)
-            yield (a, res)
-        except socket.gaierror as e:
-            log.warning("[resolve_ips_multi socket.gaierror] Failed to resolve host: %s - Ex: %s %s", addr, type(e), str(e))
-            yield (a, None)
-        except AttributeError as e:
-            log.warning("[resolve_ips_multi AttributeError] Invalid IP: %s - Ex: %s %s", a, type(e), str(e))
-            yield (a, None)
+    def _resolve(a):
+        return resolve_ips(a, version=version, v4_convert=v4_convert)
+    
+    for a, res, err in _multi_threaded(_resolve, _multi_items(addr), concurrency, timeout, ordered):
+        if err is not None:
+            _multi_resolve_error(a, err)
+        yield (a, res)
 
 
 async def get_rdns_async(host: IP_OR_STR, throw=True, version='any', name_port=80) -> Optional[str]:
@@ -540,6 +1133,18 @@ async def get_rdns_async(host: IP_OR_STR, throw=True, version='any', name_port=8
                     raise InvalidHost(f"Host '{orig_host}' is not a valid IP address, nor an existent domain")
                 return None
         
+        if _use_dnspython() and not _in_hosts_file(host):
+            try:
+                rdns = await _ptr_lookup_async(host)
+            except Exception as e:
+                log.debug("dnspython failed to look up rDNS for %s, falling back to getnameinfo - reason: %s %s",
+                          host, type(e), str(e))
+            else:
+                if rdns is not None: return rdns
+                if not _is_local_ip(host):
+                    if throw: raise ReverseDNSNotFound(f"No reverse DNS records found for host '{host}'")
+                    return None
+        
         res = await loop.getnameinfo((host, name_port))
         rdns = res[0]
         if is_ip(rdns):
@@ -599,8 +1204,26 @@ def get_rdns(host: IP_OR_STR, throw=True) -> Optional[str]:
     :raises InvalidHost: When ``throw`` is True and ``host`` is an invalid IP address or non-existent domain/hostname
     :return Optional[str] rDNS: The reverse DNS hostname for ``host`` (value of PTR record)
     """
+    host = str(host)
+    if _use_dnspython():
+        ip = host if is_ip(host) else resolve_ip(host)
+        if empty(ip):
+            if throw: raise InvalidHost(f"Host '{host}' is not a valid IP address, nor an existent domain")
+            return None
+        # IPs listed in the hosts file are left to the system resolver (gethostbyaddr), which checks the hosts file
+        if not _in_hosts_file(ip):
+            try:
+                rdns = _ptr_lookup(ip)
+            except Exception as e:
+                log.debug("dnspython failed to look up rDNS for %s, falling back to gethostbyaddr - reason: %s %s", ip, type(e), str(e))
+            else:
+                if rdns is not None: return rdns
+                # PTRs for private IPs are often only in /etc/hosts, so let the system resolver check those
+                if not _is_local_ip(ip):
+                    if throw: raise ReverseDNSNotFound(f"No reverse DNS records found for host '{host}'")
+                    return None
     try:
-        rdns = socket.gethostbyaddr(str(host))
+        rdns = socket.gethostbyaddr(host)
         return rdns[0]
     except socket.herror as e:
         if throw: raise ReverseDNSNotFound(f"No reverse DNS records found for host '{host}': {type(e)} {str(e)}")
@@ -609,13 +1232,16 @@ def get_rdns(host: IP_OR_STR, throw=True) -> Optional[str]:
     return None
 
 
-def get_rdns_multi(*hosts: IP_OR_STR, throw=False) -> Generator[Tuple[str, Optional[str]], None, None]:
+def get_rdns_multi(*hosts: IP_OR_STR, throw=False, concurrency: int = None, timeout: float = None,
+                   ordered: bool = True) -> Generator[Tuple[str, Optional[str]], None, None]:
     """
     Resolve reverse DNS hostnames for multiple IPs / domains specified as positional arguments.
     
     Each host in ``hosts`` can be an IP address as a :class:`str`, :class:`.IPv4Address`, :class:`.IPv6Address` - or a domain.
     
     Returns results as a generator, to allow for efficient handling of a large amount of hosts to resolve.
+    Up to ``concurrency`` hosts are looked up at once using a thread pool, and ``hosts`` may also be a single iterable
+    of hosts, which is consumed as results are returned - so memory usage stays flat.
     
     Basic usage::
     
@@ -641,11 +1267,363 @@ def get_rdns_multi(*hosts: IP_OR_STR, throw=False) -> Generator[Tuple[str, Optio
                        rDNS records can be found for a host, or when the host is an invalid IP / non-existent domain.
                        When ``False``, will simply return ``None`` when a host is invalid, or no rDNS records are found.
     
+    :param int concurrency: Maximum number of lookups to run at once (default: :attr:`privex.helpers.settings.DNS_MULTI_CONCURRENCY`).
+                            ``1`` resolves each host in sequence.
+    :param float timeout: Maximum seconds to wait for each lookup, after which its result is ``None``
+                          (default: :attr:`privex.helpers.settings.DNS_MULTI_TIMEOUT` - ``0`` / ``None`` for no timeout)
+    :param bool ordered: (Default: ``True``) Return results in the same order as ``hosts``. If ``False``, results are returned
+                         as soon as each lookup completes, so one slow host doesn't hold up the rest.
+
     :raises ReverseDNSNotFound: When ``throw`` is True and no rDNS records were found for ``host``
     :raises InvalidHost: When ``throw`` is True and ``host`` is an invalid IP address or non-existent domain/hostname
+    :raises TimeoutError: When ``throw`` is True and a lookup took longer than ``timeout``
     
     :return Tuple[str,Optional[str]] rDNS: A generator returning :class:`tuple`'s containing the original passed host, and it's
                                            reverse DNS hostname (value of PTR record)
     """
-    for h in hosts:
-        yield (str(h), get_rdns(str(h), throw=throw))
+    def _rdns(h):
+        return get_rdns(h, throw=throw)
+    
+    for h, res, err in _multi_threaded(_rdns, (str(h) for h in _multi_items(hosts)), concurrency, timeout, ordered):
+        if err is not None:
+            if throw or not isinstance(err, TimeoutError): raise err
+            log.warning("[get_rdns_multi TimeoutError] Timed out looking up reverse DNS for host: %s - Ex: %s", h, str(err))
+        yield (h, res)
+
+
+async def get_rdns_multi_async(*hosts: IP_OR_STR, throw=False, version='any', concurrency: int = None, timeout: float = None,
+                               ordered: bool = True) -> AsyncGenerator[Tuple[str, Optional[str]], None]:
+    """
+    AsyncIO version of :func:`.get_rdns_multi` - look up the reverse DNS for multiple hosts, running up to ``concurrency``
+    lookups at once as AsyncIO tasks. ``hosts`` may also be a single iterable / async iterable of hosts.
+    
+        >>> async for host, rdns in get_rdns_multi_async('185.130.44.10', '8.8.4.4', concurrency=50, ordered=False):
+        ...     print(f"{host:<20} -> {rdns:>5}")
+        8.8.4.4              -> dns.google
+        185.130.44.10        -> web-se1.privex.io
+    
+    See :func:`.get_rdns_multi` for the other parameters, and :func:`.get_rdns_async` for ``version``.
+    """
+    async def _rdns(h):
+        return await get_rdns_async(h, throw=throw, version=version)
+    
+    items = _multi_items(hosts)
+    if not hasattr(items, '__aiter__'):
+        items = (str(h) for h in items)
+    async for h, res, err in _multi_async(_rdns, items, concurrency, timeout, ordered):
+        if err is not None:
+            if throw or not isinstance(err, TimeoutError): raise err
+            log.warning("[get_rdns_multi TimeoutError] Timed out looking up reverse DNS for host: %s - Ex: %s", h, str(err))
+        yield (str(h), res)
+
+
+UNKNOWN_ASN = 'Unknown ASN'
+
+_ASN_TABLE: Dict[int, str] = {}
+_ASN_FILE_LOADED = False
+_ASN_LOCK = threading.Lock()
+_ASN_CACHE: Optional[DNSCache] = None
+
+_ASN_LINE = re.compile(r'^(?:AS)?(\d+)\s*[,;\t ]\s*"?(.+?)"?$', re.IGNORECASE)
+"""Matches ASN table lines such as ``210083 PRIVEX, SE``, ``AS210083,"PRIVEX, SE"`` or ``210083\tPRIVEX, SE``"""
+
+
+def _asn_int(as_number: Union[int, str]) -> Optional[int]:
+    """Convert an AS number such as ``210083``, ``'210083'`` or ``'AS210083'`` into an :class:`int` - or ``None`` if it's invalid"""
+    num = str(as_number).strip().upper()
+    num = num[2:] if num.startswith('AS') else num
+    return int(num) if num.isdigit() else None
+
+
+def _parse_asn_line(line: str) -> Optional[Tuple[int, str]]:
+    line = line.strip()
+    if len(line) == 0 or line.startswith('#'):
+        return None
+    if '|' in line:
+        # The same format as the asn.cymru.com TXT records: "210083 | SE | ripencc | 2017-05-24 | PRIVEX, SE"
+        parts = [p.strip() for p in line.split('|')]
+        num, name = _asn_int(parts[0]), parts[-1]
+        return None if num is None or len(name) == 0 else (num, name)
+    m = _ASN_LINE.match(line)
+    return None if m is None else (int(m.group(1)), m.group(2))
+
+
+def load_asn_table(source: Union[str, Iterable[str]], replace: bool = False) -> int:
+    """
+    Load a local AS number to name table, so :func:`.asn_to_name` (and the bulk / async versions) can answer those AS numbers
+    without any DNS queries. AS numbers which aren't in the table are still looked up via DNS.
+    
+    ``source`` is either a filename, or an iterable of lines (e.g. an open file). Blank lines and lines starting with ``#``
+    are skipped, and each line can be in any of these formats::
+    
+        210083 PRIVEX, SE
+        AS13335,"CLOUDFLARENET - Cloudflare, Inc., US"
+        15169 | US | arin | 2000-03-30 | GOOGLE - Google LLC, US
+    
+    A table file can also be loaded automatically on first use, by setting :attr:`privex.helpers.settings.ASN_TABLE_FILE`.
+    
+    :param str|Iterable[str] source: The filename of the table, or an iterable of lines
+    :param bool replace: If ``True``, remove any previously loaded ASNs before loading ``source``
+    :return int count: The number of ASNs loaded from ``source``
+    """
+    if isinstance(source, str):
+        with open(source, encoding='utf-8', errors='replace') as fh:
+            return load_asn_table(fh, replace=replace)
+    table = dict(filter(None, (_parse_asn_line(line) for line in source)))
+    with _ASN_LOCK:
+        if replace: _ASN_TABLE.clear()
+        _ASN_TABLE.update(table)
+    log.debug("Loaded %d ASN names into the local ASN table", len(table))
+    return len(table)
+
+
+def _asn_table() -> Dict[int, str]:
+    global _ASN_FILE_LOADED
+    if not _ASN_FILE_LOADED:
+        with _ASN_LOCK:
+            load_file = not _ASN_FILE_LOADED and not empty(settings.ASN_TABLE_FILE)
+            _ASN_FILE_LOADED = True
+        if load_file:
+            load_asn_table(settings.ASN_TABLE_FILE)
+    return _ASN_TABLE
+
+
+def get_asn_cache() -> DNSCache:
+    """
+    Get (or create) the process-wide :class:`.DNSCache` used by :func:`.asn_to_name` and friends, which holds up to
+    :attr:`privex.helpers.settings.ASN_CACHE_SIZE` AS names for :attr:`privex.helpers.settings.ASN_CACHE_TTL` seconds.
+    """
+    global _ASN_CACHE
+    if _ASN_CACHE is None:
+        with _ASN_LOCK:
+            if _ASN_CACHE is None:
+                _ASN_CACHE = DNSCache(
+                    max_entries=settings.ASN_CACHE_SIZE, default_ttl=settings.ASN_CACHE_TTL,
+                    negative_ttl=settings.ASN_CACHE_NEGATIVE_TTL
+                )
+    return _ASN_CACHE
+
+
+def _asn_cache(cache: Union[DNSCache, bool, None]) -> Optional[DNSCache]:
+    if cache is None: cache = settings.ASN_CACHE
+    if cache is True: return get_asn_cache()
+    return cache if isinstance(cache, DNSCache) else None
+
+
+def _asn_qname(num: int) -> str:
+    return f'AS{num}.asn.cymru.com'
+
+
+def _asn_adapter_key(qname: str) -> str:
+    return f'pvx_asn:{qname}'
+
+
+def _asn_txt_names(ans) -> List[str]:
+    for r in ans:
+        # r is formatted like such: "15169 | US | arin | 2000-03-30 | GOOGLE - Google LLC, US" with
+        # literal quotes. we need to strip them, split by pipe, extract the last element, then strip spaces.
+        return [str(r).strip('"').split('|')[-1].strip()]
+    return []
+
+
+def _asn_adapter_timeout(names: List[str]) -> int:
+    return settings.ASN_CACHE_TTL if len(names) > 0 else settings.ASN_CACHE_NEGATIVE_TTL
+
+
+def _asn_lookup(qname: str, family: int = 0) -> LOOKUP_RESULT:
+    """
+    Look up the AS name TXT record ``qname`` - from the :attr:`privex.helpers.settings.ASN_CACHE_ADAPTER` cache adapter
+    if enabled, otherwise via the shared dnspython resolver. Unknown ASNs return an empty list.
+    """
+    adapter = None
+    if settings.ASN_CACHE_ADAPTER:
+        from privex.helpers.cache import adapter_get
+        adapter = adapter_get()
+        name = adapter.get(_asn_adapter_key(qname))
+        if name is not None:
+            return ([name] if name else []), None
+    try:
+        names = _asn_txt_names(_dns_query(get_resolver(), qname, 'TXT'))
+    except (NoAnswer, NXDOMAIN):
+        names = []
+    if adapter is not None:
+        adapter.set(_asn_adapter_key(qname), names[0] if len(names) > 0 else '', timeout=_asn_adapter_timeout(names))
+    return names, None
+
+
+async def _asn_lookup_async(qname: str, family: int = 0) -> LOOKUP_RESULT:
+    """AsyncIO version of :func:`._asn_lookup` - uses the async cache adapter and :func:`.get_async_resolver`"""
+    if AsyncResolver is None:
+        return await asyncio.get_event_loop().run_in_executor(None, _asn_lookup, qname, family)
+    adapter = None
+    if settings.ASN_CACHE_ADAPTER:
+        from privex.helpers.cache import async_adapter_get
+        adapter = async_adapter_get()
+        name = await adapter.get(_asn_adapter_key(qname))
+        if name is not None:
+            return ([name] if name else []), None
+    try:
+        names = _asn_txt_names(await _dns_query(get_async_resolver(), qname, 'TXT'))
+    except (NoAnswer, NXDOMAIN):
+        names = []
+    if adapter is not None:
+        await adapter.set(_asn_adapter_key(qname), names[0] if len(names) > 0 else '', timeout=_asn_adapter_timeout(names))
+    return names, None
+
+
+def _asn_cached(num: int, dc: Optional[DNSCache]) -> Any:
+    """Get the name of ``num`` from the local ASN table or the cache ``dc`` - ``None`` if it's cached as unknown, or ``NO_RESULT``"""
+    table = _asn_table()
+    if num in table:
+        return table[num]
+    if dc is None:
+        return NO_RESULT
+    names = dc.get(_asn_qname(num), 0)
+    return names if names is NO_RESULT else (names[0] if len(names) > 0 else None)
+
+
+def _asn_result(as_number, name: Optional[str], quiet: bool) -> str:
+    if name is not None:
+        return name
+    if quiet:
+        return UNKNOWN_ASN
+    raise KeyError('ASN {} was not found, or server did not respond.'.format(as_number))
+
+
+def _asn_name(num: Optional[int], dc: Optional[DNSCache]) -> Optional[str]:
+    if num is None:
+        return None
+    name = _asn_cached(num, dc)
+    if name is not NO_RESULT:
+        return name
+    qname = _asn_qname(num)
+    names = _asn_lookup(qname)[0] if dc is None else dc.resolve(qname, 0, _asn_lookup)
+    return names[0] if len(names) > 0 else None
+
+
+async def _asn_name_async(num: Optional[int], dc: Optional[DNSCache]) -> Optional[str]:
+    if num is None:
+        return None
+    name = _asn_cached(num, dc)
+    if name is not NO_RESULT:
+        return name
+    qname = _asn_qname(num)
+    names = (await _asn_lookup_async(qname))[0] if dc is None else await dc.resolve_async(qname, 0, _asn_lookup_async)
+    return names[0] if len(names) > 0 else None
+
+
+def asn_to_name(as_number: Union[int, str], quiet: bool = True, cache: Union[bool, DNSCache] = None) -> str:
+    """
+    Look up an integer Autonomous System Number and return the human readable
+    name of the organization.
+
+    Usage:
+
+    >>> asn_to_name(210083)
+    'PRIVEX, SE'
+    >>> asn_to_name('13335')
+    'CLOUDFLARENET - Cloudflare, Inc., US'
+
+    Names are looked up from the TXT records of ``AS<number>.asn.cymru.com``, which requires ``dnspython>=1.16.0``
+    (unless the ASN is in a local table loaded with :func:`.load_asn_table`). You can install it in your virtualenv,
+    or systemwide::
+
+        pip3 install dnspython
+
+    Results (including unknown ASNs) are cached in-process by :func:`.get_asn_cache`, and optionally in the default
+    cache adapter as well, if :attr:`privex.helpers.settings.ASN_CACHE_ADAPTER` is enabled.
+    To look up many ASNs at once, use :func:`.asn_to_name_many`.
+
+    :param int/str as_number: The AS number as a string or integer, e.g. 210083 or '210083'
+    :param bool quiet:        (default True) If True, returns 'Unknown ASN' if a lookup fails.
+                              If False, raises a KeyError if no results are found.
+    :param DNSCache|bool cache: The :class:`.DNSCache` to cache names in. ``True`` uses :func:`.get_asn_cache`, ``False``
+                              disables caching. Default (``None``): use :func:`.get_asn_cache` if :attr:`privex.helpers.settings.ASN_CACHE`
+                              is enabled.
+    :raises KeyError:         Raised when a lookup returns no results, and ``quiet`` is set to False.
+    :raises ImportError:      When ``as_number`` isn't in the local ASN table or the cache, and dnspython isn't installed
+    :return str as_name:      The name and country code of the ASN, e.g. 'PRIVEX, SE'
+    """
+    return _asn_result(as_number, _asn_name(_asn_int(as_number), _asn_cache(cache)), quiet)
+
+
+async def asn_to_name_async(as_number: Union[int, str], quiet: bool = True, cache: Union[bool, DNSCache] = None) -> str:
+    """
+    AsyncIO version of :func:`.asn_to_name` - uses the shared :func:`.get_async_resolver` (dnspython >= 2.0), so
+    no executor threads are needed.
+    
+        >>> await asn_to_name_async(210083)
+        'PRIVEX, SE'
+    
+    """
+    return _asn_result(as_number, await _asn_name_async(_asn_int(as_number), _asn_cache(cache)), quiet)
+
+
+def _asn_many_prepare(as_numbers: tuple, dc: Optional[DNSCache]) -> Tuple[Dict[Any, Optional[str]], List[int]]:
+    """
+    Returns a dict of each unique ASN in ``as_numbers`` (as an int, or the original value if it's invalid) mapped to its name
+    if it's in the local table / cache (or ``NO_RESULT`` if it needs looking up) - plus the list of ASNs to look up.
+    """
+    res, todo = {}, []
+    for a in _multi_items(as_numbers):
+        num = _asn_int(a)
+        key = a if num is None else num
+        if key in res:
+            continue
+        res[key] = None if num is None else _asn_cached(num, dc)
+        if res[key] is NO_RESULT:
+            todo.append(num)
+    return res, todo
+
+
+def _asn_many_result(res: Dict[Any, Optional[str]], num: int, name: Optional[str], err: Optional[BaseException], quiet: bool):
+    if err is not None and (not quiet or not isinstance(err, TimeoutError)):
+        raise err
+    res[num] = name
+
+
+def asn_to_name_many(*as_numbers: Union[int, str], quiet: bool = True, concurrency: int = None, timeout: float = None,
+                     cache: Union[bool, DNSCache] = None) -> Dict[Union[int, str], str]:
+    """
+    Look up the names of many AS numbers at once. Duplicate AS numbers are only looked up once, ASNs in the local table /
+    cache are answered straight away, and the rest are looked up concurrently in background threads.
+    
+        >>> asn_to_name_many(210083, '13335', 'AS210083', 999999999)
+        {210083: 'PRIVEX, SE', 13335: 'CLOUDFLARENET - Cloudflare, Inc., US', 999999999: 'Unknown ASN'}
+    
+    ``as_numbers`` may also be a single iterable of AS numbers, e.g. ``asn_to_name_many(asn_list)``.
+    
+    :param int|str as_numbers: The AS numbers to look up, as positional arguments (see :func:`.asn_to_name`)
+    :param bool quiet: (default True) If True, unknown ASNs (and lookups which timed out) are returned as ``'Unknown ASN'``.
+                       If False, raises a KeyError if any of the ASNs weren't found.
+    :param int concurrency: Maximum number of lookups to run at once (default: :attr:`privex.helpers.settings.DNS_MULTI_CONCURRENCY`)
+    :param float timeout: Maximum seconds to wait for each lookup (default: :attr:`privex.helpers.settings.DNS_MULTI_TIMEOUT`)
+    :param DNSCache|bool cache: The :class:`.DNSCache` to use, see :func:`.asn_to_name`
+    :return Dict[int,str] names: A dict mapping each AS number (as an :class:`int`, in the order they were passed) to it's name.
+                                 Invalid AS numbers are left as they were passed.
+    """
+    dc = _asn_cache(cache)
+    res, todo = _asn_many_prepare(as_numbers, dc)
+    for num, name, err in _multi_threaded(lambda n: _asn_name(n, dc), todo, concurrency, timeout, ordered=False):
+        _asn_many_result(res, num, name, err, quiet)
+    return {k: _asn_result(k, v, quiet) for k, v in res.items()}
+
+
+async def asn_to_name_many_async(*as_numbers: Union[int, str], quiet: bool = True, concurrency: int = None, timeout: float = None,
+                                 cache: Union[bool, DNSCache] = None) -> Dict[Union[int, str], str]:
+    """
+    AsyncIO version of :func:`.asn_to_name_many` - the lookups are ran concurrently as AsyncIO tasks.
+    
+        >>> await asn_to_name_many_async(210083, 13335)
+        {210083: 'PRIVEX, SE', 13335: 'CLOUDFLARENET - Cloudflare, Inc., US'}
+    
+    """
+    dc = _asn_cache(cache)
+    res, todo = _asn_many_prepare(as_numbers, dc)
+    
+    async def _lookup_name(n):
+        return await _asn_name_async(n, dc)
+    
+    async for num, name, err in _multi_async(_lookup_name, todo, concurrency, timeout, ordered=False):
+        _asn_many_result(res, num, name, err, quiet)
+    return {k: _asn_result(k, v, quiet) for k, v in res.items()}
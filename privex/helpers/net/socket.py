@@ -23,11 +23,15 @@ which use :mod:`socket`. Part of :mod:`privex.helpers.net` - network related hel
 
 """
 import asyncio
+import errno
 import functools
+import os
+import selectors
 import socket
 import ssl
 import time
 from ipaddress import ip_network
+from itertools import zip_longest
 from typing import Any, Callable, Generator, IO, Iterable, List, Optional, Tuple, Union
 
 import attr
@@ -37,7 +41,7 @@ from privex.helpers.common import LayeredContext, byteify, empty, empty_if, is_t
 from privex.helpers.thread import SafeLoopThread
 from privex.helpers.asyncx import await_if_needed, run_coro_thread
 from privex.helpers.net.util import generate_http_request, get_ssl_context, ip_is_v6, ip_sock_ver, is_ip
-from privex.helpers.net.dns import resolve_ip, resolve_ip_async
+from privex.helpers.net.dns import resolve_ip, resolve_ip_async, resolve_ips, resolve_ips_async
 from privex.helpers.types import AUTO, AUTO_DETECTED, AnyNum, STRBYTES, T
 
 import logging
@@ -47,7 +51,8 @@ log = logging.getLogger(__name__)
 __all__ = [
     'AnySocket', 'OpAnySocket', 'SocketContextManager',
     'StopLoopOnMatch', 'SocketWrapper', 'AsyncSocketWrapper', 'send_data_async', 'send_data', 'upload_termbin',
-    'upload_termbin_file', 'upload_termbin_async', 'upload_termbin_file_async'
+    'upload_termbin_file', 'upload_termbin_async', 'upload_termbin_file_async', 'happy_eyeballs_connect',
+    'happy_eyeballs_connect_async'
 ]
 
 AnySocket = Union[ssl.SSLSocket, "socket.socket"]
@@ -186,6 +191,185 @@ class MockContext:
         pass
 
 
+_IN_PROGRESS = (errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN)
+
+
+def _he_order(ips: List[str], host: str = None) -> List[str]:
+    """
+    Order ``ips`` for Happy Eyeballs (RFC 8305 section 4) - alternating between IPv6 and IPv4 addresses, starting with the
+    address family of the first IP in ``ips`` (IPv6 when both exist, as returned by :func:`.resolve_ips`).
+    
+    :raises socket.gaierror: When ``ips`` is empty, i.e. ``host`` couldn't be resolved
+    """
+    if len(ips) == 0:
+        raise socket.gaierror(socket.EAI_NONAME, f"Could not resolve any IP addresses for host '{host}'")
+    first_v6 = ip_is_v6(ips[0])
+    first, second = [ip for ip in ips if ip_is_v6(ip) == first_v6], [ip for ip in ips if ip_is_v6(ip) != first_v6]
+    return [ip for pair in zip_longest(first, second) for ip in pair if ip is not None]
+
+
+def _he_family(ip: str) -> int:
+    return socket.AF_INET6 if ip_is_v6(ip) else socket.AF_INET
+
+
+def _he_error(err: int, ip: str, port: int) -> OSError:
+    # OSError(errno, strerror) returns the matching subclass, e.g. ConnectionRefusedError for ECONNREFUSED
+    return OSError(err, f"{os.strerror(err)} (connecting to {ip} port {port})")
+
+
+def _he_raise(errors: List[OSError], host: str, port: int):
+    for e in errors[:-1]:
+        log.debug("Happy Eyeballs connection attempt to %s port %s failed: %s %s", host, port, type(e), str(e))
+    # Same as socket.create_connection - raise the error from the last address which was tried
+    raise errors[-1]
+
+
+def happy_eyeballs_connect(host: str, port: AnyNum, version='any', timeout: AnyNum = None, delay: AnyNum = None,
+                           type=socket.SOCK_STREAM, proto=0) -> socket.socket:
+    """
+    Open a connection to ``host`` port ``port`` using Happy Eyeballs (RFC 8305). The IPv6 and IPv4 addresses of ``host``
+    are interleaved (IPv6 first), and a new connection attempt is started every ``delay`` seconds - or as soon as the previous
+    attempt fails - until one of them connects. The remaining attempts are then closed.
+    
+    This means a host with broken IPv6 (or one dead IP out of several) only costs ``delay`` seconds, rather than a whole
+    connection timeout.
+    
+        >>> s = happy_eyeballs_connect('privex.io', 80, timeout=10)
+        >>> s.getpeername()
+        ('2a07:e00::abc', 80, 0, 0)
+    
+    AsyncIO version: :func:`.happy_eyeballs_connect_async`
+    
+    :param str host: The hostname or IPv4/v6 address to connect to
+    :param int port: The port number to connect to on ``host``
+    :param str|int version: (default: ``'any'``) Set to ``'v4'`` or ``'v6'`` to only connect via that IP version
+    :param float|int timeout: Give up if no attempt has connected within this many seconds (default: no timeout).
+                              This is also set as the timeout of the returned socket.
+    :param float|int delay: Seconds to wait before starting the next attempt (default: :attr:`privex.helpers.settings.HAPPY_EYEBALLS_DELAY`)
+    :param int type: Socket type (default: :attr:`socket.SOCK_STREAM`)
+    :param int proto: Socket protocol number (default: ``0``)
+    
+    :raises socket.gaierror: When ``host`` couldn't be resolved
+    :raises socket.timeout: When no attempt connected within ``timeout`` seconds
+    :raises OSError: When every attempt failed (e.g. :class:`ConnectionRefusedError`), the error from the last address tried is raised
+    :return socket.socket sock: The connected socket
+    """
+    port, ips = int(port), _he_order(resolve_ips(host, version), host)
+    delay = float(settings.HAPPY_EYEBALLS_DELAY if delay is None else delay)
+    timeout = None if empty(timeout, zero=True) else float(timeout)
+    deadline = None if timeout is None else time.monotonic() + timeout
+    sel, errors, next_at = selectors.DefaultSelector(), [], time.monotonic()
+    try:
+        while True:
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                raise socket.timeout(f"Timed out connecting to {host} port {port} after {timeout} seconds")
+            # Start the next attempt after 'delay' seconds, or straight away if there are no attempts running
+            if len(ips) > 0 and (now >= next_at or len(sel.get_map()) == 0):
+                ip, sock = ips.pop(0), None
+                try:
+                    sock = socket.socket(_he_family(ip), type, proto)
+                    sock.setblocking(False)
+                    err = sock.connect_ex((ip, port))
+                    if err not in (0,) + _IN_PROGRESS:
+                        raise _he_error(err, ip, port)
+                except OSError as e:
+                    errors.append(e)
+                    if sock is not None: sock.close()
+                    continue
+                if err == 0:
+                    sock.settimeout(timeout)
+                    return sock
+                sel.register(sock, selectors.EVENT_WRITE, ip)
+                next_at = now + delay
+            if len(sel.get_map()) == 0:
+                _he_raise(errors, host, port)
+            waits = [w - now for w in ([next_at] if len(ips) > 0 else []) + ([deadline] if deadline is not None else [])]
+            for key, _ in sel.select(max(0.0, min(waits)) if len(waits) > 0 else None):
+                sock, ip = key.fileobj, key.data
+                sel.unregister(sock)
+                err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                if err == 0:
+                    log.debug("Happy Eyeballs connected to host %s port %s via IP %s", host, port, ip)
+                    sock.settimeout(timeout)
+                    return sock
+                errors.append(_he_error(err, ip, port))
+                sock.close()
+                next_at = time.monotonic()
+    finally:
+        for key in list(sel.get_map().values()):
+            key.fileobj.close()
+        sel.close()
+
+
+async def _he_attempt_async(loop: asyncio.AbstractEventLoop, ip: str, port: int, type: int, proto: int) -> socket.socket:
+    sock = socket.socket(_he_family(ip), type, proto)
+    try:
+        sock.setblocking(False)
+        await loop.sock_connect(sock, (ip, port))
+        return sock
+    except BaseException:
+        sock.close()
+        raise
+
+
+async def _he_race_async(host: str, port: int, ips: List[str], delay: float, type: int, proto: int,
+                         loop: asyncio.AbstractEventLoop) -> socket.socket:
+    pending, errors = {}, []
+    try:
+        while len(ips) > 0 or len(pending) > 0:
+            if len(ips) > 0:
+                ip = ips.pop(0)
+                pending[asyncio.ensure_future(_he_attempt_async(loop, ip, port, type, proto))] = ip
+            # Wait for an attempt to finish, or 'delay' seconds before starting the next one
+            done, _ = await asyncio.wait(
+                list(pending.keys()), timeout=delay if len(ips) > 0 else None, return_when=asyncio.FIRST_COMPLETED
+            )
+            winner = None
+            for task in done:
+                ip = pending.pop(task)
+                if task.exception() is not None:
+                    errors.append(task.exception())
+                elif winner is None:
+                    log.debug("Happy Eyeballs connected to host %s port %s via IP %s", host, port, ip)
+                    winner = task.result()
+                else:
+                    task.result().close()
+            if winner is not None:
+                return winner
+        _he_raise(errors, host, port)
+    finally:
+        for task in pending.keys():
+            task.cancel()
+        for res in await asyncio.gather(*pending.keys(), return_exceptions=True):
+            if isinstance(res, socket.socket): res.close()
+
+
+async def happy_eyeballs_connect_async(host: str, port: AnyNum, version='any', timeout: AnyNum = None, delay: AnyNum = None,
+                                       type=socket.SOCK_STREAM, proto=0, loop: asyncio.AbstractEventLoop = None) -> socket.socket:
+    """
+    AsyncIO version of :func:`.happy_eyeballs_connect` - each connection attempt is an AsyncIO task, and the attempts which
+    are still running once one has connected are cancelled.
+    
+        >>> s = await happy_eyeballs_connect_async('privex.io', 80, timeout=10)
+        >>> await asyncio.get_event_loop().sock_sendall(s, b"GET / HTTP/1.1\\nHost: privex.io\\n\\n")
+    
+    The returned socket is non-blocking, for use with :meth:`asyncio.AbstractEventLoop.sock_recv` etc. See
+    :func:`.happy_eyeballs_connect` for the parameters.
+    
+    :param asyncio.AbstractEventLoop loop: The event loop to connect with (default: :func:`asyncio.get_event_loop`)
+    """
+    port, ips = int(port), _he_order(await resolve_ips_async(host, version), host)
+    delay = float(settings.HAPPY_EYEBALLS_DELAY if delay is None else delay)
+    coro = _he_race_async(host, port, ips, delay, type, proto, asyncio.get_event_loop() if loop is None else loop)
+    if empty(timeout, zero=True):
+        return await coro
+    try:
+        return await asyncio.wait_for(coro, float(timeout))
+    except asyncio.TimeoutError:
+        raise socket.timeout(f"Timed out connecting to {host} port {port} after {timeout} seconds")
+
+
 @attr.s
 class SocketTracker:
     """
@@ -203,6 +387,7 @@ class SocketTracker:
     ssl_conf: dict = attr.ib(factory=dict)
     ssl_wrap_conf: dict = attr.ib(factory=dict)
     hostname: str = attr.ib(default=None)
+    happy_eyeballs: bool = attr.ib(default=False, converter=is_true)
     _ssl_context: ssl.SSLContext = attr.ib(default=None)
     _ssl_socket: ssl.SSLSocket = attr.ib(default=None)
     _loop: asyncio.AbstractEventLoop = attr.ib(default=None)
@@ -340,6 +525,21 @@ class SocketTracker:
         sock.settimeout(self.timeout)
         return sock
     
+    @property
+    def _use_happy_eyeballs(self) -> bool:
+        """Whether :meth:`.connect` should use :func:`.happy_eyeballs_connect` - only for new TCP client sockets"""
+        return self.happy_eyeballs and not self.server and self._socket is None and self._ssl_socket is None and \
+            self.socket_conf.get('type', socket.SOCK_STREAM) == socket.SOCK_STREAM
+    
+    def _happy_connected(self, sock: "socket.socket", override_ssl=None) -> AnySocket:
+        self._socket = sock
+        self.family = sock.family
+        sock.settimeout(self.timeout)
+        if self.use_ssl and override_ssl in [None, True]:
+            sock = self.ssl_socket
+        self.connected = True
+        return self.post_connect(sock)
+    
     def v6_fallback(self, ex: Exception = None) -> bool:
         ip = self.ip_address
         if self.family == socket.AF_INET6 or (self.family != socket.AF_INET and not empty(ip) and ip_is_v6(ip)):
@@ -355,6 +555,11 @@ class SocketTracker:
     
     def connect(self, force=False, override_ssl=None, _conn_tries=0) -> AnySocket:
         if not self.connected or force:
+            if self._use_happy_eyeballs:
+                sock = happy_eyeballs_connect(
+                    self.host, self.port, timeout=self.timeout, type=socket.SOCK_STREAM, proto=self.socket_conf.get('proto', 0)
+                )
+                return self._happy_connected(sock, override_ssl=override_ssl)
             sock = self.socket
             if self.use_ssl and override_ssl in [None, True]:
                 sock = self.ssl_socket
@@ -398,6 +603,12 @@ class SocketTracker:
 
     async def connect_async(self, force=False, override_ssl=None, _conn_tries=0) -> AnySocket:
         if not self.connected or force:
+            if self._use_happy_eyeballs:
+                sock = await happy_eyeballs_connect_async(
+                    self.host, self.port, timeout=self.timeout, type=socket.SOCK_STREAM, proto=self.socket_conf.get('proto', 0),
+                    loop=self.loop
+                )
+                return self._happy_connected(sock, override_ssl=override_ssl)
             sock = self.socket
             if self.use_ssl and override_ssl in [None, True]:
                 sock = self.ssl_socket
@@ -472,7 +683,8 @@ class SocketTracker:
     def duplicate(cls, inst: "SocketTracker", **kwargs) -> "SocketTracker":
         cfg = dict(
             host=inst.host, port=inst.port, timeout=inst.timeout, server=inst.server, use_ssl=inst.use_ssl,
-            socket_conf=inst.socket_conf, ssl_conf=inst.ssl_conf, ssl_wrap_conf=inst.ssl_wrap_conf
+            socket_conf=inst.socket_conf, ssl_conf=inst.ssl_conf, ssl_wrap_conf=inst.ssl_wrap_conf,
+            happy_eyeballs=inst.happy_eyeballs
         )
         cfg = {**cfg, **kwargs}
         return cls(**cfg)
@@ -528,8 +740,9 @@ class SocketWrapper(object):
     
      * Automatic address family detection - detects whether you have working IPv4 / IPv6, and decides the best way
        to connect to a host, depending on what IP versions that host supports
-     * ``Happy Eyeballs`` for IPv6. If something goes wrong with an IPv6 connection, it will fallback to IPv4 if the
-       host has it available (i.e. a domain with both ``A`` and ``AAAA`` records)
+     * ``Happy Eyeballs`` (RFC 8305) for IPv6. Connection attempts to a domain's IPv6 and IPv4 addresses are raced
+       (see :func:`.happy_eyeballs_connect`), so broken IPv6 doesn't cost a full connection timeout. Can be disabled
+       by passing ``happy_eyeballs=False``, or with :attr:`privex.helpers.settings.HAPPY_EYEBALLS`
      * Easy to use SSL, which works with HTTPS and other SSL-secured protocols. Just pass ``use_ssl=True`` in the constructor.
      * Many wrapper methods such as :meth:`.recv_eof`, :meth:`.query`, and :meth:`.http_request` to make working
        with sockets much easier.
@@ -612,12 +825,16 @@ class SocketWrapper(object):
         self.send_timeout = kwargs.get('send_timeout', settings.DEFAULT_WRITE_TIMEOUT)
         
         from privex.helpers.net.common import check_v4_async, check_v6_async
+        
+        # Happy Eyeballs picks the address family per connection, so the connectivity checks below aren't needed
+        happy_eyeballs = is_true(kwargs.get('happy_eyeballs', settings.HAPPY_EYEBALLS)) and family == -1 and \
+            not self.server and not is_ip(host)
 
         if family == -1 and is_ip(host):
             log.debug("Host '%s' appears to be an IP. Automatically setting address family based on IP.", host)
             family = ip_sock_ver(host)
         
-        if family == -1 and check_connectivity:
+        if family == -1 and check_connectivity and not happy_eyeballs:
             host_v4 = resolve_ip(host, 'v4')
             host_v6 = resolve_ip(host, 'v6')
             
@@ -657,7 +874,7 @@ class SocketWrapper(object):
                 server_hostname=kwargs.get('server_hostname'),
                 session=kwargs.get('session'),
                 do_handshake_on_connect=kwargs.get('do_handshake_on_connect', True)
-            ), hostname=kwargs.get('hostname', None)
+            ), hostname=kwargs.get('hostname', None), happy_eyeballs=happy_eyeballs
         )
 
         _socket = kwargs.get('socket', None)
@@ -1508,17 +1725,21 @@ async def send_data_async(
         
     loop = asyncio.get_event_loop()
     try:
-        s_ver = socket.AF_INET
-        ip = await resolve_ip_async(host, ip_version)
-        
-        if ip_is_v6(ip): s_ver = socket.AF_INET6
+        if settings.HAPPY_EYEBALLS:
+            log.debug(" [...] Connecting to host: %s", fhost)
+            sock = await happy_eyeballs_connect_async(host, port, ip_version, timeout=timeout, loop=loop)
+            ip = sock.getpeername()[0]
+        else:
+            ip = await resolve_ip_async(host, ip_version)
+            sock = socket.socket(socket.AF_INET6 if ip_is_v6(ip) else socket.AF_INET, socket.SOCK_STREAM)
         
         fhost += f" (IP: {ip})"
         
-        with socket.socket(s_ver, socket.SOCK_STREAM) as s:
+        with sock as s:
             s.settimeout(float(timeout))
-            log.debug(" [...] Connecting to host: %s", fhost)
-            await loop.sock_connect(s, (ip, port))
+            if not settings.HAPPY_EYEBALLS:
+                log.debug(" [...] Connecting to host: %s", fhost)
+                await loop.sock_connect(s, (ip, port))
             log.debug(" [+++] Connected to %s\n", fhost)
 
             if data is None:
@@ -1578,7 +1799,9 @@ def send_data(
                                 have whitespace, newlines, and null bytes trimmed from the start and end after it's casted into a string.
     :keyword bool fail: (Default: ``True``) If ``True``, will raise exceptions when connection errors occur. When ``False``, will simply
                         ``None`` if there are connection exceptions raised during this function's execution.
-    :keyword str|int ip_version: (Default: ``any``)
+    :keyword str|int ip_version: (Default: ``any``) Set to ``'v4'`` or ``'v6'`` to only connect via that IP version.
+                                 Otherwise the host's IPv6 and IPv4 addresses are raced using :func:`.happy_eyeballs_connect`
+                                 (unless :attr:`privex.helpers.settings.HAPPY_EYEBALLS` is disabled)
     :return:
     """
     fhost = f"({host}):{port}"
@@ -1609,21 +1832,28 @@ def send_data(
         host_is_ip = False
     
     try:
-        # First we resolve the IP address of 'host', so we can detect whether we're connecting to an IPv4 or IPv6 host,
-        # letting us adjust the AF_INET variable accordingly.
-        s_ver = socket.AF_INET
-        ip = resolve_ip(host, ip_version)
-    
-        if ip_is_v6(ip):
-            s_ver, is_v6 = socket.AF_INET6, True
-            if not host_is_ip:
-                try:
-                    v4_address = resolve_ip(host, 'v4')
-                except (socket.timeout, ConnectionRefusedError, ConnectionResetError, socket.gaierror, AttributeError) as e:
-                    log.warning(
-                        "Warning: failed to resolve IPv4 address for %s (to be used as a backup if IPv6 is broken). Reason: %s %s ",
-                        type(e), str(e)
-                    )
+        if settings.HAPPY_EYEBALLS:
+            # Race the host's IPv6 / IPv4 addresses (RFC 8305), rather than falling back to IPv4 after an IPv6 connection fails.
+            log.debug(" [...] Connecting to host: %s", fhost)
+            sock = happy_eyeballs_connect(host, port, ip_version, timeout=timeout)
+            ip = sock.getpeername()[0]
+        else:
+            # First we resolve the IP address of 'host', so we can detect whether we're connecting to an IPv4 or IPv6 host,
+            # letting us adjust the AF_INET variable accordingly.
+            s_ver = socket.AF_INET
+            ip = resolve_ip(host, ip_version)
+        
+            if ip_is_v6(ip):
+                s_ver, is_v6 = socket.AF_INET6, True
+                if not host_is_ip:
+                    try:
+                        v4_address = resolve_ip(host, 'v4')
+                    except (socket.timeout, ConnectionRefusedError, ConnectionResetError, socket.gaierror, AttributeError) as e:
+                        log.warning(
+                            "Warning: failed to resolve IPv4 address for %s (to be used as a backup if IPv6 is broken). "
+                            "Reason: %s %s ", type(e), str(e)
+                        )
+            sock = socket.socket(s_ver, socket.SOCK_STREAM)
         
         fhost += f" (IP: {ip})"
 
@@ -1634,11 +1864,12 @@ def send_data(
         return None
     
     try:
-        with socket.socket(s_ver, socket.SOCK_STREAM) as s:
+        with sock as s:
             # Once we have our socket object, we set the timeout (by default it could hang forever), and open the connection.
             s.settimeout(timeout)
-            log.debug(" [...] Connecting to host: %s", fhost)
-            s.connect((ip, port))
+            if not settings.HAPPY_EYEBALLS:
+                log.debug(" [...] Connecting to host: %s", fhost)
+                s.connect((ip, port))
             log.debug(" [+++] Connected to %s\n", fhost)
             
             if data is None:
@@ -30,23 +30,33 @@ how to override the settings if the defaults don't work for you.
 
 
 """
+import asyncio
+import inspect
 import logging
+import os
+import sys
 import threading
+import time
+import weakref
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from importlib.util import find_spec
 from os import path
-from typing import Any, Union, Optional, Generator, Tuple, Dict
+from typing import Any, Callable, Union, Optional, Generator, Tuple, Dict, Generic, List
 
 from privex.helpers.collections import DictObject
 
 from privex.helpers import settings
 from privex.helpers.types import T
 from privex.helpers.common import empty_if, empty
-from privex.helpers.exceptions import GeoIPDatabaseNotFound
+from privex.helpers.exceptions import ConnectionPoolClosed, ConnectionPoolExhausted, GeoIPDatabaseNotFound
 
 log = logging.getLogger(__name__)
 
 __all__ = [
     'HAS_REDIS', 'HAS_ASYNC_REDIS', 'HAS_ASYNC_MEMCACHED', 'HAS_DNSPYTHON', 'HAS_CRYPTO', 'HAS_SETUPPY_BUMP',
-    'HAS_SETUPPY_COMMANDS', 'HAS_SETUPPY_COMMON', 'HAS_GEOIP', 'HAS_MEMCACHED', 'HAS_PRIVEX_DB', 'clean_threadstore'
+    'HAS_SETUPPY_COMMANDS', 'HAS_SETUPPY_COMMON', 'HAS_GEOIP', 'HAS_MEMCACHED', 'HAS_PRIVEX_DB', 'clean_threadstore',
+    'prune_threadstore', 'ConnectionPool', 'AsyncConnectionPool', 'get_pool', 'get_async_pool', 'close_pool', 'close_pool_async'
 ]
 
 HAS_REDIS = False
@@ -59,17 +69,31 @@ HAS_ASYNC_MEMCACHED = False
 HAS_DNSPYTHON = False
 """If the ``dns.resolver`` module was imported successfully, this will change to True."""
 
-HAS_CRYPTO = False
-"""If :py:mod:`privex.helpers.crypto` was imported successfully, this will change to True"""
 
-HAS_SETUPPY_COMMON = False
-"""If :py:mod:`privex.helpers.setuppy.common` was imported successfully, this will change to True"""
 
-HAS_SETUPPY_BUMP = False
-"""If :py:mod:`privex.helpers.setuppy.bump` was imported successfully, this will change to True"""
+def _has_module(name: str) -> bool:
+    """
+    Returns ``True`` if the module ``name`` can be imported, without actually importing it - used for the ``HAS_X`` flags
+    of submodules which :py:mod:`privex.helpers` only imports on first use
+    """
+    try:
+        return find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+HAS_CRYPTO = _has_module('cryptography')
+"""True if :py:mod:`privex.helpers.crypto` is available (``cryptography`` is installed)"""
+
+HAS_SETUPPY_COMMON = True
+"""True if :py:mod:`privex.helpers.setuppy.common` is available (it has no external dependencies)"""
+
+HAS_SETUPPY_BUMP = _has_module('semver')
+"""True if :py:mod:`privex.helpers.setuppy.bump` is available (``semver`` is installed)"""
 
-HAS_SETUPPY_COMMANDS = False
-"""If :py:mod:`privex.helpers.setuppy.commands` was imported successfully, this will change to True"""
+# Probing for ``distutils`` itself would trigger setuptools' distutils shim, which imports all of setuptools
+HAS_SETUPPY_COMMANDS = sys.version_info < (3, 12) or _has_module('setuptools')
+"""True if :py:mod:`privex.helpers.setuppy.commands` is available (``distutils`` is part of the stdlib, or ``setuptools`` is installed)"""
 
 HAS_GEOIP = False
 """If :py:mod:`privex.helpers.geoip` was imported successfully, this will change to True"""
@@ -83,11 +107,59 @@ __STORE = dict(threads={})
 """This ``dict`` is used to store initialised classes for connections to databases, APIs etc."""
 
 
+__LOCAL = threading.local()
+"""Holds a per-thread sentinel, which removes the thread's :attr:`.__STORE` entry once the thread exits (see :func:`._watch_thread`)"""
+
+
+class _ThreadSentinel:
+    __slots__ = ('__weakref__',)
+
+
+def _drop_threadstore(thread_id):
+    log.debug("[_drop_threadstore] Thread ID '%s' has exited - removing its thread store", thread_id)
+    __STORE['threads'].pop(thread_id, None)
+
+
+def _watch_thread(thread_id):
+    """
+    Attach a sentinel object to the current thread's :class:`threading.local` storage. When the thread exits, Python
+    destroys its thread-local data, which triggers the sentinel's finalizer - removing the thread store for ``thread_id``,
+    so that the connections/instances held in it can be garbage collected.
+    """
+    if getattr(__LOCAL, 'sentinel', None) is None:
+        __LOCAL.sentinel = _ThreadSentinel()
+        weakref.finalize(__LOCAL.sentinel, _drop_threadstore, thread_id)
+
+
+def prune_threadstore() -> int:
+    """
+    Remove the thread store of every thread ID in :attr:`.__STORE` which doesn't belong to a running thread, allowing the
+    instances they hold to be garbage collected.
+
+    Thread stores for threads which called :func:`._get_threadstore` are normally removed automatically when the thread exits,
+    this is called whenever a new thread store is created, to also clean up stores which were created using an explicit ``thread_id``.
+
+    :return int removed: The number of thread stores which were removed
+    """
+    alive = set(t.ident for t in threading.enumerate())
+    removed = 0
+    for t_id in list(__STORE['threads'].keys()):
+        if t_id not in alive and isinstance(t_id, int):
+            log.debug("[prune_threadstore] Removing thread store for dead thread ID '%s'", t_id)
+            __STORE['threads'].pop(t_id, None)
+            removed += 1
+    return removed
+
+
 def _get_threadstore(name=None, fallback=None, thread_id=None) -> Any:
-    thread_id = empty_if(thread_id, threading.get_ident())
-    if thread_id not in __STORE['threads']:
-        __STORE['threads'][thread_id] = {}
-    thread_store: dict = __STORE['threads'][thread_id]
+    current = threading.get_ident()
+    thread_id = empty_if(thread_id, current)
+    thread_store: dict = __STORE['threads'].get(thread_id)
+    if thread_store is None:
+        prune_threadstore()
+        thread_store = __STORE['threads'][thread_id] = {}
+        if thread_id == current:
+            _watch_thread(thread_id)
     if name is None:
         return thread_store
     
@@ -208,6 +280,449 @@ def clean_threadstore(thread_id=None, name=None, clean_all: bool = False) -> boo
     return False
 
 
+class _PoolBase(Generic[T]):
+    """
+    Shared book-keeping for :class:`.ConnectionPool` and :class:`.AsyncConnectionPool`.
+
+    Idle clients are kept in a deque as ``(client, last_used)`` tuples. Clients are borrowed from the right (most recently used)
+    end, so the least recently used clients gather at the left end, where they're closed once :attr:`.idle_timeout` passes.
+
+    All of the ``_`` prefixed methods on this class expect :attr:`._lock` to already be held by the caller.
+    """
+    def __init__(self, factory: Callable[[], Any], max_size: int = None, timeout: float = None, idle_timeout: float = None,
+                 health_check: Callable[[T], Any] = None, health_check_interval: float = None, closer: Callable[[T], Any] = None,
+                 name: str = 'pool'):
+        """
+        :param callable factory: A function (or coroutine function for async pools) which creates and returns a new client
+        :param int max_size: Maximum number of clients (idle + borrowed) the pool may hold (default: :attr:`.settings.CACHE_POOL_MAX_SIZE`)
+        :param float timeout: Seconds to wait for a client when the pool is exhausted (default: :attr:`.settings.CACHE_POOL_TIMEOUT`)
+        :param float idle_timeout: Close clients which have been idle for this many seconds (default: :attr:`.settings.CACHE_POOL_IDLE_TIMEOUT`)
+        :param callable health_check: A function (or coroutine function) called with a client - if it raises an exception, or returns
+                                      ``False``, then the client is closed and replaced.
+        :param float health_check_interval: Only health check clients which have been idle for at least this many seconds
+                                            (default: :attr:`.settings.CACHE_POOL_HEALTH_CHECK`) - ``0`` disables health checks.
+        :param callable closer: A function (or coroutine function) called with a client to close it when it's removed from the pool
+        :param str name: A name for this pool, used in log messages
+        """
+        self.factory, self.health_check, self.closer, self.name = factory, health_check, closer, name
+        self.max_size = int(settings.CACHE_POOL_MAX_SIZE if max_size is None else max_size)
+        self.timeout = float(settings.CACHE_POOL_TIMEOUT if timeout is None else timeout)
+        self.idle_timeout = float(settings.CACHE_POOL_IDLE_TIMEOUT if idle_timeout is None else idle_timeout)
+        self.health_check_interval = float(
+            settings.CACHE_POOL_HEALTH_CHECK if health_check_interval is None else health_check_interval
+        )
+        self.closed = False
+        self._lock = threading.Lock()
+        self._idle = deque()
+        self._size = 0
+        self._pid = os.getpid()
+
+    @property
+    def size(self) -> int:
+        """Total number of clients which currently exist in this pool (both idle and borrowed)"""
+        return self._size
+
+    @property
+    def idle(self) -> int:
+        """Number of clients which are sat in the pool, ready to be borrowed"""
+        return len(self._idle)
+
+    @property
+    def in_use(self) -> int:
+        """Number of clients which are currently borrowed from the pool"""
+        return self._size - len(self._idle)
+
+    def _check_pid(self):
+        # After a fork, the child must never use (or close) sockets which belong to the parent process.
+        if self._pid != os.getpid():
+            self._idle.clear()
+            self._size, self._pid = 0, os.getpid()
+
+    def _pop_expired(self) -> List[T]:
+        if self.idle_timeout <= 0:
+            return []
+        cutoff, expired = time.monotonic() - self.idle_timeout, []
+        while len(self._idle) > 0 and self._idle[0][1] < cutoff:
+            expired.append(self._idle.popleft()[0])
+            self._size -= 1
+        return expired
+
+    def _checkout(self) -> Tuple[Optional[T], Optional[float], bool, List[T]]:
+        """
+        Try to take a client from the pool.
+
+        :return tuple res: ``(client, last_used, create, expired)`` - ``create`` is ``True`` when the caller has reserved a slot and must
+                           create a new client. If ``client`` is ``None`` and ``create`` is ``False``, the pool is exhausted.
+                           ``expired`` is a list of idle clients which the caller must close (outside of the lock).
+        :raises ConnectionPoolClosed: When the pool has been closed
+        """
+        if self.closed:
+            raise ConnectionPoolClosed(f"Connection pool '{self.name}' is closed - cannot borrow a client from it")
+        self._check_pid()
+        expired = self._pop_expired()
+        if len(self._idle) > 0:
+            conn, used = self._idle.pop()
+            return conn, used, False, expired
+        if self._size < self.max_size:
+            self._size += 1
+            return None, None, True, expired
+        return None, None, False, expired
+
+    def _checkin(self, conn: T) -> bool:
+        """Return ``conn`` to the idle deque. Returns ``False`` if it must be closed instead (pool closed)."""
+        self._check_pid()
+        if self.closed:
+            self._size = max(self._size - 1, 0)
+            return False
+        self._idle.append((conn, time.monotonic()))
+        return True
+
+    def _needs_check(self, last_used: float) -> bool:
+        if self.health_check is None or self.health_check_interval <= 0:
+            return False
+        return time.monotonic() - last_used >= self.health_check_interval
+
+    def _exhausted(self) -> ConnectionPoolExhausted:
+        return ConnectionPoolExhausted(
+            f"Connection pool '{self.name}' is exhausted ({self.max_size} clients in use) - no client was returned "
+            f"within {self.timeout} seconds"
+        )
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} name='{self.name}' size={self.size} idle={self.idle} max_size={self.max_size}>"
+
+
+class ConnectionPool(_PoolBase[T]):
+    """
+    A thread-safe, bounded pool of client objects (e.g. :class:`redis.Redis` or :class:`pylibmc.Client`), with idle timeouts
+    and health checks.
+
+    Clients are created lazily by ``factory`` as they're needed, up to ``max_size`` clients. When every client is borrowed,
+    :meth:`.acquire` blocks until another thread releases one, raising :class:`.ConnectionPoolExhausted` after ``timeout`` seconds.
+
+    The pool is fork-safe - clients inherited from a parent process are silently forgotten, rather than being shared with it.
+
+    **Basic Usage**::
+
+        >>> pool = ConnectionPool(lambda: redis.Redis(), max_size=10, health_check=lambda r: r.ping(), closer=lambda r: r.close())
+        >>> with pool.connection() as r:
+        ...     r.set('hello', 'world')
+        >>> r = pool.acquire()
+        >>> r.get('hello')
+        b'world'
+        >>> pool.release(r)
+
+    """
+    def __init__(self, factory: Callable[[], T], *args, **kwargs):
+        super().__init__(factory, *args, **kwargs)
+        self._cond = threading.Condition(self._lock)
+
+    def _close_conn(self, conn: T):
+        if self.closer is None:
+            return
+        try:
+            self.closer(conn)
+        except Exception as e:
+            log.warning("[%s] Error while closing pooled client %s: %s %s", self.name, conn, type(e), str(e))
+
+    def _is_healthy(self, conn: T) -> bool:
+        try:
+            return self.health_check(conn) is not False
+        except Exception as e:
+            log.info("[%s] Pooled client %s failed health check: %s %s", self.name, conn, type(e), str(e))
+            return False
+
+    def _create(self) -> T:
+        try:
+            return self.factory()
+        except BaseException:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+    def acquire(self, timeout: float = None) -> T:
+        """
+        Borrow a client from the pool, creating one if there are none idle and the pool isn't full.
+
+        :param float timeout: Seconds to wait if the pool is exhausted (default: :attr:`.timeout`)
+        :raises ConnectionPoolExhausted: When no client became available within ``timeout`` seconds
+        :raises ConnectionPoolClosed: When the pool is closed (including while waiting for a client)
+        :return T conn: A client from the pool - which must be passed to :meth:`.release` once you're done with it
+        """
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        while True:
+            with self._cond:
+                conn, used, create, expired = self._checkout()
+                while conn is None and not create:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise self._exhausted()
+                    self._cond.wait(remaining)
+                    conn, used, create, expired = self._checkout()
+            for c in expired:
+                self._close_conn(c)
+            if create:
+                return self._create()
+            if self._needs_check(used) and not self._is_healthy(conn):
+                self.discard(conn)
+                continue
+            return conn
+
+    def release(self, conn: T):
+        """Return a client borrowed via :meth:`.acquire` to the pool"""
+        with self._cond:
+            keep = self._checkin(conn)
+            self._cond.notify()
+        if not keep:
+            self._close_conn(conn)
+
+    def discard(self, conn: T):
+        """Close a borrowed client which is broken (or otherwise shouldn't be re-used), and free up its slot in the pool"""
+        with self._cond:
+            self._check_pid()
+            self._size = max(self._size - 1, 0)
+            self._cond.notify()
+        self._close_conn(conn)
+
+    @contextmanager
+    def connection(self, timeout: float = None) -> Generator[T, None, None]:
+        """Context manager which borrows a client using :meth:`.acquire`, and releases it when the context manager exits"""
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """Close every idle client. Clients which are currently borrowed will be closed when they're released."""
+        with self._cond:
+            self.closed = True
+            conns = [c for c, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(conns)
+            self._cond.notify_all()
+        for c in conns:
+            self._close_conn(c)
+
+
+class AsyncConnectionPool(_PoolBase[T]):
+    """
+    AsyncIO version of :class:`.ConnectionPool`. The ``factory``, ``health_check`` and ``closer`` may be either normal functions,
+    or coroutine functions.
+
+    An AsyncIO pool's clients are generally tied to the event loop they were created on - use :func:`.get_async_pool` to get
+    the pool for the current event loop, rather than sharing one pool between event loops.
+
+    **Basic Usage**::
+
+        >>> pool = AsyncConnectionPool(lambda: aioredis.Redis(), health_check=lambda r: r.ping(), closer=lambda r: r.aclose())
+        >>> async with pool.connection() as r:
+        ...     await r.set('hello', 'world')
+
+    """
+    def __init__(self, factory: Callable[[], Any], *args, **kwargs):
+        super().__init__(factory, *args, **kwargs)
+        self._waiters = deque()
+
+    @staticmethod
+    async def _call(func, *args):
+        res = func(*args)
+        return (await res) if inspect.isawaitable(res) else res
+
+    @staticmethod
+    def _wake_waiter(fut: asyncio.Future):
+        if not fut.done():
+            fut.set_result(True)
+
+    def _notify(self):
+        while len(self._waiters) > 0:
+            fut: asyncio.Future = self._waiters.popleft()
+            if fut.done():
+                continue
+            try:
+                # The waiter may be on another thread's event loop, so we must schedule the wake up via that loop.
+                fut.get_loop().call_soon_threadsafe(self._wake_waiter, fut)
+                return
+            except RuntimeError:
+                continue
+
+    async def _close_conn(self, conn: T):
+        if self.closer is None:
+            return
+        try:
+            await self._call(self.closer, conn)
+        except Exception as e:
+            log.warning("[%s] Error while closing pooled client %s: %s %s", self.name, conn, type(e), str(e))
+
+    async def _is_healthy(self, conn: T) -> bool:
+        try:
+            return (await self._call(self.health_check, conn)) is not False
+        except Exception as e:
+            log.info("[%s] Pooled client %s failed health check: %s %s", self.name, conn, type(e), str(e))
+            return False
+
+    async def _create(self) -> T:
+        try:
+            return await self._call(self.factory)
+        except BaseException:
+            with self._lock:
+                self._size -= 1
+                self._notify()
+            raise
+
+    async def acquire(self, timeout: float = None) -> T:
+        """
+        Borrow a client from the pool, creating one if there are none idle and the pool isn't full.
+
+        :param float timeout: Seconds to wait if the pool is exhausted (default: :attr:`.timeout`)
+        :raises ConnectionPoolExhausted: When no client became available within ``timeout`` seconds
+        :raises ConnectionPoolClosed: When the pool is closed (including while waiting for a client)
+        :return T conn: A client from the pool - which must be passed to :meth:`.release` once you're done with it
+        """
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        while True:
+            fut = None
+            with self._lock:
+                conn, used, create, expired = self._checkout()
+                if conn is None and not create:
+                    fut = asyncio.get_event_loop().create_future()
+                    self._waiters.append(fut)
+            for c in expired:
+                await self._close_conn(c)
+            if fut is not None:
+                try:
+                    await asyncio.wait_for(fut, max(deadline - time.monotonic(), 0))
+                except asyncio.TimeoutError:
+                    with self._lock:
+                        if fut in self._waiters: self._waiters.remove(fut)
+                    raise self._exhausted()
+                continue
+            if create:
+                return await self._create()
+            if self._needs_check(used) and not await self._is_healthy(conn):
+                await self.discard(conn)
+                continue
+            return conn
+
+    async def release(self, conn: T):
+        """Return a client borrowed via :meth:`.acquire` to the pool"""
+        with self._lock:
+            keep = self._checkin(conn)
+            self._notify()
+        if not keep:
+            await self._close_conn(conn)
+
+    async def discard(self, conn: T):
+        """Close a borrowed client which is broken (or otherwise shouldn't be re-used), and free up its slot in the pool"""
+        with self._lock:
+            self._check_pid()
+            self._size = max(self._size - 1, 0)
+            self._notify()
+        await self._close_conn(conn)
+
+    @asynccontextmanager
+    async def connection(self, timeout: float = None):
+        """Async context manager which borrows a client using :meth:`.acquire`, and releases it when the context manager exits"""
+        conn = await self.acquire(timeout)
+        try:
+            yield conn
+        finally:
+            await self.release(conn)
+
+    async def close(self):
+        """Close every idle client. Clients which are currently borrowed will be closed when they're released."""
+        with self._lock:
+            self.closed = True
+            conns = [c for c, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(conns)
+            while len(self._waiters) > 0:
+                self._notify()
+        for c in conns:
+            await self._close_conn(c)
+
+
+__POOLS: Dict[Tuple[str, int], Union[ConnectionPool, weakref.WeakKeyDictionary]] = {}
+"""
+Shared pools created by :func:`.get_pool` / :func:`.get_async_pool`, keyed by ``(name, pid)``. AsyncIO pools are stored in a
+:class:`weakref.WeakKeyDictionary` keyed by event loop, so each loop's pool is discarded along with the loop.
+"""
+
+__POOL_LOCK = threading.Lock()
+
+
+def get_pool(name: str, factory: Callable[[], T], **pool_config) -> ConnectionPool:
+    """
+    Get the shared :class:`.ConnectionPool` called ``name`` for the current process, creating it using ``factory`` and
+    ``pool_config`` (see :class:`.ConnectionPool`) if it doesn't exist yet.
+
+        >>> pool = get_pool('redis', connect_redis, health_check=lambda r: r.ping())
+        >>> with pool.connection() as r:
+        ...     r.get('hello')
+
+    """
+    key = (name, os.getpid())
+    with __POOL_LOCK:
+        pool = __POOLS.get(key)
+        if pool is None:
+            pool = __POOLS[key] = ConnectionPool(factory, name=name, **pool_config)
+        return pool
+
+
+def get_async_pool(name: str, factory: Callable[[], Any], **pool_config) -> AsyncConnectionPool:
+    """
+    Get the shared :class:`.AsyncConnectionPool` called ``name`` for the current process **and event loop**, creating it using
+    ``factory`` and ``pool_config`` (see :class:`.AsyncConnectionPool`) if it doesn't exist yet.
+    """
+    key, loop = (name, os.getpid()), asyncio.get_event_loop()
+    with __POOL_LOCK:
+        loops = __POOLS.get(key)
+        if loops is None:
+            loops = __POOLS[key] = weakref.WeakKeyDictionary()
+        pool = loops.get(loop)
+        if pool is None:
+            pool = loops[loop] = AsyncConnectionPool(factory, name=name, **pool_config)
+        return pool
+
+
+def close_pool(name: str) -> bool:
+    """
+    Close the shared synchronous pool ``name`` (see :func:`.get_pool`) for the current process, and remove it, so the next call
+    to :func:`.get_pool` creates a fresh pool (e.g. after changing connection settings).
+
+    :return bool closed: ``True`` if a pool was found and closed, otherwise ``False``
+    """
+    with __POOL_LOCK:
+        pool = __POOLS.pop((name, os.getpid()), None)
+    if pool is None:
+        return False
+    pool.close()
+    return True
+
+
+async def close_pool_async(name: str) -> bool:
+    """
+    Close and remove every AsyncIO pool called ``name`` (see :func:`.get_async_pool`) for the current process.
+
+    Only the pool for the current event loop can have its idle clients closed cleanly - pools belonging to other event loops
+    are marked as closed and dropped, so their clients are closed as they're released, or garbage collected.
+
+    :return bool closed: ``True`` if any pools were found and closed, otherwise ``False``
+    """
+    with __POOL_LOCK:
+        loops = __POOLS.pop((name, os.getpid()), None)
+    if not loops:
+        return False
+    current = asyncio.get_event_loop()
+    for loop, pool in list(loops.items()):
+        if loop is current:
+            await pool.close()
+        else:
+            pool.closed = True
+    return True
+
+
 try:
     import redis
 
@@ -278,10 +793,23 @@ try:
         settings.REDIS_DB = db
         settings.REDIS_PORT = port
         settings.REDIS_HOST = host
+        close_pool('redis')
         return reset_redis(thread_id=thread_id)
 
+    def get_redis_pool(**pool_config) -> ConnectionPool:
+        """
+        Get the shared, bounded :class:`.ConnectionPool` of :class:`redis.Redis` clients for this process. Clients are health
+        checked with ``PING`` - see :class:`.ConnectionPool` for the ``pool_config`` options, which default to the
+        ``CACHE_POOL_`` settings in :mod:`privex.helpers.settings`.
+
+            >>> with get_redis_pool().connection() as r:
+            ...     r.set('hello', 'world')
+
+        """
+        return get_pool('redis', connect_redis, health_check=lambda r: r.ping(), closer=lambda r: r.close(), **pool_config)
+
 
-    __all__ += ['get_redis', 'reset_redis', 'configure_redis', 'close_redis', 'connect_redis']
+    __all__ += ['get_redis', 'reset_redis', 'configure_redis', 'close_redis', 'connect_redis', 'get_redis_pool']
     HAS_REDIS = True
 
 except ImportError:
@@ -368,10 +896,27 @@ try:
         settings.REDIS_DB = db
         settings.REDIS_PORT = port
         settings.REDIS_HOST = host
+        await close_pool_async('aioredis')
         return await reset_redis_async(thread_id=thread_id)
 
+    def get_redis_async_pool(**pool_config) -> AsyncConnectionPool:
+        """
+        Get the shared, bounded :class:`.AsyncConnectionPool` of AsyncIO Redis clients for this process and event loop.
+        Clients are health checked with ``PING`` - see :class:`.AsyncConnectionPool` for the ``pool_config`` options.
+
+            >>> async with get_redis_async_pool().connection() as r:
+            ...     await r.set('hello', 'world')
+
+        """
+        return get_async_pool(
+            'aioredis', connect_redis_async, health_check=lambda r: r.ping(), closer=lambda r: r.aclose(), **pool_config
+        )
 
-    __all__ += ['get_redis_async', 'reset_redis_async', 'configure_redis_async', 'close_redis_async', 'connect_redis_async']
+
+    __all__ += [
+        'get_redis_async', 'reset_redis_async', 'configure_redis_async', 'close_redis_async', 'connect_redis_async',
+        'get_redis_async_pool'
+    ]
 
 
 except ImportError:
@@ -442,10 +987,23 @@ try:
         thread_id = kwargs.get('thread_id', None)
         settings.MEMCACHED_PORT = port
         settings.MEMCACHED_HOST = host
+        await close_pool_async('aiomemcached')
         return await reset_memcached_async(thread_id=thread_id)
 
+    def get_memcached_async_pool(**pool_config) -> AsyncConnectionPool:
+        """
+        Get the shared, bounded :class:`.AsyncConnectionPool` of :class:`aiomcache.Client` instances for this process and
+        event loop. Clients are health checked using ``version`` - see :class:`.AsyncConnectionPool` for the ``pool_config`` options.
+        """
+        return get_async_pool(
+            'aiomemcached', connect_memcached_async, health_check=lambda m: m.version(), closer=lambda m: m.close(), **pool_config
+        )
 
-    __all__ += ['get_memcached_async', 'reset_memcached_async', 'configure_memcached_async', 'close_memcached_async', 'connect_memcached_async']
+
+    __all__ += [
+        'get_memcached_async', 'reset_memcached_async', 'configure_memcached_async', 'close_memcached_async',
+        'connect_memcached_async', 'get_memcached_async_pool'
+    ]
 
 except ImportError:
     log.debug('%s failed to import "aiomcache", Async Memcached dependent helpers will be disabled.', __name__)
@@ -523,11 +1081,23 @@ try:
         thread_id = kwargs.get('thread_id', None)
         settings.MEMCACHED_PORT = port
         settings.MEMCACHED_HOST = host
+        close_pool('memcached')
         return reset_memcached(thread_id=thread_id)
     
     
+    def get_memcached_pool(**pool_config) -> ConnectionPool:
+        """
+        Get the shared, bounded :class:`.ConnectionPool` of :class:`pylibmc.Client` instances for this process. Since a
+        :class:`pylibmc.Client` must not be used by multiple threads at once, each borrower gets a client to itself.
+        Clients are health checked using ``get_stats`` - see :class:`.ConnectionPool` for the ``pool_config`` options.
+        """
+        return get_pool(
+            'memcached', connect_memcached, health_check=lambda m: m.get_stats(), closer=lambda m: m.disconnect_all(), **pool_config
+        )
+    
+    
     __all__ += ['get_memcached', 'reset_memcached', 'configure_memcached', 'close_memcached',
-                'connect_memcached']
+                'connect_memcached', 'get_memcached_pool']
 
 except ImportError:
     log.debug('%s failed to import "pylibmc", Synchronous Memcached dependent helpers will be disabled.', __name__)
@@ -539,7 +1109,15 @@ try:
     import geoip2
     import geoip2.database
 
+    GEOIP_MODES = {
+        'auto': geoip2.database.MODE_AUTO, 'mmap_ext': geoip2.database.MODE_MMAP_EXT, 'mmap': geoip2.database.MODE_MMAP,
+        'file': geoip2.database.MODE_FILE, 'memory': geoip2.database.MODE_MEMORY,
+    }
+    """Maps the names accepted by :attr:`privex.helpers.settings.GEOIP_MODE` to :mod:`geoip2.database` ``MODE_`` constants"""
+
     def connect_geoip(*args, **geo_config) -> geoip2.database.Reader:
+        if 'mode' not in geo_config:
+            geo_config['mode'] = GEOIP_MODES.get(settings.GEOIP_MODE, geoip2.database.MODE_AUTO)
         return geoip2.database.Reader(*args, **geo_config)
 
     def get_geodbs() -> DictObject:
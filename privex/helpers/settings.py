@@ -105,6 +105,18 @@ Can be one of the following:
     
     **Class:** :class:`.SqliteCache` (sync) // :class:`.AsyncSqliteCache` (async)
 
+  * ``tiered`` / ``tier`` - A bounded in-process memory cache (L1) in front of the adapter named in :attr:`.TIERED_CACHE_L2`
+  
+    **Requires**: whatever the L2 adapter requires
+    
+    **Class:** :class:`.TieredCache` (sync) // :class:`.AsyncTieredCache` (async)
+
+  * ``sharded`` / ``shard`` - Keys distributed over the cache nodes in :attr:`.SHARDED_CACHE_NODES` by consistent hashing
+  
+    **Requires**: whatever the node adapters require
+    
+    **Class:** :class:`.ShardedCache` (sync) // :class:`.AsyncShardedCache` (async)
+
 
 """
 
@@ -125,8 +137,73 @@ Available adapters ( same as :attr:`.DEFAULT_CACHE_ADAPTER` ):
   * ``redis`` - Caching via a local or remote Redis server
   * ``memcached`` / ``memcache`` / ``mcache`` - Caching via a local or remote Memcached server
   * ``sqlite3`` / ``sqlite`` / ``sqlitedb`` - Caching via an SQLite3 database stored on the filesystem
+  * ``tiered`` / ``tier`` - In-process memory cache (L1) in front of the adapter named in :attr:`.TIERED_CACHE_L2`
+  * ``sharded`` / ``shard`` - Keys distributed over the cache nodes in :attr:`.SHARDED_CACHE_NODES`
+
+
+"""
+
+CACHE_SINGLE_FLIGHT = _env_bool('PRIVEX_CACHE_SINGLE_FLIGHT', False)
+"""
+When ``True``, :meth:`.CacheAdapter.get_or_set`, :func:`.r_cache` and :func:`.r_cache_async` use single-flight stampede
+protection by default. Only one computation of a missing key runs at a time within a process (across threads,
+and within each event loop), while other callers for that key wait for its result. See :mod:`privex.helpers.cache.singleflight`
+"""
+CACHE_DISTRIBUTED_LOCK = _env_bool('PRIVEX_CACHE_DISTRIBUTED_LOCK', False)
+"""
+When ``True`` (and single-flight is enabled), the caller computing a missing key also holds a lock key stored in the
+cache backend itself (via :meth:`.CacheAdapter.add` - e.g. Redis ``SET NX PX`` / memcached ``add``), so that only one
+process across every server sharing the cache recomputes the key.
+"""
+CACHE_LOCK_TIMEOUT = float(env('PRIVEX_CACHE_LOCK_TIMEOUT', 30))
+"""
+Maximum number of seconds that single-flight callers wait for another caller's computation, and the expiry time of
+distributed lock keys. Once exceeded, a waiting caller gives up waiting and computes the value itself.
+"""
+CACHE_REFRESH_WORKERS = _env_int('PRIVEX_CACHE_REFRESH_WORKERS', 4)
+"""
+Maximum number of threads used to refresh stale values in the background, when :func:`.r_cache` / :func:`.z_cache` are
+used with ``soft_ttl`` or ``xfetch_beta``. See :mod:`privex.helpers.cache.refresh`
+"""
+CACHE_SERIALIZER = env('PRIVEX_CACHE_SERIALIZER', 'pickle')
+"""
+The serializer used by cache adapters which store values outside of the process (Redis, Memcached, SQLite), unless one
+is passed to the adapter's constructor. One of ``pickle``, ``msgpack``, ``orjson``, ``json`` or ``marshal``.
+Every stored value records which serializer encoded it, so changing this doesn't break reading existing keys.
+See :mod:`privex.helpers.cache.serializers`
+"""
+CACHE_COMPRESSION = env('PRIVEX_CACHE_COMPRESSION', '')
+"""
+Compression applied to large serialized cache values - empty for no compression, or one of ``zlib``, ``lz4`` or ``zstd``
+"""
+CACHE_COMPRESS_THRESHOLD = _env_int('PRIVEX_CACHE_COMPRESS_THRESHOLD', 1024)
+"""Serialized cache values smaller than this many bytes are never compressed"""
 
+CACHE_KEY_HASH_THRESHOLD = _env_int('PRIVEX_CACHE_KEY_HASH_THRESHOLD', 64)
+"""
+Encoded cache key components (function arguments) longer than this many characters are replaced with a fixed-length
+blake2b hash by :mod:`privex.helpers.cache.keys`
+"""
+CACHE_KEY_MAX_LENGTH = _env_int('PRIVEX_CACHE_KEY_MAX_LENGTH', 200)
+"""
+Cache keys built by :class:`privex.helpers.cache.keys.KeyBuilder` longer than this many characters have all of their
+argument components hashed together (Memcached rejects keys over 250 bytes)
+"""
+CACHE_METRICS = _env_bool('PRIVEX_CACHE_METRICS', False)
+"""
+When ``True``, every cache adapter is instrumented when it's constructed - recording hits, misses, sets, errors, bytes
+read / written, and latency histograms per operation and key prefix. See :mod:`privex.helpers.cache.metrics`.
+When ``False`` (default), adapters are left untouched, so there's no overhead unless you call :func:`.instrument` yourself.
+"""
+CACHE_METRICS_MAX_PREFIXES = _env_int('PRIVEX_CACHE_METRICS_MAX_PREFIXES', 100)
+"""
+Maximum number of distinct key prefixes tracked per instrumented adapter - further prefixes are counted under ``__other__``
+"""
 
+ASYNC_LOOP_RUNNER_THREADS = _env_int('PRIVEX_ASYNC_LOOP_RUNNER_THREADS', 16)
+"""
+Maximum number of long-lived event loop threads used by :func:`.run_coro_thread` / :func:`.run_coro_thread_async` and
+other helpers which run coroutines from synchronous code. See :class:`privex.helpers.asyncx.LoopRunner`
 """
 
 ########
@@ -149,6 +226,113 @@ MEMCACHED_HOST = env('PRIVEX_MEMCACHED_HOST', 'localhost')
 MEMCACHED_PORT = _env_int('PRIVEX_MEMCACHED_PORT', 11211)
 """Port number that Memcached is running on at ``MEMCACHED_HOST``"""
 
+########
+# Connection Pool Settings (Redis / Memcached)
+########
+
+CACHE_POOL_ENABLED = _env_bool('PRIVEX_CACHE_POOL_ENABLED', True)
+"""
+When ``True``, the Redis / Memcached cache adapters (sync and AsyncIO) borrow a client from a bounded connection pool
+(see :class:`privex.helpers.plugin.ConnectionPool`) for each operation - or for the whole of a ``with`` / ``async with``
+block - and return it to the pool afterwards, instead of tearing down and re-creating connections.
+Env var: ``PRIVEX_CACHE_POOL_ENABLED``
+
+As clients are only held while in use, any number of adapter instances can share the pool (see
+:mod:`privex.helpers.cache.pooling`).
+"""
+
+CACHE_POOL_MAX_SIZE = _env_int('PRIVEX_CACHE_POOL_MAX_SIZE', 20)
+"""
+Maximum number of clients each connection pool will create (per process, and per event loop for AsyncIO pools). Once the
+limit is reached, borrowers wait up to :attr:`.CACHE_POOL_TIMEOUT` seconds for a client to be returned.
+"""
+
+CACHE_POOL_TIMEOUT = float(env('PRIVEX_CACHE_POOL_TIMEOUT', 10))
+"""
+Seconds to wait for a free client when a connection pool is exhausted, before raising :class:`.ConnectionPoolExhausted`
+"""
+
+CACHE_POOL_IDLE_TIMEOUT = float(env('PRIVEX_CACHE_POOL_IDLE_TIMEOUT', 300))
+"""Pooled clients which have been idle for longer than this many seconds are closed and removed from the pool. ``0`` disables."""
+
+CACHE_POOL_HEALTH_CHECK = float(env('PRIVEX_CACHE_POOL_HEALTH_CHECK', 30))
+"""
+Pooled clients which have been idle for at least this many seconds are health checked (e.g. Redis ``PING``) before being
+handed out - clients which fail the check are closed and replaced. ``0`` disables health checks.
+"""
+
+########
+# In-memory Cache Settings
+########
+
+MEMORY_CACHE_MAX_ENTRIES = _env_int('PRIVEX_MEMORY_CACHE_MAX_ENTRIES', 0)
+"""
+Maximum number of keys the shared in-memory cache store (used by :class:`.MemoryCache` and :class:`.AsyncMemoryCache`)
+may hold before entries are evicted according to :attr:`.MEMORY_CACHE_EVICTION`. ``0`` means no entry limit.
+"""
+MEMORY_CACHE_MAX_BYTES = _env_int('PRIVEX_MEMORY_CACHE_MAX_BYTES', 0)
+"""
+Approximate maximum size (in bytes, estimated via :func:`sys.getsizeof`) of the keys + values held by the shared in-memory
+cache store, before entries are evicted. ``0`` means no byte limit.
+"""
+MEMORY_CACHE_EVICTION = env('PRIVEX_MEMORY_CACHE_EVICTION', 'lru')
+"""
+The eviction policy used by the in-memory cache store once :attr:`.MEMORY_CACHE_MAX_ENTRIES` or :attr:`.MEMORY_CACHE_MAX_BYTES`
+is reached. One of:
+
+  * ``lru`` - evict the least recently used key
+  * ``lfu`` - evict the least frequently used key (ties are broken by least recently used)
+  * ``tinylfu`` - LRU ordering with a TinyLFU admission filter: a new key only replaces the LRU victim if its
+    estimated access frequency (tracked with a small count-min sketch) is higher than the victim's
+
+"""
+
+########
+# Tiered (L1 + L2) Cache Settings
+########
+
+TIERED_CACHE_L2 = env('PRIVEX_TIERED_CACHE_L2', 'redis')
+"""
+The adapter name (e.g. ``redis``, ``memcached``, ``sqlite3``) used as the shared "L2" cache behind the in-process
+"L1" memory cache, when :class:`.TieredCache` / :class:`.AsyncTieredCache` are constructed without an ``l2`` adapter -
+e.g. when ``PRIVEX_CACHE_ADAPTER=tiered``
+"""
+TIERED_CACHE_L1_TTL = float(env('PRIVEX_TIERED_CACHE_L1_TTL', 5))
+"""
+Maximum number of seconds a key is served from the in-process L1 cache, before it's re-read from L2. This bounds how
+stale a process's L1 copy can be when a key is changed by another process.
+"""
+TIERED_CACHE_L1_MAX_ENTRIES = _env_int('PRIVEX_TIERED_CACHE_L1_MAX_ENTRIES', 10000)
+"""Maximum number of keys held in each tiered cache's L1 store (least recently used keys are evicted). ``0`` means unbounded."""
+TIERED_CACHE_INVALIDATION = _env_bool('PRIVEX_TIERED_CACHE_INVALIDATION', False)
+"""
+When ``True``, and the L2 adapter is Redis, tiered caches broadcast the keys they set / remove over Redis pub/sub, so that
+other processes drop their (now stale) L1 copies immediately, instead of after :attr:`.TIERED_CACHE_L1_TTL`
+"""
+TIERED_CACHE_CHANNEL = env('PRIVEX_TIERED_CACHE_CHANNEL', 'pvx:cache:invalidate')
+"""The Redis pub/sub channel used for tiered cache invalidation messages"""
+
+SHARDED_CACHE_NODES = env('PRIVEX_SHARDED_CACHE_NODES', '')
+"""
+Comma separated list of cache nodes used by :class:`.ShardedCache` / :class:`.AsyncShardedCache` when they're constructed
+without ``nodes`` - e.g. when ``PRIVEX_CACHE_ADAPTER=sharded``. Each node is either a server URL, or an adapter name::
+
+    PRIVEX_SHARDED_CACHE_NODES=redis://10.0.0.1:6379/0,redis://10.0.0.2:6379/0,memcached://10.0.0.3:11211
+
+"""
+SHARDED_CACHE_VNODES = _env_int('PRIVEX_SHARDED_CACHE_VNODES', 160)
+"""
+Number of virtual nodes (points on the hash ring) per cache node. More virtual nodes spread keys more evenly between
+nodes, at the cost of a slightly larger ring.
+"""
+SHARDED_CACHE_FAILOVER = _env_bool('PRIVEX_SHARDED_CACHE_FAILOVER', False)
+"""
+When ``True``, if a sharded cache node raises an error (e.g. it's down), the operation is retried on the next node on the
+hash ring, and the failed node is skipped for :attr:`.SHARDED_CACHE_RETRY` seconds. When ``False``, the error is raised.
+"""
+SHARDED_CACHE_RETRY = float(env('PRIVEX_SHARDED_CACHE_RETRY', 30))
+"""Number of seconds a failed sharded cache node is skipped for (with failover enabled), before it's tried again"""
+
 ########################################
 #                                      #
 #       GeoIP Module Settings          #
@@ -179,10 +363,54 @@ GEOASN_DETECTED, GEOCITY_DETECTED, GEOCOUNTRY_DETECTED = False, False, False
 
 GEOCITY, GEOASN, GEOCOUNTRY = join(GEOIP_DIR, GEOCITY_NAME), join(GEOIP_DIR, GEOASN_NAME), join(GEOIP_DIR, GEOCOUNTRY_NAME)
 
+GEOIP_MODE = env('GEOIP_MODE', 'auto').lower()
+"""
+The ``mode`` GeoIP2 readers are opened with by :func:`privex.helpers.plugin.get_geoip` - either ``auto``, ``mmap_ext``, ``mmap``,
+``file`` or ``memory`` (see :mod:`geoip2.database`). ``auto`` memory maps the database, using the ``libmaxminddb`` C extension
+if it's installed (``mmap_ext``), otherwise the pure python reader (``mmap``).
+"""
+
+GEOIP_CACHE_SIZE = _env_int('GEOIP_CACHE_SIZE', 10000)
+"""Maximum number of IP addresses (and separately, networks) held by the default :class:`privex.helpers.geoip.GeoIPCache`"""
+
+GEOIP_BULK_WORKERS = _env_int('GEOIP_BULK_WORKERS', 4)
+"""Default number of threads used by :func:`privex.helpers.geoip.geolocate_bulk` - set to ``1`` to look up IPs in the calling thread"""
+
+GEOIP_BULK_CHUNK_SIZE = _env_int('GEOIP_BULK_CHUNK_SIZE', 256)
+"""Number of IP addresses looked up per thread pool task by :func:`.geolocate_bulk` / :func:`.geolocate_bulk_async`"""
+
+GEOIP_PREFIX_CACHE = _env_bool('GEOIP_PREFIX_CACHE', False)
+"""
+If ``True``, :func:`privex.helpers.geoip.geolocate_ip` caches each result by network in a :class:`.GeoIPPrefixCache`, and
+answers IPs within an already looked up network from the cache instead of the GeoIP databases.
+"""
+
+GEOIP_PREFIX_CACHE_SIZE = _env_int('GEOIP_PREFIX_CACHE_SIZE', 50000)
+"""Maximum number of networks held by the default :class:`privex.helpers.geoip.GeoIPPrefixCache`"""
+
+GEOIP_PREFIX_CACHE_CHECK = _env_int('GEOIP_PREFIX_CACHE_CHECK', 30)
+"""
+Minimum seconds between checking whether the GeoIP ``.mmdb`` files were modified (which clears the :class:`.GeoIPPrefixCache`).
+Set to ``0`` to disable the checks.
+"""
+
 TERMBIN_HOST, TERMBIN_PORT = 'termbin.com', 9999
 
 CHECK_CONNECTIVITY: bool = _env_bool('CHECK_CONNECTIVITY', True)
 
+HAPPY_EYEBALLS: bool = _env_bool('HAPPY_EYEBALLS', True)
+"""
+If ``True``, :class:`.SocketWrapper`, :class:`.AsyncSocketWrapper`, :func:`.check_host` and :func:`.send_data` (plus their
+AsyncIO versions) connect using Happy Eyeballs (RFC 8305) - racing staggered connection attempts to all of a host's IPv6
+and IPv4 addresses, instead of only falling back to IPv4 after an IPv6 connection has failed or timed out.
+"""
+
+HAPPY_EYEBALLS_DELAY: float = float(env('HAPPY_EYEBALLS_DELAY', 0.25))
+"""
+Seconds to wait for a Happy Eyeballs connection attempt before starting an attempt to the host's next IP address
+(the "Connection Attempt Delay" from RFC 8305 - which recommends 250ms)
+"""
+
 HAS_WORKING_V4: Optional[bool] = None
 """
 This is a storage variable - becomes either ``True`` or ``False`` after :func:`.check_v4` has been ran.
@@ -233,6 +461,103 @@ NET_CHECK_HOST_COUNT_TRY: int = _env_int('NET_CHECK_HOST_COUNT', 8)
 Maximum number of hosts in :attr:`.V4_TEST_HOSTS` / :attr:`.V6_TEST_HOSTS` that will be tested by :func:`.check_v4` / :func:`.check_v6`
 """
 
+DNS_CACHE: bool = _env_bool('DNS_CACHE', True)
+"""
+If ``True``, :func:`.resolve_ips` / :func:`.resolve_ips_async` (and everything built on them, e.g. :func:`.check_host`,
+:func:`.send_data` and :class:`.SocketWrapper`) cache resolved hostnames in the shared :class:`.DNSCache`
+"""
+
+DNS_CACHE_SIZE: int = _env_int('DNS_CACHE_SIZE', 4096)
+"""Maximum number of hostname + IP version combinations held by the shared :class:`.DNSCache`"""
+
+DNS_CACHE_TTL: int = _env_int('DNS_CACHE_TTL', 60)
+"""Seconds to cache resolved hostnames for, when the record TTL isn't known (i.e. resolved by ``getaddrinfo`` instead of dnspython)"""
+
+DNS_CACHE_MIN_TTL: int = _env_int('DNS_CACHE_MIN_TTL', 0)
+"""Lower bound applied to record TTLs from dnspython. Records with a TTL of ``0`` are never cached unless this is raised."""
+
+DNS_CACHE_MAX_TTL: int = _env_int('DNS_CACHE_MAX_TTL', 3600)
+"""Upper bound applied to record TTLs from dnspython"""
+
+DNS_CACHE_NEGATIVE_TTL: int = _env_int('DNS_CACHE_NEGATIVE_TTL', 30)
+"""Seconds to cache hostnames which don't exist (NXDOMAIN) or have no addresses. ``0`` disables negative caching."""
+
+DNS_BACKEND: str = env('DNS_BACKEND', 'auto').lower()
+"""
+The resolver used for A/AAAA (:func:`.resolve_ips`) and PTR (:func:`.get_rdns`) lookups:
+
+  * ``auto`` - (default) Use the shared dnspython resolver from :func:`.get_resolver` / :func:`.get_async_resolver` if ``dnspython``
+    is installed, otherwise the system resolver. Record TTLs are then used by the :class:`.DNSCache`, and AsyncIO lookups
+    don't need executor threads. Names and IPs listed in the hosts file (:attr:`.DNS_HOSTS_FILE`) are always looked up
+    with the system resolver, so local overrides are respected. Names which dnspython can't resolve (e.g. ones only
+    known to other name services in ``nsswitch.conf``, or PTRs for private IPs) fall back to the system resolver.
+  * ``dnspython`` - Like ``auto``, but without checking the hosts file first - a name which exists in both the hosts file
+    and public DNS resolves to its public DNS records.
+  * ``system`` - Always use the system resolver (``getaddrinfo`` / ``getnameinfo`` / ``gethostbyaddr``), which respects
+    ``/etc/hosts``, ``nsswitch.conf`` and any other name services configured on the host.
+
+"""
+
+DNS_HOSTS_FILE: str = env(
+    'DNS_HOSTS_FILE',
+    join(env('SystemRoot', 'C:\\Windows'), 'System32', 'drivers', 'etc', 'hosts') if sys.platform == 'win32' else '/etc/hosts'
+)
+"""
+The hosts file checked by the ``auto`` :attr:`.DNS_BACKEND` - names / IPs listed in it are looked up with the system resolver.
+It's re-read whenever it's modification time changes.
+"""
+
+DNS_NAMESERVERS: str = env('DNS_NAMESERVERS', '')
+"""
+Comma separated nameserver IPs for the shared dnspython resolver, e.g. ``9.9.9.9,2620:fe::fe``.
+If empty, the nameservers are read from ``/etc/resolv.conf`` (or the Windows registry).
+"""
+
+DNS_PORT: int = _env_int('DNS_PORT', 53)
+"""The port used to query :attr:`.DNS_NAMESERVERS` with the shared dnspython resolver"""
+
+DNS_TIMEOUT: float = float(env('DNS_TIMEOUT', 5))
+"""Maximum seconds the shared dnspython resolver spends on a single query (including retries against other nameservers)"""
+
+DNS_MULTI_CONCURRENCY: int = _env_int('DNS_MULTI_CONCURRENCY', 20)
+"""
+Default number of lookups ran at once by :func:`.resolve_ips_multi`, :func:`.get_rdns_multi` (threads) and their
+AsyncIO versions (tasks). ``1`` resolves each host in sequence.
+"""
+
+DNS_MULTI_TIMEOUT: float = float(env('DNS_MULTI_TIMEOUT', 0))
+"""Default per-lookup timeout (seconds) for :func:`.resolve_ips_multi` / :func:`.get_rdns_multi` etc. - ``0`` for no timeout"""
+
+DNS_MULTI_MAX_ABANDONED: int = _env_int('DNS_MULTI_MAX_ABANDONED', 20)
+"""
+Maximum number of extra worker threads :func:`.resolve_ips_multi` / :func:`.get_rdns_multi` etc. start in place of workers
+which are stuck on a lookup that timed out (a thread can't be interrupted, so it's stuck until the lookup returns)
+"""
+
+ASN_CACHE: bool = _env_bool('ASN_CACHE', True)
+"""If ``True``, :func:`.asn_to_name` and friends cache AS names in-process using :func:`.get_asn_cache`"""
+
+ASN_CACHE_SIZE: int = _env_int('ASN_CACHE_SIZE', 100000)
+"""Maximum number of AS numbers held by the in-process ASN name cache"""
+
+ASN_CACHE_TTL: int = _env_int('ASN_CACHE_TTL', 86400)
+"""Seconds to cache AS names for (both in-process, and in the cache adapter if :attr:`.ASN_CACHE_ADAPTER` is enabled)"""
+
+ASN_CACHE_NEGATIVE_TTL: int = _env_int('ASN_CACHE_NEGATIVE_TTL', 3600)
+"""Seconds to cache unknown AS numbers for"""
+
+ASN_CACHE_ADAPTER: bool = _env_bool('ASN_CACHE_ADAPTER', False)
+"""
+If ``True``, AS names are also cached in the default cache adapter (:func:`privex.helpers.cache.adapter_get` /
+:func:`privex.helpers.cache.async_adapter_get`) - e.g. so that they're shared between processes when using Redis.
+"""
+
+ASN_TABLE_FILE: str = env('ASN_TABLE_FILE', '')
+"""
+A local AS number to name table, which is loaded by :func:`.load_asn_table` the first time an AS name is looked up.
+ASNs in the table are answered without any DNS queries.
+"""
+
 V4_TEST_HOSTS = [
     '185.130.44.10:80', '8.8.4.4:53', '1.1.1.1:53', '185.130.44.20:53', 'privex.io:80', 'files.privex.io:80',
     'google.com:80', 'www.microsoft.com:80', 'facebook.com:80', 'python.org:80'
@@ -299,3 +624,24 @@ If not set, it defaults to ``~/.privex_cache``, a hidden folder directly within
 This env var is used in conjunction with :attr:`.SQLITE_APP_DB_NAME` to produce a path to an SQLite3
 
 """
+
+SQLITE_CACHE_FAST = _env_bool('PRIVEX_SQLITE_CACHE_FAST', False)
+"""
+When ``True``, :class:`.SqliteCache` / :class:`.AsyncSqliteCache` (and their managers in :mod:`privex.helpers.cache.post_deps`)
+default to "fast mode", tuned for many processes (e.g. gunicorn workers) sharing one database file:
+
+  * the database is switched to WAL journalling with ``synchronous=NORMAL``, so readers don't block behind writers
+  * queries run directly on a long-lived connection, re-using sqlite3's prepared statement cache
+  * expired rows are purged in bounded batches by a background thread, instead of inline during get/set
+
+Can also be enabled per-adapter with ``SqliteCache(fast_mode=True)``. Env var: ``PRIVEX_SQLITE_CACHE_FAST``
+"""
+
+SQLITE_CACHE_MMAP_SIZE = _env_int('PRIVEX_SQLITE_CACHE_MMAP_SIZE', 64 * 1024 * 1024)
+"""Size in bytes of the ``PRAGMA mmap_size`` set on fast mode SQLite cache connections (default: 64MB). ``0`` disables mmap."""
+
+SQLITE_CACHE_PURGE_BATCH = _env_int('PRIVEX_SQLITE_CACHE_PURGE_BATCH', 1000)
+"""
+Maximum number of expired rows deleted per statement when fast mode SQLite caches purge expired keys. Each batch is
+committed separately, so the write lock is only held briefly and other processes can write between batches.
+"""
@@ -1,5 +1,6 @@
 import asyncio
 import inspect
+import threading
 import time
 from datetime import datetime
 from time import sleep
@@ -177,6 +178,38 @@ class TestAsyncX(PrivexBaseCase):
         async_coro = f_await(wrp_inst.example_async)
         self.assertEqual(helpers.loop_run(async_coro), 'hello world')
 
+    def test_awaitable_blacklisted(self):
+        """Test :func:`._awaitable_blacklisted` matches the calling function against each of the awaitable blacklists"""
+        from privex.helpers import asyncx
+
+        def blacklist_probe():
+            return asyncx._awaitable_blacklisted(skip=2)
+
+        self.assertFalse(blacklist_probe())
+        for bl, entry in [(asyncx.AWAITABLE_BLACKLIST_FUNCS, 'blacklist_probe'), (asyncx.AWAITABLE_BLACKLIST_MODS, 'tests.asyncx'),
+                          (asyncx.AWAITABLE_BLACKLIST, f'{__name__}.blacklist_probe')]:
+            bl.append(entry)
+            try:
+                self.assertTrue(blacklist_probe())
+                asyncx.AWAITABLE_CHECK_BLACKLIST = False
+                self.assertFalse(blacklist_probe())
+            finally:
+                asyncx.AWAITABLE_CHECK_BLACKLIST = True
+                bl.remove(entry)
+        self.assertFalse(blacklist_probe())
+
+    def test_frame_names_memo_bounded(self):
+        """The code object memo used by :func:`._awaitable_blacklisted` drops entries for code which no longer exists"""
+        import gc
+        from privex.helpers import asyncx
+        ns = {}
+        exec("import sys\ndef temp_probe():\n    return sys._getframe(0)", ns)
+        asyncx._frame_names(ns['temp_probe']())
+        count = len(asyncx._CODE_NAMES)
+        del ns
+        gc.collect()
+        self.assertEqual(len(asyncx._CODE_NAMES), count - 1)
+
     def test_async_aobject(self):
         """Test :class:`.aobject` sub-classes with async constructors can be constructed and used correctly"""
         class ExampleAsyncObject(helpers.aobject):
@@ -299,3 +332,34 @@ class TestAsyncXThread(PrivexBaseCase):
         # 2 seconds have passed - if they were ran synchronously, they would've taken 4 or more seconds.
         self.assertLessEqual((end - start).total_seconds(), 2)
         self.assertListEqual(res, [50, 200, 20, 800])
+
+    def test_run_coro_thread_reuses_loop(self):
+        """Test :func:`.run_coro_thread` runs sequential coroutines on the same long-lived loop thread, without creating new ones"""
+        async def thread_ident():
+            return threading.get_ident()
+        
+        first = helpers.run_coro_thread(thread_ident)
+        thread_count = len(helpers.get_loop_runner().threads)
+        for _ in range(10):
+            self.assertEqual(helpers.run_coro_thread(thread_ident), first)
+        self.assertEqual(len(helpers.get_loop_runner().threads), thread_count)
+        self.assertNotEqual(first, threading.get_ident())
+
+    def test_run_coro_thread_nested(self):
+        """Test :func:`.run_coro_thread` and :func:`.loop_run` work from within a running event loop, including a loop thread"""
+        async def add(a, b):
+            return a + b
+        
+        async def nested():
+            return helpers.run_coro_thread(add, 1, 2) + helpers.loop_run(add(3, 4))
+        
+        self.assertEqual(helpers.loop_run(nested()), 10)
+        self.assertEqual(helpers.run_coro_thread(nested), 10)
+
+    def test_run_coro_thread_async_timeout(self):
+        """Test :func:`.run_coro_thread_async` raises :class:`TimeoutError` when the coroutine takes too long"""
+        async def slow():
+            await asyncio.sleep(5)
+        
+        with self.assertRaises(TimeoutError):
+            helpers.loop_run(helpers.run_coro_thread_async(slow, _queue_timeout=0.2))
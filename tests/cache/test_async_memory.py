@@ -95,3 +95,48 @@ async def test_cache_remove(rcache: AsyncMemoryCache):
 
 
 
+
+
+@pytest.mark.asyncio
+async def test_cache_bounded_store():
+    c = AsyncMemoryCache(max_entries=2, eviction='lru')
+    await c.set('test_bounded_a', 1)
+    await c.set('test_bounded_b', 2)
+    await c.get('test_bounded_a')
+    await c.set('test_bounded_c', 3)
+    assert await c.get('test_bounded_b') is None
+    assert await c.get('test_bounded_a') == 1
+    s = c.stats()
+    assert s.evictions == 1
+    assert s.entries == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_get_set_many(rcache: AsyncMemoryCache):
+    k1, k2, k3 = 'test_many_1', 'test_many_2', 'test_many_3'
+    _cleanup(k1)
+    _cleanup(k2)
+    await rcache.set_many({k1: 'hello', k2: ['world', 123]}, timeout=30)
+    assert await rcache.get(k1) == 'hello'
+    assert await rcache.get_many([k1, k2, k3]) == {k1: 'hello', k2: ['world', 123]}
+    assert await rcache.get_many([]) == {}
+
+
+@pytest.mark.asyncio
+async def test_cache_remove_many(rcache: AsyncMemoryCache):
+    k1, k2, k3 = 'test_many_1', 'test_many_2', 'test_many_3'
+    await rcache.set_many({k1: 'hello', k2: 'world'}, timeout=30)
+    assert await rcache.remove_many([k1, k2, k3]) == 2
+    assert await rcache.get_many([k1, k2, k3]) == {}
+
+
+@pytest.mark.asyncio
+async def test_sync_with_while_loop_running():
+    """Sync ``with async_cached`` can't run the adapter in this thread's running loop, so it should raise a clear error"""
+    # Lives here rather than test_async_wrapper, as that module can't be imported without the Redis plugin installed
+    from privex.helpers.cache import async_cached
+    with pytest.raises(RuntimeError, match='async with async_cached'):
+        with async_cached:
+            pass
+    with pytest.raises(RuntimeError):
+        async_cached['test_sync_setitem'] = 'x'
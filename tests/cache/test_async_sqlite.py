@@ -88,8 +88,20 @@ async def test_cache_remove(rcache: AsyncSqliteCache):
     assert await rcache.get(k) is None
 
 
+@pytest.mark.asyncio
+async def test_cache_get_set_many(rcache: AsyncSqliteCache):
+    k1, k2, k3 = 'test_many_1', 'test_many_2', 'test_many_3'
+    _cleanup(k1)
+    _cleanup(k2)
+    await rcache.set_many({k1: 'hello', k2: ['world', 123]}, timeout=30)
+    assert await rcache.get(k1) == 'hello'
+    assert await rcache.get_many([k1, k2, k3]) == {k1: 'hello', k2: ['world', 123]}
+    assert await rcache.get_many([]) == {}
 
 
-
-
-
+@pytest.mark.asyncio
+async def test_cache_remove_many(rcache: AsyncSqliteCache):
+    k1, k2, k3 = 'test_many_1', 'test_many_2', 'test_many_3'
+    await rcache.set_many({k1: 'hello', k2: 'world'}, timeout=30)
+    assert await rcache.remove_many([k1, k2, k3]) == 2
+    assert await rcache.get_many([k1, k2, k3]) == {}
@@ -0,0 +1,199 @@
+"""
+Tests for the structured cache key builder :mod:`privex.helpers.cache.keys`, and it's use by the caching decorators
+"""
+from datetime import datetime
+from decimal import Decimal
+from enum import IntEnum
+
+import pytest
+
+from privex.helpers.cache import MemoryCache, adapter_set, adapter_get, cached
+from privex.helpers.cache.extras import CacheManagerMixin, z_cache
+from privex.helpers.cache.keys import KeyBuilder, encode_key_value, hash_key_component, register_key_encoder
+from privex.helpers.decorators import r_cache
+
+
+@pytest.fixture
+def memcache():
+    orig = adapter_get()
+    c = adapter_set(MemoryCache())
+    yield c
+    adapter_set(orig)
+
+
+def example(user_id, fields=('id', 'name'), active=True):
+    return user_id
+
+
+def test_encode_simple():
+    assert encode_key_value('hello') == "'hello'"
+    assert encode_key_value(12) == '12'
+    assert encode_key_value(None) == 'None'
+    assert encode_key_value(Decimal('1.50')) == "Decimal('1.50')"
+    assert encode_key_value(datetime(2020, 1, 2, 3, 4, 5)) == 'datetime(2020-01-02T03:04:05)'
+    assert encode_key_value([1, 'a', (2, 3)]) == "[1,'a',(2,3)]"
+
+
+def test_encode_order_independent():
+    assert encode_key_value({'b': 2, 'a': 1}) == encode_key_value({'a': 1, 'b': 2}) == "{'a'=1,'b'=2}"
+    assert encode_key_value({3, 1, 2}) == '{1,2,3}'
+
+
+class _Level(IntEnum):
+    LOW = 1
+
+
+@pytest.mark.parametrize('a, b', [
+    (['a,b'], ['a', 'b']),
+    ('1', 1),
+    (None, 'None'),
+    ({'a': '1,b=2'}, {'a': 1, 'b': 2}),
+    (True, 'True'),
+    (1.5, Decimal('1.5')),
+    (set(), {}),
+    ("a'b", 'a"b'),
+    ('a\\', 'a\\\\'),
+    (b'ab', 'ab'),
+    (_Level.LOW, 1),
+])
+def test_encode_no_collisions(a, b):
+    """Values which differ in type, or only in where their separators are, must never produce the same key component"""
+    assert encode_key_value(a) != encode_key_value(b)
+
+
+def test_gen_cache_key_no_collisions(memcache):
+    assert StructuredExample.gen_cache_key('a,b', _auto_cache=False) != StructuredExample.gen_cache_key('a', 'b', _auto_cache=False)
+    assert StructuredExample.gen_cache_key('1', _auto_cache=False) != StructuredExample.gen_cache_key(1, _auto_cache=False)
+    assert StructuredExample.gen_cache_key(x='1:y=2', _auto_cache=False) != \
+        StructuredExample.gen_cache_key(x='1', y=2, _auto_cache=False)
+
+
+class Plain:
+    def __init__(self, x):
+        self.x = x
+
+
+def test_encode_default_repr_objects():
+    # Objects using object.__repr__ (which contains a memory address) are encoded from their attributes
+    assert encode_key_value(Plain(1)) == encode_key_value(Plain(1))
+    assert encode_key_value(Plain(1)) != encode_key_value(Plain(2))
+
+
+def test_encode_hashes_long_values():
+    v = encode_key_value(list(range(1000)))
+    assert v.startswith('#')
+    assert len(v) == 33
+    assert v == encode_key_value(list(range(1000)))
+    assert encode_key_value('x' * 20, hash_threshold=10) == hash_key_component(repr('x' * 20))
+
+
+def test_register_key_encoder():
+    class Model:
+        def __init__(self, pk):
+            self.pk = pk
+
+    register_key_encoder(Model, lambda m: f'Model:{m.pk}')
+    assert encode_key_value(Model(5)) == 'Model:5'
+    assert encode_key_value([Model(5)]) == '[Model:5]'
+
+
+def test_builder_binds_signature():
+    kb = KeyBuilder(example, prefix='users')
+    assert kb(5) == "users:user_id=5:fields=('id','name'):active=True"
+    assert kb(5) == kb(user_id=5) == kb(5, ('id', 'name')) == kb(5, active=True)
+    assert kb(5) != kb(6)
+
+
+def test_builder_skips_self():
+    class Example:
+        def method(self, x, y=2):
+            return x + y
+
+    kb = KeyBuilder(Example.method, prefix='ex')
+    assert kb(Example(), 1) == kb(Example(), x=1) == 'ex:x=1:y=2'
+
+
+def test_builder_var_args():
+    def fn(a, *args, **kwargs):
+        return a
+
+    kb = KeyBuilder(fn, prefix='fn')
+    assert kb(1, 2, z=3, b=4) == 'fn:a=1:args[0]=2:b=4:z=3'
+    with pytest.raises(TypeError):
+        kb()
+
+
+def test_builder_max_length():
+    kb = KeyBuilder(example, prefix='users', max_length=20)
+    k = kb(5)
+    assert k.startswith('users:#')
+    assert k == kb(user_id=5)
+
+
+def test_r_cache_key_builder(memcache):
+    calls = []
+
+    @r_cache('test_kb', key_builder=True)
+    def wrapped(x, y=2):
+        calls.append(1)
+        return x + y
+
+    assert wrapped(1) == 3
+    assert wrapped(x=1, y=2) == 3
+    assert len(calls) == 1
+    assert cached.get('test_kb:x=1:y=2') == 3
+
+
+class StructuredExample(CacheManagerMixin):
+    cache_prefix = 'test_structured'
+    structured_cache_keys = True
+
+    @classmethod
+    @z_cache()
+    def hello(cls, name, greeting='Hello'):
+        return f'{greeting} {name}'
+
+
+def test_z_cache_structured_keys(memcache):
+    assert StructuredExample.hello('world') == 'Hello world'
+    assert StructuredExample.get_all_cache_keys() == {"test_structured:hello:name='world':greeting='Hello'"}
+    assert StructuredExample.hello(name='world', greeting='Hello') == 'Hello world'
+    assert len(StructuredExample.get_all_cache_keys()) == 1
+
+
+class SelfRef(CacheManagerMixin):
+    cache_prefix = 'test_selfref'
+
+    def __init__(self):
+        self.me = self
+
+    @z_cache()
+    def hello(self, name):
+        return f'Hello {name}'
+
+
+class StructuredSelfRef(SelfRef):
+    cache_prefix = 'test_structured_selfref'
+    structured_cache_keys = True
+
+
+@pytest.mark.parametrize('cls', [SelfRef, StructuredSelfRef])
+def test_z_cache_self_referencing_instance(memcache, cls):
+    """``self`` is left out of generated keys - and encoding an object which contains itself mustn't recurse forever"""
+    assert cls().hello('world') == 'Hello world'
+    assert cls().hello('world') == 'Hello world'
+    assert len(cls.get_all_cache_keys()) == 1
+    assert cls.gen_cache_key(cls(), _auto_cache=False)
+
+
+def test_encode_self_referencing():
+    obj = SelfRef()
+    assert encode_key_value(obj) == encode_key_value(SelfRef()) == "SelfRef{'me'=<SelfRef...>}"
+    items = [1]
+    items.append(items)
+    assert encode_key_value(items) == '[1,<list...>]'
+
+
+def test_gen_cache_key_str_by_default(memcache):
+    # Without structured keys, gen_cache_key keeps converting values with str(), so existing keys don't change
+    assert SelfRef.gen_cache_key('a', 1, x='y', _auto_cache=False) == 'test_selfref:a,1:x=y'
@@ -0,0 +1,150 @@
+"""
+Tests for :class:`privex.helpers.cache.memstore.MemoryStore` - the bounded / expiry-indexed backend used by
+:class:`.MemoryCache` and :class:`.AsyncMemoryCache`
+"""
+import time
+
+import pytest
+
+from privex.helpers.cache import MemoryCache
+from privex.helpers.cache.memstore import MemoryStore, NEVER
+
+
+def test_unbounded_store():
+    st = MemoryStore()
+    for i in range(100):
+        st.set(f'k{i}', i, timeout=60)
+    assert len(st) == 100
+    assert st.get_entry('k50').value == 50
+    assert st.get_entry('nonexistent') is None
+    s = st.stats()
+    assert (s.hits, s.misses, s.evictions) == (1, 1, 0)
+
+
+def test_lru_eviction():
+    st = MemoryStore(max_entries=3, eviction='lru')
+    st.set('a', 1, 60)
+    st.set('b', 2, 60)
+    st.set('c', 3, 60)
+    st.get_entry('a')                     # 'b' is now the least recently used
+    st.set('d', 4, 60)
+    assert st.get_entry('b') is None
+    assert [st.get_entry(k).value for k in ('a', 'c', 'd')] == [1, 3, 4]
+    assert st.stats().evictions == 1
+
+
+def test_lfu_eviction():
+    st = MemoryStore(max_entries=3, eviction='lfu')
+    st.set('a', 1, 60)
+    st.set('b', 2, 60)
+    st.set('c', 3, 60)
+    for _ in range(3):
+        st.get_entry('a')
+        st.get_entry('c')
+    st.get_entry('b')
+    st.set('d', 4, 60)                    # 'd' evicts 'b' (least used)
+    st.set('e', 5, 60)                    # 'e' evicts 'd' (freq 1, tie broken by recency)
+    assert st.get_entry('b') is None
+    assert st.get_entry('d') is None
+    assert st.get_entry('a').value == 1
+    assert st.get_entry('e').value == 5
+    assert st.stats().evictions == 2
+
+
+def test_tinylfu_admission():
+    st = MemoryStore(max_entries=2, eviction='tinylfu')
+    st.set('hot1', 1, 60)
+    st.set('hot2', 2, 60)
+    for _ in range(5):
+        st.get_entry('hot1')
+        st.get_entry('hot2')
+    # A one-off key is less popular than the LRU victim, so it shouldn't be admitted
+    assert st.set('oneoff', 3, 60) is None
+    assert st.get_entry('hot1') is not None and st.get_entry('hot2') is not None
+    assert st.stats().rejections == 1
+    # Once a key has been requested often enough, it's admitted, replacing the least recently used key
+    for _ in range(10):
+        st.get_entry('popular')
+    assert st.set('popular', 4, 60) is not None
+    assert st.get_entry('popular').value == 4
+    assert len(st) == 2
+
+
+def test_max_bytes():
+    st = MemoryStore(max_bytes=1000, sizeof=lambda k, v: len(v))
+    st.set('a', 'x' * 400, 60)
+    st.set('b', 'x' * 400, 60)
+    st.set('c', 'x' * 400, 60)
+    assert st.get_entry('a') is None
+    assert st.stats().bytes == 800
+    # Entries larger than the whole budget are rejected outright
+    assert st.set('huge', 'x' * 2000, 60) is None
+    assert st.stats().bytes == 800
+
+
+def test_expiry_index_reclaims_keys():
+    st = MemoryStore()
+    st.set('short1', 1, timeout=1)
+    st.set('short2', 2, timeout=1)
+    st.set('long', 3, timeout=60)
+    time.sleep(1.5)
+    # Setting any key reclaims expired keys, without them having to be requested
+    st.set('other', 4, timeout=60)
+    assert len(st) == 2
+    assert st.stats().expirations == 2
+    assert st.purge_expired() == 0
+
+
+def test_expiry_index_touch():
+    st = MemoryStore()
+    st.set('k', 1, timeout=1)
+    st.touch('k', 60)
+    time.sleep(1.5)
+    assert st.purge_expired() == 0
+    assert st.get_entry('k').value == 1
+
+
+def test_lfu_shrink_skips_overwritten_key():
+    st = MemoryStore(max_bytes=1000, eviction='lfu', sizeof=lambda k, v: len(v))
+    st.set('a', 'x' * 300, 60)
+    st.set('b', 'x' * 300, 60)
+    for _ in range(5):
+        st.get_entry('b')
+    # 'a' is the least frequently used key, but it's the one being overwritten - 'b' must be evicted instead
+    st.set('a', 'x' * 800, 60)
+    assert st.get_entry('a') is not None and st.get_entry('b') is None
+    assert st.stats().bytes <= 1000
+
+
+def test_invalid_policy():
+    with pytest.raises(ValueError):
+        MemoryStore(max_entries=10, eviction='random')
+
+
+def test_memorycache_private_store():
+    c = MemoryCache(max_entries=2)
+    assert c.store is not MemoryCache.shared_store()
+    assert MemoryCache().store is MemoryCache.shared_store()
+    c.set('test_memstore_a', 1)
+    c.set('test_memstore_b', 2)
+    c.set('test_memstore_c', 3)
+    assert c.get('test_memstore_a') is None
+    assert c.get('test_memstore_c') == 3
+    s = c.stats()
+    assert (s.hits, s.misses, s.evictions, s.entries) == (1, 1, 1, 2)
+
+
+def test_never_expires():
+    st = MemoryStore()
+    e = st.set('forever', 'value', timeout=None)
+    assert e.deadline == NEVER
+    assert not e.expired
+    assert st.purge_expired() == 0
+    st.touch('forever', 1)
+    assert st.get_entry('forever').deadline != NEVER
+
+
+def test_memorycache_no_timeout():
+    c = MemoryCache(max_entries=10)
+    c.set('test_memstore_never', 'hello', timeout=None)
+    assert c.get('test_memstore_never') == 'hello'
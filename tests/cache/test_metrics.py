@@ -0,0 +1,131 @@
+"""
+Tests for cache adapter instrumentation - :mod:`privex.helpers.cache.metrics`
+"""
+import pytest
+
+from privex.helpers import settings
+from privex.helpers.cache import MemoryCache, AsyncMemoryCache
+from privex.helpers.cache.extras import CacheManagerMixin
+from privex.helpers.cache.metrics import (
+    LatencyHistogram, add_metrics_hook, get_metrics, instrument, key_prefix, metrics_snapshot, remove_metrics_hook,
+    statsd_hook, uninstrument
+)
+
+
+class BrokenCache(MemoryCache):
+    def set(self, *args, **kwargs):
+        raise ConnectionError('server went away')
+
+
+def test_counters_and_prefixes():
+    c = MemoryCache(max_entries=1000)
+    m = instrument(c)
+    c.set('myapp:hello', 'world')
+    assert c.get('myapp:hello') == 'world'
+    assert c.get('myapp:missing', 'default') == 'default'
+    assert c.get('other', None) is None
+    snap = m.snapshot()
+    assert (snap['hits'], snap['misses'], snap['sets'], snap['errors']) == (1, 2, 1, 0)
+    assert snap['latency']['get']['count'] == 3
+    assert snap['prefixes']['myapp']['latency']['get']['count'] == 2
+    assert snap['prefixes']['myapp']['hits'] == 1
+    assert snap['prefixes']['__none__']['misses'] == 1
+
+
+def test_bulk_not_double_counted():
+    c = MemoryCache(max_entries=1000)
+    m = instrument(c)
+    c.set_many({'bulk:a': 1, 'bulk:b': 2})
+    assert c.get_many(['bulk:a', 'bulk:b', 'bulk:c']) == {'bulk:a': 1, 'bulk:b': 2}
+    snap = m.snapshot()
+    assert (snap['hits'], snap['misses'], snap['sets']) == (2, 1, 2)
+    assert 'get' not in snap['latency']
+
+
+def test_fail_and_errors():
+    c = BrokenCache(max_entries=1000)
+    m = instrument(c)
+    with pytest.raises(KeyError):
+        c['missing']
+    with pytest.raises(ConnectionError):
+        c.set('hello', 'world')
+    snap = m.snapshot()
+    assert (snap['misses'], snap['errors']) == (1, 1)
+
+
+def test_evictions():
+    c = MemoryCache(max_entries=2)
+    m = instrument(c)
+    for i in range(5):
+        c.set(f'ev:{i}', i)
+    assert m.snapshot()['evictions'] == 3
+
+
+def test_setting_instruments_new_adapters(monkeypatch):
+    monkeypatch.setattr(settings, 'CACHE_METRICS', True)
+    c = MemoryCache(max_entries=10)
+    assert get_metrics(c) is not None
+    assert instrument(c) is get_metrics(c)
+    assert get_metrics(c).name in metrics_snapshot()
+    assert uninstrument(c) is True
+    assert get_metrics(c) is None and 'get' not in c.__dict__
+    monkeypatch.setattr(settings, 'CACHE_METRICS', False)
+    assert get_metrics(MemoryCache(max_entries=10)) is None
+
+
+def test_cache_manager_prefix():
+    class MyManager(CacheManagerMixin):
+        cache_prefix = 'test_metrics_mgr'
+
+    assert key_prefix('test_metrics_mgr:g2:some:key') == 'test_metrics_mgr'
+    assert key_prefix('plain:key') == 'plain'
+
+
+def test_statsd_hook(monkeypatch):
+    monkeypatch.setattr(settings, 'CACHE_METRICS', False)
+
+    class FakeStatsd:
+        def __init__(self):
+            self.timings, self.counts = [], {}
+
+        def timing(self, name, ms):
+            self.timings.append(name)
+
+        def incr(self, name, count=1):
+            self.counts[name] = self.counts.get(name, 0) + count
+
+    client = FakeStatsd()
+    hook = statsd_hook(client, prefix='pvx')
+    add_metrics_hook(hook)
+    try:
+        c = MemoryCache(max_entries=10)
+        instrument(c, name='hooked')
+        c.set('a', 1)
+        c.get('a')
+        c.get('b')
+    finally:
+        remove_metrics_hook(hook)
+    assert client.timings == ['pvx.hooked.set', 'pvx.hooked.get', 'pvx.hooked.get']
+    assert client.counts == {'pvx.hooked.sets': 1, 'pvx.hooked.hits': 1, 'pvx.hooked.misses': 1}
+
+
+def test_histogram():
+    h = LatencyHistogram(buckets=(0.001, 0.01, 0.1))
+    for v in [0.0005] * 90 + [0.05] * 10:
+        h.observe(v)
+    snap = h.snapshot()
+    assert snap['count'] == 100
+    assert snap['buckets'] == {'0.001': 90, '0.01': 90, '0.1': 100, '+Inf': 100}
+    assert h.quantile(0.5) == 0.001
+    assert h.quantile(0.99) == 0.05
+
+
+async def test_async_adapter():
+    c = AsyncMemoryCache(max_entries=100)
+    m = instrument(c)
+    await c.set('async:hello', 'world')
+    assert await c.get('async:hello') == 'world'
+    assert await c.get('async:missing') is None
+    assert await c.get_or_set('async:gos', 'value') == 'value'
+    snap = m.snapshot()
+    assert (snap['hits'], snap['misses'], snap['sets']) == (1, 2, 2)
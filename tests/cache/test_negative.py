@@ -0,0 +1,230 @@
+"""
+Tests for caching falsey / ``None`` results and exceptions with :func:`.r_cache` - :mod:`privex.helpers.cache.negative`
+"""
+import time
+
+import pytest
+
+from privex.helpers.cache import MemoryCache, AsyncMemoryCache, adapter_get, adapter_set
+from privex.helpers.cache.negative import RESULT_TAG, decode_result, encode_exception, encode_result
+from privex.helpers.cache.serializers import CacheSerializer
+from privex.helpers.types import NO_RESULT
+from privex.helpers.decorators import r_cache, r_cache_async
+
+
+@pytest.mark.parametrize('result', [None, 0, '', [], False, {}])
+def test_r_cache_falsey_results(result):
+    calls = []
+    MemoryCache().remove('test_neg_falsey')
+
+    @r_cache('test_neg_falsey', cache_time=30)
+    def wrapped():
+        calls.append(1)
+        return result
+
+    assert wrapped() == result
+    assert wrapped() == result
+    assert type(wrapped()) is type(result)
+    assert len(calls) == 1
+    MemoryCache().remove('test_neg_falsey')
+
+
+def test_r_cache_negative_ttl():
+    calls = []
+    MemoryCache().remove('test_neg_ttl')
+
+    @r_cache('test_neg_ttl', cache_time=30, negative_ttl=1)
+    def wrapped():
+        calls.append(1)
+        return None
+
+    assert wrapped() is None
+    assert wrapped() is None
+    assert len(calls) == 1
+    time.sleep(1.1)
+    assert wrapped() is None
+    assert len(calls) == 2
+    MemoryCache().remove('test_neg_ttl')
+
+
+def test_r_cache_negative_ttl_disabled():
+    calls = []
+    MemoryCache().remove('test_neg_ttl_zero')
+
+    @r_cache('test_neg_ttl_zero', cache_time=30, negative_ttl=0)
+    def wrapped():
+        calls.append(1)
+        return None
+
+    wrapped(), wrapped()
+    assert len(calls) == 2
+
+
+def test_r_cache_exceptions():
+    calls = []
+    MemoryCache().remove('test_neg_exc')
+
+    @r_cache('test_neg_exc', cache_time=30, negative_ttl=10, cache_exceptions=KeyError)
+    def wrapped():
+        calls.append(1)
+        raise KeyError('not found')
+
+    for _ in range(3):
+        with pytest.raises(KeyError):
+            wrapped()
+    assert len(calls) == 1
+    MemoryCache().remove('test_neg_exc')
+
+
+def test_r_cache_uncached_exceptions():
+    calls = []
+    MemoryCache().remove('test_neg_exc_other')
+
+    @r_cache('test_neg_exc_other', cache_time=30, cache_exceptions=KeyError)
+    def wrapped():
+        calls.append(1)
+        raise ValueError('oops')
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            wrapped()
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize('result', [
+    '__pvx_cached_none__', '__pvx_cached_exc__:gASV', [RESULT_TAG, 'none'], (RESULT_TAG, 'value', 1), ['__pvx_x', 1], None
+])
+def test_encode_result_no_collisions(result):
+    """Real results which look like our markers must come back unchanged, rather than as ``None`` / an exception"""
+    assert decode_result(encode_result(result)) == result
+
+
+@pytest.mark.parametrize('serializer', ['pickle', 'json', 'marshal'])
+def test_encoded_results_serializable(serializer):
+    """None results and exceptions are plain lists, so they survive serializers which can't store Python objects"""
+    s = CacheSerializer(serializer)
+    assert decode_result(s.loads(s.dumps(encode_result(None)))) is None
+    with pytest.raises(KeyError):
+        decode_result(s.loads(s.dumps(encode_exception(KeyError('x')))))
+
+
+class _CustomError(Exception):
+    pass
+
+
+class _CustomSubError(_CustomError):
+    pass
+
+
+def test_exception_allow_list():
+    # Custom exceptions are only encoded / re-created if they're a subclass of an allowed type
+    assert encode_exception(_CustomError('x')) is None
+    enc = encode_exception(_CustomSubError('y', 2), (_CustomError,))
+    with pytest.raises(_CustomSubError) as exc_info:
+        decode_result(enc, (_CustomError,))
+    assert exc_info.value.args == ('y', 2)
+    # Not in the allow-list when decoding - treated as a cache miss instead of being re-created
+    assert decode_result(enc) is NO_RESULT
+    # Anything which isn't an exception class is never instantiated
+    assert decode_result([RESULT_TAG, 'exc', 'os:system', ['echo']]) is NO_RESULT
+
+
+def test_exception_not_pickled():
+    enc = encode_exception(ValueError('oops', object()))
+    # Arguments which aren't plain values are replaced with str(exc), so the encoded exception never needs pickle
+    assert enc[:3] == [RESULT_TAG, 'exc', 'builtins:ValueError']
+    assert len(enc[3]) == 1 and isinstance(enc[3][0], str)
+    with pytest.raises(ValueError):
+        decode_result(enc)
+
+
+class _NoPickleCache(MemoryCache):
+    """
+    Behaves like :class:`.RedisCache` with ``use_pickle=False`` - only plain values can be stored, and strings are
+    returned as :class:`bytes`
+    """
+    use_pickle = False
+
+    def set(self, key, value, timeout=None):
+        if not isinstance(value, (str, bytes, int, float)):
+            raise TypeError(f'Invalid input of type {type(value).__name__}')
+        return super().set(key, value.encode() if isinstance(value, str) else value, timeout)
+
+
+@pytest.mark.parametrize('result', [None, f'{RESULT_TAG}:none', f'{RESULT_TAG}:value:x', b'%s:none' % RESULT_TAG.encode(), 'x'])
+def test_encode_result_no_collisions_str(result):
+    enc = encode_result(result, objects=False)
+    assert isinstance(enc, (str, bytes))
+    assert decode_result(enc) == result
+    # Adapters such as Redis return stored strings as bytes
+    if isinstance(enc, str) and result is not None:
+        assert decode_result(enc.encode()) == result.encode()
+
+
+def test_encode_exception_str():
+    enc = encode_exception(KeyError('not found', 2), objects=False)
+    assert isinstance(enc, str)
+    for v in (enc, enc.encode()):
+        with pytest.raises(KeyError) as exc_info:
+            decode_result(v)
+        assert exc_info.value.args == ('not found', 2)
+
+
+def test_r_cache_no_pickle_adapter():
+    """None results and exceptions are still cached on adapters which can't store lists"""
+    orig = adapter_get()
+    adapter_set(_NoPickleCache())
+    try:
+        calls = []
+
+        @r_cache('test_neg_nopickle_none', cache_time=30)
+        def none_fn():
+            calls.append(1)
+            return None
+
+        @r_cache('test_neg_nopickle_exc', cache_time=30, cache_exceptions=KeyError)
+        def exc_fn():
+            calls.append(2)
+            raise KeyError('not found')
+
+        assert none_fn() is None
+        assert none_fn() is None
+        for _ in range(2):
+            with pytest.raises(KeyError):
+                exc_fn()
+        assert calls == [1, 2]
+    finally:
+        adapter_set(orig)
+
+
+@pytest.mark.asyncio
+async def test_r_cache_async_falsey_results():
+    calls = []
+    await AsyncMemoryCache().remove('test_neg_async')
+
+    @r_cache_async('test_neg_async', cache_time=30)
+    async def wrapped():
+        calls.append(1)
+        return None
+
+    assert await wrapped() is None
+    assert await wrapped() is None
+    assert len(calls) == 1
+    await AsyncMemoryCache().remove('test_neg_async')
+
+
+@pytest.mark.asyncio
+async def test_r_cache_async_exceptions():
+    calls = []
+    await AsyncMemoryCache().remove('test_neg_async_exc')
+
+    @r_cache_async('test_neg_async_exc', cache_time=30, cache_exceptions=True)
+    async def wrapped():
+        calls.append(1)
+        raise LookupError('nope')
+
+    for _ in range(2):
+        with pytest.raises(LookupError):
+            await wrapped()
+    assert len(calls) == 1
+    await AsyncMemoryCache().remove('test_neg_async_exc')
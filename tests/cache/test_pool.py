@@ -0,0 +1,269 @@
+"""
+Tests for the bounded connection pools (:class:`.ConnectionPool` / :class:`.AsyncConnectionPool`) used by the Redis / Memcached
+cache adapters, and for thread store garbage collection in :mod:`privex.helpers.plugin`
+"""
+import asyncio
+import gc
+import threading
+import time
+
+import pytest
+
+from privex.helpers import plugin
+from privex.helpers.cache.asyncx.base import AsyncCacheAdapter
+from privex.helpers.cache.CacheAdapter import CacheAdapter
+from privex.helpers.cache.pooling import AsyncPooledClientMixin, PooledClientMixin
+from privex.helpers.exceptions import ConnectionPoolClosed, ConnectionPoolExhausted
+from privex.helpers.plugin import AsyncConnectionPool, ConnectionPool, get_pool, close_pool
+
+
+class FakeClient:
+    def __init__(self):
+        self.closed = False
+        self.healthy = True
+
+    def ping(self):
+        if not self.healthy: raise ConnectionError('server went away')
+        return True
+
+    def close(self):
+        self.closed = True
+
+
+def _pool(cls=ConnectionPool, **kwargs) -> ConnectionPool:
+    return cls(FakeClient, health_check=lambda c: c.ping(), closer=lambda c: c.close(), **kwargs)
+
+
+def test_pool_reuses_clients():
+    pool = _pool(max_size=2)
+    c = pool.acquire()
+    pool.release(c)
+    assert pool.acquire() is c
+    assert (pool.size, pool.in_use, pool.idle) == (1, 1, 0)
+
+
+def test_pool_bounded():
+    pool = _pool(max_size=2, timeout=0.1)
+    a, b = pool.acquire(), pool.acquire()
+    assert a is not b
+    with pytest.raises(ConnectionPoolExhausted):
+        pool.acquire()
+    # A client released by another thread unblocks the waiting borrower
+    threading.Timer(0.05, pool.release, args=(a,)).start()
+    assert pool.acquire(timeout=2) is a
+
+
+def test_pool_idle_timeout():
+    pool = _pool(idle_timeout=0.05)
+    c = pool.acquire()
+    pool.release(c)
+    time.sleep(0.1)
+    assert pool.acquire() is not c
+    assert c.closed is True
+    assert pool.size == 1
+
+
+def test_pool_health_check():
+    pool = _pool(health_check_interval=0.01)
+    c = pool.acquire()
+    pool.release(c)
+    c.healthy = False
+    time.sleep(0.02)
+    c2 = pool.acquire()
+    assert c2 is not c and c.closed is True
+    assert pool.size == 1
+
+
+def test_pool_close():
+    pool = _pool()
+    a, b = pool.acquire(), pool.acquire()
+    pool.release(a)
+    pool.close()
+    assert a.closed is True and b.closed is False
+    # Clients borrowed before the pool was closed are closed once they're returned
+    pool.release(b)
+    assert b.closed is True and pool.size == 0
+    # A closed pool refuses to hand out (or create) any more clients
+    with pytest.raises(ConnectionPoolClosed):
+        pool.acquire()
+    assert pool.size == 0
+
+
+def test_pool_close_wakes_waiters():
+    pool = _pool(max_size=1, timeout=5)
+    pool.acquire()
+    threading.Timer(0.05, pool.close).start()
+    start = time.monotonic()
+    with pytest.raises(ConnectionPoolClosed):
+        pool.acquire()
+    assert time.monotonic() - start < 2
+
+
+def test_shared_pool_registry():
+    pool = get_pool('test_pool_reg', FakeClient)
+    assert get_pool('test_pool_reg', FakeClient) is pool
+    with pool.connection() as c:
+        assert pool.in_use == 1
+    assert close_pool('test_pool_reg') is True
+    assert c.closed is False and pool.closed is True
+    assert get_pool('test_pool_reg', FakeClient) is not pool
+    assert close_pool('test_pool_reg') is True
+
+
+async def test_async_pool():
+    async def factory():
+        return FakeClient()
+
+    pool = AsyncConnectionPool(factory, max_size=1, timeout=0.1, closer=lambda c: c.close())
+    async with pool.connection() as c:
+        with pytest.raises(ConnectionPoolExhausted):
+            await pool.acquire()
+    assert await pool.acquire() is c
+
+    async def _release():
+        await asyncio.sleep(0.05)
+        await pool.release(c)
+
+    asyncio.ensure_future(_release())
+    assert await pool.acquire(timeout=2) is c
+    await pool.release(c)
+    await pool.close()
+    assert c.closed is True
+    with pytest.raises(ConnectionPoolClosed):
+        await pool.acquire()
+
+
+def test_threadstore_removed_when_thread_exits():
+    ids = []
+
+    def _worker():
+        plugin._set_threadstore('test_pool_item', FakeClient())
+        ids.append(threading.get_ident())
+
+    t = threading.Thread(target=_worker)
+    t.start()
+    t.join()
+    gc.collect()
+    assert ids[0] not in dict(plugin._get_all_threadstore())
+
+
+def test_prune_threadstore():
+    t = threading.Thread(target=lambda: None)
+    t.start()
+    t.join()
+    # Thread stores created for another thread ID aren't watched, so they're only removed by pruning
+    plugin._set_threadstore('test_pool_item', FakeClient(), thread_id=t.ident)
+    assert plugin.prune_threadstore() >= 1
+    assert t.ident not in dict(plugin._get_all_threadstore())
+
+
+class PooledFakeCache(PooledClientMixin, CacheAdapter):
+    """Minimal pooled adapter - ``get`` returns the client used for the operation"""
+    def __init__(self, pool: ConnectionPool):
+        super().__init__()
+        self.pool = pool
+        self._init_pool(True)
+
+    def _get_pool(self):
+        return self.pool
+
+    def get(self, key, default=None, fail=False):
+        with self._client() as c:
+            return c
+
+    def set(self, key, value, timeout=None): pass
+
+    def remove(self, *key): pass
+
+    def update_timeout(self, key, timeout=None): pass
+
+    def connect(self, *args, **kwargs):
+        return self._pooled_connect()
+
+    def close(self):
+        return self._give_back(release_all=True)
+
+
+class AsyncPooledFakeCache(AsyncPooledClientMixin, AsyncCacheAdapter):
+    def __init__(self, pool: AsyncConnectionPool):
+        super().__init__()
+        self.pool = pool
+        self._init_pool(True)
+
+    def _get_pool(self):
+        return self.pool
+
+    async def get(self, key, default=None, fail=False):
+        async with self._client() as c:
+            await asyncio.sleep(0)
+            return c
+
+    async def set(self, key, value, timeout=None): pass
+
+    async def remove(self, *key): pass
+
+    async def update_timeout(self, key, timeout=None): pass
+
+    async def connect(self, *args, **kwargs):
+        return await self._pooled_connect()
+
+    async def close(self):
+        return await self._give_back(release_all=True)
+
+
+def test_pooled_adapter_borrows_per_operation():
+    pool = _pool(max_size=1, timeout=0.1)
+    # More adapters than the pool has clients - each operation returns it's client, so they never exhaust the pool
+    adapters = [PooledFakeCache(pool) for _ in range(5)]
+    clients = {id(a.get('x')) for a in adapters for _ in range(2)}
+    assert len(clients) == 1
+    assert (pool.size, pool.in_use) == (1, 0)
+
+
+def test_pooled_adapter_with_block():
+    pool = _pool(max_size=2, timeout=0.1)
+    a = PooledFakeCache(pool)
+    with a:
+        c = a.get('x')
+        assert a.get('y') is c and a.connect() is c
+        assert pool.in_use == 1
+    assert pool.in_use == 0
+    # connect() outside of a with block holds the client until close()
+    assert a.connect() is c and pool.in_use == 1
+    assert a.get('x') is c
+    a.close()
+    assert pool.in_use == 0
+
+
+def test_pooled_adapter_per_thread():
+    pool = _pool(max_size=2, timeout=1)
+    a, res = PooledFakeCache(pool), []
+
+    def _worker():
+        res.append(a.get('x'))
+
+    with a:
+        c = a.get('x')
+        t = threading.Thread(target=_worker)
+        t.start()
+        t.join()
+    # The other thread borrowed it's own client while ours was held by the with block
+    assert res[0] is not c and pool.size == 2
+    assert pool.in_use == 0
+
+
+async def test_async_pooled_adapter():
+    async def factory():
+        return FakeClient()
+
+    pool = AsyncConnectionPool(factory, max_size=1, timeout=0.1, closer=lambda c: c.close())
+    adapters = [AsyncPooledFakeCache(pool) for _ in range(5)]
+    # Concurrent operations on one adapter share it's client, and separate adapters take turns with the single client
+    res = await asyncio.gather(*[a.get('x') for a in adapters for _ in range(2)])
+    assert len({id(c) for c in res}) == 1
+    assert pool.in_use == 0
+    a = adapters[0]
+    async with a:
+        c = await a.get('x')
+        assert await a.connect() is c and pool.in_use == 1
+    assert pool.in_use == 0
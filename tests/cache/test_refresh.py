@@ -0,0 +1,147 @@
+"""
+Tests for stale-while-revalidate / XFetch early refresh - :mod:`privex.helpers.cache.refresh`
+"""
+import asyncio
+import pickle
+import time
+
+import pytest
+
+from privex.helpers.cache import MemoryCache, AsyncMemoryCache, refresh
+from privex.helpers.cache.refresh import CacheEnvelope
+from privex.helpers.decorators import r_cache, r_cache_async
+
+
+def _wait_for(cond, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not cond() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return cond()
+
+
+def test_envelope_should_refresh():
+    assert CacheEnvelope.wrap('x', -1).should_refresh()
+    assert not CacheEnvelope.wrap('x', 60).should_refresh()
+    # XFetch is disabled without a beta, or without a known computation time
+    assert not CacheEnvelope.wrap('x', 60, delta=0).should_refresh(beta=1.0)
+
+
+def test_envelope_xfetch(monkeypatch):
+    env = CacheEnvelope.wrap('x', 60, delta=10.0)
+    # random() close to 1 means log(1 - random()) is hugely negative, which forces an early refresh
+    monkeypatch.setattr(refresh.random, 'random', lambda: 0.999999999)
+    assert env.should_refresh(beta=1.0)
+    # random() of 0 means log(1) == 0, i.e. no early refresh
+    monkeypatch.setattr(refresh.random, 'random', lambda: 0.0)
+    assert not env.should_refresh(beta=1.0)
+
+
+def test_envelope_pickle():
+    env = pickle.loads(pickle.dumps(CacheEnvelope.wrap({'a': 1}, 30, delta=0.5)))
+    assert env.value == {'a': 1}
+    assert env.delta == 0.5
+
+
+def test_r_cache_stale_while_revalidate():
+    calls = []
+    MemoryCache().remove('test_swr_sync')
+
+    @r_cache('test_swr_sync', cache_time=30, soft_ttl=1)
+    def wrapped():
+        calls.append(1)
+        return len(calls)
+
+    assert wrapped() == 1
+    assert wrapped() == 1
+    time.sleep(1.1)
+    # Past the soft TTL - the stale value is returned, while it's refreshed in the background
+    assert wrapped() == 1
+    assert _wait_for(lambda: wrapped() == 2)
+    assert len(calls) == 2
+    MemoryCache().remove('test_swr_sync')
+
+
+def test_r_cache_swr_single_refresh():
+    calls = []
+    MemoryCache().remove('test_swr_once')
+
+    @r_cache('test_swr_once', cache_time=30, soft_ttl=1)
+    def wrapped():
+        calls.append(1)
+        time.sleep(0.3)
+        return len(calls)
+
+    assert wrapped() == 1
+    time.sleep(1.1)
+    # Many stale reads while the refresh is still running must only trigger one background refresh
+    assert [wrapped() for _ in range(10)] == [1] * 10
+    assert _wait_for(lambda: wrapped() == 2)
+    assert len(calls) == 2
+    MemoryCache().remove('test_swr_once')
+
+
+@pytest.mark.asyncio
+async def test_r_cache_async_stale_while_revalidate():
+    calls = []
+    await AsyncMemoryCache().remove('test_swr_async')
+
+    @r_cache_async('test_swr_async', cache_time=30, soft_ttl=1)
+    async def wrapped():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return len(calls)
+
+    assert await wrapped() == 1
+    await asyncio.sleep(1.1)
+    assert await wrapped() == 1
+    assert await wrapped() == 1
+    await asyncio.sleep(0.5)
+    assert await wrapped() == 2
+    assert len(calls) == 2
+    await AsyncMemoryCache().remove('test_swr_async')
+
+
+def test_envelope_pack_json():
+    """Packed envelopes are plain lists, so they survive serializers which can't store Python objects"""
+    from privex.helpers.cache.serializers import CacheSerializer
+    s = CacheSerializer('json')
+    env = CacheEnvelope.unpack(s.loads(s.dumps(CacheEnvelope.wrap({'a': 1}, 30, delta=0.5).pack())))
+    assert isinstance(env, CacheEnvelope)
+    assert env.value == {'a': 1}
+    assert env.delta == 0.5
+    assert CacheEnvelope.unpack(['not', 'an', 'envelope', 1]) is None
+    assert CacheEnvelope.unpack('plain value') is None
+
+
+@pytest.mark.asyncio
+async def test_r_cache_async_refresh_doesnt_block(tmp_path):
+    """A running background refresh must not stall other calls which reconnect the same adapter"""
+    try:
+        from privex.helpers.cache.asyncx import AsyncSqliteCache
+    except ImportError:
+        pytest.skip("AsyncSqliteCache unavailable (privex-db / aiosqlite not installed?)")
+    from privex.helpers.cache import async_adapter_get, async_adapter_set
+    orig, calls = async_adapter_get(), []
+    adapter = async_adapter_set(AsyncSqliteCache(str(tmp_path / 'pvx-swr.sqlite3')))
+    try:
+        @r_cache_async('test_swr_slow', cache_time=30, soft_ttl=1)
+        async def slow():
+            calls.append(1)
+            if len(calls) > 1: await asyncio.sleep(1)
+            return len(calls)
+
+        @r_cache_async('test_swr_other', cache_time=30)
+        async def other():
+            return 'other'
+
+        assert await slow() == 1
+        await asyncio.sleep(1.1)
+        assert await slow() == 1      # Stale - starts a background refresh which takes 1 second
+        start = time.monotonic()
+        assert await other() == 'other'
+        assert time.monotonic() - start < 0.5
+        await asyncio.sleep(1.2)
+        assert await slow() == 2
+    finally:
+        await adapter.close()
+        async_adapter_set(orig)
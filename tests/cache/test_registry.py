@@ -0,0 +1,148 @@
+"""
+Tests for the cache key registries in :mod:`privex.helpers.cache.registry`, and their use by :class:`.CacheManagerMixin`
+"""
+import time
+
+import pytest
+
+from privex.helpers.cache import MemoryCache, TieredCache, adapter_set, adapter_get
+from privex.helpers.cache.extras import CacheManagerMixin
+from privex.helpers.cache.registry import CacheKeyRegistry, MemoryKeyRegistry, get_key_registry
+
+
+@pytest.fixture
+def memcache():
+    orig = adapter_get()
+    c = adapter_set(MemoryCache())
+    yield c
+    adapter_set(orig)
+
+
+def test_memory_registry_add_remove(memcache):
+    reg = get_key_registry()
+    assert isinstance(reg, MemoryKeyRegistry)
+    assert get_key_registry() is reg
+    reg.add('test_reg', 'a', 'b', 'c', timeout=60)
+    assert reg.members('test_reg') == {'a', 'b', 'c'}
+    assert reg.remove('test_reg', 'a', 'x') == 1
+    assert reg.members('test_reg') == {'b', 'c'}
+    reg.clear('test_reg')
+    assert reg.members('test_reg') == set()
+
+
+def test_memory_registry_expiry(memcache):
+    reg = get_key_registry()
+    reg.add('test_reg_exp', 'a', timeout=0.5)
+    reg.add('test_reg_exp', 'b', timeout=60)
+    time.sleep(0.6)
+    assert reg.members('test_reg_exp') == {'b'}
+
+
+def test_fallback_registry_generation():
+    reg = CacheKeyRegistry(MemoryCache())
+    reg.add('test_reg_fb', 'a', 'b', timeout=60)
+    assert reg.members('test_reg_fb') == {'a', 'b'}
+    assert reg.remove('test_reg_fb', 'b') == 1
+    assert reg.members('test_reg_fb') == {'a'}
+    assert reg.generation('test_reg_fb') == 0
+    assert reg.bump_generation('test_reg_fb') == 1
+    assert reg.generation('test_reg_fb') == 1
+
+
+def test_tiered_uses_l2_registry():
+    c = TieredCache(MemoryCache())
+    assert get_key_registry(c) is get_key_registry(c.l2)
+
+
+class ExampleManager(CacheManagerMixin):
+    cache_prefix = 'test_regmgr'
+
+
+class BatchedManager(CacheManagerMixin):
+    cache_prefix = 'test_regbatch'
+    cache_key_log_batch = 10
+    cache_key_log_interval = 60
+
+
+class GenManager(CacheManagerMixin):
+    cache_prefix = 'test_reggen'
+    cache_key_generations = True
+    cache_key_generation_ttl = 60
+
+
+def test_manager_log_and_clear(memcache):
+    ExampleManager.cache_set('hello', 'world')
+    ExampleManager.cache_set('lorem', 'ipsum')
+    assert ExampleManager.get_all_cache_keys() == {'test_regmgr:hello', 'test_regmgr:lorem'}
+    ExampleManager.clear_all_cache_keys()
+    assert ExampleManager.get_all_cache_keys() == set()
+    assert ExampleManager.cache_get('hello') is None
+
+
+def test_manager_batched_log(memcache):
+    BatchedManager.cache_set('hello', 'world')
+    lk = BatchedManager._key_log_name()
+    # Key is held in the batch until it's flushed...
+    assert get_key_registry().members(lk) == set()
+    # ...but reading the key log always flushes the batch first
+    assert BatchedManager.get_all_cache_keys() == {'test_regbatch:hello'}
+
+
+def test_manager_generation_clear(memcache):
+    GenManager.cache_set('hello', 'world')
+    k = GenManager.gen_cache_key('example', _auto_cache=False)
+    assert k == 'test_reggen:g0:example'
+    assert GenManager.cache_get('hello') == 'world'
+    assert GenManager.clear_all_cache_keys() is True
+    assert GenManager.gen_cache_key('example', _auto_cache=False) == 'test_reggen:g1:example'
+    assert 'test_reggen:g0:hello' not in GenManager.get_all_cache_keys()
+    assert GenManager.cache_get('hello') is None
+
+
+def test_manager_log_returns_key_log(memcache):
+    assert ExampleManager.log_cache_key('test_regmgr:a') == {'test_regmgr:a'}
+    assert ExampleManager.log_cache_key('test_regmgr:b') == {'test_regmgr:a', 'test_regmgr:b'}
+    assert ExampleManager.log_delete_cache_keys('test_regmgr:a', 'test_regmgr:x') == {'test_regmgr:b'}
+    ExampleManager.clear_all_cache_keys()
+
+
+def test_manager_generation_per_adapter(memcache):
+    GenManager.clear_all_cache_keys()
+    g = GenManager.cache_generation()
+    orig = adapter_get()
+    try:
+        # A fresh adapter has never been bumped - the generation memoized for the other adapter mustn't be re-used
+        adapter_set(MemoryCache())
+        assert GenManager.cache_generation() == 0
+    finally:
+        adapter_set(orig)
+    assert GenManager.cache_generation() == g > 0
+
+
+def test_sqlite_registry_generation_atomic():
+    """Concurrent bumps from several threads (each with their own SQLite connection) must never be lost"""
+    from concurrent.futures import ThreadPoolExecutor
+    from privex.helpers.cache import SqliteCache
+    from privex.helpers.cache.registry import SqliteKeyRegistry
+    c = SqliteCache('pvx-helpers-tests.sqlite3')
+    reg = SqliteKeyRegistry(c)
+    name = f'test_reg_gen_atomic_{time.time()}'
+    assert reg.generation(name) == 0
+    with ThreadPoolExecutor(8) as pool:
+        gens = list(pool.map(lambda _: reg.bump_generation(name), range(40)))
+    assert sorted(gens) == list(range(1, 41))
+    assert reg.generation(name) == 40
+
+
+def test_sqlite_registry_legacy_generation():
+    """Generations stored as a cache key before the pvcache_keyreg_gen table existed carry on from where they were"""
+    from privex.helpers.cache import SqliteCache
+    from privex.helpers.cache.registry import SqliteKeyRegistry
+    c = SqliteCache('pvx-helpers-tests.sqlite3')
+    reg = SqliteKeyRegistry(c)
+    name = f'test_reg_gen_legacy_{time.time()}'
+    c.set(reg._gen_key(name), 5, timeout=None)
+    assert reg.generation(name) == 5
+    assert reg.bump_generation(name) == 6
+    assert reg.generation(name) == 6
+    c.remove(reg._gen_key(name))
@@ -0,0 +1,107 @@
+"""
+Tests for the pluggable cache value serializers - :mod:`privex.helpers.cache.serializers`
+"""
+import pickle
+
+import pytest
+
+from privex.helpers.cache import SqliteCache
+from privex.helpers.cache import serializers
+from privex.helpers.cache.serializers import MAGIC, CacheSerializer, get_serializer
+
+SAMPLE = {'hello': 'world', 'num': 123, 'items': [1, 2.5, 'three', None, True]}
+
+
+@pytest.mark.parametrize('name', ['pickle', 'marshal', 'json'])
+def test_round_trip(name):
+    s = CacheSerializer(name)
+    data = s.dumps(SAMPLE)
+    assert data[:1] == MAGIC
+    assert s.loads(data) == SAMPLE
+
+
+@pytest.mark.parametrize('name, mod', [('msgpack', serializers.msgpack), ('orjson', serializers.orjson)])
+def test_round_trip_optional(name, mod):
+    if mod is None:
+        pytest.skip(f"package for serializer '{name}' is not installed")
+    s = CacheSerializer(name)
+    assert s.loads(s.dumps(SAMPLE)) == SAMPLE
+
+
+def test_pickle_out_of_band_buffers():
+    s = CacheSerializer('pickle')
+    value = {'buf': pickle.PickleBuffer(bytearray(b'x' * 5000)), 'other': 'data'}
+    data = s.dumps(value)
+    assert data[1:2] == b'B'
+    res = s.loads(data)
+    assert bytes(res['buf']) == b'x' * 5000
+    assert res['other'] == 'data'
+
+
+def test_compression_above_threshold():
+    s = CacheSerializer('pickle', compression='zlib', compress_threshold=100)
+    small, large = 'a' * 10, 'a' * 10000
+    assert s.dumps(small)[2:3] == b'-'
+    data = s.dumps(large)
+    assert data[2:3] == b'z'
+    assert len(data) < len(pickle.dumps(large))
+    assert s.loads(data) == large
+
+
+@pytest.mark.parametrize('name, mod', [('lz4', serializers.lz4_frame), ('zstd', serializers.zstandard)])
+def test_compression_optional(name, mod):
+    if mod is None:
+        pytest.skip(f"package for compression '{name}' is not installed")
+    s = CacheSerializer('pickle', compression=name, compress_threshold=0)
+    assert s.loads(s.dumps('b' * 10000)) == 'b' * 10000
+
+
+def test_loads_any_format():
+    """Values are decoded by their own tags, whatever the reading serializer is configured to use"""
+    data = CacheSerializer('json', compression='zlib', compress_threshold=0).dumps(SAMPLE)
+    assert CacheSerializer('marshal').loads(data) == SAMPLE
+
+
+def test_legacy_pickle_values():
+    assert CacheSerializer('json').loads(pickle.dumps(SAMPLE)) == SAMPLE
+
+
+def test_headerless_non_pickle_values():
+    """Header-less values which don't start with the pickle header are returned as-is, never passed to pickle"""
+    assert CacheSerializer('pickle').loads(b'plain value') == b'plain value'
+    assert CacheSerializer('pickle').loads(b'cos\nsystem\n') == b'cos\nsystem\n'
+
+
+def test_unknown_serializer():
+    with pytest.raises(AttributeError):
+        CacheSerializer('nonexistent')
+    with pytest.raises(AttributeError):
+        CacheSerializer('pickle', compression='nonexistent')
+
+
+def test_get_serializer_settings(monkeypatch):
+    monkeypatch.setattr(serializers.settings, 'CACHE_SERIALIZER', 'marshal')
+    monkeypatch.setattr(serializers.settings, 'CACHE_COMPRESSION', 'zlib')
+    s = get_serializer()
+    assert s.serializer.name == 'marshal'
+    assert s.compressor.name == 'zlib'
+    assert get_serializer(s) is s
+
+
+def test_sqlite_adapter_serializer():
+    c = SqliteCache(memory_persist=True, serializer='json')
+    assert c.serializer.serializer.name == 'json'
+    c.set('test_serializer_json', SAMPLE)
+    assert c.get('test_serializer_json') == SAMPLE
+    c.remove('test_serializer_json')
+
+
+def test_sqlite_json_key_registry():
+    """The fallback key registry stores it's sets as lists, so it works with serializers which can't store sets"""
+    from privex.helpers.cache.registry import CacheKeyRegistry
+    reg = CacheKeyRegistry(SqliteCache(memory_persist=True, serializer='json'))
+    reg.add('test_serializer_reg', 'a', 'b', timeout=60)
+    assert reg.members('test_serializer_reg') == {'a', 'b'}
+    assert reg.remove('test_serializer_reg', 'a') == 1
+    assert reg.members('test_serializer_reg') == {'b'}
+    reg.clear('test_serializer_reg')
@@ -0,0 +1,134 @@
+"""
+Tests for the consistent hashing cache adapters - :class:`.ShardedCache` / :class:`.AsyncShardedCache`
+"""
+import pytest
+
+from privex.helpers.cache import MemoryCache, AsyncMemoryCache, ShardedCache, AsyncShardedCache
+from privex.helpers.cache import import_adapter
+from privex.helpers.cache.ShardedCache import HashRing
+
+
+class DownCache(MemoryCache):
+    """A memory cache which fails every operation while ``down`` is True, imitating an unreachable server"""
+    down = False
+
+    def get(self, *args, **kwargs):
+        if self.down: raise ConnectionError('node is down')
+        return super().get(*args, **kwargs)
+
+    def set(self, *args, **kwargs):
+        if self.down: raise ConnectionError('node is down')
+        return super().set(*args, **kwargs)
+
+    def get_many(self, *args, **kwargs):
+        if self.down: raise ConnectionError('node is down')
+        return super().get_many(*args, **kwargs)
+
+
+class AsyncDownCache(AsyncMemoryCache):
+    down = False
+
+    async def get(self, *args, **kwargs):
+        if self.down: raise ConnectionError('node is down')
+        return await super().get(*args, **kwargs)
+
+    async def set(self, *args, **kwargs):
+        if self.down: raise ConnectionError('node is down')
+        return await super().set(*args, **kwargs)
+
+
+def _nodes(count: int = 3, cls=MemoryCache) -> dict:
+    return {f'n{i}': cls(max_entries=1000) for i in range(count)}
+
+
+def test_ring_stable_and_balanced():
+    ring = HashRing(['a', 'b', 'c'])
+    keys = [f'key{i}' for i in range(3000)]
+    owners = [ring.get_node(k) for k in keys]
+    assert owners == [HashRing(['c', 'b', 'a']).get_node(k) for k in keys]
+    for n in ['a', 'b', 'c']:
+        assert 600 < owners.count(n) < 1400
+
+
+def test_ring_minimal_movement():
+    keys = [f'key{i}' for i in range(3000)]
+    before = HashRing(['a', 'b', 'c'])
+    after = HashRing(['a', 'b', 'c', 'd'])
+    moved = [k for k in keys if before.get_node(k) != after.get_node(k)]
+    # Only keys now owned by the new node should move
+    assert all(after.get_node(k) == 'd' for k in moved)
+    assert len(moved) < 1200
+
+
+def test_ring_iter_nodes():
+    ring = HashRing(['a', 'b', 'c'])
+    nodes = list(ring.iter_nodes('hello'))
+    assert sorted(nodes) == ['a', 'b', 'c']
+    assert nodes[0] == ring.get_node('hello')
+
+
+def test_sharded_get_set():
+    c = ShardedCache(_nodes())
+    c.set('test_shard', 'hello', timeout=60)
+    assert c.get('test_shard') == 'hello'
+    # The key is only stored on the node it hashes to
+    assert [n for n, a in c.nodes.items() if a.get('test_shard') is not None] == [c.node_for('test_shard')]
+    assert c.remove('test_shard') is True
+    assert c.get('test_shard', 'missing') == 'missing'
+
+
+def test_sharded_bulk():
+    c = ShardedCache(_nodes())
+    data = {f'test_shard_bulk{i}': i for i in range(50)}
+    c.set_many(data, timeout=60)
+    assert c.get_many(list(data.keys()) + ['test_shard_missing']) == data
+    assert all(len(a.get_many(data.keys())) > 0 for a in c.nodes.values())
+    assert c.remove_many(data.keys()) == 50
+    assert c.get_many(data.keys()) == {}
+
+
+def test_sharded_failover():
+    nodes = _nodes(3, DownCache)
+    c = ShardedCache(nodes, failover=True, retry_after=60)
+    key = 'test_shard_fo'
+    owner = c.node_for(key)
+    nodes[owner].down = True
+    c.set(key, 'hello', timeout=60)
+    assert c.node_for(key) != owner
+    assert c.get(key) == 'hello'
+    assert c.get_many([key]) == {key: 'hello'}
+
+
+def test_sharded_no_failover_raises():
+    nodes = _nodes(3, DownCache)
+    c = ShardedCache(nodes, failover=False)
+    nodes[c.node_for('test_shard_nofo')].down = True
+    with pytest.raises(ConnectionError):
+        c.set('test_shard_nofo', 'hello')
+
+
+def test_sharded_import_adapter():
+    assert import_adapter('sharded') is ShardedCache
+    assert import_adapter('shard', 'async') is AsyncShardedCache
+    c = ShardedCache(['memory', 'memory'])
+    assert list(c.nodes.keys()) == ['node0', 'node1']
+
+
+@pytest.mark.asyncio
+async def test_async_sharded():
+    c = AsyncShardedCache(_nodes(3, AsyncMemoryCache))
+    await c.set('test_ashard', 'hello', timeout=60)
+    assert await c.get('test_ashard') == 'hello'
+    data = {f'test_ashard_bulk{i}': i for i in range(30)}
+    await c.set_many(data, timeout=60)
+    assert await c.get_many(data.keys()) == data
+    assert await c.remove_many(data.keys()) == 30
+
+
+@pytest.mark.asyncio
+async def test_async_sharded_failover():
+    nodes = _nodes(3, AsyncDownCache)
+    c = AsyncShardedCache(nodes, failover=True, retry_after=60)
+    nodes[c.node_for('test_ashard_fo')].down = True
+    await c.set('test_ashard_fo', 'hello', timeout=60)
+    assert await c.get('test_ashard_fo') == 'hello'
@@ -0,0 +1,207 @@
+"""
+Tests for single-flight stampede protection - :mod:`privex.helpers.cache.singleflight`
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from privex.helpers.cache import MemoryCache, AsyncMemoryCache
+from privex.helpers.cache.singleflight import AsyncSingleFlight, SingleFlight, lock_key
+from privex.helpers.decorators import r_cache, r_cache_async
+
+try:
+    from privex.helpers.cache import SqliteCache
+    HAS_SQLITE_CACHE = True
+except ImportError:
+    HAS_SQLITE_CACHE = False
+
+
+class _Counter:
+    def __init__(self):
+        self.calls, self._lock = 0, threading.Lock()
+
+    def slow(self, *args, **kwargs):
+        with self._lock:
+            self.calls += 1
+        time.sleep(0.3)
+        return 'computed'
+
+
+def _hammer(fn, threads=10):
+    with ThreadPoolExecutor(threads) as pool:
+        return list(pool.map(lambda _: fn(), range(threads)))
+
+
+def test_single_flight_threads():
+    c, ctr = MemoryCache(), _Counter()
+    c.remove('test_sf_threads')
+    res = _hammer(lambda: c.get_or_set('test_sf_threads', ctr.slow, timeout=30, single_flight=True))
+    assert res == ['computed'] * 10
+    assert ctr.calls == 1
+    c.remove('test_sf_threads')
+
+
+def test_no_single_flight_threads():
+    c, ctr = MemoryCache(), _Counter()
+    c.remove('test_sf_nothreads')
+    _hammer(lambda: c.get_or_set('test_sf_nothreads', ctr.slow, timeout=30, single_flight=False))
+    assert ctr.calls > 1
+    c.remove('test_sf_nothreads')
+
+
+def test_single_flight_exception_shared():
+    sf, calls = SingleFlight(), []
+
+    def boom():
+        calls.append(1)
+        time.sleep(0.2)
+        raise ValueError('boom')
+
+    def call():
+        try:
+            sf.do('test_sf_exc', boom, wait_timeout=5)
+        except ValueError:
+            return 'raised'
+    assert _hammer(call, 5) == ['raised'] * 5
+    assert len(calls) == 1
+
+
+def test_single_flight_wait_timeout():
+    sf, calls = SingleFlight(), []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.5)
+        return 'ok'
+    # Waiters give up after 0.1s and compute the value themselves
+    assert _hammer(lambda: sf.do('test_sf_timeout', slow, wait_timeout=0.1), 3) == ['ok'] * 3
+    assert len(calls) == 3
+
+
+def test_r_cache_single_flight():
+    ctr = _Counter()
+
+    @r_cache('test_sf_rcache', cache_time=30, single_flight=True)
+    def wrapped():
+        return ctr.slow()
+
+    MemoryCache().remove('test_sf_rcache')
+    assert _hammer(wrapped) == ['computed'] * 10
+    assert ctr.calls == 1
+    MemoryCache().remove('test_sf_rcache')
+
+
+@pytest.mark.asyncio
+async def test_async_single_flight():
+    c, calls = AsyncMemoryCache(), []
+    await c.remove('test_sf_async')
+
+    async def slow(key):
+        calls.append(key)
+        await asyncio.sleep(0.3)
+        return 'computed'
+
+    res = await asyncio.gather(*[c.get_or_set('test_sf_async', slow, timeout=30, single_flight=True) for _ in range(10)])
+    assert res == ['computed'] * 10
+    assert len(calls) == 1
+    await c.remove('test_sf_async')
+
+
+@pytest.mark.asyncio
+async def test_async_single_flight_leader_cancelled():
+    flight, calls = AsyncSingleFlight(), []
+
+    async def slow():
+        calls.append(1)
+        await asyncio.sleep(0.2)
+        return 'computed'
+
+    leader = asyncio.ensure_future(flight.do('test_sf_cancel', slow))
+    await asyncio.sleep(0.01)
+    waiters = [asyncio.ensure_future(flight.do('test_sf_cancel', slow)) for _ in range(5)]
+    await asyncio.sleep(0.01)
+    leader.cancel()
+    # Waiters mustn't inherit the leader's cancellation - one of them takes over the computation instead
+    assert await asyncio.gather(*waiters) == ['computed'] * 5
+    assert leader.cancelled() and len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_r_cache_async_single_flight():
+    calls = []
+
+    @r_cache_async('test_sf_rcache_async', cache_time=30, single_flight=True)
+    async def wrapped():
+        calls.append(1)
+        await asyncio.sleep(0.3)
+        return 'computed'
+
+    await AsyncMemoryCache().remove('test_sf_rcache_async')
+    assert await asyncio.gather(*[wrapped() for _ in range(10)]) == ['computed'] * 10
+    assert len(calls) == 1
+    await AsyncMemoryCache().remove('test_sf_rcache_async')
+
+
+@pytest.mark.skipif(not HAS_SQLITE_CACHE, reason="requires package 'privex-db'")
+def test_distributed_lock_waits_for_other_process():
+    """Simulate another process holding the backend lock, then storing the value"""
+    c, k, ctr = SqliteCache('pvx-helpers-tests.sqlite3'), 'test_sf_distributed', _Counter()
+    c.remove(k, lock_key(k))
+    assert c.add(lock_key(k), 'other-process', timeout=10)
+
+    def other_process():
+        time.sleep(0.5)
+        c.set(k, 'from other process', timeout=30)
+        c.remove(lock_key(k))
+
+    t = threading.Thread(target=other_process)
+    t.start()
+    res = c.get_or_set(k, ctr.slow, timeout=30, single_flight=True, distributed_lock=True, lock_timeout=5)
+    t.join()
+    assert res == 'from other process'
+    assert ctr.calls == 0
+    c.remove(k)
+
+
+@pytest.mark.skipif(not HAS_SQLITE_CACHE, reason="requires package 'privex-db'")
+def test_distributed_lock_released():
+    c, k, ctr = SqliteCache('pvx-helpers-tests.sqlite3'), 'test_sf_distributed_rel', _Counter()
+    c.remove(k, lock_key(k))
+    assert c.get_or_set(k, ctr.slow, timeout=30, single_flight=True, distributed_lock=True) == 'computed'
+    assert ctr.calls == 1
+    assert c.get(lock_key(k)) is None
+    c.remove(k)
+
+
+def test_remove_if_memory():
+    c = MemoryCache()
+    c.set('test_sf_remove_if', 'token-a', timeout=30)
+    assert not c.remove_if('test_sf_remove_if', 'token-b')
+    assert c.get('test_sf_remove_if') == 'token-a'
+    assert c.remove_if('test_sf_remove_if', 'token-a')
+    assert c.get('test_sf_remove_if') is None
+
+
+@pytest.mark.skipif(not HAS_SQLITE_CACHE, reason="requires package 'privex-db'")
+def test_remove_if_sqlite():
+    c, k = SqliteCache('pvx-helpers-tests.sqlite3'), 'test_sf_remove_if_sqlite'
+    c.set(k, 'token-a', timeout=30)
+    assert not c.remove_if(k, 'token-b')
+    assert c.get(k) == 'token-a'
+    assert c.remove_if(k, 'token-a')
+    assert c.get(k) is None
+
+
+def test_backend_lock_keeps_other_owners_lock():
+    """If our lock expired and another process took it over, releasing ours must not delete theirs"""
+    from privex.helpers.cache.singleflight import backend_lock
+    c, k = MemoryCache(), 'test_sf_lock_owner'
+    c.remove(lock_key(k))
+    with backend_lock(c, k, lock_timeout=10) as acquired:
+        assert acquired
+        c.set(lock_key(k), 'other-process', timeout=10)
+    assert c.get(lock_key(k)) == 'other-process'
+    c.remove(lock_key(k))
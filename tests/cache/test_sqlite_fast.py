@@ -0,0 +1,96 @@
+"""
+Tests for the fast mode (WAL, direct prepared statements, batched background purging) of :class:`.SqliteCache`
+and :class:`.AsyncSqliteCache`
+"""
+import time
+from os.path import join
+
+import pytest
+
+try:
+    from privex.helpers.cache import SqliteCache
+    from privex.helpers.cache.asyncx import AsyncSqliteCache
+    from privex.helpers.cache.post_deps import SqliteCacheManager, SqliteCachePurger
+except ImportError:
+    pytest.skip("Failed to import SqliteCache / AsyncSqliteCache (privex-db / aiosqlite not installed?)", allow_module_level=True)
+
+
+@pytest.fixture
+def db_file(tmp_path):
+    return join(str(tmp_path), 'pvx-fast-tests.sqlite3')
+
+
+def test_fast_manager_wal_and_indexes(db_file):
+    mgr = SqliteCacheManager(db_file, fast_mode=True)
+    assert mgr.conn.execute("PRAGMA journal_mode;").fetchone()[0].lower() == 'wal'
+    indexes = {r[0] for r in mgr.conn.execute("SELECT name FROM sqlite_master WHERE type = 'index';").fetchall()}
+    assert {'pvcache_expires_idx', 'pvcache_keyreg_expires_idx'} <= indexes
+    mgr.close()
+
+
+def test_fast_manager_upsert(db_file):
+    mgr = SqliteCacheManager(db_file, fast_mode=True)
+    mgr.set_cache_key('hello', b'world', expires_secs=60)
+    mgr.set_cache_key('hello', b'lorem', expires_secs=60)
+    assert mgr.find_cache_key('hello').value == b'lorem'
+    assert mgr.conn.execute("SELECT count(*) FROM pvcache WHERE name = 'hello';").fetchone()[0] == 1
+    assert mgr.add_cache_key('hello', b'ipsum', expires_secs=60) is False
+    assert mgr.delete_cache_key('hello') == 1
+    assert mgr.find_cache_key('hello') is None
+    mgr.close()
+
+
+@pytest.mark.parametrize('fast_mode', [True, False])
+def test_remove_expired_not_counted(db_file, fast_mode):
+    c = SqliteCache(db_file, fast_mode=fast_mode)
+    c.set('test_rm_live', 'hello', timeout=60)
+    c.set_many({'test_rm_exp1': 'a', 'test_rm_exp2': 'b'}, timeout=0.1)
+    time.sleep(0.2)
+    # Expired rows are still deleted, but aren't counted as removed
+    assert c.remove('test_rm_exp1') is False
+    assert c.remove_many(['test_rm_live', 'test_rm_exp2']) == 1
+    assert c.wrapper.find_cache_keys(['test_rm_live', 'test_rm_exp1', 'test_rm_exp2']) == []
+    c.close()
+
+
+async def test_async_remove_expired_not_counted(db_file):
+    c = AsyncSqliteCache(db_file)
+    await c.set('test_rm_live', 'hello', timeout=60)
+    await c.set('test_rm_exp', 'world', timeout=0.1)
+    time.sleep(0.2)
+    assert await c.remove_many(['test_rm_live', 'test_rm_exp']) == 1
+    assert await c.remove('test_rm_exp') is False
+
+
+def test_purge_expired_batches(db_file):
+    mgr = SqliteCacheManager(db_file, fast_mode=True)
+    mgr.set_cache_keys({f'exp{i}': b'x' for i in range(25)}, expires_secs=0.1)
+    mgr.set_cache_key('keep', b'x', expires_secs=60)
+    time.sleep(0.2)
+    assert mgr.purge_expired(batch_size=10) == 25
+    assert [r.name for r in mgr.find_cache_keys([f'exp{i}' for i in range(25)] + ['keep'])] == ['keep']
+    mgr.close()
+
+
+def test_fast_cache_background_purge(db_file):
+    c = SqliteCache(db_file, fast_mode=True, purge_every=0.1)
+    c.set('test_fast_bg', 'hello', timeout=0.1)
+    c.set('test_fast_keep', 'world', timeout=60)
+    assert isinstance(c._purger, SqliteCachePurger)
+    assert SqliteCachePurger.start_for(c.wrapper.db) is c._purger
+    time.sleep(0.5)
+    assert c.wrapper.find_cache_key('test_fast_bg') is None
+    assert c.get('test_fast_keep') == 'world'
+    c._purger.stop()
+
+
+@pytest.mark.asyncio
+async def test_async_fast_cache(db_file):
+    c = AsyncSqliteCache(db_file, fast_mode=True)
+    await c.set('test_async_fast', 'hello', timeout=60)
+    await c.set('test_async_fast', 'world', timeout=60)
+    assert await c.get('test_async_fast') == 'world'
+    assert await c.get_many(['test_async_fast', 'test_missing']) == {'test_async_fast': 'world'}
+    assert await c.remove('test_async_fast') is True
+    assert await c.get('test_async_fast') is None
+    c._purger.stop()
@@ -0,0 +1,100 @@
+"""
+Tests for the two-tier (L1 memory + L2 adapter) cache - :class:`.TieredCache` / :class:`.AsyncTieredCache`
+"""
+import time
+
+import pytest
+
+from privex.helpers.cache import MemoryCache, AsyncMemoryCache, TieredCache, AsyncTieredCache, adapter_set, adapter_get
+from privex.helpers.cache import import_adapter
+from privex.helpers.cache.TieredCache import TieredBase
+
+
+def _tiered(**kwargs) -> TieredCache:
+    return TieredCache(MemoryCache(max_entries=1000), **kwargs)
+
+
+def test_read_through():
+    c = _tiered(l1_ttl=30)
+    c.l2.set('test_tier_rt', 'hello', timeout=60)
+    assert c.get('test_tier_rt') == 'hello'
+    assert 'test_tier_rt' in c.l1
+    # Served from L1, even though L2 was changed behind our back
+    c.l2.set('test_tier_rt', 'changed', timeout=60)
+    assert c.get('test_tier_rt') == 'hello'
+    assert c.stats().hits == 1
+
+
+def test_l1_expires():
+    c = _tiered(l1_ttl=0.5)
+    c.set('test_tier_exp', 'hello', timeout=60)
+    c.l2.set('test_tier_exp', 'changed', timeout=60)
+    assert c.get('test_tier_exp') == 'hello'
+    time.sleep(0.6)
+    assert c.get('test_tier_exp') == 'changed'
+
+
+def test_l1_never_outlives_l2():
+    c = _tiered(l1_ttl=30)
+    c.set('test_tier_short', 'hello', timeout=1)
+    time.sleep(1.1)
+    assert c.get('test_tier_short') is None
+
+
+def test_write_through_and_remove():
+    c = _tiered(l1_ttl=30)
+    c.set_many({'test_tier_a': 1, 'test_tier_b': 0}, timeout=60)
+    assert c.l2.get_many(['test_tier_a', 'test_tier_b']) == {'test_tier_a': 1, 'test_tier_b': 0}
+    assert c.get_many(['test_tier_a', 'test_tier_b', 'test_tier_c']) == {'test_tier_a': 1, 'test_tier_b': 0}
+    assert c.remove('test_tier_a')
+    assert 'test_tier_a' not in c.l1
+    assert c.get('test_tier_a') is None
+    assert c.remove_many(['test_tier_b']) == 1
+    assert c.get('test_tier_b', 'gone') == 'gone'
+
+
+def test_invalidation_message():
+    a, b = _tiered(l1_ttl=30), _tiered(l1_ttl=30)
+    a.set('test_tier_inv', 'x', timeout=60)
+    b.set('test_tier_inv', 'x', timeout=60)
+    msg = a._message(['test_tier_inv'])
+    # Our own messages are ignored, other nodes drop the key from their L1
+    a._on_message(msg)
+    b._on_message(msg.encode())
+    assert 'test_tier_inv' in a.l1
+    assert 'test_tier_inv' not in b.l1
+
+
+def test_invalidation_requires_redis():
+    c = _tiered(invalidation=True)
+    assert c.invalidation is False
+
+
+def test_tiered_adapter_names():
+    assert import_adapter('tiered') is TieredCache
+    assert import_adapter('tier', 'asyncio') is AsyncTieredCache
+    with pytest.raises(AttributeError):
+        TieredBase._resolve_l2('tiered', 'sync', 'TieredCache')
+
+
+def test_global_adapter():
+    orig = adapter_get()
+    try:
+        c = adapter_set(_tiered(l1_ttl=30))
+        c.set('test_tier_global', 'hello', timeout=60)
+        assert c.get('test_tier_global') == 'hello'
+        c.remove('test_tier_global')
+    finally:
+        adapter_set(orig)
+
+
+@pytest.mark.asyncio
+async def test_async_tiered():
+    c = AsyncTieredCache(AsyncMemoryCache(max_entries=1000), l1_ttl=30)
+    await c.set('test_atier', 'hello', timeout=60)
+    await c.l2.set('test_atier', 'changed', timeout=60)
+    assert await c.get('test_atier') == 'hello'
+    assert await c.get_many(['test_atier', 'test_atier_missing']) == {'test_atier': 'hello'}
+    assert await c.remove('test_atier')
+    assert await c.get('test_atier') is None
+    assert await c.l2.get('test_atier') is None
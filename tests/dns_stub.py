@@ -0,0 +1,68 @@
+"""
+A minimal UDP DNS server for testing the dnspython resolver backend in :py:mod:`privex.helpers.net.dns` without network access.
+
+    >>> with StubDNSServer({('example.test', 'A'): (300, ['192.0.2.1'])}) as srv:
+    ...     res = Resolver(configure=False)
+    ...     res.nameservers, res.port = ['127.0.0.1'], srv.port
+
+Names which aren't in ``records`` at all are answered with NXDOMAIN, while names which exist but don't have the queried record
+type get an empty NOERROR answer.
+"""
+import socket
+import threading
+from typing import Dict, List, Tuple
+
+import dns.message
+import dns.rcode
+import dns.rrset
+
+RECORDS = Dict[Tuple[str, str], Tuple[int, List[str]]]
+
+
+class StubDNSServer:
+    def __init__(self, records: RECORDS):
+        self.records = {(name.rstrip('.').lower() + '.', rdtype.upper()): v for (name, rdtype), v in records.items()}
+        self.names = set(name for name, _ in self.records.keys())
+        self.queries = []
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(('127.0.0.1', 0))
+        self.sock.settimeout(0.1)
+        self.port = self.sock.getsockname()[1]
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+
+    def _answer(self, data: bytes) -> bytes:
+        query = dns.message.from_wire(data)
+        resp = dns.message.make_response(query)
+        q = query.question[0]
+        name, rdtype = q.name.to_text().lower(), dns.rdatatype.to_text(q.rdtype)
+        self.queries.append((name, rdtype))
+        if name not in self.names:
+            resp.set_rcode(dns.rcode.NXDOMAIN)
+        elif (name, rdtype) in self.records:
+            ttl, values = self.records[(name, rdtype)]
+            resp.answer.append(dns.rrset.from_text_list(q.name, ttl, 'IN', rdtype, values))
+        return resp.to_wire()
+
+    def _serve(self):
+        while not self._stop.is_set():
+            try:
+                data, addr = self.sock.recvfrom(4096)
+            except socket.timeout:
+                continue
+            self.sock.sendto(self._answer(data), addr)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.sock.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
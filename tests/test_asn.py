@@ -0,0 +1,152 @@
+"""
+Test cases for :func:`.asn_to_name`, :func:`.asn_to_name_many` and their AsyncIO versions - covering the ASN name cache,
+concurrent bulk lookups and the local ASN table.
+
+These run against :class:`tests.dns_stub.StubDNSServer` on localhost, so they don't require network access.
+"""
+import threading
+
+import pytest
+
+pytest.importorskip('dns.asyncresolver')
+
+from dns.asyncresolver import Resolver as AsyncResolver
+from dns.resolver import Resolver
+
+from privex.helpers import settings
+from privex.helpers.cache import MemoryCache, AsyncMemoryCache
+from privex.helpers.net import dns as dnsmod
+from privex.helpers.net.dns import DNSCache
+
+from tests.dns_stub import StubDNSServer
+
+RECORDS = {
+    ('AS210083.asn.cymru.com', 'TXT'): (60, ['"210083 | SE | ripencc | 2017-05-24 | PRIVEX, SE"']),
+    ('AS13335.asn.cymru.com', 'TXT'): (60, ['"13335 | US | arin | 2010-07-14 | CLOUDFLARENET - Cloudflare, Inc., US"']),
+    ('AS15169.asn.cymru.com', 'TXT'): (60, ['"15169 | US | arin | 2000-03-30 | GOOGLE - Google LLC, US"']),
+}
+
+
+@pytest.fixture()
+def stub(monkeypatch):
+    with StubDNSServer(RECORDS) as srv:
+        res, ares = Resolver(configure=False), AsyncResolver(configure=False)
+        for r in [res, ares]:
+            r.nameservers, r.port, r.lifetime = ['127.0.0.1'], srv.port, 2.0
+        monkeypatch.setattr(settings, 'ASN_CACHE_ADAPTER', False)
+        monkeypatch.setattr(dnsmod, '_ASN_TABLE', {})
+        monkeypatch.setattr(dnsmod, '_ASN_FILE_LOADED', True)
+        dnsmod.set_resolver(res, ares)
+        try:
+            yield srv
+        finally:
+            dnsmod.set_resolver()
+
+
+def _asn_queries(srv: StubDNSServer):
+    return [q for q, _ in srv.queries]
+
+
+def test_asn_cached(stub):
+    c = DNSCache()
+    assert dnsmod.asn_to_name(210083, cache=c) == 'PRIVEX, SE'
+    assert dnsmod.asn_to_name('AS210083', cache=c) == 'PRIVEX, SE'
+    # Unknown ASNs are negatively cached
+    assert dnsmod.asn_to_name(1, cache=c) == 'Unknown ASN'
+    with pytest.raises(KeyError):
+        dnsmod.asn_to_name('1', quiet=False, cache=c)
+    assert _asn_queries(stub) == ['as210083.asn.cymru.com.', 'as1.asn.cymru.com.']
+    assert dnsmod.asn_to_name(210083, cache=False) == 'PRIVEX, SE' and len(stub.queries) == 3
+    # Invalid AS numbers are never queried
+    assert dnsmod.asn_to_name('nonexistent', cache=c) == 'Unknown ASN' and len(stub.queries) == 3
+
+
+def test_asn_many(stub):
+    c = DNSCache()
+    dnsmod.asn_to_name(15169, cache=c)
+    res = dnsmod.asn_to_name_many(210083, '13335', 'AS210083', 15169, 1, 'invalid', concurrency=4, cache=c)
+    assert res == {
+        210083: 'PRIVEX, SE', 13335: 'CLOUDFLARENET - Cloudflare, Inc., US', 15169: 'GOOGLE - Google LLC, US',
+        1: 'Unknown ASN', 'invalid': 'Unknown ASN',
+    }
+    assert list(res.keys()) == [210083, 13335, 15169, 1, 'invalid']
+    # Duplicates and the cached AS15169 weren't queried again
+    assert sorted(_asn_queries(stub)) == sorted([
+        'as13335.asn.cymru.com.', 'as15169.asn.cymru.com.', 'as1.asn.cymru.com.', 'as210083.asn.cymru.com.'
+    ])
+    with pytest.raises(KeyError):
+        dnsmod.asn_to_name_many([210083, 2], quiet=False, cache=c)
+
+
+async def test_asn_async(stub):
+    c = DNSCache()
+    assert await dnsmod.asn_to_name_async(210083, cache=c) == 'PRIVEX, SE'
+    assert await dnsmod.asn_to_name_async(1, cache=c) == 'Unknown ASN'
+    res = await dnsmod.asn_to_name_many_async(13335, 210083, 13335, 1, cache=c)
+    assert res == {13335: 'CLOUDFLARENET - Cloudflare, Inc., US', 210083: 'PRIVEX, SE', 1: 'Unknown ASN'}
+    assert len(stub.queries) == 3
+    with pytest.raises(KeyError):
+        await dnsmod.asn_to_name_async(2, quiet=False, cache=c)
+
+
+def test_asn_table(stub, tmp_path, monkeypatch):
+    table = tmp_path / 'asn.txt'
+    table.write_text(
+        '# ASN table\n'
+        '64512 EXAMPLE-PRIVATE, ZZ\n'
+        'AS64513,"EXAMPLE, Inc., US"\n'
+        '64514\tTAB EXAMPLE\n'
+        '64515 | SE | ripencc | 2017-05-24 | PIPE EXAMPLE, SE\n'
+        '\n'
+        'not an asn line\n'
+    )
+    monkeypatch.setattr(settings, 'ASN_TABLE_FILE', str(table))
+    monkeypatch.setattr(dnsmod, '_ASN_FILE_LOADED', False)
+    res = dnsmod.asn_to_name_many(64512, 64513, 64514, 'AS64515', cache=False)
+    assert res == {64512: 'EXAMPLE-PRIVATE, ZZ', 64513: 'EXAMPLE, Inc., US', 64514: 'TAB EXAMPLE', 64515: 'PIPE EXAMPLE, SE'}
+    assert stub.queries == []
+    # ASNs which aren't in the table are still looked up via DNS
+    assert dnsmod.asn_to_name(210083, cache=False) == 'PRIVEX, SE'
+    assert dnsmod.load_asn_table(['210083 LOCAL NAME'], replace=True) == 1
+    assert dnsmod.asn_to_name(210083, cache=False) == 'LOCAL NAME' and dnsmod.asn_to_name(64512) == 'Unknown ASN'
+
+
+def test_asn_adapter(stub, monkeypatch):
+    import privex.helpers.cache as cache_mod
+    mc, amc = MemoryCache(), AsyncMemoryCache()
+    monkeypatch.setattr(settings, 'ASN_CACHE_ADAPTER', True)
+    monkeypatch.setattr(cache_mod, 'adapter_get', lambda *args, **kwargs: mc)
+    monkeypatch.setattr(cache_mod, 'async_adapter_get', lambda *args, **kwargs: amc)
+    assert dnsmod.asn_to_name(210083, cache=False) == 'PRIVEX, SE'
+    assert dnsmod.asn_to_name(1, cache=False) == 'Unknown ASN'
+    assert mc.get('pvx_asn:AS210083.asn.cymru.com') == 'PRIVEX, SE' and mc.get('pvx_asn:AS1.asn.cymru.com') == ''
+    # Both names are now answered by the cache adapter
+    assert dnsmod.asn_to_name(210083, cache=False) == 'PRIVEX, SE' and dnsmod.asn_to_name(1, cache=False) == 'Unknown ASN'
+    assert len(stub.queries) == 2
+
+
+async def test_asn_adapter_async(stub, monkeypatch):
+    import privex.helpers.cache as cache_mod
+    amc = AsyncMemoryCache()
+    monkeypatch.setattr(settings, 'ASN_CACHE_ADAPTER', True)
+    monkeypatch.setattr(cache_mod, 'async_adapter_get', lambda *args, **kwargs: amc)
+    assert await dnsmod.asn_to_name_async(13335, cache=False) == 'CLOUDFLARENET - Cloudflare, Inc., US'
+    assert await dnsmod.asn_to_name_async(13335, cache=False) == 'CLOUDFLARENET - Cloudflare, Inc., US'
+    assert len(stub.queries) == 1
+
+
+def test_asn_many_concurrent(stub):
+    seen, lock = set(), threading.Lock()
+    orig = dnsmod._asn_lookup
+
+    def tracking_lookup(qname, family=0):
+        with lock:
+            seen.add(threading.get_ident())
+        return orig(qname, family)
+
+    dnsmod._asn_lookup, nums = tracking_lookup, [210083, 13335, 15169, 1, 2, 3]
+    try:
+        res = dnsmod.asn_to_name_many(nums, concurrency=3, cache=False)
+    finally:
+        dnsmod._asn_lookup = orig
+    assert list(res.keys()) == nums and len(seen) > 1
@@ -182,6 +182,9 @@ class TestMemoryCache(PrivexBaseCase):
         'test_update_timeout',
         'test_update_timeout_noexist',
         'test_cache_remove',
+        'test_many_1',
+        'test_many_2',
+        'test_many_3',
     ]
     """A list of all cache keys used during the test case, so they can be removed by :py:meth:`.tearDown` once done."""
     
@@ -241,6 +244,24 @@ class TestMemoryCache(PrivexBaseCase):
         c.remove(key)
         self.assertIs(c.get(key), None)
 
+    def test_cache_get_set_many(self):
+        """Test that cache.set_many stores multiple keys, and cache.get_many only returns keys that exist"""
+        k1, k2, k3 = self.cache_keys[5:8]
+        c = self.cache
+        c.set_many({k1: 'hello', k2: ['world', 123]}, timeout=30)
+        self.assertEqual(c.get(k1), 'hello')
+        self.assertEqual(c.get_many([k1, k2, k3]), {k1: 'hello', k2: ['world', 123]})
+        self.assertEqual(c.get_many([]), {})
+
+    def test_cache_remove_many(self):
+        """Test that cache.remove_many removes multiple keys, returning the number of keys which existed"""
+        k1, k2, k3 = self.cache_keys[5:8]
+        c = self.cache
+        c.set_many({k1: 'hello', k2: 'world'}, timeout=30)
+        self.assertEqual(c.remove_many([k1, k2, k3]), 2)
+        self.assertEqual(c.get_many([k1, k2, k3]), {})
+        self.assertEqual(c.remove_many([k1]), 0)
+
 
 @pytest.mark.skipif(not HAS_REDIS, reason="TestRedisCache requires package 'redis'")
 class TestRedisCache(TestMemoryCache):
@@ -308,6 +329,26 @@ class TestSqliteCache(TestMemoryCache):
         cls.cache = helpers.cached
 
 
+class TestTieredCache(TestMemoryCache):
+    """
+    :class:`.TieredCache` Test cases for caching related functions/classes in :py:mod:`privex.helpers.cache`
+
+    This is **simply a child class** for :class:`.TestMemoryCache` - but with an overridden :class:`.setUpClass`
+    to ensure the cache adapter is set to :class:`.TieredCache` (backed by SQLite, or a private memory store if
+    ``privex-db`` isn't installed) for this re-run.
+    """
+    
+    cache_keys: list
+    """A list of all cache keys used during the test case, so they can be removed by :py:meth:`.tearDown` once done."""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Set the current cache adapter to an instance of TieredCache() and make it available through ``self.cache``"""
+        l2 = SqliteCache('pvx-helpers-tests.sqlite3') if HAS_SQLITE_CACHE else helpers.MemoryCache(max_entries=10000)
+        helpers.cache.adapter_set(helpers.TieredCache(l2, l1_ttl=1))
+        cls.cache = helpers.cached
+    
+
 class CacheManagerExample(CacheManagerMixin):
     cache_prefix = 'example'
     default_cache_time = 20
@@ -469,3 +510,17 @@ class TestCacheManager(PrivexBaseCase):
         # run testing + lorem again, and assert that the runtime matches non-cached time.
         self._check_testing_method(CacheManagerExample.testing, cmst * 2, self._delta, 'example')
         self._check_testing_method(CacheManagerExample.lorem, cmst, self._delta, 'example')
+
+    def test_z_cache_subclass_settings(self):
+        """Test :func:`.z_cache` resolves cache settings separately for each class calling an inherited wrapped method"""
+        class SubExample(CacheManagerExample):
+            cache_prefix = 'subexample'
+        
+        try:
+            self._check_testing_method(CacheManagerExample.testing, cmst * 2, self._delta, 'sub')
+            # SubExample has a different cache prefix, so it must not share CacheManagerExample's cached result
+            self._check_testing_method(SubExample.testing, cmst * 2, self._delta, 'sub')
+            self._check_testing_method(SubExample.testing, 0.2, self._delta, 'sub')
+            self.assertTrue(all(k.startswith('subexample:') for k in SubExample.get_all_cache_keys()))
+        finally:
+            SubExample.clear_all_cache_keys()
@@ -0,0 +1,101 @@
+"""
+Test cases for the shared dnspython resolver backend in :py:mod:`privex.helpers.net.dns` - used by :func:`.resolve_ips`,
+:func:`.get_rdns`, :func:`.asn_to_name` and their AsyncIO versions.
+
+These run against :class:`tests.dns_stub.StubDNSServer` on localhost, so they don't require network access.
+"""
+import socket
+
+import pytest
+
+pytest.importorskip('dns.asyncresolver')
+
+from dns.asyncresolver import Resolver as AsyncResolver
+from dns.resolver import Resolver
+
+from privex.helpers import settings
+from privex.helpers.exceptions import InvalidHost, ReverseDNSNotFound
+from privex.helpers.net import dns as dnsmod
+from privex.helpers.net.dns import DNSCache
+from tests.dns_stub import StubDNSServer
+
+RECORDS = {
+    ('stub.test', 'A'): (120, ['192.0.2.10']),
+    ('stub.test', 'AAAA'): (300, ['2001:db8::10']),
+    ('v4only.test', 'A'): (60, ['192.0.2.20']),
+    ('10.2.0.192.in-addr.arpa', 'PTR'): (60, ['stub.test.']),
+    (dnsmod.ip_to_rdns('2001:db8::10'), 'PTR'): (60, ['stub.test.']),
+    ('AS210083.asn.cymru.com', 'TXT'): (60, ['"210083 | SE | ripencc | 2017-05-24 | PRIVEX, SE"']),
+}
+
+
+def _no_system_resolver(*args, **kwargs):
+    raise AssertionError('the system resolver should not be used')
+
+
+@pytest.fixture()
+def stub(monkeypatch):
+    with StubDNSServer(RECORDS) as srv:
+        res, ares = Resolver(configure=False), AsyncResolver(configure=False)
+        for r in [res, ares]:
+            r.nameservers, r.port, r.lifetime = ['127.0.0.1'], srv.port, 2.0
+        monkeypatch.setattr(settings, 'DNS_BACKEND', 'dnspython')
+        monkeypatch.setattr(socket, 'getaddrinfo', _no_system_resolver)
+        monkeypatch.setattr(socket, 'gethostbyaddr', _no_system_resolver)
+        dnsmod.set_resolver(res, ares)
+        try:
+            yield srv
+        finally:
+            dnsmod.set_resolver()
+
+
+def test_resolve_ips(stub):
+    assert dnsmod.resolve_ips('stub.test', cache=False) == ['2001:db8::10', '192.0.2.10']
+    assert dnsmod.resolve_ips('stub.test', 'v4', cache=False) == ['192.0.2.10']
+    assert dnsmod.resolve_ips('v4only.test', 'v6', cache=False) == []
+    c = DNSCache(max_ttl=3600)
+    dnsmod.resolve_ips('stub.test', cache=c)
+    # The lowest TTL of the A / AAAA records is used by the cache
+    assert c._entries[('stub.test', 0)][0] - dnsmod.time.monotonic() == pytest.approx(120, abs=5)
+
+
+async def test_resolve_ips_async(stub):
+    assert await dnsmod.resolve_ips_async('stub.test', cache=False) == ['2001:db8::10', '192.0.2.10']
+    assert await dnsmod.resolve_ips_async('v4only.test', 'v4', cache=False) == ['192.0.2.20']
+    assert ('v4only.test.', 'A') in stub.queries
+
+
+def test_get_rdns(stub):
+    assert dnsmod.get_rdns('192.0.2.10') == 'stub.test'
+    assert dnsmod.get_rdns('2001:db8::10') == 'stub.test'
+    # Domains are resolved first, then the PTR of the first IP is looked up
+    assert dnsmod.get_rdns('stub.test') == 'stub.test'
+    with pytest.raises(ReverseDNSNotFound):
+        dnsmod.get_rdns('1.2.3.4')
+    assert dnsmod.get_rdns('1.2.3.4', throw=False) is None
+    with pytest.raises(InvalidHost):
+        dnsmod.get_rdns('missing.test')
+
+
+async def test_get_rdns_async(stub):
+    assert await dnsmod.get_rdns_async('192.0.2.10') == 'stub.test'
+    assert await dnsmod.get_rdns_async('stub.test', version='v4') == 'stub.test'
+    assert await dnsmod.get_rdns_async('1.2.3.4', throw=False) is None
+
+
+def test_asn_to_name(stub):
+    assert dnsmod.asn_to_name(210083) == 'PRIVEX, SE'
+    assert dnsmod.asn_to_name('1') == 'Unknown ASN'
+    with pytest.raises(KeyError):
+        dnsmod.asn_to_name(1, quiet=False)
+
+
+def test_shared_resolver_from_settings(monkeypatch, stub):
+    monkeypatch.setattr(settings, 'DNS_NAMESERVERS', '127.0.0.1')
+    monkeypatch.setattr(settings, 'DNS_PORT', stub.port)
+    monkeypatch.setattr(settings, 'DNS_TIMEOUT', 2.0)
+    dnsmod.set_resolver()
+    res = dnsmod.get_resolver()
+    assert res is dnsmod.get_resolver() and dnsmod.get_async_resolver() is dnsmod.get_async_resolver()
+    assert res.port == stub.port and res.lifetime == 2.0
+    assert dnsmod.resolve_ips('stub.test', 'v6', cache=False) == ['2001:db8::10']
@@ -0,0 +1,194 @@
+"""
+Test cases for :class:`.DNSCache` and its use by :func:`.resolve_ips` / :func:`.resolve_ips_async`
+
+These use fake lookup functions / a patched ``getaddrinfo``, so they don't require network access.
+"""
+import asyncio
+import socket
+import threading
+import time
+
+import pytest
+
+from privex.helpers import plugin, settings
+from privex.helpers.net import dns as dnsmod
+from privex.helpers.net.dns import DNSCache, resolve_ips, resolve_ips_async
+from privex.helpers.types import NO_RESULT
+
+
+class FakeGAI:
+    """Imitates :func:`socket.getaddrinfo` for a few fake hostnames, counting each lookup"""
+    HOSTS = {
+        'example.test': ['2001:db8::1', '192.0.2.1'],
+        'v4only.test': ['::ffff:192.0.2.2', '192.0.2.2'],
+    }
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, host, port, family=0, type=0, proto=0, flags=0):
+        self.calls.append(host)
+        if host == 'flaky.test':
+            raise socket.gaierror(socket.EAI_AGAIN, 'Temporary failure in name resolution')
+        if host not in self.HOSTS:
+            raise socket.gaierror(socket.EAI_NONAME, 'Name or service not known')
+        ips = [ip for ip in self.HOSTS[host] if family != socket.AF_INET or ':' not in ip]
+        return [(socket.AF_INET6 if ':' in ip else socket.AF_INET, socket.SOCK_STREAM, proto, '', (ip, port)) for ip in ips]
+
+
+@pytest.fixture()
+def gai(monkeypatch):
+    g = FakeGAI()
+    monkeypatch.setattr(socket, 'getaddrinfo', g)
+    monkeypatch.setattr(settings, 'DNS_BACKEND', 'system')
+    return g
+
+
+def test_ttl_and_negative():
+    c = DNSCache(default_ttl=60, negative_ttl=0.05)
+    c.set('example.test', 0, ['192.0.2.1'])
+    c.set('missing.test', 0, [])
+    assert c.get('EXAMPLE.test.') == ['192.0.2.1']
+    assert c.get('missing.test') == [] and 'missing.test' in c
+    assert c.get('example.test', socket.AF_INET6) is NO_RESULT
+    time.sleep(0.1)
+    assert c.get('missing.test') is NO_RESULT and len(c) == 1
+    # Record TTLs are clamped, and TTL 0 records aren't cached
+    c = DNSCache(min_ttl=0, max_ttl=10)
+    c.set('zero.test', 0, ['192.0.2.1'], ttl=0)
+    c.set('long.test', 0, ['192.0.2.1'], ttl=86400)
+    assert c.get('zero.test') is NO_RESULT
+    assert c._entries[('long.test', 0)][0] <= time.monotonic() + 10
+
+
+def test_size_bound():
+    c = DNSCache(max_entries=2)
+    c.set('a.test', 0, ['192.0.2.1'])
+    c.set('b.test', 0, ['192.0.2.2'])
+    c.get('a.test')
+    c.set('c.test', 0, ['192.0.2.3'])
+    # b.test was the least recently used
+    assert len(c) == 2 and c.get('b.test') is NO_RESULT and c.get('a.test') == ['192.0.2.1']
+    c.remove('a.test')
+    assert 'a.test' not in c
+    c.clear()
+    assert len(c) == 0
+
+
+def test_resolve_ips_cached(gai):
+    c = DNSCache()
+    assert resolve_ips('example.test', cache=c) == ['2001:db8::1', '192.0.2.1']
+    assert resolve_ips('example.test', cache=c) == ['2001:db8::1', '192.0.2.1']
+    assert resolve_ips('example.test', 'v4', cache=c) == ['192.0.2.1']
+    assert resolve_ips('v4only.test', 'v6', cache=c) == ['192.0.2.2']
+    assert resolve_ips('v4only.test', 'v6', v4_convert=True, cache=c) == ['::ffff:192.0.2.2', '192.0.2.2']
+    assert gai.calls == ['example.test', 'example.test', 'v4only.test']
+    assert (c.hits, c.misses) == (2, 3)
+    assert resolve_ips('example.test', cache=False) == ['2001:db8::1', '192.0.2.1']
+    assert len(gai.calls) == 4
+
+
+def test_resolve_ips_negative(gai):
+    c = DNSCache(negative_ttl=60)
+    assert resolve_ips('missing.test', cache=c) == []
+    assert resolve_ips('missing.test', cache=c) == []
+    assert gai.calls == ['missing.test']
+    # Temporary failures aren't cached
+    assert resolve_ips('flaky.test', cache=c) == []
+    assert resolve_ips('flaky.test', cache=c) == []
+    assert gai.calls.count('flaky.test') == 2
+
+
+def test_dnspython_ttl(monkeypatch, gai):
+    calls = []
+
+    def fake_lookup(addr, family):
+        calls.append(addr)
+        return (['192.0.2.10'], 5) if addr == 'ttl.test' else ([], None)
+
+    monkeypatch.setattr(plugin, 'HAS_DNSPYTHON', True)
+    monkeypatch.setattr(settings, 'DNS_BACKEND', 'dnspython')
+    monkeypatch.setattr(dnsmod, '_dnspython_lookup', fake_lookup)
+    c = DNSCache(default_ttl=3600)
+    assert resolve_ips('ttl.test', 'v4', cache=c) == ['192.0.2.10']
+    assert c._entries[('ttl.test', socket.AF_INET)][0] <= time.monotonic() + 5
+    # Names that dnspython can't resolve fall back to getaddrinfo, and use the default TTL
+    assert resolve_ips('example.test', 'v4', cache=c) == ['192.0.2.1']
+    assert calls == ['ttl.test', 'example.test'] and gai.calls == ['example.test']
+
+
+def test_auto_backend_hosts_file(monkeypatch, tmp_path):
+    # dnspython is used by default, but names / IPs in the hosts file go to the system resolver so overrides are respected
+    hosts = tmp_path / 'hosts'
+    hosts.write_text('127.0.0.1 localhost\n192.0.2.1 example.test  # override\n2001:DB8:0::5 v6host.test\n')
+    g, calls = FakeGAI(), []
+    monkeypatch.setattr(socket, 'getaddrinfo', g)
+    monkeypatch.setattr(plugin, 'HAS_DNSPYTHON', True)
+    monkeypatch.setattr(settings, 'DNS_HOSTS_FILE', str(hosts))
+    monkeypatch.setattr(dnsmod, '_dnspython_lookup', lambda addr, family: calls.append(addr) or (['198.51.100.1'], 30))
+    assert settings.DNS_BACKEND == 'auto'
+    assert resolve_ips('example.test', 'v4', cache=False) == ['192.0.2.1']
+    assert resolve_ips('public.test', 'v4', cache=False) == ['198.51.100.1']
+    assert g.calls == ['example.test'] and calls == ['public.test']
+    assert dnsmod._in_hosts_file('EXAMPLE.test.') and dnsmod._in_hosts_file('2001:db8::5')
+    assert not dnsmod._in_hosts_file('public.test')
+    # The 'dnspython' backend doesn't check the hosts file
+    monkeypatch.setattr(settings, 'DNS_BACKEND', 'dnspython')
+    assert resolve_ips('example.test', 'v4', cache=False) == ['198.51.100.1']
+
+
+def test_single_flight_threads():
+    calls, c = [], DNSCache()
+
+    def slow_lookup(host, family):
+        calls.append(host)
+        time.sleep(0.2)
+        return ['192.0.2.1'], None
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(c.resolve('slow.test', 0, slow_lookup))) for _ in range(8)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert calls == ['slow.test'] and results == [['192.0.2.1']] * 8
+
+
+def test_single_flight_error():
+    calls, c = [], DNSCache()
+
+    def broken_lookup(host, family):
+        calls.append(host)
+        time.sleep(0.1)
+        raise socket.gaierror(socket.EAI_AGAIN, 'Temporary failure in name resolution')
+
+    errors = []
+
+    def run():
+        try:
+            c.resolve('broken.test', 0, broken_lookup)
+        except socket.gaierror as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert len(calls) == 1 and len(errors) == 4 and len(c) == 0
+
+
+async def test_single_flight_async():
+    calls, c = [], DNSCache()
+
+    async def slow_lookup(host, family):
+        calls.append(host)
+        await asyncio.sleep(0.1)
+        return ['192.0.2.1'], None
+
+    res = await asyncio.gather(*[c.resolve_async('slow.test', 0, slow_lookup) for _ in range(10)])
+    assert calls == ['slow.test'] and res == [['192.0.2.1']] * 10
+    assert await c.resolve_async('slow.test', 0, slow_lookup) == ['192.0.2.1'] and c.hits == 1
+
+
+async def test_shared_sync_async(gai):
+    c = DNSCache()
+    assert await resolve_ips_async('example.test', 'v4', cache=c) == ['192.0.2.1']
+    assert resolve_ips('example.test', 'v4', cache=c) == ['192.0.2.1']
+    assert gai.calls == ['example.test']
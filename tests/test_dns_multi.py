@@ -0,0 +1,176 @@
+"""
+Test cases for the concurrent modes of :func:`.resolve_ips_multi`, :func:`.resolve_ips_multi_async`, :func:`.get_rdns_multi`
+and :func:`.get_rdns_multi_async`
+
+The lookup functions are replaced with fakes which sleep for a set time per host, so these don't require network access.
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from privex.helpers.net import dns as dnsmod
+
+DELAYS = {'slow.test': 0.3, 'timeout.test': 2.0}
+
+
+class FakeLookup:
+    """Fake ``resolve_ips`` / ``get_rdns`` - sleeps for :attr:`.DELAYS` (default 0.1s), and tracks the peak concurrency"""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running, self.peak = 0, 0
+
+    def _enter(self):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+
+    def _exit(self):
+        with self.lock:
+            self.running -= 1
+
+    def __call__(self, addr, *args, **kwargs):
+        self._enter()
+        try:
+            time.sleep(DELAYS.get(addr, 0.1))
+            return [f'ip-of-{addr}']
+        finally:
+            self._exit()
+
+    async def run_async(self, addr, *args, **kwargs):
+        self._enter()
+        try:
+            await asyncio.sleep(DELAYS.get(addr, 0.1))
+            return [f'ip-of-{addr}']
+        finally:
+            self._exit()
+
+
+@pytest.fixture()
+def fake(monkeypatch):
+    f = FakeLookup()
+    monkeypatch.setattr(dnsmod, 'resolve_ips', f)
+    monkeypatch.setattr(dnsmod, 'resolve_ips_async', f.run_async)
+    monkeypatch.setattr(dnsmod, 'get_rdns', f)
+    monkeypatch.setattr(dnsmod, 'get_rdns_async', f.run_async)
+    return f
+
+
+def test_resolve_multi_ordered(fake):
+    hosts = [f'host{i}.test' for i in range(20)]
+    start = time.monotonic()
+    res = list(dnsmod.resolve_ips_multi(*hosts, concurrency=10))
+    assert time.monotonic() - start < 1.0
+    assert [h for h, _ in res] == hosts and res[3] == ('host3.test', ['ip-of-host3.test'])
+    assert fake.peak == 10
+
+
+def test_resolve_multi_completion_order(fake):
+    res = [h for h, _ in dnsmod.resolve_ips_multi('slow.test', 'a.test', 'b.test', concurrency=3, ordered=False)]
+    assert res[-1] == 'slow.test' and sorted(res[:2]) == ['a.test', 'b.test']
+
+
+def test_resolve_multi_sequential(fake):
+    res = dict(dnsmod.resolve_ips_multi('a.test', 'b.test', concurrency=1))
+    assert res == {'a.test': ['ip-of-a.test'], 'b.test': ['ip-of-b.test']}
+    assert fake.peak == 1
+
+
+def test_resolve_multi_timeout(fake):
+    start = time.monotonic()
+    res = dict(dnsmod.resolve_ips_multi('timeout.test', 'a.test', concurrency=2, timeout=0.3))
+    assert time.monotonic() - start < 1.0
+    assert res == {'timeout.test': None, 'a.test': ['ip-of-a.test']}
+
+
+def test_resolve_multi_hung_lookups(monkeypatch):
+    # Lookups which hang forever must not hold up the healthy hosts queued behind them
+    release = threading.Event()
+
+    def lookup(addr, *args, **kwargs):
+        if addr.startswith('hung'): release.wait()
+        return [f'ip-of-{addr}']
+
+    monkeypatch.setattr(dnsmod, 'resolve_ips', lookup)
+    hosts = ['hung1.test', 'hung2.test'] + [f'host{i}.test' for i in range(6)]
+    try:
+        for ordered in [True, False]:
+            res = dict(dnsmod.resolve_ips_multi(*hosts, concurrency=2, timeout=0.3, ordered=ordered))
+            assert res['hung1.test'] is None and res['hung2.test'] is None
+            assert all(res[h] == [f'ip-of-{h}'] for h in hosts[2:]), f"healthy hosts timed out (ordered={ordered}): {res}"
+    finally:
+        release.set()
+
+
+def test_resolve_multi_abandoned_cap(monkeypatch):
+    # Workers stuck on timed out lookups are only replaced up to DNS_MULTI_MAX_ABANDONED times
+    release, started = threading.Event(), []
+
+    def lookup(addr, *args, **kwargs):
+        started.append(addr)
+        release.wait()
+        return [f'ip-of-{addr}']
+
+    monkeypatch.setattr(dnsmod, 'resolve_ips', lookup)
+    monkeypatch.setattr(dnsmod.settings, 'DNS_MULTI_MAX_ABANDONED', 1)
+    hosts = [f'hung{i}.test' for i in range(5)]
+    try:
+        res = dict(dnsmod.resolve_ips_multi(*hosts, concurrency=2, timeout=0.2))
+        assert all(v is None for v in res.values()) and len(res) == 5
+        # 2 workers, plus 1 replacement - the last 2 hosts time out waiting for a free worker, without being started
+        assert len(started) == 3
+    finally:
+        release.set()
+
+
+def test_resolve_multi_streaming(fake):
+    pulled = []
+
+    def gen():
+        for i in range(1000):
+            pulled.append(i)
+            yield f'host{i}.test'
+
+    res = dnsmod.resolve_ips_multi(gen(), concurrency=5)
+    first = next(res)
+    assert first == ('host0.test', ['ip-of-host0.test'])
+    # Only a window of hosts is read from the input, rather than all 1000 up front
+    assert len(pulled) <= 6
+    res.close()
+
+
+def test_get_rdns_multi(fake):
+    res = list(dnsmod.get_rdns_multi('a.test', 'timeout.test', 'b.test', concurrency=3, timeout=0.3))
+    assert res == [('a.test', ['ip-of-a.test']), ('timeout.test', None), ('b.test', ['ip-of-b.test'])]
+    with pytest.raises(TimeoutError):
+        list(dnsmod.get_rdns_multi('timeout.test', throw=True, concurrency=2, timeout=0.1))
+
+
+async def test_resolve_multi_async(fake):
+    hosts = [f'host{i}.test' for i in range(50)]
+    start = time.monotonic()
+    res = [x async for x in dnsmod.resolve_ips_multi_async(*hosts, concurrency=25)]
+    assert time.monotonic() - start < 1.0
+    assert [h for h, _ in res] == hosts and fake.peak == 25
+
+
+async def test_resolve_multi_async_completion_timeout(fake):
+    res = [x async for x in dnsmod.resolve_ips_multi_async(
+        'timeout.test', 'slow.test', 'a.test', concurrency=3, timeout=0.5, ordered=False
+    )]
+    assert res == [('a.test', ['ip-of-a.test']), ('slow.test', ['ip-of-slow.test']), ('timeout.test', None)]
+    # The timed out lookup was cancelled, rather than left running
+    assert fake.running == 0
+
+
+async def test_get_rdns_multi_async_iterable(fake):
+    async def agen():
+        for i in range(10):
+            yield f'host{i}.test'
+
+    res = [x async for x in dnsmod.get_rdns_multi_async(agen(), concurrency=4)]
+    assert [h for h, _ in res] == [f'host{i}.test' for i in range(10)]
+    assert fake.peak == 4
+    with pytest.raises(TimeoutError):
+        [x async for x in dnsmod.get_rdns_multi_async('timeout.test', throw=True, timeout=0.1)]
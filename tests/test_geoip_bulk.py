@@ -0,0 +1,179 @@
+"""
+Test cases for the bulk lookup functions, :class:`.GeoIPCache` and :class:`.GeoIPPrefixCache` in :py:mod:`privex.helpers.geoip`
+
+These use a fake GeoIP2 reader, so unlike ``tests/test_geoip.py`` they don't require the GeoLite2 databases - only the
+``geoip2`` package.
+"""
+from ipaddress import ip_address, ip_network
+from types import SimpleNamespace
+
+import os
+
+import pytest
+
+pytest.importorskip('geoip2')
+
+import geoip2.errors
+
+from privex.helpers import geoip, plugin
+from privex.helpers.exceptions import GeoIPAddressNotFound
+from privex.helpers.types import NO_RESULT
+
+NETWORKS = {
+    ip_network('10.0.0.0/24'): ('Sweden', 'SE', 'Stockholm', 210083, 'Privex Inc.'),
+    ip_network('10.0.1.0/24'): ('Finland', 'FI', 'Helsinki', 24940, 'Hetzner Online GmbH'),
+    ip_network('2a07:e00::/32'): ('Sweden', 'SE', 'Stockholm', 210083, 'Privex Inc.'),
+}
+
+
+class FakeReader:
+    """Imitates :class:`geoip2.database.Reader` for the networks in :attr:`.NETWORKS`, counting each lookup"""
+    def __init__(self):
+        self.lookups = []
+
+    def _find(self, addr):
+        ip = ip_address(addr)
+        self.lookups.append(addr)
+        for net, data in NETWORKS.items():
+            if ip in net: return net, data
+        # Unknown addresses are reported as being within an empty /16 (IPv4) or /32 (IPv6)
+        raise geoip2.errors.AddressNotFoundError(
+            f"The address {addr} is not in the database.", addr, 16 if ip.version == 4 else 32
+        )
+
+    def city(self, addr):
+        net, (country, code, city, _, _) = self._find(addr)
+        return SimpleNamespace(
+            country=SimpleNamespace(iso_code=code, names={'en': country}), city=SimpleNamespace(names={'en': city}),
+            postal=SimpleNamespace(code=None), location=SimpleNamespace(longitude=1.0, latitude=2.0),
+            traits=SimpleNamespace(network=net),
+        )
+
+    def asn(self, addr):
+        net, (_, _, _, asn, as_name) = self._find(addr)
+        return SimpleNamespace(
+            autonomous_system_organization=as_name, autonomous_system_number=asn, network=net, ip_address=addr
+        )
+
+
+@pytest.fixture()
+def reader(monkeypatch):
+    r = FakeReader()
+    monkeypatch.setattr(plugin, 'get_geoip', lambda geo_type, *args, **kwargs: r)
+    return r
+
+
+def test_bulk_dedup_and_order(reader):
+    ips = ['10.0.0.5', '10.0.1.7', '10.0.0.5', '192.168.1.1', '2a07:e00::333']
+    res = list(geoip.geolocate_bulk(ips, cache=False, workers=1))
+    assert [ip for ip, _ in res] == ['10.0.0.5', '10.0.1.7', '192.168.1.1', '2a07:e00::333']
+    data = dict(res)
+    assert data['10.0.0.5'].country == 'Sweden' and data['10.0.0.5'].as_number == 210083
+    assert data['10.0.1.7'].city == 'Helsinki'
+    assert data['192.168.1.1'] is None
+    assert reader.lookups.count('10.0.0.5') == 2      # One City + one ASN lookup
+
+
+def test_bulk_network_cache(reader):
+    cache = geoip.GeoIPCache(max_entries=100)
+    res = dict(geoip.geolocate_bulk([f'10.0.0.{i}' for i in range(1, 51)], cache=cache, workers=1))
+    # Only the first IP needs database lookups - the rest are inside of the cached 10.0.0.0/24 network
+    assert len(reader.lookups) == 2
+    assert res['10.0.0.50'].ip_address == '10.0.0.50' and res['10.0.0.50'].as_name == 'Privex Inc.'
+    assert (cache.hits, cache.misses) == (49, 1)
+    assert cache.get('10.0.1.1') is NO_RESULT
+
+
+def test_bulk_threaded(reader):
+    ips = [f'10.0.{i % 2}.{i % 250}' for i in range(1000)] + ['172.16.0.1']
+    res = dict(geoip.geolocate_bulk(ips, cache=geoip.GeoIPCache(by_network=False), workers=4, chunk_size=50))
+    assert len(res) == len(set(ips))
+    assert res['10.0.1.3'].country_code == 'FI' and res['172.16.0.1'] is None
+
+
+def test_bulk_throw(reader):
+    with pytest.raises(GeoIPAddressNotFound):
+        list(geoip.geolocate_bulk(['10.0.0.1', '172.16.0.1'], throw=True, cache=False, workers=1))
+    with pytest.raises(ValueError):
+        list(geoip.geolocate_bulk(['not an ip'], throw=True, cache=False, workers=1))
+    assert dict(geoip.geolocate_bulk(['not an ip'], cache=False, workers=1)) == {'not an ip': None}
+
+
+def test_cache_bounded():
+    cache = geoip.GeoIPCache(max_entries=2)
+    res = geoip.GeoIPResult(country='Sweden', network=ip_network('10.0.0.0/24'))
+    cache.set('10.0.0.1', res)
+    cache.set('10.0.5.1', None)
+    cache.set('10.0.6.1', None)
+    assert len(cache) == 2 and '10.0.0.1' not in cache._ips
+    # The 10.0.0.0/24 network is still cached, even though the IP itself was evicted
+    assert cache.get('10.0.0.99').country == 'Sweden'
+    cache.clear()
+    assert len(cache) == 0 and cache.get('10.0.0.99') is NO_RESULT
+
+
+async def test_bulk_async(reader):
+    cache = geoip.GeoIPCache()
+    cache.set('10.0.1.1', None)
+    ips = ['10.0.0.1', '10.0.0.2', '10.0.1.1', '2a07:e00::1', '10.0.0.1']
+    res = [r async for r in geoip.geolocate_bulk_async(ips, cache=cache, chunk_size=2)]
+    assert len(res) == 4
+    # Cached results are returned first
+    assert res[0] == ('10.0.1.1', None)
+    data = dict(res)
+    assert data['10.0.0.2'].country == 'Sweden' and data['2a07:e00::1'].as_number == 210083
+    assert cache.get('10.0.0.2').country == 'Sweden'
+
+
+def test_prefix_cache_hits(reader):
+    pc = geoip.GeoIPPrefixCache(max_networks=100, check_interval=0)
+    res = geoip.geolocate_ip('10.0.0.1', prefix_cache=pc)
+    assert res.country == 'Sweden' and len(reader.lookups) == 2
+    for i in range(2, 50):
+        r = geoip.geolocate_ip(f'10.0.0.{i}', prefix_cache=pc)
+        assert r.ip_address == f'10.0.0.{i}' and r.as_name == 'Privex Inc.'
+    assert geoip.geolocate_ip('10.0.1.1', prefix_cache=pc).country == 'Finland'
+    assert geoip.geolocate_ip('2a07:e00::1', prefix_cache=pc).as_number == 210083
+    assert geoip.geolocate_ip('2a07:e00:1234::5', prefix_cache=pc).country_code == 'SE'
+    # Only the first IP of each network needs database lookups
+    assert len(reader.lookups) == 6
+    assert (pc.hits, pc.misses, len(pc)) == (49, 3, 3)
+    assert pc.get('10.0.2.1') is NO_RESULT and pc.get('2a07:e01::1') is NO_RESULT
+
+
+def test_prefix_cache_negative(reader):
+    pc = geoip.GeoIPPrefixCache(max_networks=100, check_interval=0)
+    assert geoip.geolocate_ip('192.168.1.1', throw=False, prefix_cache=pc) is None
+    with pytest.raises(GeoIPAddressNotFound):
+        geoip.geolocate_ip('192.168.55.3', prefix_cache=pc)
+    assert len(reader.lookups) == 1
+    assert pc.get('192.168.200.200') is None and pc.get('192.169.0.1') is NO_RESULT
+
+
+def test_prefix_cache_longest_match_and_eviction():
+    pc = geoip.GeoIPPrefixCache(max_networks=2, check_interval=0)
+    pc.set('10.0.0.0/8', geoip.GeoIPResult(country='Wide'))
+    pc.set('10.1.0.0/16', geoip.GeoIPResult(country='Narrow'))
+    assert pc.get('10.1.2.3').country == 'Narrow' and pc.get('10.2.0.1').country == 'Wide'
+    # 10.1.0.0/16 is the least recently used, so it's evicted first
+    pc.set('172.16.0.0/12', None)
+    assert len(pc) == 2 and pc.get('10.1.2.3').country == 'Wide'
+    pc.set('10.1.0.0/16', geoip.GeoIPResult(country='Narrow'))
+    assert len(pc) == 2 and pc.get('172.16.0.1') is NO_RESULT
+    pc.clear()
+    assert len(pc) == 0 and pc.get('10.1.2.3') is NO_RESULT
+    assert pc._roots[4][0] is None and pc._roots[4][1] is None
+
+
+def test_prefix_cache_file_change(tmp_path):
+    db = tmp_path / 'GeoLite2-City.mmdb'
+    db.write_bytes(b'v1')
+    changes = []
+    pc = geoip.GeoIPPrefixCache(watch_files=[str(db)], check_interval=0, on_change=lambda: changes.append(1))
+    assert pc.check_files() is False
+    pc.set('10.0.0.0/24', geoip.GeoIPResult(country='Sweden'))
+    assert pc.check_files() is False and len(pc) == 1
+    st = os.stat(db)
+    os.utime(db, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert pc.check_files() is True
+    assert len(pc) == 0 and pc.get('10.0.0.1') is NO_RESULT and changes == [1]
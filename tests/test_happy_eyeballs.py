@@ -0,0 +1,160 @@
+"""
+Test cases for Happy Eyeballs (RFC 8305) connection racing - :func:`.happy_eyeballs_connect` /
+:func:`.happy_eyeballs_connect_async`, and their use by :class:`.SocketWrapper`, :class:`.AsyncSocketWrapper`,
+:func:`.check_host` and :func:`.send_data`.
+
+Hostnames are "resolved" by patching ``resolve_ips`` / ``resolve_ips_async``, and connections are made to a TCP server
+on localhost, so these don't require network access.
+"""
+import socket
+import threading
+import time
+
+import pytest
+
+from privex.helpers import settings
+from privex.helpers.net import common as netcommon, socket as netsock
+from privex.helpers.net.socket import AsyncSocketWrapper, SocketWrapper, happy_eyeballs_connect, happy_eyeballs_connect_async
+
+BLACKHOLE = '127.0.0.2'
+
+
+class GreetingServer:
+    """A TCP server on localhost which reads whatever the client sends (if anything), replies ``hello`` and disconnects"""
+    def __init__(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.bind(('127.0.0.1', 0))
+        self.sock.listen(16)
+        self.sock.settimeout(0.1)
+        self.port = self.sock.getsockname()[1]
+        self.received = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self):
+        while not self._stop.is_set():
+            try:
+                conn, _ = self.sock.accept()
+            except socket.timeout:
+                continue
+            with conn:
+                conn.settimeout(0.3)
+                try:
+                    self.received.append(conn.recv(64))
+                except socket.timeout:
+                    pass
+                conn.sendall(b'hello\n')
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.sock.close()
+
+
+@pytest.fixture()
+def server():
+    srv = GreetingServer()
+    # A listener on BLACKHOLE with a full backlog, so connections to it hang - like a host with broken IPv6
+    bh = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    bh.bind((BLACKHOLE, srv.port))
+    bh.listen(0)
+    fillers = [socket.socket(socket.AF_INET, socket.SOCK_STREAM) for _ in range(3)]
+    for f in fillers:
+        f.setblocking(False)
+        f.connect_ex((BLACKHOLE, srv.port))
+    yield srv
+    for f in fillers + [bh]:
+        f.close()
+    srv.stop()
+
+
+@pytest.fixture()
+def hosts(monkeypatch):
+    """Fake DNS records for ``*.test`` hostnames, used in place of :func:`.resolve_ips`"""
+    records = {}
+
+    def fake_resolve(addr, version='any', *args, **kwargs):
+        return list(records.get(addr, [addr]))
+
+    async def fake_resolve_async(addr, version='any', *args, **kwargs):
+        return fake_resolve(addr, version)
+
+    monkeypatch.setattr(netsock, 'resolve_ips', fake_resolve)
+    monkeypatch.setattr(netsock, 'resolve_ips_async', fake_resolve_async)
+    monkeypatch.setattr(settings, 'HAPPY_EYEBALLS', True)
+    return records
+
+
+def test_order():
+    ips = ['2001:db8::1', '2001:db8::2', '2001:db8::3', '192.0.2.1', '192.0.2.2']
+    assert netsock._he_order(ips) == ['2001:db8::1', '192.0.2.1', '2001:db8::2', '192.0.2.2', '2001:db8::3']
+    assert netsock._he_order(['192.0.2.1', '2001:db8::1']) == ['192.0.2.1', '2001:db8::1']
+    with pytest.raises(socket.gaierror):
+        netsock._he_order([], 'missing.test')
+
+
+def test_connect_races(server, hosts):
+    # A hanging address is raced against a working one, instead of waiting for it to time out
+    hosts['dual.test'] = [BLACKHOLE, '127.0.0.1']
+    start = time.monotonic()
+    with happy_eyeballs_connect('dual.test', server.port, timeout=10, delay=0.2) as s:
+        assert s.getpeername()[0] == '127.0.0.1' and s.gettimeout() == 10
+        assert s.recv(16) == b'hello\n'
+    assert 0.2 <= time.monotonic() - start < 2
+
+
+def test_connect_errors(server, hosts):
+    closed = socket.socket()
+    closed.bind(('127.0.0.1', 0))
+    port = closed.getsockname()[1]
+    closed.close()
+    with pytest.raises(ConnectionRefusedError):
+        happy_eyeballs_connect('127.0.0.1', port, timeout=5)
+    hosts['missing.test'] = []
+    with pytest.raises(socket.gaierror):
+        happy_eyeballs_connect('missing.test', server.port)
+    hosts['dead.test'] = [BLACKHOLE]
+    with pytest.raises(socket.timeout):
+        happy_eyeballs_connect('dead.test', server.port, timeout=0.3)
+
+
+async def test_connect_async(server, hosts):
+    hosts['dual.test'] = [BLACKHOLE, '127.0.0.1']
+    start = time.monotonic()
+    s = await happy_eyeballs_connect_async('dual.test', server.port, timeout=10, delay=0.2)
+    with s:
+        assert s.getpeername()[0] == '127.0.0.1'
+    assert 0.2 <= time.monotonic() - start < 2
+    hosts['dead.test'] = [BLACKHOLE]
+    with pytest.raises(socket.timeout):
+        await happy_eyeballs_connect_async('dead.test', server.port, timeout=0.3)
+
+
+def test_socket_wrapper(server, hosts):
+    hosts['dual.test'] = [BLACKHOLE, '127.0.0.1']
+    sw = SocketWrapper('dual.test', server.port, timeout=10)
+    assert sw.tracker.happy_eyeballs
+    assert sw.query('hi') == 'hello'
+    assert sw.tracker.family == socket.AF_INET
+    assert not SocketWrapper('dual.test', server.port, happy_eyeballs=False).tracker.happy_eyeballs
+    assert not SocketWrapper('127.0.0.1', server.port).tracker.happy_eyeballs
+
+
+async def test_async_socket_wrapper(server, hosts):
+    hosts['dual.test'] = [BLACKHOLE, '127.0.0.1']
+    sw = AsyncSocketWrapper('dual.test', server.port, timeout=10)
+    assert await sw.query('hi') == 'hello'
+
+
+def test_check_host_send_data(server, hosts):
+    hosts['dual.test'] = [BLACKHOLE, '127.0.0.1']
+    assert netcommon.check_host('dual.test', server.port, timeout=10)
+    assert netsock.send_data('dual.test', server.port, 'ping', timeout=10) == 'hello'
+    assert b'ping' in server.received
+
+
+async def test_check_host_send_data_async(server, hosts):
+    hosts['dual.test'] = [BLACKHOLE, '127.0.0.1']
+    assert await netcommon.check_host_async('dual.test', server.port, timeout=10)
+    assert await netsock.send_data_async('dual.test', server.port, 'ping', timeout=10) == 'hello'
@@ -0,0 +1,121 @@
+"""
+Test cases for the lazy loading of submodules by :py:mod:`privex.helpers` (``privex/helpers/__init__.py``), including
+a ``python -X importtime`` startup benchmark with a regression budget.
+
+The budget defaults to 200ms for ``import privex.helpers``, and can be adjusted for slow CI machines using the env var
+``PRIVEX_IMPORT_BUDGET_MS``.
+"""
+import importlib
+import os
+import subprocess
+import sys
+
+import pytest
+
+from privex import helpers
+from privex.helpers import plugin
+
+IMPORT_BUDGET_MS = int(os.getenv('PRIVEX_IMPORT_BUDGET_MS', 200))
+
+HEAVY_MODULES = [
+    'privex.helpers.net', 'privex.helpers.cache', 'privex.helpers.decorators', 'privex.helpers.crypto',
+    'privex.helpers.geoip', 'privex.helpers.setuppy', 'privex.helpers.converters', 'privex.helpers.thread',
+    'cryptography', 'geoip2', 'dateutil', 'redis', 'pylibmc', 'setuptools', 'distutils', 'asyncio',
+]
+"""Modules which must not be imported by a plain ``import privex.helpers``"""
+
+
+def _importtime(code: str = 'import privex.helpers') -> dict:
+    """Run ``code`` in a fresh interpreter with ``-X importtime``, and return a dict of ``{module: cumulative_us}``"""
+    res = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code], stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), check=True
+    )
+    mods = {}
+    for line in res.stderr.decode().splitlines():
+        if not line.startswith('import time:') or '|' not in line: continue
+        _, cumulative, name = line.split('|')
+        if not cumulative.strip().isdigit(): continue
+        mods[name.strip()] = int(cumulative)
+    return mods
+
+
+def _loaded_modules(code: str = 'import privex.helpers') -> set:
+    """Run ``code`` in a fresh interpreter, and return the names of all modules in ``sys.modules`` afterwards"""
+    res = subprocess.run(
+        [sys.executable, '-c', f'{code}\nimport sys\nprint("\\n".join(sys.modules.keys()))'], stdout=subprocess.PIPE,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), check=True
+    )
+    return set(res.stdout.decode().split())
+
+
+def test_import_does_not_load_heavy_modules():
+    mods = _loaded_modules()
+    assert 'privex.helpers.common' in mods
+    loaded = [m for m in HEAVY_MODULES if m in mods]
+    assert loaded == [], f"'import privex.helpers' should not import: {loaded}"
+
+
+def test_import_time_budget():
+    # Best of 3 runs, to avoid failing due to a one-off slow run
+    best = min(_importtime()['privex.helpers'] for _ in range(3)) / 1000
+    assert best < IMPORT_BUDGET_MS, f"'import privex.helpers' took {best:.1f}ms (budget: {IMPORT_BUDGET_MS}ms)"
+
+
+def test_lazy_attribute_imports_submodule():
+    mods = _loaded_modules('from privex.helpers import ip_is_v4')
+    assert 'privex.helpers.net' in mods
+    assert 'privex.helpers.crypto' not in mods and 'privex.helpers.geoip' not in mods
+
+
+def test_lazy_names():
+    from privex.helpers import r_cache, MemoryCache, resolve_ips
+    from privex.helpers.decorators import r_cache as orig_r_cache
+    assert r_cache is orig_r_cache
+    assert helpers.MemoryCache is MemoryCache
+    assert callable(resolve_ips)
+    assert helpers.net is importlib.import_module('privex.helpers.net')
+    assert 'r_cache' in dir(helpers)
+    with pytest.raises(AttributeError):
+        helpers.this_does_not_exist
+    with pytest.raises(ImportError):
+        from privex.helpers import _this_does_not_exist
+
+
+def test_unknown_name_does_not_load_submodules():
+    mods = _loaded_modules('import privex.helpers\nassert not hasattr(privex.helpers, "this_does_not_exist")')
+    loaded = [m for m in HEAVY_MODULES if m in mods]
+    assert loaded == [], f"looking up an unknown name on privex.helpers should not import: {loaded}"
+
+
+def _plugin_has(name: str) -> bool:
+    """plugin only defines its Redis / Memcached / GeoIP helpers if their dependencies are installed"""
+    deps = [
+        ('redis_async', plugin.HAS_ASYNC_REDIS), ('memcached_async', plugin.HAS_ASYNC_MEMCACHED),
+        ('redis', plugin.HAS_REDIS), ('memcached', plugin.HAS_MEMCACHED), ('geo', plugin.HAS_GEOIP),
+    ]
+    return next((has for dep, has in deps if dep in name), True)
+
+
+def test_lazy_attrs_match_submodules():
+    """Every name listed in ``_LAZY_ATTRS`` must exist in its submodule (if the submodule's dependencies are installed)"""
+    unavailable = {'cache.RedisCache': not plugin.HAS_REDIS, 'cache.MemcachedCache': not plugin.HAS_MEMCACHED}
+    for mod, attrs in helpers._LAZY_ATTRS.items():
+        if unavailable.get(mod, False):
+            continue
+        try:
+            m = importlib.import_module(f'privex.helpers.{mod}')
+        except ImportError:
+            continue
+        missing = [a for a in attrs if not hasattr(m, a) and not (mod == 'plugin' and not _plugin_has(a))]
+        assert missing == [], f"privex.helpers.{mod} is missing lazy names: {missing}"
+        if mod in helpers._STAR_MODULES and hasattr(m, '__all__'):
+            unlisted = [a for a in m.__all__ if a not in helpers._ATTR_MODULES and a not in helpers._EAGER_ATTRS]
+            assert unlisted == [], f"names in privex.helpers.{mod}.__all__ are missing from _LAZY_ATTRS: {unlisted}"
+
+
+def test_star_import():
+    ns = {}
+    exec('from privex.helpers import *', ns)
+    for name in ['empty', 'r_cache', 'z_cache', 'MemoryCache', 'resolve_ips', 'DictObject', 'run_sync', 'BetterEvent']:
+        assert name in ns, f"'from privex.helpers import *' should export {name}"